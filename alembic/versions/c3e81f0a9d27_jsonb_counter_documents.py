@@ -0,0 +1,57 @@
+"""jsonb counter documents
+
+Revision ID: c3e81f0a9d27
+Revises: a59998b48ad5
+Create Date: 2025-07-12 14:05:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e81f0a9d27'
+down_revision: Union[str, Sequence[str], None] = 'a59998b48ad5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTER_COLUMNS = ('inventory', 'tier_fragments', 'element_fragments')
+
+
+def upgrade() -> None:
+    """Move inventory/fragment documents to JSONB and index total item counts."""
+    for column in COUNTER_COLUMNS:
+        op.alter_column('player', column,
+                        existing_type=postgresql.JSON(astext_type=sa.Text()),
+                        type_=postgresql.JSONB(astext_type=sa.Text()),
+                        postgresql_using=f'{column}::jsonb',
+                        existing_nullable=True)
+
+    # Sum of all counts in a {key: count} document; IMMUTABLE so it can back an index
+    op.execute("""
+        CREATE OR REPLACE FUNCTION player_item_count(doc jsonb) RETURNS bigint
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+            SELECT COALESCE(SUM(CASE WHEN jsonb_typeof(value) = 'number' THEN value::text::bigint ELSE 0 END), 0)
+            FROM jsonb_each(COALESCE(doc, '{}'::jsonb))
+        $$
+    """)
+    op.execute("CREATE INDEX ix_player_inventory_item_count ON player (player_item_count(inventory))")
+    # Key lookups for admin queries ("who holds echo_key?")
+    op.create_index('ix_player_inventory_keys', 'player', ['inventory'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Back to JSON documents."""
+    op.drop_index('ix_player_inventory_keys', table_name='player')
+    op.execute("DROP INDEX IF EXISTS ix_player_inventory_item_count")
+    op.execute("DROP FUNCTION IF EXISTS player_item_count(jsonb)")
+
+    for column in COUNTER_COLUMNS:
+        op.alter_column('player', column,
+                        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+                        type_=postgresql.JSON(astext_type=sa.Text()),
+                        postgresql_using=f'{column}::json',
+                        existing_nullable=True)
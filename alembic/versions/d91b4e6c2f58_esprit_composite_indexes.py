@@ -0,0 +1,70 @@
+"""esprit composite indexes
+
+Revision ID: d91b4e6c2f58
+Revises: c3e81f0a9d27
+Create Date: 2025-07-13 11:22:47.918305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91b4e6c2f58'
+down_revision: Union[str, Sequence[str], None] = 'c3e81f0a9d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STACK_COLUMNS = ['esprit_base_id', 'quantity']
+
+
+def upgrade() -> None:
+    """One stack per (owner, base) plus owner-scoped covering indexes."""
+    # Duplicate stacks can exist from racing captures: fold them into the oldest row first
+    op.execute("""
+        CREATE TEMP TABLE esprit_stack_merge ON COMMIT DROP AS
+        SELECT id AS duplicate_id,
+               MIN(id) OVER (PARTITION BY owner_id, esprit_base_id) AS keep_id
+        FROM esprit
+    """)
+    op.execute("DELETE FROM esprit_stack_merge WHERE duplicate_id = keep_id")
+    op.execute("""
+        UPDATE esprit e
+        SET quantity = e.quantity + d.quantity,
+            awakening_level = GREATEST(e.awakening_level, d.awakening_level)
+        FROM (
+            SELECT m.keep_id, SUM(x.quantity) AS quantity, MAX(x.awakening_level) AS awakening_level
+            FROM esprit_stack_merge m JOIN esprit x ON x.id = m.duplicate_id
+            GROUP BY m.keep_id
+        ) d
+        WHERE e.id = d.keep_id
+    """)
+    for column in ('leader_esprit_stack_id', 'support1_esprit_stack_id', 'support2_esprit_stack_id'):
+        op.execute(f"""
+            UPDATE player p SET {column} = m.keep_id
+            FROM esprit_stack_merge m WHERE p.{column} = m.duplicate_id
+        """)
+    op.execute("DELETE FROM esprit WHERE id IN (SELECT duplicate_id FROM esprit_stack_merge)")
+
+    op.create_index('uq_esprit_owner_base', 'esprit', ['owner_id', 'esprit_base_id'], unique=True)
+    op.create_index('ix_esprit_owner_created', 'esprit', ['owner_id', 'created_at'],
+                    postgresql_include=STACK_COLUMNS)
+    op.create_index('ix_esprit_owner_tier_awakening', 'esprit', ['owner_id', 'tier', 'awakening_level'],
+                    postgresql_include=STACK_COLUMNS)
+    op.create_index('ix_esprit_owner_element', 'esprit', ['owner_id', 'element'],
+                    postgresql_include=STACK_COLUMNS)
+
+    # Leading column of uq_esprit_owner_base covers every owner_id-only lookup
+    op.drop_index(op.f('ix_esprit_owner_id'), table_name='esprit')
+    op.execute("ANALYZE esprit")
+
+
+def downgrade() -> None:
+    """Back to single-column indexes (merged duplicate stacks stay merged)."""
+    op.create_index(op.f('ix_esprit_owner_id'), 'esprit', ['owner_id'], unique=False)
+    op.drop_index('ix_esprit_owner_element', table_name='esprit')
+    op.drop_index('ix_esprit_owner_tier_awakening', table_name='esprit')
+    op.drop_index('ix_esprit_owner_created', table_name='esprit')
+    op.drop_index('uq_esprit_owner_base', table_name='esprit')
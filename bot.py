@@ -1,15 +1,24 @@
 # bot.py - PREFIX COMMANDS VERSION WITH BACKGROUND TASKS
-import disnake
-from disnake.ext import commands
 import os
 import sys
-import logging
-from pathlib import Path
-from dotenv import load_dotenv
 
 # Add project root to path so imports work
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Startup timing first, so --profile-startup sees every import below
+from src.utils.startup import Startup
+
+PROFILE_STARTUP = "--profile-startup" in sys.argv
+if PROFILE_STARTUP:
+    Startup.profile_imports()
+
+import asyncio
+import disnake
+from disnake.ext import commands
+import logging
+from pathlib import Path
+from dotenv import load_dotenv
+
 # Load environment variables
 load_dotenv()
 
@@ -45,11 +54,6 @@ if sys.platform == "win32":
 
 logger = logging.getLogger("reve")
 
-# Import our stuff AFTER path is set
-from src.utils.database_service import DatabaseService
-from src.utils.config_manager import ConfigManager
-from src.utils.redis_service import RedisService
-
 # =====================================
 # PREFIX COMMAND CONFIGURATION
 # =====================================
@@ -74,9 +78,36 @@ bot = commands.Bot(
     help_command=None  # We'll make our own
 )
 
+# =====================================
+# COMMAND TRACING
+# =====================================
+
+from src.utils.tracing import Tracer
+
+Tracer.instrument_discord(bot.http)
+
+@bot.before_invoke
+async def start_command_trace(ctx):
+    """Open a trace span for every prefix command"""
+    Tracer.start_trace(f"r {ctx.command.qualified_name}", user=ctx.author.id)
+
+@bot.after_invoke
+async def finish_command_trace(ctx):
+    Tracer.finish_current("failed" if ctx.command_failed else None)
+
+@bot.before_slash_command_invoke
+async def start_slash_trace(inter):
+    """Open a trace span for every slash command"""
+    Tracer.start_trace(f"/{inter.application_command.qualified_name}", user=inter.author.id)
+
+@bot.after_slash_command_invoke
+async def finish_slash_trace(inter):
+    Tracer.finish_current("failed" if inter.command_failed else None)
+
 @bot.event
 async def on_ready():
     """Bot startup"""
+    first_ready = Startup.mark_ready()
     logger.info(f"{bot.user} is online with prefix commands!")
     logger.info(f"Connected to {len(bot.guilds)} guilds")
     logger.info(f"Prefix: r")
@@ -109,6 +140,18 @@ async def on_ready():
             
     except Exception as e:
         logger.error(f"Failed to setup emoji manager: {e}")
+    
+    # Local Prometheus endpoint (only when METRICS_PORT is set; on_ready can fire again on reconnect)
+    try:
+        from src.utils.metrics import Metrics
+        await Metrics.serve()
+    except Exception as e:
+        logger.error(f"Failed to start metrics endpoint: {e}")
+    
+    if first_ready and PROFILE_STARTUP:
+        await Startup.wait_warmups()
+        print(Startup.report())
+        await bot.close()
 
 @bot.event
 async def on_command_error(ctx, error):
@@ -179,12 +222,12 @@ def load_cogs():
         except Exception as e:
             logger.error(f"Failed to load {cog_name}: {e}")
 
-def initialize_services():
-    """Initialize all services - UPDATED TO INCLUDE BACKGROUND CONFIG"""
+async def initialize_services():
+    """Config, database and Redis come up concurrently (see Startup.initialize)"""
     try:
-        # Config Manager - LOAD BACKGROUND TASKS CONFIG
+        await Startup.initialize()
+        
         from src.utils.config_manager import ConfigManager
-        ConfigManager.load_all()
         logger.info(f"ConfigManager loaded: {len(ConfigManager._configs)} configs")
         
         # Verify background tasks config loaded
@@ -203,18 +246,7 @@ def initialize_services():
         else:
             logger.warning("⚠️ Background tasks configuration not found - using defaults")
         
-        # Database - ACTUALLY INITIALIZE IT
-        from src.utils.database_service import DatabaseService
-        DatabaseService.init()
         logger.info("✅ DatabaseService ready")
-        
-        # Redis - ACTUALLY INITIALIZE IT
-        from src.utils.redis_service import RedisService
-        RedisService.init()
-        if RedisService.is_available():
-            logger.info("✅ RedisService connected")
-        else:
-            logger.warning("⚠️ Redis not available - running without cache")
             
     except Exception as e:
         logger.error(f"❌ Error initializing services: {e}")
@@ -225,21 +257,35 @@ def main():
     # Create logs directory
     os.makedirs("logs", exist_ok=True)
     
-    # Initialize services first
+    # Initialize services first (on the bot's loop, so pooled connections stay usable)
     logger.info("🚀 Starting REVE with prefix commands + automated background tasks...")
     try:
-        initialize_services()
+        with Startup.phase("services"):
+            bot.loop.run_until_complete(initialize_services())
     except Exception as e:
         logger.critical(f"❌ Failed to initialize services: {e}")
         sys.exit(1)
     
     # Load cogs (including system_tasks_cog for background automation)
     logger.info("📦 Loading cogs...")
-    load_cogs()
+    with Startup.phase("cogs"):
+        load_cogs()
+    
+    # Asset and index caches fill while the bot logs in
+    Startup.start_warmups(bot.loop)
     
     # Get Discord token
     token = os.getenv("DISCORD_TOKEN")
     if not token:
+        if PROFILE_STARTUP:
+            bot.loop.run_until_complete(Startup.wait_warmups())
+            print(Startup.report())
+            print("(no DISCORD_TOKEN: stopped before login)")
+            pending = asyncio.all_tasks(bot.loop)
+            for task in pending:
+                task.cancel()
+            bot.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            return
         logger.error("❌ DISCORD_TOKEN not found in environment variables!")
         sys.exit(1)
     
@@ -248,10 +294,12 @@ def main():
         logger.info("🎮 Bot starting with prefix 'r' and automated systems...")
         logger.info("⚡ Energy/Stamina: Regenerates every 1 minute per player")
         logger.info("🏗️ Building Income: Processes every 30 minutes (stacks up to 12 hours)")
-        logger.info("🧹 Cache Cleanup: Every 6 hours")
+        logger.info("🧹 Cache Sweeper: Small budgeted slice every 10 seconds")
         logger.info("🌅 Daily Reset: Midnight UTC")
         logger.info("🔧 Admin Commands: r system status, r system trigger")
+        logger.info(f"⏱️ Pre-login startup took {Startup.elapsed():.2f}s")
         
+        Startup.mark_login()
         bot.run(token)
         
     except KeyboardInterrupt:
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Contention benchmark: locking read-modify-write vs single-statement conditional UPDATE.
+
+"locking" replays the old CurrencyService.spend_currency path (SELECT ... FOR UPDATE,
+check in Python, write, commit). "conditional" calls CurrencyService._conditional_adjust
+(UPDATE ... WHERE revies >= :n RETURNING). Each variant runs twice: every worker on one
+hot player, then workers spread across many players.
+
+Usage:
+    python scripts/benchmark_conditional_updates.py --workers 32 --players 100 --seconds 5
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, delete
+
+from src.database.models.player import Player
+from src.services.currency_service import CurrencyService
+from src.utils.database_service import DatabaseService
+
+STARTING_REVIES = 10**12
+
+
+async def create_bench_players(count: int) -> List[int]:
+    async with DatabaseService.get_transaction() as session:
+        players = [
+            Player(discord_id=-random.randint(10**9, 10**12), username="conditional-benchmark", revies=STARTING_REVIES)
+            for _ in range(count)
+        ]
+        session.add_all(players)
+        await session.flush()
+        return [p.id for p in players if p.id is not None]
+
+
+async def delete_bench_players(player_ids: List[int]):
+    async with DatabaseService.get_transaction() as session:
+        await session.execute(delete(Player).where(Player.id.in_(player_ids)))  # type: ignore
+
+
+async def spend_locking(player_id: int):
+    async with DatabaseService.get_transaction() as session:
+        stmt = select(Player).options(Player.projection("currency")).where(Player.id == player_id).with_for_update()  # type: ignore
+        player = (await session.execute(stmt)).scalar_one()
+        if player.revies < 1:
+            raise ValueError("Insufficient revies")
+        player.revies -= 1
+        player.update_activity()
+        await session.commit()
+
+
+async def spend_conditional(player_id: int):
+    async with DatabaseService.get_transaction() as session:
+        if await CurrencyService._conditional_adjust(session, player_id, "revies", -1) is None:
+            raise ValueError("Insufficient revies")
+        await session.commit()
+
+
+VARIANTS = {"locking": spend_locking, "conditional": spend_conditional}
+
+
+async def run(spend, player_ids: List[int], workers: int, seconds: float) -> Dict[str, Any]:
+    deadline = time.perf_counter() + seconds
+    latencies: List[float] = []
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            await spend(random.choice(player_ids))
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    ordered = sorted(latencies)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000  # noqa: E731
+    return {
+        "spends": len(ordered),
+        "ops_per_second": len(ordered) / seconds,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": pick(0.5),
+        "p99_ms": pick(0.99),
+    }
+
+
+async def spent_total(player_ids: List[int]) -> int:
+    async with DatabaseService.get_session() as session:
+        balances = (await session.execute(select(Player.revies).where(Player.id.in_(player_ids)))).scalars().all()  # type: ignore
+        return STARTING_REVIES * len(player_ids) - sum(balances)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Conditional UPDATE vs SELECT FOR UPDATE contention benchmark")
+    parser.add_argument("--workers", type=int, default=32, help="Concurrent spenders")
+    parser.add_argument("--players", type=int, default=100, help="Players in the spread scenario")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each run")
+    args = parser.parse_args()
+
+    DatabaseService.init()
+    player_ids = await create_bench_players(args.players)
+    scenarios = {"hot": player_ids[:1], "spread": player_ids}
+    try:
+        print(f"{'Scenario':<8} {'Variant':<12} {'Spends':>9} {'ops/s':>10} {'mean':>9} {'p50':>9} {'p99':>9} {'Exact':>6}")
+        for scenario, ids in scenarios.items():
+            for name, spend in VARIANTS.items():
+                before = await spent_total(player_ids)
+                result = await run(spend, ids, args.workers, args.seconds)
+                exact = await spent_total(player_ids) - before == result["spends"]
+                print(
+                    f"{scenario:<8} {name:<12} {result['spends']:>9,} {result['ops_per_second']:>10,.0f} "
+                    f"{result['mean_ms']:>7.2f}ms {result['p50_ms']:>7.2f}ms {result['p99_ms']:>7.2f}ms {str(exact):>6}"
+                )
+        print(f"\nPool: {DatabaseService.get_pool_stats()}")
+    finally:
+        await delete_bench_players(player_ids)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
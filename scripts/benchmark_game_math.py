@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the pure game-math hot paths.
+
+Each benchmark replays a fixed batch of inputs built from a seeded RNG (esprit
+bases with relics, stacks at every awakening level, tier pairs, combat stats,
+the live reve rates) so runs on the same machine are comparable. Every
+benchmark is warmed up, auto-ranged to ~--round-ms per round, then timed for
+--rounds rounds interleaved across benchmarks; a separate tracemalloc pass
+records peak bytes per call and bytes still held afterwards.
+
+Against a saved baseline a benchmark counts as a regression when its median
+is more than --threshold slower AND a Mann-Whitney U test over the per-round
+samples says the shift is not noise (p < --alpha). Allocation peaks are
+compared with the same threshold. Regressions exit with code 1.
+
+Usage:
+    python scripts/benchmark_game_math.py --save-baseline
+    python scripts/benchmark_game_math.py                      # compare against scripts/game_math_baseline.json
+    python scripts/benchmark_game_math.py --filter fusion --rounds 30
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.database.models.esprit import Esprit
+from src.database.models.esprit_base import EspritBase
+from src.services.combat_service import CombatService
+from src.services.fusion_service import FusionService
+from src.services.reve_service import ReveService
+from src.utils.config_manager import ConfigManager
+from src.utils.game_constants import Elements, GameConstants
+
+DEFAULT_BASELINE = Path(__file__).parent / "game_math_baseline.json"
+BATCH_SIZE = 512
+ALLOC_SLACK_BYTES = 64  # tracemalloc peaks jitter by a few blocks; ignore growth below this
+
+
+class Benchmark:
+    """A function plus the fixed argument tuples it is replayed over"""
+
+    def __init__(self, name: str, func: Callable, inputs: List[Tuple], reseed: Optional[int] = None):
+        self.name = name
+        self.func = func
+        self.inputs = inputs
+        self.reseed = reseed  # for functions that roll the global RNG
+
+    def run_batch(self) -> int:
+        if self.reseed is not None:
+            random.seed(self.reseed)
+        func = self.func
+        for args in self.inputs:
+            func(*args)
+        return len(self.inputs)
+
+
+def build_benchmarks(seed: int) -> List[Benchmark]:
+    """Deterministic fixtures; same seed and configs give the same inputs"""
+    rng = random.Random(seed)
+    elements = list(Elements)
+    relic_names = [r["name"] for r in (ConfigManager.get("relics") or {}).get("relics", [])]
+
+    bases: List[EspritBase] = []
+    for i in range(BATCH_SIZE):
+        equipped: List[Optional[str]] = [rng.choice(relic_names) for _ in range(rng.randint(0, 3))] if relic_names else []
+        if equipped and rng.random() < 0.2:
+            equipped.append(None)  # empty slot
+        bases.append(EspritBase(
+            name=f"bench_{i}",
+            element=elements[i % len(elements)].display_name,
+            base_tier=rng.randint(1, 12),
+            base_atk=rng.randint(20, 5000),
+            base_def=rng.randint(20, 5000),
+            base_hp=rng.randint(200, 50000),
+            description="benchmark fixture",
+            equipped_relics=equipped,
+        ))
+
+    stacks = [
+        (Esprit(esprit_base_id=i + 1, owner_id=1, quantity=rng.randint(1, 50), tier=base.base_tier,
+                awakening_level=i % 6, element=base.element), base)
+        for i, base in enumerate(bases)
+    ]
+
+    archetypes = [None, None, "tank", "dps", "balanced"]
+    fusion_pairs = []
+    for _ in range(BATCH_SIZE):
+        tier = rng.randint(1, 11)
+        fusion_pairs.append((tier, tier if rng.random() < 0.7 else min(12, tier + 1)))
+
+    rates = (ConfigManager.get("reve_system") or {}).get("rates") or {"1": 0.6, "2": 0.3, "3": 0.1}
+
+    return [
+        Benchmark("esprit.individual_power",
+                  lambda stack, base: stack.get_individual_power(base), stacks),
+        Benchmark("esprit.stack_total_power",
+                  lambda stack, base: stack.get_stack_total_power(base), stacks),
+        Benchmark("esprit_base.total_stats_with_relics",
+                  EspritBase.get_total_stats_with_relics, [(base,) for base in bases]),
+        Benchmark("elements.leadership_bonuses",
+                  Elements.calculate_leadership_bonuses,
+                  [(elements[i % len(elements)], rng.randint(1, 12), rng.randint(0, 5)) for i in range(BATCH_SIZE)]),
+        Benchmark("game_constants.esprit_stats",
+                  GameConstants.calculate_esprit_stats,
+                  [(elements[i % len(elements)].display_name.lower(), rng.randint(50, 20000), rng.choice(archetypes))
+                   for i in range(BATCH_SIZE)]),
+        Benchmark("fusion.success_rate", FusionService._calculate_success_rate, fusion_pairs),
+        Benchmark("combat.base_damage",
+                  CombatService._calculate_base_damage,
+                  [(rng.randint(100, 500_000), rng.randint(50, 200_000), rng.choice([100, 120, 150, 200]))
+                   for _ in range(BATCH_SIZE)]),
+        Benchmark("reve.select_tier", ReveService._select_tier_by_probability,
+                  [(rates,)] * BATCH_SIZE, reseed=seed),
+    ]
+
+
+# --- Timing ---
+
+def autorange(bench: Benchmark, round_ms: float) -> int:
+    """Batches per round so one round lasts about round_ms"""
+    batches = 1
+    while True:
+        started = time.perf_counter_ns()
+        for _ in range(batches):
+            bench.run_batch()
+        elapsed_ms = (time.perf_counter_ns() - started) / 1e6
+        if elapsed_ms >= round_ms / 4 or batches >= 1 << 16:
+            return max(1, math.ceil(batches * round_ms / max(elapsed_ms, 1e-3)))
+        batches *= 2
+
+
+def time_benchmarks(benchmarks: List[Benchmark], rounds: int, round_ms: float,
+                    warmup_ms: float) -> Dict[str, List[float]]:
+    """ns/call per round; rounds are interleaved so machine-wide drift hits every benchmark alike"""
+    batches = {}
+    for bench in benchmarks:
+        deadline = time.perf_counter() + warmup_ms / 1000
+        while time.perf_counter() < deadline:
+            bench.run_batch()
+        batches[bench.name] = autorange(bench, round_ms)
+
+    samples: Dict[str, List[float]] = {bench.name: [] for bench in benchmarks}
+    for _ in range(rounds):
+        for bench in benchmarks:
+            calls = 0
+            started = time.perf_counter_ns()
+            for _ in range(batches[bench.name]):
+                calls += bench.run_batch()
+            samples[bench.name].append((time.perf_counter_ns() - started) / calls)
+    return samples
+
+
+def measure_allocations(bench: Benchmark) -> Dict[str, float]:
+    """Peak bytes allocated per call and bytes still held after a batch (growth = a leak or a cache)"""
+    bench.run_batch()  # populate lazy caches outside the traced window
+    tracemalloc.start()
+    try:
+        base_current, _ = tracemalloc.get_traced_memory()
+        peak_per_call = 0
+        func = bench.func
+        if bench.reseed is not None:
+            random.seed(bench.reseed)
+        for args in bench.inputs:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            func(*args)
+            _, peak = tracemalloc.get_traced_memory()
+            peak_per_call = max(peak_per_call, peak - before)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"peak_bytes_per_call": peak_per_call, "retained_bytes": max(0, current - base_current)}
+
+
+# --- Statistics ---
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    quartiles = statistics.quantiles(samples, n=4) if len(samples) >= 2 else [samples[0]] * 3
+    return {
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) >= 2 else 0.0,
+        "min": min(samples),
+        "iqr": quartiles[2] - quartiles[0],
+    }
+
+
+def mann_whitney_p(current: List[float], baseline: List[float]) -> float:
+    """One-sided p-value that current is stochastically larger (normal approximation, tie-corrected)"""
+    n1, n2 = len(current), len(baseline)
+    if n1 < 3 or n2 < 3:
+        return 1.0
+    combined = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tied = j - i + 1
+        tie_term += tied ** 3 - tied
+        i = j + 1
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any],
+            threshold: float, alpha: float) -> List[str]:
+    failures = []
+    known = baseline.get("benchmarks", {})
+    print(f"\n{'benchmark':38} {'baseline':>10} {'current':>10} {'change':>8} {'p':>7}  alloc")
+    for name, result in results.items():
+        expected = known.get(name)
+        if expected is None:
+            print(f"{name:38} {'—':>10} {result['stats']['median']:>9.0f}n  (new)")
+            continue
+        old, new = expected["stats"]["median"], result["stats"]["median"]
+        change = (new - old) / old if old else 0.0
+        p = mann_whitney_p(result["samples"], expected["samples"])
+        old_peak = expected["allocations"]["peak_bytes_per_call"]
+        new_peak = result["allocations"]["peak_bytes_per_call"]
+
+        flags = []
+        if change > threshold and p < alpha:
+            flags.append("SLOWER")
+            failures.append(f"{name}: median {old:.0f}ns → {new:.0f}ns (+{change:.1%}, p={p:.4f})")
+        elif change < -threshold and mann_whitney_p(expected["samples"], result["samples"]) < alpha:
+            flags.append("faster")
+        if new_peak > old_peak * (1 + threshold) + ALLOC_SLACK_BYTES:
+            flags.append("MORE ALLOC")
+            failures.append(f"{name}: peak {old_peak}B → {new_peak}B per call")
+        print(f"{name:38} {old:>9.0f}n {new:>9.0f}n {change:>+8.1%} {p:>7.4f}  "
+              f"{old_peak}→{new_peak}B {' '.join(flags)}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Game-math micro-benchmarks with baseline comparison")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run as the new baseline")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--round-ms", type=float, default=50.0)
+    parser.add_argument("--warmup-ms", type=float, default=200.0)
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown that counts as a regression")
+    parser.add_argument("--alpha", type=float, default=0.01, help="Significance level for the Mann-Whitney test")
+    parser.add_argument("--seed", type=int, default=20240601)
+    args = parser.parse_args()
+
+    ConfigManager.load_all()
+    benchmarks = [b for b in build_benchmarks(args.seed) if args.filter in b.name]
+    if not benchmarks:
+        print(f"No benchmarks match '{args.filter}'")
+        sys.exit(2)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    print(f"{'benchmark':38} {'median':>9} {'iqr':>8} {'stdev':>8} {'min':>9} {'peak':>7} {'held':>7}")
+    timings = time_benchmarks(benchmarks, args.rounds, args.round_ms, args.warmup_ms)
+    for bench in benchmarks:
+        samples = timings[bench.name]
+        stats = summarize(samples)
+        allocations = measure_allocations(bench)
+        results[bench.name] = {"samples": samples, "stats": stats, "allocations": allocations}
+        print(f"{bench.name:38} {stats['median']:>7.0f}ns {stats['iqr']:>6.1f}ns {stats['stdev']:>6.1f}ns "
+              f"{stats['min']:>7.0f}ns {allocations['peak_bytes_per_call']:>6}B {allocations['retained_bytes']:>6}B")
+
+    if args.save_baseline:
+        existing = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        merged = dict(existing.get("benchmarks", {}))
+        merged.update(results)
+        args.baseline.write_text(json.dumps({"environment": environment(), "seed": args.seed, "benchmarks": merged},
+                                            indent=2, sort_keys=True))
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline first")
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("environment") != environment():
+        print(f"\n⚠️ Baseline was recorded on {baseline.get('environment')}; timings may not be comparable")
+    if baseline.get("seed") != args.seed:
+        print(f"⚠️ Baseline used seed {baseline.get('seed')}; fixtures differ")
+
+    failures = compare(results, baseline, args.threshold, args.alpha)
+    if failures:
+        print("\nRegressions:")
+        for failure in failures:
+            print(f"  ✗ {failure}")
+        sys.exit(1)
+    print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
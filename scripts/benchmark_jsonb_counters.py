@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent item grants: read-modify-write vs server-side JSONB deltas.
+
+"rmw" is the old InventoryService path (SELECT ... FOR UPDATE, mutate the dict in
+Python, flag_modified, rewrite the whole document). "jsonb" is JsonbCounters.increment
+(one UPDATE ... RETURNING). Workers grant items to a shared pool of players so both
+row contention and document size show up in the numbers.
+
+Usage:
+    python scripts/benchmark_jsonb_counters.py --players 20 --workers 16 --seconds 10 --inventory-items 300
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, delete
+from sqlalchemy.orm.attributes import flag_modified
+
+from src.database.models.player import Player
+from src.utils.database_service import DatabaseService
+from src.utils.jsonb_counters import JsonbCounters
+
+ITEMS = ("faded_echo", "vivid_echo", "brilliant_echo", "echo_key", "energy_potion", "stamina_potion")
+
+
+async def create_bench_players(count: int, inventory_items: int) -> List[int]:
+    """Insert throwaway players whose inventories are padded to a realistic size"""
+    async with DatabaseService.get_transaction() as session:
+        players = [
+            Player(
+                discord_id=-random.randint(10**9, 10**12),
+                username="jsonb-benchmark",
+                inventory={f"item_{i}": random.randint(1, 99) for i in range(inventory_items)},
+            )
+            for _ in range(count)
+        ]
+        session.add_all(players)
+        await session.flush()
+        return [p.id for p in players if p.id is not None]
+
+
+async def delete_bench_players(player_ids: List[int]):
+    async with DatabaseService.get_transaction() as session:
+        await session.execute(delete(Player).where(Player.id.in_(player_ids)))  # type: ignore
+
+
+async def grant_rmw(player_id: int, item: str):
+    async with DatabaseService.get_transaction() as session:
+        stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
+        player = (await session.execute(stmt)).scalar_one()
+        player.inventory[item] = player.inventory.get(item, 0) + 1
+        flag_modified(player, "inventory")
+        player.update_activity()
+        await session.commit()
+
+
+async def grant_jsonb(player_id: int, item: str):
+    async with DatabaseService.get_transaction() as session:
+        await JsonbCounters.increment(session, player_id, "inventory", item, 1)
+        await session.commit()
+
+
+VARIANTS = {"rmw": grant_rmw, "jsonb": grant_jsonb}
+
+
+async def run_variant(grant, player_ids: List[int], workers: int, seconds: float) -> Dict[str, Any]:
+    deadline = time.perf_counter() + seconds
+    latencies: List[float] = []
+    granted: Dict[int, int] = {pid: 0 for pid in player_ids}
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            player_id = random.choice(player_ids)
+            started = time.perf_counter()
+            await grant(player_id, random.choice(ITEMS))
+            latencies.append(time.perf_counter() - started)
+            granted[player_id] += 1
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    ordered = sorted(latencies)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000  # noqa: E731
+    return {
+        "grants": len(latencies),
+        "ops_per_second": len(latencies) / seconds,
+        "mean_ms": statistics.fmean(ordered) * 1000 if ordered else 0.0,
+        "p50_ms": pick(0.5) if ordered else 0.0,
+        "p99_ms": pick(0.99) if ordered else 0.0,
+        "granted": granted,
+    }
+
+
+async def verify_totals(player_ids: List[int], baseline: Dict[int, int], granted: Dict[int, int]) -> bool:
+    """No lost updates: every player's echo/potion total grew by exactly what was granted"""
+    totals = await tracked_totals(player_ids)
+    return all(totals[pid] - baseline[pid] == granted[pid] for pid in player_ids)
+
+
+async def tracked_totals(player_ids: List[int]) -> Dict[int, int]:
+    async with DatabaseService.get_session() as session:
+        rows = (await session.execute(
+            select(Player.id, Player.inventory).where(Player.id.in_(player_ids))  # type: ignore
+        )).all()
+        return {row.id: sum(int((row.inventory or {}).get(item, 0)) for item in ITEMS) for row in rows}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Concurrent item grant benchmark")
+    parser.add_argument("--players", type=int, default=20, help="Players sharing the grants")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent workers")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration per variant")
+    parser.add_argument("--inventory-items", type=int, default=200, help="Padding keys per inventory")
+    args = parser.parse_args()
+
+    DatabaseService.init()
+    player_ids = await create_bench_players(args.players, args.inventory_items)
+    try:
+        print(f"{'Variant':<8} {'Grants':>9} {'ops/s':>10} {'mean':>9} {'p50':>9} {'p99':>9} {'Consistent':>11}")
+        for name, grant in VARIANTS.items():
+            baseline = await tracked_totals(player_ids)
+            result = await run_variant(grant, player_ids, args.workers, args.seconds)
+            consistent = await verify_totals(player_ids, baseline, result["granted"])
+            print(
+                f"{name:<8} {result['grants']:>9,} {result['ops_per_second']:>10,.0f} "
+                f"{result['mean_ms']:>7.2f}ms {result['p50_ms']:>7.2f}ms {result['p99_ms']:>7.2f}ms {str(consistent):>11}"
+            )
+        print(f"\nPool: {DatabaseService.get_pool_stats()}")
+    finally:
+        await delete_bench_players(player_ids)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark full-row vs projected Player loads on a real database.
+
+For a synthetic player with realistic JSON blobs this measures, per command:
+  * bytes transferred for the locked SELECT (pg_column_size of the returned row)
+  * lock hold time (SELECT ... FOR UPDATE through COMMIT) for a currency spend
+  * throughput and latency when several workers contend on the same row
+
+Usage:
+    python scripts/benchmark_player_projection.py --iterations 500 --workers 8 --seconds 5
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, delete, func
+
+from src.database.models.player import Player, PLAYER_COLUMN_GROUPS
+from src.utils.database_service import DatabaseService
+
+VARIANTS = {
+    "full": None,
+    "projected": ("currency",),
+}
+
+
+def _player_stmt(player_id: int, groups: Optional[tuple]):
+    stmt = select(Player).where(Player.id == player_id)  # type: ignore
+    if groups is not None:
+        stmt = stmt.options(Player.projection(*groups))
+    return stmt
+
+
+async def create_bench_player(inventory_items: int) -> int:
+    """Insert a throwaway player with inventory/fragment blobs sized like an active account"""
+    async with DatabaseService.get_transaction() as session:
+        player = Player(
+            discord_id=-random.randint(10**9, 10**12),
+            username="projection-benchmark",
+            revies=10**9,
+            inventory={f"item_{i}": random.randint(1, 99) for i in range(inventory_items)},
+            tier_fragments={str(t): random.randint(0, 500) for t in range(1, 13)},
+            element_fragments={e: random.randint(0, 500) for e in ("inferno", "verdant", "abyssal", "tempest", "umbral", "radiant")},
+            achievements_earned=[f"achievement_{i}" for i in range(60)],
+        )
+        session.add(player)
+        await session.flush()
+        assert player.id is not None
+        return player.id
+
+
+async def delete_bench_player(player_id: int):
+    async with DatabaseService.get_transaction() as session:
+        await session.execute(delete(Player).where(Player.id == player_id))  # type: ignore
+
+
+async def row_bytes(player_id: int, groups: Optional[tuple]) -> int:
+    """Bytes of the row the SELECT returns, as stored by Postgres"""
+    if groups is None:
+        columns = list(Player.__table__.columns)  # type: ignore[attr-defined]
+    else:
+        names = set(PLAYER_COLUMN_GROUPS["core"]).union(*(PLAYER_COLUMN_GROUPS[g] for g in groups))
+        columns = [Player.__table__.c[name] for name in sorted(names)]  # type: ignore[attr-defined]
+    subquery = select(*columns).where(Player.id == player_id).subquery()  # type: ignore
+    async with DatabaseService.get_session() as session:
+        stmt = select(func.pg_column_size(subquery.table_valued()))
+        return int((await session.execute(stmt)).scalar() or 0)
+
+
+async def spend_once(player_id: int, groups: Optional[tuple]) -> float:
+    """One locked currency spend; returns seconds between lock request and commit"""
+    async with DatabaseService.get_transaction() as session:
+        started = time.perf_counter()
+        player = (await session.execute(_player_stmt(player_id, groups).with_for_update())).scalar_one()
+        player.revies -= 1
+        player.update_activity()
+        await session.commit()
+        return time.perf_counter() - started
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000  # noqa: E731
+    return {"mean_ms": statistics.fmean(ordered) * 1000, "p50_ms": pick(0.5), "p95_ms": pick(0.95), "p99_ms": pick(0.99)}
+
+
+async def contention(player_id: int, groups: Optional[tuple], workers: int, seconds: float) -> Dict[str, Any]:
+    """Several workers spending on the same row for a fixed duration"""
+    deadline = time.perf_counter() + seconds
+    latencies: List[float] = []
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            await spend_once(player_id, groups)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return {"ops_per_second": len(latencies) / seconds, **_percentiles(latencies)}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Full vs projected Player load benchmark")
+    parser.add_argument("--iterations", type=int, default=300, help="Sequential spends per variant")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent workers for the contention run")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each contention run")
+    parser.add_argument("--inventory-items", type=int, default=200, help="Keys in the synthetic inventory blob")
+    args = parser.parse_args()
+
+    DatabaseService.init()
+    player_id = await create_bench_player(args.inventory_items)
+    try:
+        print(f"{'Variant':<10} {'Row bytes':>10} {'Lock p50':>9} {'p95':>8} {'p99':>8} {'Contended ops/s':>16} {'p95':>8}")
+        for name, groups in VARIANTS.items():
+            size = await row_bytes(player_id, groups)
+            for _ in range(10):  # warm the pool and plan cache
+                await spend_once(player_id, groups)
+            holds = [await spend_once(player_id, groups) for _ in range(args.iterations)]
+            hold_stats = _percentiles(holds)
+            contended = await contention(player_id, groups, args.workers, args.seconds)
+            print(
+                f"{name:<10} {size:>10,} {hold_stats['p50_ms']:>8.2f}ms {hold_stats['p95_ms']:>6.2f}ms "
+                f"{hold_stats['p99_ms']:>6.2f}ms {contended['ops_per_second']:>16,.0f} {contended['p95_ms']:>6.2f}ms"
+            )
+        print(f"\nPool: {DatabaseService.get_pool_stats()}")
+    finally:
+        await delete_bench_player(player_id)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
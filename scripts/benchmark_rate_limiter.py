@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for rate limit decisions.
+
+Compares the old sliding-window deque limiter (re-implemented here for reference)
+with the GCRA InMemoryRateLimiter: nanoseconds per decision, and memory retained
+after N distinct users each hit a command. With --redis-url it also times the
+Redis Lua backend end to end (one round trip per decision).
+
+Usage:
+    python scripts/benchmark_rate_limiter.py --decisions 500000 --users 200000
+    python scripts/benchmark_rate_limiter.py --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import asyncio
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Dict, Tuple
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.utils.redis_service import InMemoryRateLimiter, RateLimiter, RedisService
+
+
+class SlidingWindowLimiter:
+    """The previous limiter: a deque of timestamps per (command, user), never evicted"""
+
+    def __init__(self):
+        self.usage_logs: Dict[str, Dict[int, deque]] = defaultdict(lambda: defaultdict(deque))
+
+    def is_rate_limited(self, user_id: int, command_name: str, uses: int, per_seconds: int) -> Tuple[bool, float]:
+        now = time.time()
+        user_log = self.usage_logs[command_name][user_id]
+        cutoff_time = now - per_seconds
+        while user_log and user_log[0] <= cutoff_time:
+            user_log.popleft()
+        if len(user_log) < uses:
+            user_log.append(now)
+            return False, 0.0
+        return True, max(0.0, user_log[0] + per_seconds - now)
+
+
+def time_decisions(limiter, decisions: int, users: int) -> float:
+    ids = [random.randrange(users) for _ in range(decisions)]
+    started = time.perf_counter_ns()
+    for user_id in ids:
+        limiter.is_rate_limited(user_id, "bench", 10, 60)
+    return (time.perf_counter_ns() - started) / decisions
+
+
+def retained_bytes(limiter, users: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for user_id in range(users):
+        limiter.is_rate_limited(user_id, "bench", 10, 60)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before
+
+
+async def time_redis(decisions: int, users: int, concurrency: int) -> float:
+    per_task = decisions // concurrency
+
+    async def worker():
+        for _ in range(per_task):
+            await RateLimiter.hit(random.randrange(users), "bench", 10, 60)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return (time.perf_counter() - started) / (per_task * concurrency) * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Rate limiter decision cost and memory benchmark")
+    parser.add_argument("--decisions", type=int, default=500_000)
+    parser.add_argument("--users", type=int, default=200_000, help="Distinct users for the memory run")
+    parser.add_argument("--max-keys", type=int, default=100_000, help="Local GCRA key cap")
+    parser.add_argument("--redis-url", help="Also benchmark the Redis Lua backend (use a scratch database)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    print(f"{'Limiter':<16} {'ns/decision':>12} {'retained after ' + format(args.users, ',') + ' users':>34}")
+    for name, factory in (("sliding-window", SlidingWindowLimiter), ("gcra-lru", lambda: InMemoryRateLimiter(args.max_keys))):
+        cost = time_decisions(factory(), args.decisions, args.users)
+        memory = retained_bytes(factory(), args.users)
+        print(f"{name:<16} {cost:>12,.0f} {memory / 1024 / 1024:>31.1f}MiB")
+
+    if args.redis_url:
+        RedisService.init(args.redis_url)
+        if not await RedisService.ping():
+            raise SystemExit(f"Redis not reachable at {args.redis_url}")
+        decisions = min(args.decisions, 50_000)
+        micros = await time_redis(decisions, args.users, args.concurrency)
+        print(f"{'redis-lua':<16} {micros * 1000:>12,.0f}  ({args.concurrency} concurrent callers, includes round trip)")
+        await RedisService.delete_pattern("ratelimit:bench:*")
+        await RedisService.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
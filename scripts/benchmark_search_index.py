@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for EspritSearchIndex autocomplete under concurrent load.
+
+Builds the index from the live catalog (or a synthetic one with --synthetic N),
+then fires random prefixes, typos and substrings from many concurrent tasks and
+reports per-lookup latency. Discord autocomplete must answer within 3 seconds,
+so p99 here should sit orders of magnitude below that.
+
+Usage:
+    python scripts/benchmark_search_index.py --synthetic 2000 --tasks 200 --lookups 50
+"""
+
+import argparse
+import asyncio
+import random
+import string
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.utils.esprit_search_index import CatalogEntry, EspritSearchIndex
+
+ELEMENTS = ["inferno", "verdant", "abyssal", "tempest", "umbral", "radiant"]
+
+
+def synthetic_catalog(size: int) -> List[CatalogEntry]:
+    rng = random.Random(7)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 8))).title() for _ in range(size // 2 + 10)]
+    return [
+        CatalogEntry(
+            id=i, name=f"{rng.choice(words)} {rng.choice(words)} {i}", element=rng.choice(ELEMENTS),
+            tier=rng.randint(1, 18), atk=rng.randint(10, 5000), defense=rng.randint(10, 5000), hp=rng.randint(100, 50000)
+        )
+        for i in range(size)
+    ]
+
+
+def make_query(name: str) -> str:
+    """Prefix, word prefix, substring or one-typo variant of a real name"""
+    kind = random.choice(("prefix", "word", "substring", "typo"))
+    if kind == "prefix":
+        return name[:random.randint(2, len(name))]
+    if kind == "word":
+        word = random.choice(name.split())
+        return word[:random.randint(2, len(word))] if len(word) > 2 else word
+    if kind == "substring":
+        start = random.randint(0, max(0, len(name) - 4))
+        return name[start:start + 4]
+    i = random.randrange(len(name))
+    return name[:i] + random.choice(string.ascii_lowercase) + name[i + 1:]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Esprit search index autocomplete benchmark")
+    parser.add_argument("--synthetic", type=int, default=0, help="Use N synthetic entries instead of the database")
+    parser.add_argument("--tasks", type=int, default=200, help="Concurrent autocomplete callers")
+    parser.add_argument("--lookups", type=int, default=50, help="Lookups per caller")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.synthetic:
+        EspritSearchIndex._snapshot = EspritSearchIndex.build(synthetic_catalog(args.synthetic))
+    else:
+        from src.utils.database_service import DatabaseService
+        DatabaseService.init()
+        await EspritSearchIndex.rebuild()
+    snapshot = await EspritSearchIndex.ensure_loaded()
+    print(f"Index built: {len(snapshot.entries):,} entries in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    names = [entry.name for entry in snapshot.entries]
+    latencies: List[float] = []
+
+    async def caller():
+        for _ in range(args.lookups):
+            query = make_query(random.choice(names))
+            element = random.choice([None, None, random.choice(ELEMENTS)])
+            t0 = time.perf_counter()
+            await EspritSearchIndex.autocomplete(query, element=element)
+            latencies.append(time.perf_counter() - t0)
+            await asyncio.sleep(0)
+
+    wall = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(args.tasks)))
+    wall = time.perf_counter() - wall
+
+    ordered = sorted(latencies)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000  # noqa: E731
+    print(f"Lookups: {len(ordered):,} in {wall:.2f}s ({len(ordered) / wall:,.0f}/s)")
+    print(f"p50 {pick(0.5):.3f}ms  p99 {pick(0.99):.3f}ms  max {ordered[-1] * 1000:.3f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
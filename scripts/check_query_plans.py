@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression suite for the hot esprit/player service queries.
+
+Seeds a LOCAL Postgres with a large synthetic population, runs real service calls
+while capturing every SELECT they issue, then replays each one under
+EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON). The run fails (exit code 1) when:
+  * a captured query sequentially scans a large table (esprit, player), or
+  * its plan shape (node types + indexes) differs from the stored baseline, or
+  * it touches more than --buffer-tolerance x the baseline's shared buffers.
+
+Point it at a throwaway database that has been migrated (alembic upgrade head)
+and has esprit bases loaded (scripts/populate_esprits.py).
+
+Usage:
+    python scripts/check_query_plans.py --database-url postgresql+asyncpg://localhost/reve_plans --seed --players 20000
+    python scripts/check_query_plans.py --database-url ... --update-baseline
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import event, func, insert, select, text
+
+DEFAULT_BASELINE = Path(__file__).parent / "query_plan_baseline.json"
+LARGE_TABLES = {"esprit", "player"}
+SEED_USERNAME = "plan-seed"
+
+
+class QueryCapture:
+    """Records the SELECTs issued through the engine while a scenario runs"""
+
+    def __init__(self):
+        self.active: Optional[str] = None
+        self.queries: Dict[str, List[Tuple[str, Any]]] = {}
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active and not executemany and statement.lstrip().upper().startswith("SELECT"):
+            self.queries.setdefault(self.active, []).append((statement, parameters))
+
+
+def _fingerprint(statement: str) -> str:
+    normalized = re.sub(r"\s+", " ", statement).strip()
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12]
+
+
+def _walk(node: Dict[str, Any]):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def summarize_plan(plan_json: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Shape, seq-scanned relations, buffers and timing of one EXPLAIN result"""
+    root = plan_json[0]
+    nodes = list(_walk(root["Plan"]))
+    shape = [
+        node["Node Type"] + (f"[{node['Index Name']}]" if "Index Name" in node else "")
+        + (f"({node['Relation Name']})" if "Relation Name" in node else "")
+        for node in nodes
+    ]
+    return {
+        "shape": shape,
+        "seq_scans": sorted({node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"}),
+        "shared_buffers": root["Plan"].get("Shared Hit Blocks", 0) + root["Plan"].get("Shared Read Blocks", 0),
+        "execution_ms": root.get("Execution Time", 0.0),
+    }
+
+
+async def seed(players: int, stacks_per_player: int):
+    """Bulk-create seed players and their esprit stacks server-side"""
+    from src.database.models.player import Player
+    from src.utils.database_service import DatabaseService
+
+    async with DatabaseService.get_transaction() as session:
+        bases = (await session.execute(text("SELECT count(*) FROM esprit_base"))).scalar() or 0
+        if bases < stacks_per_player:
+            raise SystemExit(f"Need at least {stacks_per_player} esprit bases, found {bases}: run scripts/populate_esprits.py")
+
+        existing = (await session.execute(
+            select(func.count()).select_from(Player).where(Player.username == SEED_USERNAME)  # type: ignore
+        )).scalar() or 0
+        for start in range(existing, players, 5000):
+            rows = [{"discord_id": -(10**12 + i), "username": SEED_USERNAME} for i in range(start, min(players, start + 5000))]
+            await session.execute(insert(Player), rows)
+
+        await session.execute(text("""
+            INSERT INTO esprit (esprit_base_id, owner_id, quantity, tier, awakening_level, element, created_at, last_modified)
+            SELECT b.id, p.id, 1 + (random() * 20)::int, b.base_tier, (random() * 5)::int, b.element,
+                   now() - random() * interval '180 days', now()
+            FROM player p
+            CROSS JOIN LATERAL (
+                SELECT id, base_tier, element FROM esprit_base
+                ORDER BY md5(esprit_base.id::text || p.id::text) LIMIT :per
+            ) b
+            WHERE p.username = :username
+              AND NOT EXISTS (SELECT 1 FROM esprit e WHERE e.owner_id = p.id)
+        """), {"per": stacks_per_player, "username": SEED_USERNAME})
+        await session.commit()
+
+    engine = DatabaseService._engine
+    assert engine is not None
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.exec_driver_sql("VACUUM ANALYZE player")
+        await conn.exec_driver_sql("VACUUM ANALYZE esprit")
+
+
+async def run_scenarios(capture: QueryCapture):
+    """The hot service calls under test; each gets its own capture bucket"""
+    from src.database.models.esprit import Esprit
+    from src.database.models.player import Player
+    from src.services.awakening_service import AwakeningService
+    from src.services.collection_service import CollectionService
+    from src.services.esprit_service import EspritService
+    from src.services.leadership_service import LeadershipService
+    from src.utils.database_service import DatabaseService
+
+    async with DatabaseService.get_session() as session:
+        player_id = (await session.execute(
+            select(Player.id).where(Player.username == SEED_USERNAME).order_by(Player.id).limit(1)  # type: ignore
+        )).scalar_one()
+        base_id = (await session.execute(
+            select(Esprit.esprit_base_id).where(Esprit.owner_id == player_id).limit(1)  # type: ignore
+        )).scalar_one()
+
+    scenarios = {
+        "EspritService.add_to_collection": lambda: EspritService.add_to_collection(player_id, base_id, 1),
+        "EspritService.get_collection_stats": lambda: EspritService.get_collection_stats(player_id),
+        "CollectionService.get_recent_acquisitions": lambda: CollectionService.get_recent_acquisitions(player_id),
+        "CollectionService.get_element_progress": lambda: CollectionService.get_element_progress(player_id),
+        "CollectionService.get_tier_progress": lambda: CollectionService.get_tier_progress(player_id),
+        "AwakeningService.get_awakening_candidates": lambda: AwakeningService.get_awakening_candidates(player_id),
+        "LeadershipService.get_eligible_leaders": lambda: LeadershipService.get_eligible_leaders(player_id),
+    }
+    for name, call in scenarios.items():
+        capture.active = name
+        try:
+            result = await call()
+            if not result.success:
+                print(f"  ! {name} failed: {result.error}")
+        finally:
+            capture.active = None
+
+
+async def explain_all(capture: QueryCapture) -> Dict[str, Dict[str, Any]]:
+    from src.utils.database_service import DatabaseService
+
+    engine = DatabaseService._engine
+    assert engine is not None
+    plans: Dict[str, Dict[str, Any]] = {}
+    async with engine.connect() as conn:
+        for scenario, queries in capture.queries.items():
+            for statement, parameters in queries:
+                key = f"{scenario}:{_fingerprint(statement)}"
+                if key in plans:
+                    continue
+                result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters)
+                raw = result.scalar()
+                plan = summarize_plan(raw if isinstance(raw, list) else json.loads(raw))
+                plans[key] = {"scenario": scenario, "sql": re.sub(r"\s+", " ", statement).strip(), **plan}
+        # EXPLAIN ANALYZE executes FOR UPDATE selects; never keep their effects
+        await conn.rollback()
+    return plans
+
+
+def compare(plans: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            tolerance: float) -> List[str]:
+    failures = []
+    for key, plan in sorted(plans.items()):
+        large_scans = [rel for rel in plan["seq_scans"] if rel in LARGE_TABLES]
+        if large_scans:
+            failures.append(f"{key}: sequential scan on {', '.join(large_scans)}")
+
+        expected = baseline.get(key)
+        if expected is None:
+            continue
+        if plan["shape"] != expected["shape"]:
+            failures.append(f"{key}: plan changed\n      was: {' > '.join(expected['shape'])}\n      now: {' > '.join(plan['shape'])}")
+        budget = expected["shared_buffers"] * tolerance + 16
+        if plan["shared_buffers"] > budget:
+            failures.append(f"{key}: {plan['shared_buffers']} shared buffers (baseline {expected['shared_buffers']})")
+    return failures
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN-based query plan regression suite")
+    parser.add_argument("--database-url", required=True, help="Throwaway local Postgres (postgresql+asyncpg://...)")
+    parser.add_argument("--allow-remote", action="store_true", help="Allow a non-localhost database")
+    parser.add_argument("--seed", action="store_true", help="Create seed players/stacks before checking")
+    parser.add_argument("--players", type=int, default=20_000)
+    parser.add_argument("--stacks-per-player", type=int, default=40)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="Write current plans as the new baseline")
+    parser.add_argument("--buffer-tolerance", type=float, default=1.5)
+    args = parser.parse_args()
+
+    host = urlparse(args.database_url.replace("+asyncpg", "")).hostname or "localhost"
+    if host not in ("localhost", "127.0.0.1", "::1") and not args.allow_remote:
+        raise SystemExit(f"Refusing to seed/EXPLAIN ANALYZE against {host}; pass --allow-remote if intended")
+
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.pop("DATABASE_READ_URL", None)
+
+    from src.utils.database_service import DatabaseService
+
+    DatabaseService.init()
+    assert DatabaseService._engine is not None
+
+    if args.seed:
+        print(f"Seeding {args.players:,} players x {args.stacks_per_player} stacks...")
+        await seed(args.players, args.stacks_per_player)
+
+    capture = QueryCapture()
+    event.listen(DatabaseService._engine.sync_engine, "before_cursor_execute", capture)
+    await run_scenarios(capture)
+    event.remove(DatabaseService._engine.sync_engine, "before_cursor_execute", capture)
+
+    plans = await explain_all(capture)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+
+    print(f"\n{'Query':<58} {'Buffers':>8} {'ms':>8}  Plan")
+    for key, plan in sorted(plans.items()):
+        print(f"{key:<58} {plan['shared_buffers']:>8,} {plan['execution_ms']:>8.2f}  {' > '.join(plan['shape'])}")
+
+    if args.update_baseline or not baseline:
+        args.baseline.write_text(json.dumps(plans, indent=2, sort_keys=True))
+        print(f"\nBaseline written to {args.baseline}")
+
+    failures = compare(plans, baseline, args.buffer_tolerance)
+    if failures:
+        print(f"\n{len(failures)} plan problem(s):")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print(f"\nAll {len(plans)} captured queries passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,671 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test: drives the real cogs and services with synthetic interactions.
+
+Seeds N synthetic players (discord ids from --id-base up) with realistic
+collections, then runs --concurrency virtual users that replay a weighted
+command mix by calling the cog command callbacks with fake interaction
+objects, exactly as disnake would after parsing. Runs against whatever
+DATABASE_URL / REDIS_URL point at - use a local scratch database (a
+non-localhost DATABASE_URL is refused unless --allow-remote is passed).
+
+Reports throughput and p50/p95/p99 per command, outcome counts (ok, rejected,
+rate-limited, error), Postgres lock waits and deadlocks, connection pool
+saturation and the slowest service operations / SQL statements. Each report
+is saved as JSON (tagged with the git commit) so runs can be compared.
+
+Usage:
+    python scripts/load_test.py --players 10000 --seed-only
+    python scripts/load_test.py --concurrency 200 --duration 120
+    python scripts/load_test.py --duration 60 --compare logs/load_reports/<earlier>.json
+    python scripts/load_test.py --reset
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import disnake
+from sqlalchemy import delete, func, insert, select, text, update
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel
+
+from src.database.models.esprit import Esprit
+from src.database.models.esprit_base import EspritBase
+from src.database.models.player import Player
+from src.utils.config_manager import ConfigManager
+from src.utils.database_service import DatabaseService
+from src.utils.embed_colors import EmbedColors
+from src.utils.metrics import Metrics
+from src.utils.redis_service import RedisService
+
+DEFAULT_ID_BASE = 9_000_000_000_000_000_000
+DEFAULT_MIX = "quest_start=25,quest_areas=10,esprit_index=20,esprit_view=10,team=10,buildings=10,collect=5,collection_page=10"
+
+# --- Synthetic interactions ---
+
+
+class FakeUser:
+    def __init__(self, discord_id: int):
+        self.id = discord_id
+        self.name = self.display_name = self.global_name = f"load{discord_id % 1_000_000}"
+        self.mention = f"<@{discord_id}>"
+        self.bot = False
+        self.display_avatar = self.avatar = type("Asset", (), {"url": "https://cdn.discordapp.com/embed/avatars/0.png"})()
+
+
+class FakeMessage:
+    def __init__(self, inter: "FakeInteraction"):
+        self.inter = inter
+        self.id = random.getrandbits(62)
+
+    async def edit(self, **kwargs):
+        self.inter._record(kwargs)
+        return self
+
+    async def delete(self, **kwargs):
+        pass
+
+
+class FakeResponse:
+    def __init__(self, inter: "FakeInteraction"):
+        self.inter = inter
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    def _respond(self, kwargs: Optional[Dict[str, Any]] = None):
+        if self._done:
+            raise disnake.errors.InteractionResponded(self.inter)  # type: ignore[arg-type]
+        self._done = True
+        self.inter._acknowledged()
+        if kwargs:
+            self.inter._record(kwargs)
+
+    async def defer(self, **kwargs):
+        self._respond()
+
+    async def send_message(self, content: Optional[str] = None, **kwargs):
+        self._respond({"content": content, **kwargs})
+
+    async def edit_message(self, content: Optional[str] = None, **kwargs):
+        self._respond({"content": content, **kwargs})
+
+
+class FakeFollowup:
+    def __init__(self, inter: "FakeInteraction"):
+        self.inter = inter
+
+    async def send(self, content: Optional[str] = None, **kwargs):
+        self.inter._record({"content": content, **kwargs})
+        return FakeMessage(self.inter)
+
+
+class FakeClient:
+    def __init__(self, cogs: Dict[str, Any]):
+        self.cogs = cogs
+        self.user = FakeUser(1)
+        self.loop = asyncio.get_event_loop()
+
+    def get_cog(self, name: str):
+        return self.cogs.get(name)
+
+    async def wait_until_ready(self):
+        return None
+
+
+class FakeInteraction:
+    """Just enough of ApplicationCommandInteraction for the cogs; records what they send"""
+
+    def __init__(self, discord_id: int, client: FakeClient):
+        self.id = random.getrandbits(62)
+        self.author = self.user = FakeUser(discord_id)
+        self.client = self.bot = client
+        self.guild = None
+        self.guild_id = None
+        self.channel = type("Channel", (), {"id": 0, "send": self._channel_send})()
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+        self.data = type("Data", (), {"values": [], "custom_id": ""})()
+        self.started = time.perf_counter()
+        self.ack_latency: Optional[float] = None
+        self.last_embed: Optional[disnake.Embed] = None
+        self.messages = 0
+
+    def _acknowledged(self):
+        if self.ack_latency is None:
+            self.ack_latency = time.perf_counter() - self.started
+
+    def _record(self, kwargs: Dict[str, Any]):
+        self._acknowledged()
+        self.messages += 1
+        embed = kwargs.get("embed") or (kwargs.get("embeds") or [None])[0]
+        if embed is not None:
+            self.last_embed = embed
+        view = kwargs.get("view")
+        if isinstance(view, disnake.ui.View):
+            view.stop()
+        for file in ([kwargs["file"]] if kwargs.get("file") else []) + list(kwargs.get("files") or []):
+            file.close()
+
+    async def _channel_send(self, content: Optional[str] = None, **kwargs):
+        self._record({"content": content, **kwargs})
+        return FakeMessage(self)
+
+    async def edit_original_response(self, content: Optional[str] = None, **kwargs):
+        self._record({"content": content, **kwargs})
+        return FakeMessage(self)
+
+    edit_original_message = edit_original_response
+
+    async def original_response(self):
+        return FakeMessage(self)
+
+    original_message = original_response
+
+    async def send(self, content: Optional[str] = None, **kwargs):
+        if self.response.is_done():
+            return await self.followup.send(content, **kwargs)
+        await self.response.send_message(content, **kwargs)
+
+    def outcome(self) -> str:
+        """Classify the last embed the command sent"""
+        embed = self.last_embed
+        if embed is None:
+            return "ok" if self.messages else "no_response"
+        title = (embed.title or "").lower()
+        if "rate limited" in title:
+            return "rate_limited"
+        color = embed.color.value if embed.color else None
+        if color == EmbedColors.ERROR or any(word in title for word in ("error", "failed", "wrong")):
+            return "error" if any(word in title for word in ("error", "wrong")) else "rejected"
+        if color == EmbedColors.WARNING or "not " in title:
+            return "rejected"
+        return "ok"
+
+
+# --- Scenarios ---
+
+
+class PlayerPool:
+    """Synthetic players, plus a bounded cache of owned esprit names for /esprit view"""
+
+    def __init__(self, players: List[Tuple[int, int]]):
+        self.players = players
+        self.names: Dict[int, List[str]] = {}
+
+    def pick(self) -> Tuple[int, int]:
+        return random.choice(self.players)
+
+    async def owned_names(self, player_id: int) -> List[str]:
+        names = self.names.get(player_id)
+        if names is None:
+            async with DatabaseService.get_read_session() as session:
+                stmt = (
+                    select(EspritBase.name).join(Esprit, Esprit.esprit_base_id == EspritBase.id)  # type: ignore
+                    .where(Esprit.owner_id == player_id).limit(50)  # type: ignore
+                )
+                names = list((await session.execute(stmt)).scalars())
+            if len(self.names) > 50_000:
+                self.names.clear()
+            self.names[player_id] = names
+        return names
+
+
+def cog_command(module: str, cog_class: str, attribute: str, kwargs: Optional[Callable] = None) -> Dict[str, Any]:
+    return {"module": module, "cog": cog_class, "attribute": attribute, "kwargs": kwargs}
+
+
+async def esprit_view_kwargs(pool: PlayerPool, player_id: int) -> Dict[str, Any]:
+    names = await pool.owned_names(player_id)
+    return {"esprit_name": random.choice(names) if names else "Unknown"}
+
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "quest_start": cog_command("src.cogs.quest_cog", "Quest", "quest_start"),
+    "quest_areas": cog_command("src.cogs.quest_cog", "Quest", "quest_areas"),
+    "esprit_index": cog_command("src.cogs.collection_cog", "EspritCog", "collection"),
+    "esprit_view": cog_command("src.cogs.collection_cog", "EspritCog", "view_esprit", esprit_view_kwargs),
+    "team": cog_command("src.cogs.team_cog", "TeamCog", "team_command"),
+    "buildings": cog_command("src.cogs.building_cog", "BuildingCog", "buildings_command"),
+    "collect": cog_command("src.cogs.building_cog", "BuildingCog", "collect_command"),
+    # Service-only scenario: deep collection paging with a random sort
+    "collection_page": {"service": "collection_page"},
+}
+
+
+async def run_collection_page(player_id: int) -> str:
+    from src.services.esprit_service import EspritService
+    from src.utils.collection_cursor import COLLECTION_SORTS
+
+    sort = random.choice(list(COLLECTION_SORTS))
+    cursor = None
+    for _ in range(random.randint(1, 4)):
+        result = await EspritService.get_collection_page(player_id, sort, after=cursor)
+        if not result.success:
+            return "error"
+        cursor = result.data["next_cursor"]  # type: ignore[index]
+        if not cursor:
+            break
+    return "ok"
+
+
+def load_cogs(names: List[str]) -> Tuple[Dict[str, Any], FakeClient]:
+    """Instantiate each cog the mix needs; scenarios whose cog can't import are dropped"""
+    cogs: Dict[str, Any] = {}
+    client = FakeClient(cogs)
+    for name in names:
+        scenario = SCENARIOS[name]
+        if "module" not in scenario or scenario["cog"] in cogs:
+            continue
+        try:
+            module = importlib.import_module(scenario["module"])
+            cogs[scenario["cog"]] = getattr(module, scenario["cog"])(client)
+        except Exception as e:
+            print(f"⚠️  {scenario['module']} unavailable ({e}); dropping scenarios that need it")
+    return cogs, client
+
+
+# --- Seeding ---
+
+
+def _column_defaults(model, **sample) -> Dict[str, Any]:
+    """Python-side defaults for every column (the tables have no server defaults)"""
+    template = model(**sample)
+    return {column.name: getattr(template, column.name) for column in model.__table__.columns if column.name != "id"}
+
+
+async def seed(target: int, id_base: int, batch: int = 2000):
+    async with DatabaseService.get_read_session() as session:
+        existing = (await session.execute(
+            select(func.count()).select_from(Player).where(Player.discord_id >= id_base)  # type: ignore
+        )).scalar_one()
+        catalog = (await session.execute(select(EspritBase.id, EspritBase.base_tier, EspritBase.element))).all()  # type: ignore
+    if existing >= target:
+        print(f"Seed: {existing:,} synthetic players already present")
+        return
+    if not catalog:
+        raise SystemExit("EspritBase catalog is empty - run scripts/populate_esprits.py first")
+
+    # Low tiers are common, high tiers rare, roughly like the capture tables
+    weights = [1.0 / (tier ** 1.6) for _, tier, _ in catalog]
+    player_defaults = _column_defaults(Player, discord_id=0, username="load")
+    esprit_defaults = _column_defaults(Esprit, esprit_base_id=0, owner_id=0, element="inferno")
+    max_energy = player_defaults["max_energy"]
+
+    started = time.perf_counter()
+    for offset in range(existing, target, batch):
+        rows = []
+        for i in range(offset, min(offset + batch, target)):
+            level = max(1, int(random.paretovariate(1.6) * 3))
+            rows.append({
+                **player_defaults, "discord_id": id_base + i, "username": f"load{i}", "level": level,
+                "energy": max_energy, "revies": random.randint(0, 500_000), "erythl": random.randint(0, 5_000),
+                "shrine_count": random.randint(0, 3), "cluster_count": random.randint(0, 2),
+                "pending_revies_income": random.randint(0, 50_000),
+            })
+        async with DatabaseService.get_transaction() as session:
+            players = (await session.execute(insert(Player).returning(Player.id), rows)).scalars().all()  # type: ignore
+            esprits = []
+            for player_id in players:
+                # Collection size is heavy-tailed: most players own a few dozen, whales own most of the catalog
+                size = min(len(catalog), max(3, int(random.lognormvariate(3.2, 0.9))))
+                chosen = dict.fromkeys(random.choices(range(len(catalog)), weights=weights, k=size * 2))
+                for index in list(chosen)[:size]:
+                    base_id, tier, element = catalog[index]
+                    esprits.append({
+                        **esprit_defaults, "esprit_base_id": base_id, "owner_id": player_id, "tier": tier,
+                        "element": element, "quantity": max(1, int(random.expovariate(0.3))),
+                        "awakening_level": min(5, int(random.expovariate(1.2))),
+                    })
+            for chunk in range(0, len(esprits), 5000):
+                await session.execute(insert(Esprit), esprits[chunk:chunk + 5000])
+            # Leader = strongest stack
+            leader = (
+                select(Esprit.id).where(Esprit.owner_id == Player.id)  # type: ignore
+                .order_by(Esprit.tier.desc(), Esprit.id).limit(1).scalar_subquery()  # type: ignore
+            )
+            await session.execute(update(Player).where(Player.id.in_(players)).values(leader_esprit_stack_id=leader))  # type: ignore
+        done = min(offset + batch, target)
+        rate = (done - existing) / (time.perf_counter() - started)
+        print(f"\rSeed: {done:,}/{target:,} players ({rate:,.0f}/s)", end="", flush=True)
+    print()
+    async with DatabaseService.get_session() as session:
+        await session.execute(text("ANALYZE player"))
+        await session.execute(text("ANALYZE esprit"))
+        await session.commit()
+
+
+async def reset(id_base: int):
+    """Delete synthetic players and every row referencing them"""
+    synthetic = select(Player.id).where(Player.discord_id >= id_base).scalar_subquery()  # type: ignore
+    async with DatabaseService.get_transaction() as session:
+        await session.execute(update(Player).where(Player.id.in_(synthetic)).values(  # type: ignore
+            leader_esprit_stack_id=None, support1_esprit_stack_id=None, support2_esprit_stack_id=None,
+        ))
+        for table in reversed(SQLModel.metadata.sorted_tables):
+            for fk in table.foreign_keys:
+                if fk.column.table.name == "player" and fk.column.name == "id":
+                    await session.execute(delete(table).where(fk.parent.in_(synthetic)))
+        deleted = (await session.execute(delete(Player).where(Player.discord_id >= id_base))).rowcount  # type: ignore
+    print(f"Reset: removed {deleted:,} synthetic players")
+
+
+# --- Sampling ---
+
+
+class Sampler:
+    """Polls pool stats and Postgres lock waits on its own connection while the load runs"""
+
+    LOCKS = text("""
+        SELECT count(*) FILTER (WHERE wait_event_type = 'Lock'),
+               count(*) FILTER (WHERE state = 'active'),
+               coalesce(max(extract(epoch FROM now() - query_start)) FILTER (WHERE wait_event_type = 'Lock'), 0)
+        FROM pg_stat_activity
+        WHERE datname = current_database() AND application_name LIKE 'reve-%'
+    """)
+    DATABASE = text("""
+        SELECT deadlocks, xact_commit, xact_rollback, blks_hit, blks_read, temp_files
+        FROM pg_stat_database WHERE datname = current_database()
+    """)
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.lock_waiters: List[int] = []
+        self.active: List[int] = []
+        self.longest_lock_wait = 0.0
+        self.saturation: Dict[str, List[float]] = defaultdict(list)
+        self.db_before: Optional[Tuple] = None
+        self.db_after: Optional[Tuple] = None
+        self._engine = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        url = os.getenv("DATABASE_URL", "")
+        if url.startswith("postgresql"):
+            connect_args = {"server_settings": {"application_name": "loadtest-sampler"}} if "+asyncpg" in url else {}
+            self._engine = create_async_engine(url, poolclass=NullPool, connect_args=connect_args)
+            self.db_before = await self._scalar_row(self.DATABASE)
+        self._task = asyncio.create_task(self._loop())
+
+    async def _scalar_row(self, statement) -> Optional[Tuple]:
+        async with self._engine.connect() as conn:  # type: ignore[union-attr]
+            return tuple((await conn.execute(statement)).one())
+
+    async def _loop(self):
+        while True:
+            for name, stats in DatabaseService.get_pool_stats().items():
+                self.saturation[name].append(stats["saturation"])
+            if self._engine is not None:
+                try:
+                    waiting, active, longest = await self._scalar_row(self.LOCKS)  # type: ignore[misc]
+                    self.lock_waiters.append(waiting)
+                    self.active.append(active)
+                    self.longest_lock_wait = max(self.longest_lock_wait, float(longest))
+                except Exception as e:
+                    print(f"\n⚠️  lock sampler: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+        if self._engine is not None:
+            self.db_after = await self._scalar_row(self.DATABASE)
+            await self._engine.dispose()
+
+    def summary(self) -> Dict[str, Any]:
+        samples = max(len(self.lock_waiters), 1)
+        pools = {}
+        for name, stats in DatabaseService.get_pool_stats().items():
+            history = self.saturation.get(name) or [0.0]
+            pools[name] = {
+                "peak_saturation": max(history), "mean_saturation": sum(history) / len(history),
+                "checkouts": stats["checkouts"], "timeouts": stats["timeouts"], "slow_checkouts": stats["slow_checkouts"],
+                "avg_wait_ms": stats["avg_wait_ms"], "max_wait_ms": stats["max_wait_ms"],
+            }
+        database = {}
+        if self.db_before and self.db_after:
+            keys = ("deadlocks", "commits", "rollbacks", "blks_hit", "blks_read", "temp_files")
+            database = {key: after - before for key, before, after in zip(keys, self.db_before, self.db_after)}
+        return {
+            "locks": {
+                "mean_waiting": sum(self.lock_waiters) / samples, "peak_waiting": max(self.lock_waiters, default=0),
+                "samples_with_waiters": sum(1 for w in self.lock_waiters if w), "samples": len(self.lock_waiters),
+                "longest_wait_s": self.longest_lock_wait, "peak_active": max(self.active, default=0),
+            },
+            "pools": pools,
+            "database": database,
+        }
+
+
+# --- Load ---
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+class Results:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.ack: Dict[str, List[float]] = defaultdict(list)
+        self.outcomes: Dict[str, Counter] = defaultdict(Counter)
+        self.exceptions: Counter = Counter()
+
+    def summary(self, wall: float) -> Dict[str, Any]:
+        commands = {}
+        for name, values in sorted(self.latencies.items()):
+            ordered = sorted(values)
+            acks = sorted(self.ack[name])
+            commands[name] = {
+                "count": len(ordered), "per_second": len(ordered) / wall,
+                "p50_ms": percentile(ordered, 0.50) * 1000, "p95_ms": percentile(ordered, 0.95) * 1000,
+                "p99_ms": percentile(ordered, 0.99) * 1000, "max_ms": ordered[-1] * 1000,
+                "ack_p95_ms": percentile(acks, 0.95) * 1000,
+                "outcomes": dict(self.outcomes[name]),
+            }
+        total = sum(len(v) for v in self.latencies.values())
+        return {"total": total, "per_second": total / wall, "commands": commands, "exceptions": dict(self.exceptions.most_common(10))}
+
+
+async def virtual_user(mix: List[Tuple[str, float]], pool: PlayerPool, cogs: Dict[str, Any], client: FakeClient,
+                       results: Results, deadline: float, think: float):
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    while time.perf_counter() < deadline:
+        name = random.choices(names, weights=weights)[0]
+        scenario = SCENARIOS[name]
+        player_id, discord_id = pool.pick()
+        started = time.perf_counter()
+        try:
+            if "service" in scenario:
+                outcome = await run_collection_page(player_id)
+                ack = time.perf_counter() - started
+            else:
+                kwargs = await scenario["kwargs"](pool, player_id) if scenario["kwargs"] else {}
+                cog = cogs[scenario["cog"]]
+                inter = FakeInteraction(discord_id, client)
+                started = inter.started = time.perf_counter()
+                await getattr(cog, scenario["attribute"]).callback(cog, inter, **kwargs)
+                outcome = inter.outcome()
+                ack = inter.ack_latency or (time.perf_counter() - started)
+        except Exception as e:
+            outcome = "exception"
+            ack = time.perf_counter() - started
+            results.exceptions[f"{name}: {type(e).__name__}: {str(e)[:120]}"] += 1
+        results.latencies[name].append(time.perf_counter() - started)
+        results.ack[name].append(ack)
+        results.outcomes[name][outcome] += 1
+        if think:
+            await asyncio.sleep(random.expovariate(1 / think))
+
+
+def parse_mix(spec: str) -> List[Tuple[str, float]]:
+    mix = []
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix.append((name.strip(), float(weight or 1)))
+    return mix
+
+
+def git_revision() -> str:
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout.strip()
+        return f"{sha}{'+dirty' if dirty else ''}"
+    except Exception:
+        return "unknown"
+
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None):
+    load = report["load"]
+    print(f"\n{report['revision']} • {report['config']['concurrency']} users • {report['config']['duration']}s • "
+          f"{load['total']:,} commands ({load['per_second']:,.1f}/s)")
+    header = f"{'command':<16} {'count':>7} {'/s':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  outcomes"
+    print(header + ("   Δp95      Δ/s" if baseline else ""))
+    for name, stats in load["commands"].items():
+        outcomes = " ".join(f"{k}={v}" for k, v in sorted(stats["outcomes"].items()))
+        line = (f"{name:<16} {stats['count']:>7,} {stats['per_second']:>7.1f} {stats['p50_ms']:>7.1f}ms "
+                f"{stats['p95_ms']:>6.1f}ms {stats['p99_ms']:>6.1f}ms {stats['max_ms']:>6.0f}ms  {outcomes}")
+        previous = (baseline or {}).get("load", {}).get("commands", {}).get(name)
+        if previous:
+            delta = (stats["p95_ms"] / previous["p95_ms"] - 1) * 100 if previous["p95_ms"] else 0.0
+            line += f"   {delta:+6.1f}%  {stats['per_second'] - previous['per_second']:+7.1f}"
+        print(line)
+
+    locks = report["sampling"]["locks"]
+    print(f"\nLocks: mean {locks['mean_waiting']:.2f} waiting, peak {locks['peak_waiting']}, "
+          f"{locks['samples_with_waiters']}/{locks['samples']} samples with waiters, longest {locks['longest_wait_s']:.2f}s")
+    for name, pool in report["sampling"]["pools"].items():
+        print(f"Pool {name}: peak saturation {pool['peak_saturation']:.0%}, mean {pool['mean_saturation']:.0%}, "
+              f"{pool['timeouts']} timeouts, checkout avg {pool['avg_wait_ms']:.2f}ms max {pool['max_wait_ms']:.1f}ms")
+    if report["sampling"]["database"]:
+        db = report["sampling"]["database"]
+        hit = db["blks_hit"] / max(db["blks_hit"] + db["blks_read"], 1)
+        print(f"Database: {db['commits']:,} commits, {db['rollbacks']:,} rollbacks, {db['deadlocks']} deadlocks, "
+              f"cache hit {hit:.2%}, {db['temp_files']} temp files")
+    print("\nSlowest service operations (total time):")
+    for entry in report["service_operations"][:8]:
+        print(f"  {entry['operation']:<48} {entry['count']:>7,}  avg {entry['avg_ms']:.1f}ms  errors {entry['errors']}")
+    if load["exceptions"]:
+        print("\nUnhandled exceptions:")
+        for message, count in load["exceptions"].items():
+            print(f"  {count:>6,}  {message}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Drive the real cogs with synthetic interactions")
+    parser.add_argument("--players", type=int, default=10_000, help="Synthetic players to seed (10k-1M)")
+    parser.add_argument("--id-base", type=int, default=DEFAULT_ID_BASE, help="First synthetic discord id")
+    parser.add_argument("--seed-only", action="store_true", help="Seed and exit")
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--reset", action="store_true", help="Delete synthetic players and exit")
+    parser.add_argument("--concurrency", type=int, default=100, help="Virtual users")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds of load")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Mean pause between a user's commands")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="name=weight,... scenarios")
+    parser.add_argument("--sample-interval", type=float, default=0.5)
+    parser.add_argument("--report-dir", default="logs/load_reports")
+    parser.add_argument("--label", default="", help="Added to the report file name")
+    parser.add_argument("--compare", help="Earlier report to diff against")
+    parser.add_argument("--allow-remote", action="store_true", help="Allow a non-localhost database")
+    args = parser.parse_args()
+
+    host = urlparse(os.getenv("DATABASE_URL", "").replace("+asyncpg", "")).hostname or "localhost"
+    if host not in ("localhost", "127.0.0.1", "::1") and not args.allow_remote:
+        raise SystemExit(f"Refusing to seed/load/reset against {host}; pass --allow-remote if intended")
+
+    ConfigManager.load_all()
+    DatabaseService.init()
+    RedisService.init()
+
+    if args.reset:
+        await reset(args.id_base)
+        return
+    if not args.skip_seed:
+        await seed(args.players, args.id_base)
+    if args.seed_only:
+        return
+
+    mix = parse_mix(args.mix)
+    cogs, client = load_cogs([name for name, _ in mix])
+    mix = [(name, weight) for name, weight in mix if "service" in SCENARIOS[name] or SCENARIOS[name]["cog"] in cogs]
+
+    async with DatabaseService.get_read_session() as session:
+        players = (await session.execute(
+            select(Player.id, Player.discord_id).where(Player.discord_id >= args.id_base).limit(args.players)  # type: ignore
+        )).all()
+    if not players:
+        raise SystemExit("No synthetic players - run with --players N first")
+    pool = PlayerPool([tuple(row) for row in players])  # type: ignore[misc]
+
+    from src.utils.esprit_search_index import EspritSearchIndex
+    await EspritSearchIndex.rebuild()
+    Metrics.reset()
+
+    sampler = Sampler(args.sample_interval)
+    await sampler.start()
+    results = Results()
+    print(f"Running {args.concurrency} virtual users for {args.duration:.0f}s over {len(pool.players):,} players: "
+          + ", ".join(f"{name}={weight:g}" for name, weight in mix))
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*(
+        virtual_user(mix, pool, cogs, client, results, deadline, args.think_ms / 1000)
+        for _ in range(args.concurrency)
+    ))
+    wall = time.perf_counter() - started
+    await sampler.stop()
+
+    report = {
+        "revision": git_revision(),
+        "created_at": datetime.utcnow().isoformat(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("compare",)},
+        "load": results.summary(wall),
+        "sampling": sampler.summary(),
+        "service_operations": [
+            {"operation": stats.label, "count": stats.histogram.count, "avg_ms": stats.histogram.mean * 1000,
+             "p95_ms": stats.histogram.quantile(0.95) * 1000, "errors": stats.errors}
+            for _, stats in Metrics.top(Metrics.operations, limit=25)
+        ],
+        "sql_statements": [
+            {"statement": " ".join(key), "count": stats.histogram.count, "avg_ms": stats.histogram.mean * 1000,
+             "rows": stats.rows, "errors": stats.errors}
+            for key, stats in Metrics.top(Metrics.statements, limit=25)
+        ],
+    }
+
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_report(report, baseline)
+
+    report_dir = Path(args.report_dir)
+    report_dir.mkdir(parents=True, exist_ok=True)
+    label = f"-{args.label}" if args.label else ""
+    path = report_dir / f"{datetime.utcnow():%Y%m%d-%H%M%S}-{report['revision']}{label}.json"
+    path.write_text(json.dumps(report, indent=2, default=str))
+    print(f"\nReport saved to {path}")
+
+    await RedisService.close()
+    await DatabaseService.get_engine().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Offline combat balance simulator.
+
+Runs batched Monte Carlo boss fights for every combination of leader element,
+tier, awakening level, support setup and boss quest, spread across all cores.
+Uses the same formulas as CombatService (src/domain/combat_formulas.py).
+
+Usage:
+    python scripts/simulate_combat.py --fights 1000000 --tiers 1 2 3 --awakening 0 5
+    python scripts/simulate_combat.py --areas area_1 --status-effects --output sim.json
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.domain.combat_simulation import (
+    BatchOutcome, SimScenario, DEFAULT_POLICY, HAS_NUMPY,
+    build_team, bosses_from_quests, run_batch
+)
+from src.utils.game_constants import Elements
+
+CONFIG_DIR = Path(__file__).parent.parent / "data" / "config"
+
+
+def load_config(name: str) -> dict:
+    with (CONFIG_DIR / f"{name}.json").open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_scenarios(args) -> List[SimScenario]:
+    catalog = load_config("esprits")["esprits"]
+    abilities = load_config("esprit_abilities")
+    bosses = bosses_from_quests(load_config("quests"), catalog, args.areas)
+    if not bosses:
+        raise SystemExit("No boss quests matched the requested areas")
+
+    scenarios = []
+    for element, tier, awakening, support_count, boss in itertools.product(
+        args.elements, args.tiers, args.awakening, args.supports, bosses
+    ):
+        support_element = args.support_element or element
+        team = build_team(
+            catalog, abilities, element, tier, awakening,
+            support_elements=[support_element] * support_count
+        )
+        scenarios.append(SimScenario(
+            team=team,
+            boss=boss,
+            stamina=args.stamina,
+            damage_rolls=not args.no_damage_rolls,
+            status_effects=args.status_effects,
+            policy=tuple(args.policy),
+            max_turns=args.max_turns
+        ))
+    return scenarios
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo combat balance simulator")
+    parser.add_argument("--fights", type=int, default=100_000, help="Fights per scenario")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Fights per worker task")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--elements", nargs="+", default=[e.display_name for e in Elements])
+    parser.add_argument("--tiers", nargs="+", type=int, default=[1, 2, 3])
+    parser.add_argument("--awakening", nargs="+", type=int, default=[0])
+    parser.add_argument("--supports", nargs="+", type=int, default=[0, 2], help="Support slots filled (0-2)")
+    parser.add_argument("--support-element", default=None, help="Support element (default: leader's)")
+    parser.add_argument("--areas", nargs="*", default=None, help="Quest areas to take bosses from")
+    parser.add_argument("--stamina", type=int, default=50)
+    parser.add_argument("--max-turns", type=int, default=200)
+    parser.add_argument("--policy", nargs="+", default=list(DEFAULT_POLICY), help="Action priority order")
+    parser.add_argument("--status-effects", action="store_true", help="Model DOT and attack modifiers")
+    parser.add_argument("--no-damage-rolls", action="store_true", help="Disable variance and crits")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write JSON results to this path")
+    args = parser.parse_args()
+
+    if not HAS_NUMPY:
+        raise SystemExit("numpy is required: pip install numpy")
+
+    scenarios = build_scenarios(args)
+    tasks = []
+    for index, scenario in enumerate(scenarios):
+        remaining = args.fights
+        chunk = 0
+        while remaining > 0:
+            size = min(args.chunk_size, remaining)
+            tasks.append((scenario, size, args.seed * 1_000_003 + index * 10_007 + chunk))
+            remaining -= size
+            chunk += 1
+
+    print(f"Simulating {len(scenarios)} scenarios x {args.fights:,} fights on {args.workers} workers...")
+    started = time.perf_counter()
+
+    outcomes: Dict[str, BatchOutcome] = {}
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for batch in pool.map(run_batch, tasks, chunksize=max(1, len(tasks) // (args.workers * 4))):
+            outcomes.setdefault(batch.key, BatchOutcome(key=batch.key)).merge(batch)
+
+    elapsed = time.perf_counter() - started
+    total_fights = sum(o.fights for o in outcomes.values())
+    summaries = [outcomes[s.key].summary() for s in scenarios if s.key in outcomes]
+
+    print(f"\n{'Scenario':<52} {'Win%':>7} {'Turns p50':>10} {'p90':>6} {'Stamina p50':>12} {'p90':>6}")
+    for summary in summaries:
+        turns = summary["turns_to_kill"]
+        stamina = summary["stamina_used"]
+        print(
+            f"{summary['scenario'][:52]:<52} {summary['win_rate'] * 100:>6.1f}% "
+            f"{turns['p50']:>10.0f} {turns['p90']:>6.0f} {stamina['p50']:>12.0f} {stamina['p90']:>6.0f}"
+        )
+    print(f"\n{total_fights:,} fights in {elapsed:.2f}s ({total_fights / max(elapsed, 1e-9):,.0f} fights/s)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "elapsed_seconds": elapsed, "results": summaries}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Offline economy capacity simulator.
+
+Advances a synthetic player population day by day (building income, quest
+rewards, level ups, building/upgrade/slot purchases and fusion costs) and
+reports revies/erythl supply, faucets vs sinks and inflation. Uses the same
+formulas as BuildingService, FusionService and QuestRewardCalculator
+(src/domain/economy_formulas.py); the population is sharded across all cores.
+
+Usage:
+    python scripts/simulate_economy.py --players 1000000 --days 90
+    python scripts/simulate_economy.py --players 200000 --days 30 --join-days 30 --upkeep 500 --output econ.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.domain.economy_simulation import (
+    EconomyOutcome, EconomyParams, HAS_NUMPY,
+    areas_from_quests, run_shard, split_population
+)
+
+CONFIG_DIR = Path(__file__).parent.parent / "data" / "config"
+
+
+def load_config(name: str) -> dict:
+    with (CONFIG_DIR / f"{name}.json").open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic-population economy simulator")
+    parser.add_argument("--players", type=int, default=100_000, help="Population size")
+    parser.add_argument("--days", type=int, default=30, help="Days to simulate")
+    parser.add_argument("--shard-size", type=int, default=50_000, help="Players per worker task")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--join-days", type=int, default=0, help="Spread signups over this many days")
+    parser.add_argument("--starting-revies", type=int, default=1000)
+    parser.add_argument("--upkeep", type=int, default=0, help="Daily revies upkeep per building")
+    parser.add_argument("--report-every", type=int, default=5, help="Print every Nth day")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write the daily report as JSON")
+    args = parser.parse_args()
+
+    if not HAS_NUMPY:
+        raise SystemExit("numpy is required: pip install numpy")
+
+    params = EconomyParams(
+        days=args.days,
+        buildings_config=load_config("buildings"),
+        fusion_config=load_config("fusion_system"),
+        areas=areas_from_quests(load_config("quests")),
+        join_days=args.join_days,
+        starting_revies=args.starting_revies,
+        upkeep_per_building=args.upkeep
+    )
+    tasks = [
+        (params, size, args.seed * 1_000_003 + index)
+        for index, size in enumerate(split_population(args.players, args.shard_size))
+    ]
+
+    print(f"Simulating {args.players:,} players x {args.days} days in {len(tasks)} shards on {args.workers} workers...")
+    started = time.perf_counter()
+
+    outcome = EconomyOutcome()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for shard in pool.map(run_shard, tasks):
+            outcome.merge(shard)
+
+    elapsed = time.perf_counter() - started
+    report = outcome.daily_report()
+
+    print(f"\n{'Day':>4} {'Active':>9} {'Revies supply':>16} {'Inflation':>10} {'Faucets':>14} "
+          f"{'Sinks':>14} {'Sink%':>6} {'Erythl':>12} {'p50 wealth':>11} {'Gini':>5} {'Lvl':>5}")
+    for day in report:
+        if day["day"] % args.report_every and day["day"] != len(report):
+            continue
+        print(
+            f"{day['day']:>4} {day['active_players']:>9,} {day['revies_supply']:>16,} "
+            f"{day['inflation'] * 100:>9.2f}% {day['revies_faucets']:>14,} {day['revies_sinks']:>14,} "
+            f"{day['sink_ratio'] * 100:>5.0f}% {day['erythl_supply']:>12,} "
+            f"{day['wealth']['p50']:>11,.0f} {day['wealth']['gini']:>5.2f} {day['avg_level']:>5.1f}"
+        )
+
+    player_days = args.players * args.days
+    print(f"\n{player_days:,} player-days in {elapsed:.2f}s "
+          f"({args.days * 86400 / max(elapsed, 1e-9):,.0f}x real time)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "elapsed_seconds": elapsed, "days": report}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Checks for DatabaseService's ambient unit of work: nested service sessions join the
+caller's session in a SAVEPOINT, and their writes persist only when the outer block
+ends well.
+
+Runs against a scratch table, so any database works; defaults to in-memory SQLite.
+
+Usage:
+    python scripts/test_unit_of_work.py
+    python scripts/test_unit_of_work.py --database-url postgresql+asyncpg://localhost/reve_scratch
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, event, func, insert, select
+
+from src.utils.database_service import DatabaseService
+
+metadata = MetaData()
+scratch = Table(
+    "uow_scratch", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("label", String(32), nullable=False),
+)
+
+
+async def _write(label: str):
+    """A service-style writer that relies on get_transaction() committing on exit"""
+    async with DatabaseService.get_transaction() as session:
+        await session.execute(insert(scratch).values(label=label))
+
+
+async def _labels():
+    async with DatabaseService.get_session() as session:
+        return sorted((await session.execute(select(scratch.c.label))).scalars())
+
+
+async def _reset():
+    async with DatabaseService.get_transaction() as session:
+        await session.execute(scratch.delete())
+
+
+async def check_nested_transaction_in_session():
+    """Two nested get_transaction() writes inside a plain get_session() both persist"""
+    await _reset()
+    async with DatabaseService.get_session() as session:
+        await _write("first")
+        await _write("second")
+        await session.execute(select(func.count()).select_from(scratch))
+    return await _labels() == ["first", "second"]
+
+
+async def check_failed_nested_call_rolls_back():
+    """A nested writer that raises leaves no rows; its sibling's write still lands"""
+    await _reset()
+    async with DatabaseService.get_session():
+        await _write("kept")
+        try:
+            async with DatabaseService.get_transaction() as session:
+                await session.execute(insert(scratch).values(label="dropped"))
+                raise ValueError("boom")
+        except ValueError:
+            pass
+    return await _labels() == ["kept"]
+
+
+async def check_outer_failure_discards_nested_writes():
+    """Nested writes are discarded when the outer block raises"""
+    await _reset()
+    try:
+        async with DatabaseService.get_session():
+            await _write("lost")
+            raise RuntimeError("outer failed")
+    except RuntimeError:
+        pass
+    return await _labels() == []
+
+
+async def check_hooks_run_after_commit():
+    """after_commit callbacks registered by nested writers run once the outer block commits"""
+    await _reset()
+    ran = []
+    async with DatabaseService.get_session():
+        async with DatabaseService.get_transaction() as session:
+            await session.execute(insert(scratch).values(label="hooked"))
+            await DatabaseService.after_commit(ran.append, "hook")
+        if ran:
+            return False
+    return ran == ["hook"] and await _labels() == ["hooked"]
+
+
+CHECKS = [
+    check_nested_transaction_in_session,
+    check_failed_nested_call_rolls_back,
+    check_outer_failure_discards_nested_writes,
+    check_hooks_run_after_commit,
+]
+
+
+async def main(database_url: str) -> int:
+    os.environ["DATABASE_URL"] = database_url
+    DatabaseService.init()
+    engine = DatabaseService.get_engine()
+    if engine.dialect.name == "sqlite":
+        # pysqlite's own transaction handling makes RELEASE SAVEPOINT commit; let SQLAlchemy emit BEGIN
+        @event.listens_for(engine.sync_engine, "connect")
+        def _no_implicit_transactions(dbapi_connection, _record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine.sync_engine, "begin")
+        def _begin(connection):
+            connection.exec_driver_sql("BEGIN")
+
+    async with DatabaseService.get_engine().begin() as conn:
+        await conn.run_sync(metadata.create_all)
+
+    failures = 0
+    try:
+        for check in CHECKS:
+            try:
+                passed = await check()
+            except Exception as e:
+                passed = False
+                print(f"❌ {check.__name__}: {e}")
+            else:
+                print(f"{'✅' if passed else '❌'} {check.__name__}")
+            failures += not passed
+    finally:
+        async with DatabaseService.get_engine().begin() as conn:
+            await conn.run_sync(metadata.drop_all)
+        await DatabaseService.get_engine().dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check nested session/transaction behaviour")
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///:memory:")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.database_url)))
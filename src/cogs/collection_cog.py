@@ -1,7 +1,8 @@
 # src/cogs/collection_cog.py
 import disnake
 from disnake.ext import commands
-from typing import Optional, List
+import asyncio
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 
 from src.utils.database_service import DatabaseService
@@ -12,86 +13,76 @@ from src.utils.emoji_manager import get_emoji_manager
 from src.database.models import Player, Esprit, EspritBase
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
-from src.utils.stats_generator import ImageGenerator  # JUST THE CLASS
 from src.utils.redis_service import ratelimit
+from src.services.esprit_service import EspritService
+from src.utils.esprit_search_index import EspritSearchIndex
 
 logger = get_logger(__name__)
 
 
 class SimpleCollectionView(disnake.ui.View):
-    """Dead simple pagination for collection"""
+    """Keyset pagination for collection: holds the current page, its cursors and a prefetched next page"""
     
-    def __init__(self, esprits: List[tuple], player_name: str, author_id: int):
+    def __init__(self, player_id: int, player_name: str, author_id: int, page: Dict[str, Any]):
         super().__init__(timeout=180)
-        self.esprits = esprits
+        self.player_id = player_id
         self.player_name = player_name
         self.author_id = author_id
         self.current_page = 0
         self.items_per_page = 10
-        self.total_pages = (len(esprits) + self.items_per_page - 1) // self.items_per_page
         
         # Sorting state - DEFAULT TO HIGHEST TIER
         self.sort_mode = "tier_desc"
-        self.original_esprits = esprits.copy()
-        
-        # Initial sort by highest tier
-        self._sort_esprits()
-        
-        # Update button states
+        self.total_count = page["total_count"] or 0
+        self.total_pages = max(1, (self.total_count + self.items_per_page - 1) // self.items_per_page)
+        self._prefetch: Optional[asyncio.Task] = None
+        self._show(page)
+    
+    def _show(self, page: Dict[str, Any]):
+        """Make page current and start fetching the one after it"""
+        self.esprits = page["esprits"]
+        self.next_cursor = page["next_cursor"]
+        self.prev_cursor = page["prev_cursor"]
         self._update_buttons()
+        
+        if self._prefetch and not self._prefetch.done():
+            self._prefetch.cancel()
+        self._prefetch = asyncio.create_task(self._fetch(after=self.next_cursor)) if self.next_cursor else None
+        if self._prefetch:
+            self._prefetch.add_done_callback(self._prefetch_done)
+    
+    @staticmethod
+    def _prefetch_done(task: asyncio.Task):
+        # Retrieve the exception so a failed, never-awaited prefetch isn't reported as unhandled
+        if not task.cancelled() and task.exception():
+            logger.debug(f"Collection page prefetch failed: {task.exception()}")
+    
+    async def _fetch(self, after: Optional[str] = None, before: Optional[str] = None,
+                     include_total: bool = False) -> Dict[str, Any]:
+        result = await EspritService.get_collection_page(
+            self.player_id, self.sort_mode, after=after, before=before,
+            limit=self.items_per_page, include_total=include_total
+        )
+        if not result.success or result.data is None:
+            raise RuntimeError(result.error or "Failed to load collection page")
+        return result.data
     
     def _update_buttons(self):
-        """Enable/disable buttons based on current page"""
-        self.prev_button.disabled = self.current_page == 0
-        self.next_button.disabled = self.current_page >= self.total_pages - 1
+        """Enable/disable buttons based on available cursors"""
+        self.prev_button.disabled = self.prev_cursor is None
+        self.next_button.disabled = self.next_cursor is None
     
-    def _sort_esprits(self):
-        """Sort esprits based on current sort mode"""
-        if self.sort_mode == "tier_desc":
-            self.esprits = sorted(self.original_esprits, 
-                key=lambda x: (x[1].base_tier, x[1].name), reverse=True)
-        elif self.sort_mode == "tier_asc":
-            self.esprits = sorted(self.original_esprits, 
-                key=lambda x: (x[1].base_tier, x[1].name))
-        elif self.sort_mode == "name_asc":
-            self.esprits = sorted(self.original_esprits, 
-                key=lambda x: x[1].name)
-        elif self.sort_mode == "name_desc":
-            self.esprits = sorted(self.original_esprits, 
-                key=lambda x: x[1].name, reverse=True)
-        elif self.sort_mode == "power_desc":
-            # Calculate total power for sorting
-            def get_power(item):
-                stack, base = item
-                power = stack.get_individual_power(base)
-                return power['atk'] + power['def']
-            self.esprits = sorted(self.original_esprits, 
-                key=get_power, reverse=True)
-        elif self.sort_mode == "atk_desc":
-            # Sort by attack
-            def get_atk(item):
-                stack, base = item
-                power = stack.get_individual_power(base)
-                return power['atk']
-            self.esprits = sorted(self.original_esprits, 
-                key=get_atk, reverse=True)
-        elif self.sort_mode == "def_desc":
-            # Sort by defense
-            def get_def(item):
-                stack, base = item
-                power = stack.get_individual_power(base)
-                return power['def']
-            self.esprits = sorted(self.original_esprits, 
-                key=get_def, reverse=True)
-        elif self.sort_mode == "element":
-            # Sort by element, then by tier within element
-            self.esprits = sorted(self.original_esprits, 
-                key=lambda x: (x[1].element, -x[1].base_tier))
-        
-        # Reset to first page after sorting
+    async def _sort_esprits(self):
+        """Restart from the first page in the current sort mode"""
+        page = await self._fetch(include_total=True)
         self.current_page = 0
-        self.total_pages = (len(self.esprits) + self.items_per_page - 1) // self.items_per_page
-        self._update_buttons()
+        self.total_count = page["total_count"] or 0
+        self.total_pages = max(1, (self.total_count + self.items_per_page - 1) // self.items_per_page)
+        self._show(page)
+    
+    async def on_timeout(self):
+        if self._prefetch and not self._prefetch.done():
+            self._prefetch.cancel()
     
     async def interaction_check(self, inter: disnake.MessageInteraction) -> bool:
         if inter.author.id != self.author_id:
@@ -106,41 +97,32 @@ class SimpleCollectionView(disnake.ui.View):
             color=EmbedColors.DEFAULT
         )
         
-        # Calculate page slice
-        start = self.current_page * self.items_per_page
-        end = start + self.items_per_page
-        page_items = self.esprits[start:end]
-        
-        if not page_items:
+        if not self.esprits:
             embed.description = "No Esprits found!"
             return embed
         
         # Build description
         lines = []
-        for stack, base in page_items:
-            elem = Elements.from_string(base.element)
+        emoji_manager = get_emoji_manager()
+        for esprit in self.esprits:
+            tier_info = Tiers.get(esprit["tier"])
+            tier_display = f"T{tier_info.roman}" if tier_info else f"T{esprit['tier']}"
             
-            tier_info = Tiers.get(base.base_tier)
-            tier_display = f"T{tier_info.roman}" if tier_info else f"T{base.base_tier}"
-            
-            # Calculate power
-            power = stack.get_individual_power(base)
-            total_power = power['atk'] + power['def']
+            total_power = esprit["atk"] + esprit["def"]
             
             # Format line
-            qty = f" x{stack.quantity}" if stack.quantity > 1 else ""
-            stars = "⭐" * stack.awakening_level if stack.awakening_level > 0 else ""
+            qty = f" x{esprit['quantity']}" if esprit["quantity"] > 1 else ""
+            stars = "⭐" * esprit["awakening_level"] if esprit["awakening_level"] > 0 else ""
             
             # Get custom emoji - JUST THE PORTRAIT
-            emoji_manager = get_emoji_manager()
             if emoji_manager:
-                portrait = emoji_manager.get_emoji("_" + base.name.lower(), "🎴")
+                portrait = emoji_manager.get_emoji("_" + esprit["name"].lower(), "🎴")
             else:
                 portrait = "🎴"  # Card as fallback
             
             lines.append(
-                f"{portrait} **{base.name}** {tier_display}{qty}\n"
-                f"└ ATK: {power['atk']} | DEF: {power['def']} | Power: {total_power} {stars}"
+                f"{portrait} **{esprit['name']}** {tier_display}{qty}\n"
+                f"└ ATK: {esprit['atk']} | DEF: {esprit['def']} | Power: {total_power} {stars}"
             )
         
         embed.description = "\n".join(lines)
@@ -154,19 +136,22 @@ class SimpleCollectionView(disnake.ui.View):
             "power_desc": "Power ↓",
             "atk_desc": "Attack ↓",
             "def_desc": "Defense ↓",
-            "element": "Element"
+            "element": "Element",
+            "recent": "Recent"
         }
         embed.set_footer(
-            text=f"Page {self.current_page + 1}/{self.total_pages} | Total: {len(self.esprits)} | Sort: {sort_display.get(self.sort_mode, 'Unknown')}"
+            text=f"Page {self.current_page + 1}/{self.total_pages} | Total: {self.total_count} | Sort: {sort_display.get(self.sort_mode, 'Unknown')}"
         )
         
         return embed
     
     @disnake.ui.button(emoji="◀️", style=disnake.ButtonStyle.secondary, row=0)
     async def prev_button(self, button: disnake.ui.Button, inter: disnake.MessageInteraction):
-        self.current_page -= 1
-        self._update_buttons()
-        await inter.response.edit_message(embed=self.create_embed(), view=self)
+        await inter.response.defer()
+        page = await self._fetch(before=self.prev_cursor)
+        self.current_page = max(0, self.current_page - 1)
+        self._show(page)
+        await inter.edit_original_response(embed=self.create_embed(), view=self)
     
     @disnake.ui.button(label="Sort", emoji="🔄", style=disnake.ButtonStyle.primary, row=0)
     async def sort_button(self, button: disnake.ui.Button, inter: disnake.MessageInteraction):
@@ -216,6 +201,12 @@ class SimpleCollectionView(disnake.ui.View):
                 emoji="🔤",
                 default=self.sort_mode == "name_asc"
             ),
+            disnake.SelectOption(
+                label="Recently Acquired", 
+                value="recent", 
+                emoji="🆕",
+                default=self.sort_mode == "recent"
+            ),
         ]
         
         select = disnake.ui.Select(
@@ -225,9 +216,10 @@ class SimpleCollectionView(disnake.ui.View):
         )
         
         async def sort_callback(interaction: disnake.MessageInteraction):
+            await interaction.response.defer()
             self.sort_mode = select.values[0]
-            self._sort_esprits()
-            await interaction.response.edit_message(embed=self.create_embed(), view=self)
+            await self._sort_esprits()
+            await interaction.edit_original_response(embed=self.create_embed(), view=self)
         
         select.callback = sort_callback
         
@@ -239,9 +231,28 @@ class SimpleCollectionView(disnake.ui.View):
     
     @disnake.ui.button(emoji="▶️", style=disnake.ButtonStyle.secondary, row=0)
     async def next_button(self, button: disnake.ui.Button, inter: disnake.MessageInteraction):
+        await inter.response.defer()
+        prefetched, self._prefetch = self._prefetch, None
+        page = None
+        if prefetched and not prefetched.cancelled():
+            try:
+                page = await prefetched
+            except Exception as e:
+                logger.debug(f"Collection page prefetch failed, fetching directly: {e}")
+        try:
+            if page is None:
+                page = await self._fetch(after=self.next_cursor)
+        except Exception as e:
+            logger.error(f"Failed to load next collection page for player {self.player_id}: {e}")
+            embed = disnake.Embed(
+                title="Error",
+                description="Something went wrong loading the next page. Please try again.",
+                color=EmbedColors.ERROR
+            )
+            return await inter.edit_original_response(embed=embed, view=self)
         self.current_page += 1
-        self._update_buttons()
-        await inter.response.edit_message(embed=self.create_embed(), view=self)
+        self._show(page)
+        await inter.edit_original_response(embed=self.create_embed(), view=self)
 
 
 class EspritCog(commands.Cog):
@@ -249,7 +260,12 @@ class EspritCog(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
-        self.image_generator = ImageGenerator()  # Create once, reuse
+    
+    @property
+    def image_generator(self):
+        """Shared card generator, loaded on first card render rather than at cog load"""
+        from src.utils.stats_generator import get_generator
+        return get_generator()
     
     @commands.slash_command(name="esprit", description="Esprit-related commands")
     async def esprit(self, inter: disnake.ApplicationCommandInteraction):
@@ -276,16 +292,12 @@ class EspritCog(commands.Cog):
                     )
                     return await inter.edit_original_response(embed=embed)
                 
-                # Get all Esprits with their base info
-                query = select(Esprit, EspritBase).where(
-                    Esprit.owner_id == player.id, #type: ignore[assignment]
-                    Esprit.esprit_base_id == EspritBase.id # type: ignore[assignment]
-                )
-                
-                result = await session.execute(query)
-                esprits = result.all()
+                # First page only; the view fetches the rest by cursor
+                page_result = await EspritService.get_collection_page(player.id, "tier_desc", include_total=True)  # type: ignore[arg-type]
+                if not page_result.success or page_result.data is None:
+                    raise RuntimeError(page_result.error)
                 
-                if not esprits:
+                if not page_result.data["esprits"]:
                     embed = disnake.Embed(
                         title="Empty Index",
                         description="You don't have any Esprits yet!\nUse `/quest` to find some!",
@@ -294,7 +306,7 @@ class EspritCog(commands.Cog):
                     return await inter.edit_original_response(embed=embed)
                 
                 # Create view and send
-                view = SimpleCollectionView(esprits, player.username, inter.author.id) #type: ignore[assignment]
+                view = SimpleCollectionView(player.id, player.username, inter.author.id, page_result.data) #type: ignore[assignment]
                 embed = view.create_embed()
                 
                 await inter.edit_original_response(embed=embed, view=view)
@@ -561,6 +573,14 @@ class EspritCog(commands.Cog):
                 color=EmbedColors.ERROR
             )
             await inter.edit_original_response(embed=embed)
+    
+    @view_esprit.autocomplete("esprit_name")
+    async def view_esprit_autocomplete(self, inter: disnake.ApplicationCommandInteraction, string: str) -> List[str]:
+        return await EspritSearchIndex.autocomplete(string)
+    
+    @showcase_esprit.autocomplete("esprit_name")
+    async def showcase_esprit_autocomplete(self, inter: disnake.ApplicationCommandInteraction, string: str) -> List[str]:
+        return await EspritSearchIndex.autocomplete(string)
 
 
 def setup(bot):
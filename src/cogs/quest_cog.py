@@ -9,8 +9,6 @@ from src.utils.config_manager import ConfigManager
 from src.utils.redis_service import ratelimit
 from src.database.models import Player
 from src.domain.quest_domain import BossEncounter, PendingCapture, CaptureSystem
-from src.utils.boss_generator import generate_boss_card
-from src.utils.stats_generator import generate_esprit_card
 from src.utils.game_constants import Elements as GameElements, Tiers, GameConstants as GameConsts
 from sqlalchemy import select
 
@@ -333,6 +331,7 @@ class BossCombatView(disnake.ui.View):
                     "sprite_path": boss_image_data.get("sprite_path")  # Alternative path
                 }
                 
+                from src.utils.boss_generator import generate_boss_card  # Pillow loads on first card, not at startup
                 boss_file = await generate_boss_card(boss_card_data, f"boss_combat_{display_data['name']}.png")
                 logger.info(f"📸 Boss card generated: {boss_file is not None}")
         except Exception as e:
@@ -546,6 +545,7 @@ class CaptureDecisionView(disnake.ui.View):
                         "source": "capture"
                     }
                     
+                    from src.utils.stats_generator import generate_esprit_card
                     esprit_file = await generate_esprit_card(card_data, f"captured_{esprit_base.name}.png")
                     
                     if esprit_file:
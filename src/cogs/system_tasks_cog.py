@@ -1,245 +1,231 @@
 # src/cogs/system_tasks_cog.py
 import disnake
 from disnake.ext import commands, tasks
+import io
 import logging
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
 from typing import Dict, Any
 
 # ✅ ALL IMPORTS ARE CORRECT - USING src.* PATTERN
 from src.services.resource_service import ResourceService
 from src.services.building_service import BuildingService
 from src.services.cache_service import CacheService
+from src.services.statistics_service import StatisticsService
 from src.utils.config_manager import ConfigManager
+from src.utils.job_scheduler import Job, JobScheduler
+from src.utils.metrics import Metrics
+from src.utils.startup import Startup
+from src.utils.tracing import Tracer
 from src.utils.logger import get_logger
 
 # NO OTHER IMPORTS - especially no bare 'utils' imports!
 
 logger = get_logger(__name__)
 
+
+def _background_config() -> Dict[str, Any]:
+    """background_tasks.json nests its sections under a "background_tasks" key"""
+    config = ConfigManager.get("background_tasks") or {}
+    return config.get("background_tasks", config)
+
+
 class SystemTasksCog(commands.Cog):
     """Background task automation for REVE - ALL LOGIC IS IN SERVICES"""
     
     def __init__(self, bot):
         self.bot = bot
-        self.task_stats = {
-            "energy_regen": {"runs": 0, "errors": 0, "last_run": None},
-            "stamina_regen": {"runs": 0, "errors": 0, "last_run": None},
-            "building_income": {"runs": 0, "errors": 0, "last_run": None},
-            "cache_cleanup": {"runs": 0, "errors": 0, "last_run": None},
-            "daily_reset": {"runs": 0, "errors": 0, "last_run": None}
-        }
+        self.scheduler = JobScheduler()
+        self.task_stats = {"analytics_flush": {"runs": 0, "errors": 0, "last_run": None}}
         logger.info("SystemTasksCog initialized - background tasks ready")
 
+    def _register_jobs(self):
+        """Build scheduler jobs from background_tasks.json"""
+        background_config = _background_config()
+        minutes = lambda section, default: timedelta(  # noqa: E731
+            minutes=background_config.get(section, {}).get("interval_minutes", default)
+        )
+        jobs = [
+            ("energy_regeneration", Job("energy_regen", self._energy_regeneration, interval=minutes("energy_regeneration", 1),
+                                        lease_seconds=60, jitter_seconds=10)),
+            ("stamina_regeneration", Job("stamina_regen", self._stamina_regeneration, interval=minutes("stamina_regeneration", 1),
+                                         lease_seconds=60, jitter_seconds=10)),
+            ("building_income", Job("building_income", self._building_income, interval=minutes("building_income", 30),
+                                    lease_seconds=300, jitter_seconds=60)),
+            ("cache_warming", Job("cache_warming", self._cache_warming, interval=minutes("cache_warming", 5),
+                                  lease_seconds=900, jitter_seconds=30)),
+            ("cache_sweeper", Job("cache_sweep", self._cache_sweep,
+                                  interval=timedelta(seconds=background_config.get("cache_sweeper", {}).get("interval_seconds", 10)),
+                                  lease_seconds=30, jitter_seconds=2)),
+        ]
+        reset_config = background_config.get("daily_reset", {})
+        jobs.append(("daily_reset", Job(
+            "daily_reset", self._daily_reset,
+            daily_at=time(reset_config.get("hour_utc", 0), reset_config.get("minute", 0)), lease_seconds=600
+        )))
+
+        for section, job in jobs:
+            if background_config.get(section, {}).get("enabled", True):
+                self.scheduler.add(job)
+                logger.info(f"Scheduled background job {job.name}")
+
     async def cog_load(self):
         """Start background tasks when cog loads"""
-        background_config = ConfigManager.get("background_tasks") or {}
-        
-        # Start energy regeneration if enabled
-        if background_config.get("energy_regeneration", {}).get("enabled", True):
-            self.energy_regeneration_task.start()
-            logger.info("Started energy regeneration background task")
-        
-        # Start stamina regeneration if enabled
-        if background_config.get("stamina_regeneration", {}).get("enabled", True):
-            self.stamina_regeneration_task.start()
-            logger.info("Started stamina regeneration background task")
-        
-        # Start building income if enabled
-        if background_config.get("building_income", {}).get("enabled", True):
-            self.building_income_task.start()
-            logger.info("Started building income background task")
-        
-        # Start cache cleanup if enabled
-        if background_config.get("cache_cleanup", {}).get("enabled", True):
-            self.cache_cleanup_task.start()
-            logger.info("Started cache cleanup background task")
+        background_config = _background_config()
+        self._register_jobs()
+        self.bot.loop.create_task(self._start_scheduler())
+
+        # Analytics buffers are per process (local fallback), so every process flushes its own
+        flush_config = background_config.get("analytics_flush", {})
+        if flush_config.get("enabled", True):
+            self.analytics_flush_task.change_interval(seconds=flush_config.get("interval_seconds", 10))
+            self.analytics_flush_task.start()
+            logger.info("Started analytics counter flush background task")
+
+    async def _start_scheduler(self):
+        await self.bot.wait_until_ready()
+        await self.scheduler.start()
+        logger.info(f"Job scheduler started as {self.scheduler.owner}")
         
-        # Start daily reset if enabled
-        if background_config.get("daily_reset", {}).get("enabled", True):
-            self.daily_reset_task.start()
-            logger.info("Started daily reset background task")
+        # Fresh deploy: warm now rather than at the next interval (the lease keeps it to one process)
+        if "cache_warming" in self.scheduler.jobs:
+            try:
+                await self.scheduler.run_now("cache_warming")
+            except RuntimeError:
+                pass  # another process is already warming
 
     async def cog_unload(self):
         """Stop background tasks when cog unloads"""
-        self.energy_regeneration_task.cancel()
-        self.stamina_regeneration_task.cancel()
-        self.building_income_task.cancel()
-        self.cache_cleanup_task.cancel()
-        self.daily_reset_task.cancel()
+        await self.scheduler.stop()
+        self.analytics_flush_task.cancel()
+        
+        # Push buffered analytics counters before the process goes away
+        await StatisticsService.flush_analytics_counters()
         logger.info("Stopped all background tasks")
 
-    @tasks.loop(minutes=1)
-    async def energy_regeneration_task(self):
-        """Energy regeneration every 1 minute - LOGIC IN ResourceService"""
-        task_name = "energy_regen"
-        try:
-            start_time = datetime.utcnow()
-            
-            # ALL BUSINESS LOGIC IS IN THE SERVICE
-            result = await ResourceService.regenerate_energy_for_all()
-            
-            execution_time = (datetime.utcnow() - start_time).total_seconds()
-            
-            if result.success and result.data:
-                stats = result.data
-                self.task_stats[task_name]["runs"] += 1
-                self.task_stats[task_name]["last_run"] = start_time
-                
-                # Only log if significant activity
-                energy_granted = stats.get('total_energy_granted', 0)
-                if energy_granted > 0:
-                    logger.info(
-                        f"⚡ Energy regeneration: "
-                        f"{stats.get('players_processed', 0)} players, "
-                        f"{energy_granted} energy granted, "
-                        f"{stats.get('errors', 0)} errors ({execution_time:.2f}s)"
-                    )
-            else:
-                raise Exception(result.error or "Unknown error in energy regeneration")
-                
-        except Exception as e:
-            self.task_stats[task_name]["errors"] += 1
-            logger.error(f"Energy regeneration task failed: {e}")
-            
-            # Alert on consecutive failures
-            background_config = ConfigManager.get("background_tasks") or {}
-            if (background_config.get("performance_monitoring", {}).get("alert_on_errors", True) and
-                self.task_stats[task_name]["errors"] >= background_config.get("performance_monitoring", {}).get("max_consecutive_failures", 3)):
-                logger.critical(f"⚠️ Energy regeneration has failed {self.task_stats[task_name]['errors']} times consecutively!")
+    def _check_failures(self, job_name: str, label: str):
+        """Alert once a job keeps failing (run from the job that just failed)"""
+        background_config = _background_config()
+        monitoring = background_config.get("performance_monitoring", {})
+        failures = self.scheduler.state[job_name].consecutive_failures + 1
+        if monitoring.get("alert_on_errors", True) and failures >= monitoring.get("max_consecutive_failures", 3):
+            logger.critical(f"⚠️ {label} has failed {failures} times consecutively!")
 
-    @tasks.loop(minutes=1)
-    async def stamina_regeneration_task(self):
-        """Stamina regeneration every 1 minute - LOGIC IN ResourceService"""
-        task_name = "stamina_regen"
-        try:
-            start_time = datetime.utcnow()
-            
-            # ALL BUSINESS LOGIC IS IN THE SERVICE
-            result = await ResourceService.regenerate_stamina_for_all()
-            
-            execution_time = (datetime.utcnow() - start_time).total_seconds()
-            
-            if result.success and result.data:
-                stats = result.data
-                self.task_stats[task_name]["runs"] += 1
-                self.task_stats[task_name]["last_run"] = start_time
-                
-                # Only log if significant activity
-                stamina_granted = stats.get('total_stamina_granted', 0)
-                if stamina_granted > 0:
-                    logger.info(
-                        f"💪 Stamina regeneration: "
-                        f"{stats.get('players_processed', 0)} players, "
-                        f"{stamina_granted} stamina granted, "
-                        f"{stats.get('errors', 0)} errors ({execution_time:.2f}s)"
-                    )
-            else:
-                raise Exception(result.error or "Unknown error in stamina regeneration")
-                
-        except Exception as e:
-            self.task_stats[task_name]["errors"] += 1
-            logger.error(f"Stamina regeneration task failed: {e}")
+    # Scheduled jobs: raise on failure so the scheduler records it; ALL LOGIC IS IN SERVICES
 
-    @tasks.loop(minutes=30)
-    async def building_income_task(self):
-        """Building passive income every 30 minutes - LOGIC IN BuildingService"""
-        task_name = "building_income"
-        try:
-            start_time = datetime.utcnow()
-            
-            # ALL BUSINESS LOGIC IS IN THE SERVICE
-            result = await BuildingService.process_passive_income_for_all()
-            
-            execution_time = (datetime.utcnow() - start_time).total_seconds()
-            
-            if result.success and result.data:
-                stats = result.data
-                self.task_stats[task_name]["runs"] += 1
-                self.task_stats[task_name]["last_run"] = start_time
-                
-                logger.info(
-                    f"🏗️ Building income: "
-                    f"{stats.get('players_processed', 0)} players, "
-                    f"{stats.get('total_income_granted', 0):,} revies granted, "
-                    f"{stats.get('total_ticks_processed', 0)} ticks, "
-                    f"{stats.get('errors', 0)} errors ({execution_time:.2f}s)"
-                )
-            else:
-                raise Exception(result.error or "Unknown error in building income")
-                
-        except Exception as e:
-            self.task_stats[task_name]["errors"] += 1
-            logger.error(f"Building income task failed: {e}")
+    async def _energy_regeneration(self):
+        result = await ResourceService.regenerate_energy_for_all()
+        if not (result.success and result.data):
+            self._check_failures("energy_regen", "Energy regeneration")
+            raise Exception(result.error or "Unknown error in energy regeneration")
+        stats = result.data
+        energy_granted = stats.get('total_energy_granted', 0)
+        if energy_granted > 0:
+            logger.info(
+                f"⚡ Energy regeneration: "
+                f"{stats.get('players_processed', 0)} players, "
+                f"{energy_granted} energy granted, "
+                f"{stats.get('errors', 0)} errors"
+            )
+        return result
+
+    async def _stamina_regeneration(self):
+        result = await ResourceService.regenerate_stamina_for_all()
+        if not (result.success and result.data):
+            self._check_failures("stamina_regen", "Stamina regeneration")
+            raise Exception(result.error or "Unknown error in stamina regeneration")
+        stats = result.data
+        stamina_granted = stats.get('total_stamina_granted', 0)
+        if stamina_granted > 0:
+            logger.info(
+                f"💪 Stamina regeneration: "
+                f"{stats.get('players_processed', 0)} players, "
+                f"{stamina_granted} stamina granted, "
+                f"{stats.get('errors', 0)} errors"
+            )
+        return result
+
+    async def _building_income(self):
+        result = await BuildingService.process_passive_income_for_all()
+        if not (result.success and result.data):
+            self._check_failures("building_income", "Building income")
+            raise Exception(result.error or "Unknown error in building income")
+        stats = result.data
+        logger.info(
+            f"🏗️ Building income: "
+            f"{stats.get('players_processed', 0)} players, "
+            f"{stats.get('total_income_granted', 0):,} revies granted, "
+            f"{stats.get('total_ticks_processed', 0)} ticks, "
+            f"{stats.get('errors', 0)} errors"
+        )
+        return result
 
-    @tasks.loop(hours=6)
-    async def cache_cleanup_task(self):
-        """Cache cleanup every 6 hours - LOGIC IN CacheService"""
-        task_name = "cache_cleanup"
+    async def _cache_warming(self):
+        settings = _background_config().get("cache_warming", {})
+        # Only when no warm has finished since this process started (deploy) or the marker is gone (Redis flush)
+        result = await CacheService.warm_active_players(
+            active_within_hours=settings.get("active_within_hours", 24),
+            max_players=settings.get("max_players", 20000),
+            batch_size=settings.get("batch_size", 200),
+            concurrency=settings.get("concurrency", 2),
+            players_per_second=settings.get("players_per_second", 500),
+            skip_if_warmed_since=Startup.started_at
+        )
+        if not result.success:
+            self._check_failures("cache_warming", "Cache warming")
+            raise Exception(result.error or "Unknown error in cache warming")
+        return result
+
+    async def _cache_sweep(self):
+        settings = _background_config().get("cache_sweeper", {})
+        # One small slice per tick; the budget keeps it out of command latency
+        result = await CacheService.sweep_cache(
+            time_budget_ms=settings.get("time_budget_ms", 25),
+            max_commands=settings.get("max_commands", 400),
+            scan_count=settings.get("scan_count", 100),
+            idle_evict_seconds=settings.get("idle_evict_seconds", 21600),
+            max_entry_bytes=settings.get("max_entry_bytes", 262144),
+            tag_sample=settings.get("tag_sample", 20)
+        )
+        if not result.success:
+            self._check_failures("cache_sweep", "Cache sweeper")
+            raise Exception(result.error or "Unknown error in cache sweep")
+        return result
+
+    async def _daily_reset(self):
+        # This would call various services for daily resets
+        # For now, just log that daily reset occurred
+        # Future: RewardService.process_daily_rewards(), etc.
+        logger.info("🌅 Daily reset completed")
+
+    @tasks.loop(seconds=10)
+    async def analytics_flush_task(self):
+        """Write buffered analytics counters to the database - LOGIC IN StatisticsService"""
+        task_name = "analytics_flush"
         try:
             start_time = datetime.utcnow()
             
-            # ALL BUSINESS LOGIC IS IN THE SERVICE
-            result = await CacheService.cleanup_expired_cache()
+            result = await StatisticsService.flush_analytics_counters()
             
             execution_time = (datetime.utcnow() - start_time).total_seconds()
             
-            if result.success:
+            if result.success and result.data is not None:
                 self.task_stats[task_name]["runs"] += 1
                 self.task_stats[task_name]["last_run"] = start_time
                 
-                logger.info(f"🧹 Cache cleanup completed in {execution_time:.2f}s")
+                if result.data.get("players_flushed", 0) > 0:
+                    logger.debug(
+                        f"📈 Analytics flush: {result.data['players_flushed']} players ({execution_time:.2f}s)"
+                    )
             else:
-                raise Exception(result.error or "Unknown error in cache cleanup")
-                
-        except Exception as e:
-            self.task_stats[task_name]["errors"] += 1
-            logger.error(f"Cache cleanup task failed: {e}")
-
-    @tasks.loop(time=time(0, 0))  # Daily at midnight UTC
-    async def daily_reset_task(self):
-        """Daily reset tasks at midnight UTC - LOGIC IN SERVICES"""
-        task_name = "daily_reset"
-        try:
-            start_time = datetime.utcnow()
-            
-            # This would call various services for daily resets
-            # For now, just log that daily reset occurred
-            # Future: RewardService.process_daily_rewards(), etc.
-            
-            execution_time = (datetime.utcnow() - start_time).total_seconds()
-            
-            self.task_stats[task_name]["runs"] += 1
-            self.task_stats[task_name]["last_run"] = start_time
-            
-            logger.info(f"🌅 Daily reset completed in {execution_time:.2f}s")
+                raise Exception(result.error or "Unknown error in analytics flush")
                 
         except Exception as e:
             self.task_stats[task_name]["errors"] += 1
-            logger.error(f"Daily reset task failed: {e}")
+            logger.error(f"Analytics flush task failed: {e}")
 
-    @energy_regeneration_task.before_loop
-    async def before_energy_regeneration(self):
-        """Wait for bot to be ready before starting energy regeneration"""
-        await self.bot.wait_until_ready()
-
-    @stamina_regeneration_task.before_loop
-    async def before_stamina_regeneration(self):
-        """Wait for bot to be ready before starting stamina regeneration"""
-        await self.bot.wait_until_ready()
-
-    @building_income_task.before_loop
-    async def before_building_income(self):
-        """Wait for bot to be ready before starting building income"""
-        await self.bot.wait_until_ready()
-
-    @cache_cleanup_task.before_loop
-    async def before_cache_cleanup(self):
-        """Wait for bot to be ready before starting cache cleanup"""
-        await self.bot.wait_until_ready()
-
-    @daily_reset_task.before_loop
-    async def before_daily_reset(self):
-        """Wait for bot to be ready before starting daily reset"""
+    @analytics_flush_task.before_loop
+    async def before_analytics_flush(self):
+        """Wait for bot to be ready before starting analytics flush"""
         await self.bot.wait_until_ready()
 
     # =====================================
@@ -257,12 +243,12 @@ class SystemTasksCog(commands.Cog):
             )
             embed.add_field(
                 name="📊 Commands",
-                value="`r system status` - View all background task status\n`r system trigger <task>` - Manually run a specific task",
+                value="`r system status` - View all background task status\n`r system trigger <task>` - Manually run a specific task\n`r system metrics [services|sql|redis]` - Latency and error metrics\n`r system traces [n]` - Last slow command timing trees\n`r system startup` - Startup phases and time-to-ready trend",
                 inline=False
             )
             embed.add_field(
                 name="⚡ Available Tasks",
-                value="`energy` • `stamina` • `income` • `cache`",
+                value="`energy` • `stamina` • `income` • `cache` • `warm`",
                 inline=False
             )
             embed.set_footer(text="Background tasks run automatically 24/7")
@@ -282,44 +268,169 @@ class SystemTasksCog(commands.Cog):
             "energy_regen": "⚡ Energy Regeneration",
             "stamina_regen": "💪 Stamina Regeneration", 
             "building_income": "🏗️ Building Income",
-            "cache_cleanup": "🧹 Cache Cleanup",
-            "daily_reset": "🌅 Daily Reset"
+            "cache_sweep": "🧹 Cache Sweeper",
+            "cache_warming": "🔥 Cache Warming",
+            "daily_reset": "🌅 Daily Reset",
+            "analytics_flush": "📈 Analytics Flush"
         }
         
-        # AUTOMATION STATUS
-        automation_status = []
+        # AUTOMATION STATUS (shared across processes via the scheduler state)
+        task_health = []
+        states = await self.scheduler.status()
         
-        for task_name, stats in self.task_stats.items():
-            if stats["runs"] > 0:
+        for task_name, state in states.items():
+            if state.runs > 0:
                 status = "🟢 Active"
-                if stats["errors"] > 0:
-                    status += f" (⚠️ {stats['errors']} errors)"
+                if state.consecutive_failures > 0:
+                    status = f"🟠 Failing ({state.consecutive_failures}x)"
+                elif state.errors > 0:
+                    status += f" (⚠️ {state.errors} errors)"
             else:
                 status = "🔴 Not Started"
             
-            last_run = stats["last_run"].strftime("%H:%M UTC") if stats["last_run"] else "Never"
-            
+            last_run = state.last_run.strftime("%H:%M UTC") if state.last_run else "Never"
+            next_due = state.next_due.strftime("%H:%M UTC") if state.next_due else "—"
             pretty_name = pretty_names.get(task_name, task_name.replace('_', ' ').title())
             
             embed.add_field(
                 name=pretty_name,
-                value=f"**Status:** {status}\n**Runs:** {stats['runs']:,}\n**Last:** {last_run}",
+                value=(
+                    f"**Status:** {status}\n**Runs:** {state.runs:,}\n**Last:** {last_run} ({state.last_duration:.2f}s)\n"
+                    f"**Lag:** {state.last_lag:.1f}s (max {state.max_lag:.1f}s)\n**Next:** {next_due}"
+                ),
                 inline=True
             )
-            
+            task_health.append(state.runs > 0)
+        
+        # Per-process loops
+        for task_name, stats in self.task_stats.items():
             if stats["runs"] > 0:
-                automation_status.append("🟢")
+                status = "🟢 Active"
+                if stats["errors"] > 0:
+                    status += f" (⚠️ {stats['errors']} errors)"
             else:
-                automation_status.append("🔴")
+                status = "🔴 Not Started"
+            last_run = stats["last_run"].strftime("%H:%M UTC") if stats["last_run"] else "Never"
+            embed.add_field(
+                name=pretty_names.get(task_name, task_name.replace('_', ' ').title()),
+                value=f"**Status:** {status}\n**Runs:** {stats['runs']:,}\n**Last:** {last_run}",
+                inline=True
+            )
+            task_health.append(stats["runs"] > 0)
+        
+        automation_status = ["🟢" if healthy else "🔴" for healthy in task_health]
         
         # Overall system health
-        active_tasks = sum(1 for stats in self.task_stats.values() if stats["runs"] > 0)
-        total_tasks = len(self.task_stats)
+        active_tasks = sum(task_health)
+        total_tasks = len(task_health)
         
         health_status = f"**System Health:** {active_tasks}/{total_tasks} tasks active {''.join(automation_status)}"
         embed.description = f"Automated systems running 24/7\n{health_status}"
         
-        embed.set_footer(text="💡 Use 'r system trigger <task>' to manually test a task")
+        embed.set_footer(text=f"💡 Use 'r system trigger <task>' to manually test a task • {self.scheduler.owner}")
+        await ctx.send(embed=embed)
+
+    @system_admin.command(name="metrics")
+    async def metrics_status(self, ctx, view: str = "services"):
+        """Slowest service operations, SQL statements and Redis commands since start (or reset)"""
+        if view == "reset":
+            Metrics.reset()
+            await ctx.send("📉 Metrics reset")
+            return
+        
+        def line(label: str, stats) -> str:
+            histogram = stats.histogram
+            failures = f" • ❌ {stats.errors}" if stats.errors else ""
+            return (
+                f"`{label[:38]}` {histogram.count:,}× avg {histogram.mean * 1000:.1f}ms "
+                f"p95 ≤{histogram.quantile(0.95) * 1000:g}ms{failures}"
+            )
+        
+        sections = {
+            "services": ("⚙️ Service Operations", Metrics.operations, lambda key: f"{key[0].replace('Service', '')}.{key[1]}"),
+            "sql": ("🗄️ SQL Statements", Metrics.statements, lambda key: f"{key[1]} {key[2]}" + (f" ({key[0]})" if key[0] != "primary" else "")),
+            "redis": ("🔴 Redis Commands", Metrics.redis_commands, lambda key: key),
+        }
+        if view not in sections:
+            await ctx.send(f"❌ Unknown view. Use one of: {' • '.join(f'`{v}`' for v in list(sections) + ['reset'])}")
+            return
+        
+        title, table, label = sections[view]
+        embed = disnake.Embed(
+            title=f"📊 {title}",
+            description=f"Ranked by total time since <t:{int(Metrics.started_at)}:R>",
+            color=0x2c2d31
+        )
+        top = Metrics.top(table, limit=10)
+        embed.add_field(
+            name="⏱️ Top by total time",
+            value="\n".join(line(label(key), stats) for key, stats in top)[:1024] or "No samples yet",
+            inline=False
+        )
+        failing = [(key, stats) for key, stats in Metrics.top(table, limit=5, by="errors") if stats.errors]
+        if failing:
+            embed.add_field(
+                name="❌ Most errors",
+                value="\n".join(f"`{label(key)[:38]}` {stats.errors:,} errors / {stats.histogram.count:,}" for key, stats in failing),
+                inline=False
+            )
+        if view == "services":
+            inflight = sum(stats.inflight for stats in Metrics.operations.values())
+            rejected = sum(stats.rejected for stats in Metrics.operations.values())
+            embed.add_field(name="🔄 In Flight", value=f"**{inflight}**", inline=True)
+            embed.add_field(name="🚫 Rejected (validation)", value=f"**{rejected:,}**", inline=True)
+        
+        embed.set_footer(text="r system metrics services|sql|redis|reset • full data on /metrics (METRICS_PORT)")
+        await ctx.send(embed=embed)
+
+    @system_admin.command(name="traces")
+    async def slow_traces(self, ctx, count: int = 3):
+        """Dump the last N slow command traces with their timing trees"""
+        traces = Tracer.recent_slow(max(1, min(count, 20)))
+        if not traces:
+            await ctx.send(f"🐢 No commands over {Tracer.slow_threshold_ms:.0f}ms since start")
+            return
+        
+        dump = "\n\n".join(trace.render() if trace.sampled else f"{trace.root.name} {trace.duration_ms:.1f}ms (not sampled)" for trace in traces)
+        summary = "\n".join(
+            f"`{trace.root.name}` **{trace.duration_ms:,.0f}ms** "
+            + " • ".join(f"{kind} {ms:,.0f}ms" for kind, ms in sorted(trace.breakdown().items(), key=lambda item: -item[1])[:3])
+            for trace in traces
+        )
+        embed = disnake.Embed(
+            title="🐢 Slow Commands",
+            description=summary[:4000],
+            color=0x2c2d31
+        )
+        embed.set_footer(text=f"Threshold {Tracer.slow_threshold_ms:.0f}ms • sampling {Tracer.sample_rate:.0%} • full trees in logs/slow_commands.log")
+        
+        # Timing trees rarely fit a message; attach them
+        buffer = io.BytesIO(dump.encode("utf-8"))
+        await ctx.send(embed=embed, file=disnake.File(buffer, filename="slow_traces.txt"))
+
+    @system_admin.command(name="startup")
+    async def startup_status(self, ctx):
+        """This process's startup phases plus time-to-ready for recent restarts"""
+        ready = f"**{Startup.time_to_ready:.2f}s**" if Startup.time_to_ready is not None else "not ready yet"
+        embed = disnake.Embed(
+            title="⏱️ Startup",
+            description=f"Time to ready: {ready}",
+            color=0x2c2d31
+        )
+        phases = sorted(Startup.phases.items(), key=lambda item: item[1][0])
+        embed.add_field(
+            name="🧩 Phases",
+            value="\n".join(f"`{name}` +{offset:.2f}s → {seconds:.2f}s" for name, (offset, seconds) in phases)[:1024] or "No phases recorded",
+            inline=False
+        )
+        history = Startup.history(10)
+        if history:
+            embed.add_field(
+                name="📈 Recent Restarts",
+                value="\n".join(f"`{entry['at'][:16]}` {entry['time_to_ready']:.2f}s" for entry in reversed(history))[:1024],
+                inline=False
+            )
+        embed.set_footer(text="python bot.py --profile-startup for per-module import times • logs/startup_history.jsonl")
         await ctx.send(embed=embed)
 
     @system_admin.command(name="trigger")
@@ -338,7 +449,7 @@ class SystemTasksCog(commands.Cog):
             )
             embed.add_field(
                 name="⚡ Available Tasks",
-                value="**`energy`** - Process energy regeneration for all players\n**`stamina`** - Process stamina regeneration for all players\n**`income`** - Process building income generation\n**`cache`** - Clean expired cache entries",
+                value="**`energy`** - Process energy regeneration for all players\n**`stamina`** - Process stamina regeneration for all players\n**`income`** - Process building income generation\n**`cache`** - Run one cache sweeper slice\n**`warm`** - Warm caches for recently active players",
                 inline=False
             )
             embed.set_footer(text="⚠️ These tasks normally run automatically")
@@ -350,7 +461,8 @@ class SystemTasksCog(commands.Cog):
             "energy": "energy_regen",
             "stamina": "stamina_regen", 
             "income": "building_income",
-            "cache": "cache_cleanup"
+            "cache": "cache_sweep",
+            "warm": "cache_warming"
         }
         
         if task not in task_mapping:
@@ -369,7 +481,8 @@ class SystemTasksCog(commands.Cog):
             "energy": "⚡",
             "stamina": "💪", 
             "income": "🏗️",
-            "cache": "🧹"
+            "cache": "🧹",
+            "warm": "🔥"
         }
         
         # Send "working" message with pretty name
@@ -379,14 +492,24 @@ class SystemTasksCog(commands.Cog):
         try:
             start_time = datetime.utcnow()
             
-            if internal_task == "energy_regen":
+            if internal_task == "cache_warming":
+                # Manual warm skips the deploy/flush check (and tops up whatever is missing)
+                result = await CacheService.warm_active_players()
+            elif internal_task in self.scheduler.jobs:
+                # Same lease as the scheduled run, so a manual trigger never overlaps it
+                result = await self.scheduler.run_now(internal_task)
+            elif internal_task == "energy_regen":
                 result = await ResourceService.regenerate_energy_for_all()
             elif internal_task == "stamina_regen":
                 result = await ResourceService.regenerate_stamina_for_all()
             elif internal_task == "building_income":
                 result = await BuildingService.process_passive_income_for_all()
-            elif internal_task == "cache_cleanup":
-                result = await CacheService.cleanup_expired_cache()
+            elif internal_task == "cache_sweep":
+                result = await CacheService.sweep_cache()
+            
+            if result is None:
+                state = self.scheduler.state[internal_task]
+                raise Exception(state.last_error or "Task failed")
             
             execution_time = (datetime.utcnow() - start_time).total_seconds()
             
@@ -396,7 +519,8 @@ class SystemTasksCog(commands.Cog):
                     "energy_regen": "⚡ Energy Regeneration",
                     "stamina_regen": "💪 Stamina Regeneration", 
                     "building_income": "🏗️ Building Income Generation",
-                    "cache_cleanup": "🧹 Cache Cleanup"
+                    "cache_sweep": "🧹 Cache Sweep",
+                    "cache_warming": "🔥 Cache Warming"
                 }
                 
                 embed = disnake.Embed(
@@ -413,6 +537,11 @@ class SystemTasksCog(commands.Cog):
                         "total_stamina_granted": "💪 Stamina Granted",
                         "income_generated": "💰 Income Generated",  # 🆕 CHANGED FROM income_granted
                         "total_ticks_processed": "🔄 Income Ticks",
+                        "active_players": "👥 Active Players",
+                        "players_warmed": "🔥 Players Warmed",
+                        "keys_sampled": "🔍 Keys Sampled",
+                        "evicted": "🗑️ Evicted",
+                        "tag_sets_removed": "🏷️ Orphaned Tag Sets",
                         "errors": "❌ Errors"
                     }
                     
@@ -434,6 +563,23 @@ class SystemTasksCog(commands.Cog):
                             embed.add_field(name="💡 Note", value="No income generated - players may not have income-generating buildings or next tick isn't due yet", inline=False)
                         else:
                             embed.add_field(name="💡 Note", value=f"Income added to pending storage - players can collect with `r collect`", inline=False)
+                    elif task == "warm" and "coverage_after" in result.data:
+                        before, after = result.data["coverage_before"], result.data["coverage_after"]
+                        embed.add_field(
+                            name="🎯 Coverage",
+                            value="\n".join(f"`{kind}` {before[kind]:.0%} → **{after[kind]:.0%}**" for kind in after),
+                            inline=False
+                        )
+                    elif task == "cache":
+                        status = await CacheService.get_sweep_status()
+                        last_pass = (status.data or {}).get("last_pass_memory") if status.success else None
+                        if last_pass:
+                            embed.add_field(
+                                name="🧠 Memory (last full pass)",
+                                value="\n".join(f"`{prefix}` {info['keys']:,} keys, {info['bytes'] / 1024:,.0f}KB"
+                                                for prefix, info in list(last_pass.items())[:8]),
+                                inline=False
+                            )
                         
             else:
                 embed = disnake.Embed(
@@ -1,19 +1,30 @@
 # src/database/models/esprit.py
 from typing import Any, Optional, Dict, TYPE_CHECKING
 from sqlmodel import SQLModel, Field
-from sqlalchemy import Column, String, BigInteger
+from sqlalchemy import Column, String, BigInteger, Index
 from datetime import datetime
 
+from src.domain.combat_formulas import awakened_stat
+
 if TYPE_CHECKING:
     from src.database.models import EspritBase
 
 class Esprit(SQLModel, table=True):
     __tablename__: str = "esprit"  
     """Universal Stack System - Each row represents ALL copies of an Esprit type a player owns"""
+    __table_args__ = (
+        # One stack per (owner, base); also serves every owner_id-only lookup
+        Index("uq_esprit_owner_base", "owner_id", "esprit_base_id", unique=True),
+        # Recent acquisitions, awakening candidates and element filters, index-only where possible
+        Index("ix_esprit_owner_created", "owner_id", "created_at", postgresql_include=["esprit_base_id", "quantity"]),
+        Index("ix_esprit_owner_tier_awakening", "owner_id", "tier", "awakening_level",
+              postgresql_include=["esprit_base_id", "quantity"]),
+        Index("ix_esprit_owner_element", "owner_id", "element", postgresql_include=["esprit_base_id", "quantity"]),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     esprit_base_id: int = Field(foreign_key="esprit_base.id", index=True)
-    owner_id: int = Field(foreign_key="player.id", index=True)
+    owner_id: int = Field(foreign_key="player.id")
     
     # Universal Stack Properties
     quantity: int = Field(sa_column=Column(BigInteger), default=1)
@@ -35,12 +46,9 @@ class Esprit(SQLModel, table=True):
         base_hp = base.base_hp
         
         # Apply awakening bonus (20% per star, multiplicative)
-        awakening_multiplier = 1.0 + (self.awakening_level * 0.2)
-        
-        # Calculate final stats with awakening
-        final_atk = int(base_atk * awakening_multiplier)
-        final_def = int(base_def * awakening_multiplier)
-        final_hp = int(base_hp * awakening_multiplier)
+        final_atk = awakened_stat(base_atk, self.awakening_level)
+        final_def = awakened_stat(base_def, self.awakening_level)
+        final_hp = awakened_stat(base_hp, self.awakening_level)
         
         return {
             "atk": final_atk,
@@ -1,16 +1,35 @@
 # src/database/models/player.py
 from typing import List, Optional, Dict, Any, TYPE_CHECKING
 from sqlmodel import BigInteger, Relationship, SQLModel, Field, Column
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.dialects.postgresql import JSON, JSONB
 from sqlalchemy.orm.attributes import flag_modified
 from datetime import datetime, timedelta, date
 from sqlalchemy import Column, BigInteger, Index
+from sqlalchemy.orm import load_only
 from src.utils.game_constants import Elements, Tiers, GameConstants
 from src.utils.config_manager import ConfigManager
 
 if TYPE_CHECKING:
     from src.database.models.player_class import PlayerClass
 
+# --- Hot/cold column groups for load_only projections ---
+# Hot counters are what most commands lock and mutate; the JSON blobs and analytics
+# columns stay unloaded unless a service asks for their group.
+PLAYER_COLUMN_GROUPS: Dict[str, tuple] = {
+    "core": ("id", "discord_id", "username", "level", "experience", "last_active"),
+    "energy": ("energy", "max_energy", "last_energy_update", "total_energy_spent"),
+    "stamina": ("stamina", "max_stamina", "last_stamina_update", "total_stamina_spent"),
+    "currency": ("revies", "erythl", "total_revies_earned", "total_erythl_earned"),
+    "reve": ("reve_charges", "last_reve_charge_time"),
+    "buildings": (
+        "building_slots", "shrine_count", "shrine_level", "cluster_count", "cluster_level",
+        "pending_revies_income", "pending_erythl_income", "last_income_collection",
+        "total_passive_income_collected", "upkeep_paid_until", "total_upkeep_cost", "total_upkeep_paid"
+    ),
+    "inventory": ("inventory",),
+    "fragments": ("tier_fragments", "element_fragments"),
+}
+
 class Player(SQLModel, table=True):
     __tablename__: str = "player" 
     __table_args__ = (
@@ -55,11 +74,11 @@ class Player(SQLModel, table=True):
     # --- Currencies & Resources ---
     revies: int = Field(default=0)  # Primary currency
     erythl: int = Field(default=0)  # Premium currency
-    inventory: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON))
+    inventory: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSONB))
     
     # --- Tier Fragments (MW Style) AND Element Fragments ---
-    tier_fragments: Dict[str, int] = Field(default_factory=dict, sa_column=Column(JSON))
-    element_fragments: Dict[str, int] = Field(default_factory=dict, sa_column=Column(JSON))
+    tier_fragments: Dict[str, int] = Field(default_factory=dict, sa_column=Column(JSONB))
+    element_fragments: Dict[str, int] = Field(default_factory=dict, sa_column=Column(JSONB))
     
     # --- Daily/Weekly Systems ---
     daily_quest_streak: int = Field(default=0)
@@ -231,6 +250,17 @@ class Player(SQLModel, table=True):
         """Update last active timestamp"""
         self.last_active = datetime.utcnow()
 
+    @classmethod
+    def projection(cls, *groups: str):
+        """
+        load_only option for the "core" columns plus the named PLAYER_COLUMN_GROUPS.
+        Unloaded columns raise on access instead of lazy loading inside async code.
+        """
+        names = set(PLAYER_COLUMN_GROUPS["core"])
+        for group in groups:
+            names.update(PLAYER_COLUMN_GROUPS[group])
+        return load_only(*(getattr(cls, name) for name in sorted(names)), raiseload=True)
+
     # --- SIMPLE STAT CALCULATIONS ---
 
     def get_win_rate(self) -> float:
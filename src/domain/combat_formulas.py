@@ -0,0 +1,264 @@
+# src/domain/combat_formulas.py
+"""
+Pure combat formulas shared by CombatService and the offline combat simulator.
+
+Every function here is side-effect free. Functions that take an optional ``xp``
+argument work on plain ints when ``xp`` is None and on NumPy arrays when the
+``numpy`` module is passed in, so the live service and the vectorized simulator
+evaluate exactly the same expressions.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+from enum import Enum
+
+from src.utils.game_constants import GameConstants
+
+
+class EffectType(Enum):
+    """Types of status effects"""
+    BUFF = "buff"
+    DEBUFF = "debuff"
+    DOT = "damage_over_time"
+    HOT = "heal_over_time"
+    SPECIAL = "special"
+    ADVANCED = "advanced"
+
+
+# === STATUS EFFECT DEFINITIONS ===
+EFFECT_DEFINITIONS: Dict[str, Dict[str, Any]] = {
+    # Basic DOT/HOT effects
+    "burn": {
+        "name": "Burning",
+        "type": EffectType.DOT,
+        "description": "Takes fire damage each turn",
+        "max_stacks": 3,
+        "base_damage_percent": 0.1
+    },
+    "poison": {
+        "name": "Poisoned",
+        "type": EffectType.DOT,
+        "description": "Takes poison damage each turn",
+        "max_stacks": 5,
+        "base_damage_percent": 0.08
+    },
+    "regeneration": {
+        "name": "Regenerating",
+        "type": EffectType.HOT,
+        "description": "Restores health each turn",
+        "max_stacks": 1,
+        "base_heal_percent": 0.05
+    },
+
+    # Basic buffs/debuffs
+    "attack_boost": {
+        "name": "Attack Boost",
+        "type": EffectType.BUFF,
+        "description": "Increased attack power",
+        "max_stacks": 1,
+        "stat_modifiers": {"attack_multiplier": 1.2}
+    },
+    "weakened": {
+        "name": "Weakened",
+        "type": EffectType.DEBUFF,
+        "description": "Reduced attack power",
+        "max_stacks": 1,
+        "stat_modifiers": {"attack_multiplier": 0.7}
+    }
+}
+
+# === ADVANCED EFFECT DEFINITIONS WITH TIER SCALING ===
+ADVANCED_EFFECTS: Dict[str, Dict[str, Any]] = {
+    "elemental_weakness": {
+        "name": "Elemental Weakness",
+        "description": "Next opposing element attack deals {multiplier}x damage",
+        "duration": 1,
+        "base_multiplier": 2.0,
+        "tier_scaling": 0.1
+    },
+    "vulnerability_mark": {
+        "name": "Vulnerability Mark",
+        "description": "Increases damage taken by {percent}% per stack",
+        "duration": 3,
+        "base_percent": 16,
+        "tier_scaling": 1.0,
+        "max_stacks_base": 5
+    },
+    "power_siphon": {
+        "name": "Power Siphon",
+        "description": "Steals {percent}% attack per turn",
+        "duration": 4,
+        "base_percent": 5.5,
+        "tier_scaling": 0.5
+    },
+    "berserker_rage": {
+        "name": "Berserker Rage",
+        "description": "Damage increases by {percent}% each turn",
+        "duration": 4,
+        "base_percent": 15,
+        "tier_scaling": 0.5
+    },
+    "perfect_counter": {
+        "name": "Perfect Counter",
+        "description": "Next attack reflects {percent}% damage",
+        "duration": 2,
+        "base_percent": 80,
+        "tier_scaling": 2.0
+    },
+    "overcharge": {
+        "name": "Overcharge",
+        "description": "Next attack deals {multiplier}x damage but costs 2x stamina",
+        "duration": 1,
+        "base_multiplier": 1.5,
+        "tier_scaling": 0.05
+    },
+    "temporal_shift": {
+        "name": "Temporal Shift",
+        "description": "Cooldowns reduced by {reduction} turns",
+        "duration": 1,
+        "base_reduction": 1,
+        "tier_scaling": 0.1
+    },
+    "elemental_resonance": {
+        "name": "Elemental Resonance",
+        "description": "All abilities enhanced with {element} properties",
+        "duration": 3,
+        "base_power": 1.0,
+        "tier_scaling": 0.1
+    },
+    "counter_stance": {
+        "name": "Counter Stance",
+        "description": "Automatically counterattacks for {percent}% damage",
+        "duration": 3,
+        "base_percent": 50,
+        "tier_scaling": 1.0
+    },
+    "mana_burn": {
+        "name": "Mana Burn",
+        "description": "Reduces enemy resource generation by {percent}%",
+        "duration": 3,
+        "base_percent": 30,
+        "tier_scaling": 1.0
+    }
+}
+
+# Stamina costs per action
+LEADER_BASIC_STAMINA_COST = 1
+LEADER_ULTIMATE_STAMINA_COST = 2
+SUPPORT_STAMINA_COST = 1
+
+# Overcharge modifiers (applied to the next leader action)
+OVERCHARGE_DAMAGE_MULTIPLIER = 1.5
+OVERCHARGE_STAMINA_MULTIPLIER = 2.0
+
+# Boss AI phases: (hp fraction below which the phase starts, attack multiplier)
+BOSS_DESPERATE_THRESHOLD = 0.25
+BOSS_AGGRESSIVE_THRESHOLD = 0.5
+BOSS_DESPERATE_MULTIPLIER = 0.4
+BOSS_AGGRESSIVE_MULTIPLIER = 0.3
+BOSS_NORMAL_MULTIPLIER = 0.2
+BOSS_AGGRESSIVE_BURN_CHANCE = 0.3
+
+# Boss defaults when quest data is incomplete
+DEFAULT_BOSS_HP_MULTIPLIER = 3.0
+
+
+def calculate_base_damage(attack: Any, defense: Any, power: Any, xp: Optional[Any] = None) -> Any:
+    """Calculate base damage from attack, defense, and ability power (minimum 1)"""
+    base = (attack * power // 100) - (defense // 2)
+    if xp is None:
+        return max(1, base)
+    return xp.maximum(base, 1)
+
+
+def support_attack(attack: Any) -> Any:
+    """Support skills strike with half of the team attack"""
+    return attack // 2
+
+
+def stamina_cost(base_cost: int, overcharged: Any, xp: Optional[Any] = None) -> Any:
+    """Stamina cost of a leader action, doubled while overcharge is active"""
+    overcharged_cost = int(base_cost * OVERCHARGE_STAMINA_MULTIPLIER)
+    if xp is None:
+        return overcharged_cost if overcharged else base_cost
+    return xp.where(overcharged, overcharged_cost, base_cost)
+
+
+def apply_overcharge(damage: Any, overcharged: Any, xp: Optional[Any] = None) -> Any:
+    """Apply the overcharge damage multiplier when active"""
+    if xp is None:
+        return int(damage * OVERCHARGE_DAMAGE_MULTIPLIER) if overcharged else damage
+    boosted = (damage * OVERCHARGE_DAMAGE_MULTIPLIER).astype(damage.dtype)
+    return xp.where(overcharged, boosted, damage)
+
+
+def boss_attack_multiplier(hp_fraction: Any, xp: Optional[Any] = None) -> Any:
+    """Boss counter-attack multiplier for its current HP phase"""
+    if xp is None:
+        if hp_fraction < BOSS_DESPERATE_THRESHOLD:
+            return BOSS_DESPERATE_MULTIPLIER
+        if hp_fraction < BOSS_AGGRESSIVE_THRESHOLD:
+            return BOSS_AGGRESSIVE_MULTIPLIER
+        return BOSS_NORMAL_MULTIPLIER
+    return xp.where(
+        hp_fraction < BOSS_DESPERATE_THRESHOLD,
+        BOSS_DESPERATE_MULTIPLIER,
+        xp.where(hp_fraction < BOSS_AGGRESSIVE_THRESHOLD, BOSS_AGGRESSIVE_MULTIPLIER, BOSS_NORMAL_MULTIPLIER)
+    )
+
+
+def boss_attack_damage(player_attack: Any, hp_fraction: Any, xp: Optional[Any] = None) -> Any:
+    """Raw boss counter-attack damage (scales off the player's attack)"""
+    multiplier = boss_attack_multiplier(hp_fraction, xp)
+    if xp is None:
+        return int(player_attack * multiplier)
+    return (player_attack * multiplier).astype(player_attack.dtype)
+
+
+def damage_after_defense(damage: Any, defense: Any, xp: Optional[Any] = None) -> Any:
+    """Damage the player takes after defense mitigation (minimum 1)"""
+    mitigated = damage - defense // 2
+    if xp is None:
+        return max(1, mitigated)
+    return xp.maximum(mitigated, 1)
+
+
+def boss_max_hp(base_hp: int, hp_multiplier: float) -> int:
+    """Boss HP from its esprit base HP and the quest's hp_multiplier"""
+    return int(base_hp * hp_multiplier)
+
+
+def scale_effect_value(effect_def: Dict[str, Any], source_tier: int) -> float:
+    """Tier-scaled value of an advanced effect"""
+    if "base_multiplier" in effect_def:
+        return effect_def["base_multiplier"] + (source_tier * effect_def.get("tier_scaling", 0))
+    if "base_percent" in effect_def:
+        return effect_def["base_percent"] + (source_tier * effect_def.get("tier_scaling", 0))
+    return 1.0
+
+
+def victory_rewards(turn_count: int) -> Tuple[int, int]:
+    """Base (revies, xp) for winning a combat encounter"""
+    return 200 + (turn_count * 10), 50 + (turn_count * 5)
+
+
+# Per-hit damage rolls (Monster Warlord style variance and crits)
+DAMAGE_VARIANCE = 0.15
+CRIT_CHANCE = 0.1
+CRIT_MULTIPLIER = 1.5
+
+
+def apply_damage_roll(damage: Any, variance: Any, is_crit: Any, xp: Optional[Any] = None) -> Any:
+    """Apply a variance roll in [-DAMAGE_VARIANCE, DAMAGE_VARIANCE] and a crit flag to damage"""
+    if xp is None:
+        rolled = int(damage * (1.0 + variance))
+        if is_crit:
+            rolled = int(rolled * CRIT_MULTIPLIER)
+        return max(1, rolled)
+    rolled = (damage * (1.0 + variance)).astype(damage.dtype)
+    rolled = xp.where(is_crit, (rolled * CRIT_MULTIPLIER).astype(damage.dtype), rolled)
+    return xp.maximum(rolled, 1)
+
+
+def awakened_stat(base_stat: int, awakening_level: int) -> int:
+    """Stat of one copy after its awakening multiplier (20% per star)"""
+    return int(base_stat * (1.0 + awakening_level * GameConstants.AWAKENING_BONUS_PER_STAR))
@@ -0,0 +1,424 @@
+# src/domain/combat_simulation.py
+"""
+Vectorized Monte Carlo boss-fight simulation for combat balance tuning.
+
+Each batch advances thousands of independent fights at once as NumPy arrays
+(boss HP, stamina, cooldowns, overcharge and status effects are all array
+state) using the same formulas as CombatService via ``combat_formulas``.
+Batches are plain picklable dataclasses so scripts can fan them out across a
+process pool and merge the histograms afterwards.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+
+from src.domain import combat_formulas
+from src.domain.combat_formulas import EffectType, EFFECT_DEFINITIONS
+
+# Optional dependency - only the offline simulator needs NumPy
+try:
+    import numpy as np  # type: ignore
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+    np = None  # type: ignore
+
+# Action slots, in the same order as CombatState cooldown fields
+SLOT_NAMES = ("leader_basic", "leader_ultimate", "support1", "support2")
+DEFAULT_POLICY = ("leader_ultimate", "leader_basic", "support1", "support2")
+
+# Effects the simulator models as array state when status effects are enabled
+DOT_EFFECTS = tuple(name for name, d in EFFECT_DEFINITIONS.items() if d["type"] == EffectType.DOT)
+DEFAULT_EFFECT_DURATION = 3
+
+
+@dataclass(frozen=True)
+class SimAbility:
+    """Ability as the simulator sees it"""
+    name: str
+    power: int
+    cooldown: int
+    stamina_cost: int
+    is_leader: bool
+    effects: Tuple[str, ...] = ()
+    duration: int = DEFAULT_EFFECT_DURATION
+
+
+@dataclass(frozen=True)
+class SimTeam:
+    """Team composition reduced to combat stats and abilities"""
+    label: str
+    attack: int
+    defense: int
+    leader_tier: int
+    basic: SimAbility
+    ultimate: SimAbility
+    supports: Tuple[SimAbility, ...] = ()
+
+
+@dataclass(frozen=True)
+class SimBoss:
+    """Boss configuration; one candidate is drawn per fight"""
+    label: str
+    names: Tuple[str, ...]
+    max_hp: Tuple[int, ...]
+    defense: Tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class SimScenario:
+    """One cell of the simulation matrix"""
+    team: SimTeam
+    boss: SimBoss
+    stamina: int = 50
+    damage_rolls: bool = True
+    status_effects: bool = False
+    policy: Tuple[str, ...] = DEFAULT_POLICY
+    max_turns: int = 200
+
+    @property
+    def key(self) -> str:
+        return f"{self.team.label} vs {self.boss.label}"
+
+
+@dataclass
+class BatchOutcome:
+    """Mergeable histograms for a batch of simulated fights"""
+    key: str
+    fights: int = 0
+    victories: int = 0
+    turn_histogram: Any = None          # victories by number of player actions
+    stamina_histogram: Any = None       # all fights by stamina spent
+    total_damage_taken: int = 0
+    timeouts: int = 0
+
+    def merge(self, other: "BatchOutcome") -> "BatchOutcome":
+        """Fold another batch of the same scenario into this one"""
+        if self.turn_histogram is None:
+            self.turn_histogram = other.turn_histogram.copy()
+            self.stamina_histogram = other.stamina_histogram.copy()
+        else:
+            self.turn_histogram += other.turn_histogram
+            self.stamina_histogram += other.stamina_histogram
+        self.fights += other.fights
+        self.victories += other.victories
+        self.total_damage_taken += other.total_damage_taken
+        self.timeouts += other.timeouts
+        return self
+
+    def summary(self) -> Dict[str, Any]:
+        """Win rate plus turns-to-kill and stamina distributions"""
+        return {
+            "scenario": self.key,
+            "fights": self.fights,
+            "win_rate": self.victories / self.fights if self.fights else 0.0,
+            "timeouts": self.timeouts,
+            "turns_to_kill": _histogram_stats(self.turn_histogram),
+            "stamina_used": _histogram_stats(self.stamina_histogram),
+            "avg_damage_taken": self.total_damage_taken / self.fights if self.fights else 0.0,
+        }
+
+
+def _histogram_stats(histogram: Any) -> Dict[str, float]:
+    """Mean and percentiles from an integer-valued histogram"""
+    total = int(histogram.sum()) if histogram is not None else 0
+    if total == 0:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p90": 0.0, "p99": 0.0}
+    values = np.arange(len(histogram))
+    cumulative = np.cumsum(histogram)
+    stats = {"count": total, "mean": float((values * histogram).sum() / total)}
+    for label, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        stats[label] = float(np.searchsorted(cumulative, q * total))
+    return stats
+
+
+def _require_numpy() -> None:
+    if not HAS_NUMPY:
+        raise RuntimeError("Combat simulation requires numpy (pip install numpy)")
+
+
+# --- SCENARIO CONSTRUCTION (pure, config-driven) ---
+
+def _ability_from_config(data: Dict[str, Any], base_cost: int, is_leader: bool, default_cooldown: int) -> SimAbility:
+    return SimAbility(
+        name=data.get("name", "Unknown"),
+        power=int(data.get("power", 100)),
+        cooldown=int(data.get("cooldown", default_cooldown)),
+        stamina_cost=base_cost,
+        is_leader=is_leader,
+        effects=tuple(data.get("effects", []) or ()),
+        duration=int(data.get("duration") or DEFAULT_EFFECT_DURATION)
+    )
+
+
+def resolve_leader_abilities(
+    abilities_config: Dict[str, Any],
+    element: str,
+    tier: int,
+    esprit_name: Optional[str] = None
+) -> Tuple[SimAbility, SimAbility]:
+    """Basic and ultimate for a leader: custom esprit abilities first, then universal element/tier"""
+    config = None
+    if esprit_name:
+        config = abilities_config.get("custom_esprit_abilities", {}).get("esprits", {}).get(esprit_name)
+    if not config:
+        config = abilities_config.get("universal_element_abilities", {}).get(element.lower(), {}).get(str(tier), {})
+
+    basic = _ability_from_config(
+        config.get("basic", {"name": "Basic Attack", "power": 100}),
+        combat_formulas.LEADER_BASIC_STAMINA_COST, True, 0
+    )
+    ultimate = _ability_from_config(
+        config.get("ultimate", {"name": "Ultimate Attack", "power": 150}),
+        combat_formulas.LEADER_ULTIMATE_STAMINA_COST, True, 4
+    )
+    return basic, ultimate
+
+
+def resolve_support_skill(abilities_config: Dict[str, Any], element: str) -> SimAbility:
+    """Element support skill used from a support slot"""
+    data = abilities_config.get("support_skills", {}).get(f"{element.lower()}_support", {})
+    return _ability_from_config(
+        data or {"name": "Support Skill", "power": 80},
+        combat_formulas.SUPPORT_STAMINA_COST, False, 3
+    )
+
+
+def catalog_stats(catalog: Sequence[Dict[str, Any]], element: str, tier: int) -> Tuple[int, int, int]:
+    """Average (atk, def, hp) of catalog esprits with this element and tier"""
+    matches = [
+        e for e in catalog
+        if e.get("element", "").lower() == element.lower() and e.get("base_tier") == tier
+    ]
+    if not matches:
+        matches = [e for e in catalog if e.get("base_tier") == tier]
+    if not matches:
+        raise ValueError(f"No esprits of tier {tier} in catalog")
+    count = len(matches)
+    return (
+        sum(e["base_atk"] for e in matches) // count,
+        sum(e["base_def"] for e in matches) // count,
+        sum(e["base_hp"] for e in matches) // count,
+    )
+
+
+def build_team(
+    catalog: Sequence[Dict[str, Any]],
+    abilities_config: Dict[str, Any],
+    leader_element: str,
+    tier: int,
+    awakening_level: int = 0,
+    support_elements: Sequence[str] = ()
+) -> SimTeam:
+    """Team of tier-average esprits; attack/defense are the awakened member totals"""
+    attack = 0
+    defense = 0
+    supports = []
+    for index, element in enumerate((leader_element, *support_elements[:2])):
+        atk, defense_stat, _ = catalog_stats(catalog, element, tier)
+        attack += combat_formulas.awakened_stat(atk, awakening_level)
+        defense += combat_formulas.awakened_stat(defense_stat, awakening_level)
+        if index > 0:
+            supports.append(resolve_support_skill(abilities_config, element))
+
+    basic, ultimate = resolve_leader_abilities(abilities_config, leader_element, tier)
+    support_label = "+".join(e.lower() for e in support_elements[:2]) or "solo"
+    return SimTeam(
+        label=f"{leader_element.lower()} T{tier} A{awakening_level} [{support_label}]",
+        attack=attack,
+        defense=defense,
+        leader_tier=tier,
+        basic=basic,
+        ultimate=ultimate,
+        supports=tuple(supports)
+    )
+
+
+def bosses_from_quests(
+    quests_config: Dict[str, Any],
+    catalog: Sequence[Dict[str, Any]],
+    area_ids: Optional[Sequence[str]] = None
+) -> List[SimBoss]:
+    """One SimBoss per boss quest, with every possible esprit as a candidate"""
+    by_name = {e["name"].lower(): e for e in catalog}
+    bosses = []
+    for area_id, area_data in quests_config.items():
+        if area_ids and area_id not in area_ids:
+            continue
+        for quest in area_data.get("quests", []):
+            if not quest.get("is_boss"):
+                continue
+            boss_config = quest.get("boss_data", {})
+            hp_multiplier = boss_config.get("hp_multiplier", combat_formulas.DEFAULT_BOSS_HP_MULTIPLIER)
+            names, hp, defense = [], [], []
+            for name in boss_config.get("possible_esprits", []):
+                esprit = by_name.get(name.lower())
+                if not esprit:
+                    continue
+                names.append(esprit["name"])
+                hp.append(combat_formulas.boss_max_hp(esprit["base_hp"], hp_multiplier))
+                defense.append(esprit["base_def"])
+            if names:
+                bosses.append(SimBoss(
+                    label=f"{quest.get('id', area_id)} x{hp_multiplier:g}",
+                    names=tuple(names),
+                    max_hp=tuple(hp),
+                    defense=tuple(defense)
+                ))
+    return bosses
+
+
+# --- VECTORIZED FIGHT LOOP ---
+
+def simulate_batch(scenario: SimScenario, fights: int, seed: Optional[int] = None) -> BatchOutcome:
+    """Run ``fights`` independent fights of one scenario as array operations"""
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+    team = scenario.team
+    n = fights
+    i64 = np.int64
+
+    # Per-fight boss draw (BossEncounter picks one of possible_esprits at random)
+    pick = rng.integers(0, len(scenario.boss.names), size=n)
+    boss_max_hp = np.asarray(scenario.boss.max_hp, dtype=i64)[pick]
+    boss_defense = np.asarray(scenario.boss.defense, dtype=i64)[pick]
+
+    # Slot tables
+    slots: List[Optional[SimAbility]] = [team.basic, team.ultimate]
+    slots += list(team.supports[:2]) + [None] * (2 - len(team.supports[:2]))
+    exists = np.array([s is not None for s in slots])
+    order = [SLOT_NAMES.index(name) for name in scenario.policy if name in SLOT_NAMES]
+
+    # Fight state
+    boss_hp = boss_max_hp.copy()
+    stamina = np.full(n, scenario.stamina, dtype=i64)
+    cooldowns = np.zeros((n, 4), dtype=i64)
+    overcharge = np.zeros(n, dtype=bool)
+    active = np.ones(n, dtype=bool)
+    victory = np.zeros(n, dtype=bool)
+    actions = np.zeros(n, dtype=i64)
+    damage_taken = np.zeros(n, dtype=i64)
+    attack = np.full(n, team.attack, dtype=i64)
+
+    # Status effect state: DOT stacks on the boss, attack modifiers on the player
+    dot_stacks = np.zeros((n, len(DOT_EFFECTS)), dtype=i64)
+    dot_power = np.zeros((n, len(DOT_EFFECTS)), dtype=i64)
+    dot_turns = np.zeros((n, len(DOT_EFFECTS)), dtype=i64)
+    boost_turns = np.zeros(n, dtype=i64)
+    weakened_turns = np.zeros(n, dtype=i64)
+
+    for _ in range(scenario.max_turns):
+        if not active.any():
+            break
+
+        # Stamina cost per slot (leader actions double while overcharged)
+        costs = np.zeros((n, 4), dtype=i64)
+        for k, ability in enumerate(slots):
+            if ability is None:
+                continue
+            if ability.is_leader:
+                costs[:, k] = combat_formulas.stamina_cost(ability.stamina_cost, overcharge, np)
+            else:
+                costs[:, k] = ability.stamina_cost
+
+        affordable = (stamina[:, None] >= costs) & exists[None, :]
+        ready = affordable & (cooldowns == 0)
+
+        # Out of stamina for anything: the fight is lost
+        active &= affordable.any(axis=1)
+
+        choice = np.full(n, -1, dtype=i64)
+        for k in reversed(order):
+            choice = np.where(ready[:, k], k, choice)
+        choice = np.where(active, choice, -1)
+
+        # Effective attack for this turn
+        turn_attack = attack
+        if scenario.status_effects:
+            multiplier = np.ones(n)
+            multiplier = np.where(boost_turns > 0, multiplier * EFFECT_DEFINITIONS["attack_boost"]["stat_modifiers"]["attack_multiplier"], multiplier)
+            multiplier = np.where(weakened_turns > 0, multiplier * EFFECT_DEFINITIONS["weakened"]["stat_modifiers"]["attack_multiplier"], multiplier)
+            turn_attack = (attack * multiplier).astype(i64)
+
+        hit = np.zeros(n, dtype=i64)
+        for k, ability in enumerate(slots):
+            if ability is None:
+                continue
+            chosen = choice == k
+            if not chosen.any():
+                continue
+
+            source_attack = turn_attack if ability.is_leader else combat_formulas.support_attack(turn_attack)
+            damage = combat_formulas.calculate_base_damage(source_attack, boss_defense, ability.power, np)
+            if ability.is_leader:
+                damage = combat_formulas.apply_overcharge(damage, overcharge, np)
+                overcharge = np.where(chosen, False, overcharge)
+            if scenario.damage_rolls:
+                variance = rng.uniform(-combat_formulas.DAMAGE_VARIANCE, combat_formulas.DAMAGE_VARIANCE, size=n)
+                is_crit = rng.random(n) < combat_formulas.CRIT_CHANCE
+                damage = combat_formulas.apply_damage_roll(damage, variance, is_crit, np)
+
+            hit = np.where(chosen, damage, hit)
+            stamina -= np.where(chosen, costs[:, k], 0)
+            if ability.cooldown > 0:
+                cooldowns[:, k] = np.where(chosen, ability.cooldown, cooldowns[:, k])
+
+            for effect in ability.effects:
+                if effect == "overcharge":
+                    overcharge |= chosen
+                elif scenario.status_effects and effect in DOT_EFFECTS:
+                    e = DOT_EFFECTS.index(effect)
+                    max_stacks = EFFECT_DEFINITIONS[effect]["max_stacks"]
+                    tick = (damage * EFFECT_DEFINITIONS[effect]["base_damage_percent"]).astype(i64)
+                    dot_stacks[:, e] = np.where(chosen, np.minimum(dot_stacks[:, e] + 1, max_stacks), dot_stacks[:, e])
+                    dot_power[:, e] = np.where(chosen, np.maximum(tick, 1), dot_power[:, e])
+                    dot_turns[:, e] = np.where(chosen, ability.duration, dot_turns[:, e])
+                elif scenario.status_effects and effect == "attack_boost":
+                    boost_turns = np.where(chosen, ability.duration, boost_turns)
+
+        boss_hp -= hit
+        actions += choice >= 0
+
+        won = active & (boss_hp <= 0)
+        victory |= won
+        active &= ~won
+
+        # Boss counter-attack scales off the player's (unmodified) attack
+        hp_fraction = boss_hp / boss_max_hp
+        raw = combat_formulas.boss_attack_damage(attack, hp_fraction, np)
+        taken = combat_formulas.damage_after_defense(raw, team.defense, np)
+        damage_taken += np.where(active, taken, 0)
+        if scenario.status_effects:
+            desperate = active & (hp_fraction < combat_formulas.BOSS_DESPERATE_THRESHOLD)
+            weakened_turns = np.where(desperate, DEFAULT_EFFECT_DURATION, weakened_turns)
+
+            # Damage-over-time ticks at end of turn
+            ticking = dot_turns > 0
+            boss_hp -= np.where(active, (dot_stacks * dot_power * ticking).sum(axis=1), 0)
+            dot_turns = np.maximum(dot_turns - 1, 0)
+            dot_stacks = np.where(dot_turns > 0, dot_stacks, 0)
+            boost_turns = np.maximum(boost_turns - 1, 0)
+            weakened_turns = np.maximum(weakened_turns - 1, 0)
+
+            won = active & (boss_hp <= 0)
+            victory |= won
+            active &= ~won
+
+        cooldowns = np.maximum(cooldowns - 1, 0)
+
+    stamina_used = scenario.stamina - stamina
+    return BatchOutcome(
+        key=scenario.key,
+        fights=n,
+        victories=int(victory.sum()),
+        turn_histogram=np.bincount(actions[victory], minlength=scenario.max_turns + 1),
+        stamina_histogram=np.bincount(stamina_used, minlength=scenario.stamina + 1),
+        total_damage_taken=int(damage_taken.sum()),
+        timeouts=int(active.sum())
+    )
+
+
+def run_batch(task: Tuple[SimScenario, int, int]) -> BatchOutcome:
+    """Process-pool entry point: (scenario, fights, seed) -> BatchOutcome"""
+    scenario, fights, seed = task
+    return simulate_batch(scenario, fights, seed)
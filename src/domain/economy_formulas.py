@@ -0,0 +1,156 @@
+# src/domain/economy_formulas.py
+"""
+Pure economy formulas shared by BuildingService, FusionService, QuestRewardCalculator
+and the offline economy simulator.
+
+Functions that take an optional ``xp`` argument work on plain ints when ``xp`` is
+None and on NumPy arrays when the ``numpy`` module is passed in, mirroring
+combat_formulas.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.game_constants import GameConstants
+
+# Defaults used when config keys are missing (match the service fallbacks)
+DEFAULT_SHRINE_INCOME_MULTIPLIER = 1.3
+DEFAULT_CLUSTER_INCOME_MULTIPLIER = 1.4
+DEFAULT_UPGRADE_COST_MULTIPLIER = 1.5
+DEFAULT_INCOME_INTERVAL_MINUTES = 30
+DEFAULT_MAX_STACK_HOURS = 12
+
+DEFAULT_BASE_FUSION_COST = 1000
+DEFAULT_TIER_COST_MULTIPLIER = 100
+DEFAULT_BASE_FUSION_SUCCESS = 50
+DEFAULT_FUSION_TIER_PENALTY = 2
+MIN_FUSION_SUCCESS = 5
+MAX_FUSION_SUCCESS = 95
+
+DEFAULT_REVIES_REWARD = [50, 150]
+DEFAULT_XP_REWARD = 10
+MAX_QUEST_LEVEL_BONUS = 0.5
+QUEST_LEVEL_BONUS_PER_LEVEL = 0.01
+
+
+# === BUILDINGS ===
+
+def building_income_per_tick(base_income: int, income_multiplier: float, level: Any, xp: Optional[Any] = None) -> Any:
+    """Income of one building per tick at its current level"""
+    if xp is None:
+        return int(base_income * (income_multiplier ** (level - 1)))
+    return (base_income * (income_multiplier ** (level - 1))).astype(xp.int64)
+
+
+def building_upgrade_cost(base_cost: int, cost_multiplier: float, level: Any, xp: Optional[Any] = None) -> Any:
+    """Cost per building to upgrade from ``level`` to ``level + 1``"""
+    if xp is None:
+        return int(base_cost * (cost_multiplier ** level))
+    return (base_cost * (cost_multiplier ** level)).astype(xp.int64)
+
+
+def max_income_ticks(income_interval_minutes: int, max_stack_hours: int) -> int:
+    """Most income ticks that can stack up before collection stops accruing"""
+    return int((max_stack_hours * 60) / income_interval_minutes)
+
+
+# === FUSION ===
+
+def fusion_cost(tier1: Any, tier2: Any, config: Dict[str, Any], xp: Optional[Any] = None) -> Any:
+    """Revies cost for fusing two esprits of the given tiers"""
+    base_cost = config.get("base_fusion_cost", DEFAULT_BASE_FUSION_COST)
+    tier_multiplier = config.get("tier_cost_multiplier", DEFAULT_TIER_COST_MULTIPLIER)
+    average_tier = (tier1 + tier2) / 2
+    if xp is None:
+        return int(base_cost + (average_tier * tier_multiplier))
+    return (base_cost + (average_tier * tier_multiplier)).astype(xp.int64)
+
+
+def fusion_success_rate(tier1: Any, tier2: Any, config: Dict[str, Any], xp: Optional[Any] = None) -> Any:
+    """Base fusion success rate in percent, clamped to [5, 95]"""
+    base_rate = config.get("base_success_rate", DEFAULT_BASE_FUSION_SUCCESS)
+    tier_penalty = config.get("tier_penalty_per_level", DEFAULT_FUSION_TIER_PENALTY)
+    average_tier = (tier1 + tier2) / 2
+    if xp is None:
+        success_rate = base_rate - int((average_tier - 1) * tier_penalty)
+        return max(MIN_FUSION_SUCCESS, min(MAX_FUSION_SUCCESS, success_rate))
+    success_rate = base_rate - ((average_tier - 1) * tier_penalty).astype(xp.int64)
+    return xp.clip(success_rate, MIN_FUSION_SUCCESS, MAX_FUSION_SUCCESS)
+
+
+# === QUEST REWARDS ===
+
+def quest_revies_range(quest_data: Dict[str, Any]) -> Tuple[int, int]:
+    """Inclusive (low, high) revies reward of a quest"""
+    revies_range = quest_data.get("revies_reward", DEFAULT_REVIES_REWARD)
+    if isinstance(revies_range, list) and len(revies_range) == 2:
+        return int(revies_range[0]), int(revies_range[1])
+    fixed = int(revies_range) if isinstance(revies_range, (int, float)) else DEFAULT_REVIES_REWARD[0]
+    return fixed, fixed
+
+
+def quest_level_bonus(player_level: Any, xp: Optional[Any] = None) -> Any:
+    """Level bonus applied to quest rewards (1% per level, capped at 50%)"""
+    if xp is None:
+        return min(MAX_QUEST_LEVEL_BONUS, player_level * QUEST_LEVEL_BONUS_PER_LEVEL)
+    return xp.minimum(MAX_QUEST_LEVEL_BONUS, player_level * QUEST_LEVEL_BONUS_PER_LEVEL)
+
+
+def apply_level_bonus(amount: Any, player_level: Any, xp: Optional[Any] = None) -> Any:
+    """Scale a quest reward by the player's level bonus"""
+    scaled = amount * (1 + quest_level_bonus(player_level, xp))
+    if xp is None:
+        return int(scaled)
+    return scaled.astype(xp.int64)
+
+
+def area_reward_profile(area_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Per-attempt reward moments for an area, treating an attempt as a uniformly
+    chosen quest from the area (area-level keys are used when it has no quests).
+    """
+    quests = area_data.get("quests", [])
+    if not quests:
+        quests = [{
+            "energy_cost": area_data.get("energy_cost", 10),
+            "revies_reward": area_data.get("revies_reward", [50, 100]),
+            "xp_reward": area_data.get("xp_reward", 50)
+        }]
+
+    revies_ranges: List[Tuple[int, int]] = [quest_revies_range(quest) for quest in quests]
+    xp_values = [quest.get("xp_reward", DEFAULT_XP_REWARD) for quest in quests]
+    count = len(quests)
+
+    # Mixture of discrete uniforms: E = mean of means, Var = mean of variances + variance of means
+    revies_means = [(low + high) / 2 for low, high in revies_ranges]
+    revies_vars = [((high - low + 1) ** 2 - 1) / 12 for low, high in revies_ranges]
+    revies_mean = sum(revies_means) / count
+    revies_var = sum(revies_vars) / count + sum((m - revies_mean) ** 2 for m in revies_means) / count
+
+    xp_mean = sum(xp_values) / count
+    xp_var = sum((x - xp_mean) ** 2 for x in xp_values) / count
+
+    energy_cost = max(1, round(sum(q.get("energy_cost", 10) for q in quests) / count))
+
+    return {
+        "energy_cost": energy_cost,
+        "revies_ranges": revies_ranges,
+        "xp_values": xp_values,
+        "revies_mean": revies_mean,
+        "revies_var": revies_var,
+        "xp_mean": xp_mean,
+        "xp_var": xp_var
+    }
+
+
+# === PLAYER PROGRESSION ===
+
+def xp_required(level: Any, xp: Optional[Any] = None) -> Any:
+    """XP needed to advance from ``level`` (GameConstants.get_xp_required)"""
+    if xp is None:
+        return GameConstants.get_xp_required(level)
+    return (100 * (level ** 1.5)).astype(xp.int64)
+
+
+def daily_energy_regen() -> int:
+    """Energy regenerated over a full day"""
+    return (24 * 60) // GameConstants.ENERGY_REGEN_MINUTES
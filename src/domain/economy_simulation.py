@@ -0,0 +1,376 @@
+# src/domain/economy_simulation.py
+"""
+Array-backed economy simulation over synthetic player populations.
+
+A shard holds its whole population as NumPy columns (level, currencies, energy,
+buildings) and advances it day by day with the same formulas as BuildingService,
+FusionService and QuestRewardCalculator via ``economy_formulas``. Players never
+interact, so shards are independent: scripts fan them out across a process pool
+and merge the per-day totals and wealth histograms afterwards.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+
+from src.domain import economy_formulas
+from src.utils.game_constants import GameConstants
+
+# Optional dependency - only the offline simulator needs NumPy
+try:
+    import numpy as np  # type: ignore
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+    np = None  # type: ignore
+
+# Wealth histogram buckets: 0, then [2^(k-1), 2^k) for k = 1..WEALTH_BUCKETS-1
+WEALTH_BUCKETS = 64
+
+# Per-day flow columns tracked by every shard
+FLOW_COLUMNS = (
+    "quest_revies", "shrine_revies", "cluster_erythl",
+    "building_spend", "upgrade_spend", "slot_spend", "fusion_spend", "upkeep_spend",
+    "fusions", "fusion_successes", "levels_gained"
+)
+# Per-day stock columns (end-of-day snapshots)
+STOCK_COLUMNS = (
+    "revies_supply", "erythl_supply", "pending_revies", "pending_erythl",
+    "joined_players", "active_players", "level_sum", "buildings", "unpaid_upkeep_players"
+)
+
+
+@dataclass(frozen=True)
+class PlayerArchetype:
+    """Behaviour profile for a slice of the synthetic population"""
+    name: str
+    weight: float
+    login_chance: float         # chance of playing on any given day
+    energy_usage: float         # share of the day's energy spent on quests
+    fusions_per_day: float      # mean fusions attempted on active days
+    revies_reserve: int         # revies held back before investing
+
+
+DEFAULT_ARCHETYPES: Tuple[PlayerArchetype, ...] = (
+    PlayerArchetype("casual", 0.6, 0.5, 0.4, 0.5, 2_000),
+    PlayerArchetype("regular", 0.3, 0.85, 0.8, 2.0, 5_000),
+    PlayerArchetype("hardcore", 0.1, 1.0, 1.0, 5.0, 10_000),
+)
+
+
+@dataclass(frozen=True)
+class EconomyParams:
+    """Everything a shard needs; plain config dicts so it pickles cleanly"""
+    days: int
+    buildings_config: Dict[str, Any]
+    fusion_config: Dict[str, Any]
+    areas: Tuple[Dict[str, Any], ...]
+    archetypes: Tuple[PlayerArchetype, ...] = DEFAULT_ARCHETYPES
+    join_days: int = 0                  # players join uniformly over this many days (0 = all on day 0)
+    starting_revies: int = 1000
+    starting_erythl: int = 0
+    upkeep_per_building: int = 0        # daily revies upkeep; 0 matches live (upkeep never charged)
+    max_level: int = 200
+    max_tier: int = 12
+
+
+@dataclass
+class EconomyOutcome:
+    """Mergeable per-day totals for one or more shards"""
+    players: int = 0
+    flows: Any = None           # (days, len(FLOW_COLUMNS)) int64
+    stocks: Any = None          # (days, len(STOCK_COLUMNS)) int64
+    wealth_histogram: Any = None  # (days, WEALTH_BUCKETS) int64 over joined players' revies
+
+    def merge(self, other: "EconomyOutcome") -> "EconomyOutcome":
+        """Fold another shard into this one"""
+        if self.flows is None:
+            self.flows = other.flows.copy()
+            self.stocks = other.stocks.copy()
+            self.wealth_histogram = other.wealth_histogram.copy()
+        else:
+            self.flows += other.flows
+            self.stocks += other.stocks
+            self.wealth_histogram += other.wealth_histogram
+        self.players += other.players
+        return self
+
+    def daily_report(self) -> List[Dict[str, Any]]:
+        """Per-day supply, faucets, sinks and inflation"""
+        report = []
+        previous_supply = 0
+        for day in range(self.flows.shape[0]):
+            flows = dict(zip(FLOW_COLUMNS, (int(v) for v in self.flows[day])))
+            stocks = dict(zip(STOCK_COLUMNS, (int(v) for v in self.stocks[day])))
+            supply = stocks["revies_supply"] + stocks["pending_revies"]
+            faucets = flows["quest_revies"] + flows["shrine_revies"]
+            sinks = (flows["building_spend"] + flows["upgrade_spend"] + flows["slot_spend"]
+                     + flows["fusion_spend"] + flows["upkeep_spend"])
+            joined = max(stocks["joined_players"], 1)
+            report.append({
+                "day": day + 1,
+                **stocks,
+                **flows,
+                "revies_faucets": faucets,
+                "revies_sinks": sinks,
+                "sink_ratio": sinks / faucets if faucets else 0.0,
+                "revies_per_player": supply / joined,
+                "inflation": (supply - previous_supply) / previous_supply if previous_supply else 0.0,
+                "avg_level": stocks["level_sum"] / joined,
+                "wealth": _wealth_stats(self.wealth_histogram[day])
+            })
+            previous_supply = supply
+        return report
+
+
+def _wealth_stats(histogram: Any) -> Dict[str, float]:
+    """Approximate percentiles and Gini of revies holdings from a log2 histogram"""
+    total = int(histogram.sum())
+    if total == 0:
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "gini": 0.0}
+    # Bucket representatives: 0 for the zero bucket, geometric midpoint otherwise
+    midpoints = np.zeros(len(histogram))
+    midpoints[1:] = 2.0 ** (np.arange(1, len(histogram)) - 0.5)
+    cumulative = np.cumsum(histogram)
+    stats = {}
+    for label, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        stats[label] = float(midpoints[np.searchsorted(cumulative, q * total)])
+    # Gini over bucket representatives (Lorenz curve on sorted buckets)
+    wealth = histogram * midpoints
+    if wealth.sum() == 0:
+        stats["gini"] = 0.0
+    else:
+        population_share = histogram / total
+        lorenz = np.cumsum(wealth) / wealth.sum()
+        lorenz_prev = np.concatenate(([0.0], lorenz[:-1]))
+        stats["gini"] = float(1.0 - np.sum(population_share * (lorenz + lorenz_prev)))
+    return stats
+
+
+def _require_numpy() -> None:
+    if not HAS_NUMPY:
+        raise RuntimeError("Economy simulation requires numpy (pip install numpy)")
+
+
+def areas_from_quests(quests_config: Dict[str, Any]) -> Tuple[Dict[str, Any], ...]:
+    """Reward profiles for every quest area, ordered by level requirement"""
+    areas = []
+    for area_id, area_data in quests_config.items():
+        profile = economy_formulas.area_reward_profile(area_data)
+        areas.append({
+            "area_id": area_id,
+            "level_requirement": area_data.get("level_requirement", 1),
+            "energy_cost": profile["energy_cost"],
+            "revies_mean": profile["revies_mean"],
+            "revies_var": profile["revies_var"],
+            "xp_mean": profile["xp_mean"],
+            "xp_var": profile["xp_var"]
+        })
+    areas.sort(key=lambda area: area["level_requirement"])
+    return tuple(areas)
+
+
+def _sum_of_draws(rng: Any, attempts: Any, mean: Any, variance: Any) -> Any:
+    """Total of ``attempts`` i.i.d. per-quest rewards (normal approximation, floored at 0)"""
+    totals = rng.normal(attempts * mean, np.sqrt(attempts * variance))
+    return np.maximum(np.rint(totals), 0).astype(np.int64)
+
+
+def _spendable(revies: Any, reserve: Any) -> Any:
+    """Revies a player is willing to spend after holding back their reserve"""
+    return np.maximum(revies - reserve, 0)
+
+
+def simulate_shard(params: EconomyParams, players: int, seed: Optional[int] = None) -> EconomyOutcome:
+    """Advance ``players`` synthetic players through ``params.days`` days"""
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+    n = players
+
+    building_configs = params.buildings_config.get("buildings", {})
+    system_config = params.buildings_config.get("building_system", {})
+    shrine = building_configs.get("shrine", {})
+    cluster = building_configs.get("cluster", {})
+    shrine_upgrade = shrine.get("upgrade_system", {})
+    cluster_upgrade = cluster.get("upgrade_system", {})
+    interval = system_config.get("income_interval_minutes", economy_formulas.DEFAULT_INCOME_INTERVAL_MINUTES)
+    ticks_per_day = (24 * 60) // interval
+    max_slots = system_config.get("max_slots", 10)
+    slot_cost = system_config.get("slot_expansion_cost", 25000)
+
+    # Archetype columns
+    weights = np.array([a.weight for a in params.archetypes], dtype=np.float64)
+    archetype = rng.choice(len(params.archetypes), size=n, p=weights / weights.sum())
+    login_chance = np.array([a.login_chance for a in params.archetypes])[archetype]
+    energy_usage = np.array([a.energy_usage for a in params.archetypes])[archetype]
+    fusion_rate = np.array([a.fusions_per_day for a in params.archetypes])[archetype]
+    reserve = np.array([a.revies_reserve for a in params.archetypes], dtype=np.int64)[archetype]
+
+    # Player columns (Player model defaults)
+    join_day = rng.integers(0, params.join_days, size=n) if params.join_days > 0 else np.zeros(n, dtype=np.int64)
+    level = np.ones(n, dtype=np.int64)
+    experience = np.zeros(n, dtype=np.int64)
+    max_energy = np.full(n, GameConstants.MAX_ENERGY_BASE, dtype=np.int64)
+    revies = np.full(n, params.starting_revies, dtype=np.int64)
+    erythl = np.full(n, params.starting_erythl, dtype=np.int64)
+    pending_revies = np.zeros(n, dtype=np.int64)
+    pending_erythl = np.zeros(n, dtype=np.int64)
+    slots = np.full(n, system_config.get("default_slots", 2), dtype=np.int64)
+    shrine_count = np.zeros(n, dtype=np.int64)
+    cluster_count = np.zeros(n, dtype=np.int64)
+    shrine_level = np.ones(n, dtype=np.int64)
+    cluster_level = np.ones(n, dtype=np.int64)
+
+    # Area lookup tables
+    requirements = np.array([a["level_requirement"] for a in params.areas], dtype=np.int64)
+    area_energy = np.array([a["energy_cost"] for a in params.areas], dtype=np.int64)
+    area_revies_mean = np.array([a["revies_mean"] for a in params.areas])
+    area_revies_var = np.array([a["revies_var"] for a in params.areas])
+    area_xp_mean = np.array([a["xp_mean"] for a in params.areas])
+    area_xp_var = np.array([a["xp_var"] for a in params.areas])
+
+    daily_energy = economy_formulas.daily_energy_regen()
+    flows = np.zeros((params.days, len(FLOW_COLUMNS)), dtype=np.int64)
+    stocks = np.zeros((params.days, len(STOCK_COLUMNS)), dtype=np.int64)
+    wealth_histogram = np.zeros((params.days, WEALTH_BUCKETS), dtype=np.int64)
+    flow = {name: i for i, name in enumerate(FLOW_COLUMNS)}
+    stock = {name: i for i, name in enumerate(STOCK_COLUMNS)}
+
+    for day in range(params.days):
+        joined = join_day <= day
+        active = joined & (rng.random(n) < login_chance)
+
+        # --- Upkeep: manual payment, so only active players can keep buildings running ---
+        buildings_owned = shrine_count + cluster_count
+        producing = buildings_owned > 0
+        if params.upkeep_per_building > 0:
+            upkeep = buildings_owned * params.upkeep_per_building
+            pays = active & producing & (revies >= upkeep)
+            revies -= np.where(pays, upkeep, 0)
+            flows[day, flow["upkeep_spend"]] = int(upkeep[pays].sum())
+            stocks[day, stock["unpaid_upkeep_players"]] = int((producing & ~pays).sum())
+            producing &= pays
+
+        # --- Building income accrues as pending (background task) ---
+        shrine_income = economy_formulas.building_income_per_tick(
+            shrine.get("income_per_tick", 0),
+            shrine_upgrade.get("income_multiplier", economy_formulas.DEFAULT_SHRINE_INCOME_MULTIPLIER),
+            shrine_level, np
+        ) * shrine_count * ticks_per_day
+        cluster_income = economy_formulas.building_income_per_tick(
+            cluster.get("income_per_tick", 0),
+            cluster_upgrade.get("income_multiplier", economy_formulas.DEFAULT_CLUSTER_INCOME_MULTIPLIER),
+            cluster_level, np
+        ) * cluster_count * ticks_per_day
+        shrine_income = np.where(producing, shrine_income, 0)
+        cluster_income = np.where(producing, cluster_income, 0)
+        pending_revies += shrine_income
+        pending_erythl += cluster_income
+        flows[day, flow["shrine_revies"]] = int(shrine_income.sum())
+        flows[day, flow["cluster_erythl"]] = int(cluster_income.sum())
+
+        # Active players collect everything pending
+        revies += np.where(active, pending_revies, 0)
+        erythl += np.where(active, pending_erythl, 0)
+        pending_revies[active] = 0
+        pending_erythl[active] = 0
+
+        # --- Quests in the highest unlocked area ---
+        area = np.searchsorted(requirements, level, side="right") - 1
+        area = np.clip(area, 0, len(requirements) - 1)
+        energy = np.minimum(daily_energy, max_energy) * energy_usage
+        attempts = np.where(active, (energy // area_energy[area]).astype(np.int64), 0)
+        quest_revies = economy_formulas.apply_level_bonus(
+            _sum_of_draws(rng, attempts, area_revies_mean[area], area_revies_var[area]), level, np
+        )
+        quest_xp = economy_formulas.apply_level_bonus(
+            _sum_of_draws(rng, attempts, area_xp_mean[area], area_xp_var[area]), level, np
+        )
+        revies += quest_revies
+        experience += quest_xp
+        flows[day, flow["quest_revies"]] = int(quest_revies.sum())
+
+        # --- Level ups (ExperienceService loop, vectorized) ---
+        levels_before = int(level.sum())
+        while True:
+            need = economy_formulas.xp_required(level, np)
+            leveling = (experience >= need) & (level < params.max_level)
+            if not leveling.any():
+                break
+            experience -= np.where(leveling, need, 0)
+            level += leveling
+            max_energy += np.where(leveling, GameConstants.MAX_ENERGY_PER_LEVEL, 0)
+        flows[day, flow["levels_gained"]] = int(level.sum()) - levels_before
+
+        # --- Investment: expand, build, upgrade (one action of each kind per day) ---
+        free_slots = slots - shrine_count - cluster_count
+        expand = active & (free_slots == 0) & (slots < max_slots) & (_spendable(revies, reserve) >= slot_cost)
+        revies -= np.where(expand, slot_cost, 0)
+        slots += expand
+        flows[day, flow["slot_spend"]] = int(expand.sum()) * slot_cost
+
+        free_slots = slots - shrine_count - cluster_count
+        want_cluster = shrine_count >= 2 * (cluster_count + 1)
+        build_cost = np.where(want_cluster, cluster.get("cost", 0), shrine.get("cost", 0))
+        build = active & (free_slots > 0) & (_spendable(revies, reserve) >= build_cost)
+        revies -= np.where(build, build_cost, 0)
+        cluster_count += build & want_cluster
+        shrine_count += build & ~want_cluster
+        flows[day, flow["building_spend"]] = int(build_cost[build].sum())
+
+        upgrade_spend = 0
+        for count, building_level, config, upgrade in (
+            (shrine_count, shrine_level, shrine, shrine_upgrade),
+            (cluster_count, cluster_level, cluster, cluster_upgrade),
+        ):
+            cost = economy_formulas.building_upgrade_cost(
+                config.get("cost", 0),
+                upgrade.get("cost_multiplier", economy_formulas.DEFAULT_UPGRADE_COST_MULTIPLIER),
+                building_level, np
+            ) * count
+            upgrade_now = active & (count > 0) & (building_level < config.get("max_level", 10)) & (_spendable(revies, reserve) >= cost)
+            revies -= np.where(upgrade_now, cost, 0)
+            building_level += upgrade_now
+            upgrade_spend += int(cost[upgrade_now].sum())
+        flows[day, flow["upgrade_spend"]] = upgrade_spend
+
+        # --- Fusion sink: players fuse pairs around their progression tier ---
+        tier = np.clip(1 + level // 10, 1, params.max_tier)
+        fusion_price = economy_formulas.fusion_cost(tier, tier, params.fusion_config, np)
+        wanted = np.where(active, rng.poisson(fusion_rate), 0)
+        fusions = np.minimum(wanted, _spendable(revies, reserve) // fusion_price)
+        revies -= fusions * fusion_price
+        success_rate = economy_formulas.fusion_success_rate(tier, tier, params.fusion_config, np)
+        flows[day, flow["fusions"]] = int(fusions.sum())
+        flows[day, flow["fusion_successes"]] = int(rng.binomial(fusions, success_rate / 100).sum())
+        flows[day, flow["fusion_spend"]] = int((fusions * fusion_price).sum())
+
+        # --- End-of-day snapshot ---
+        stocks[day, stock["revies_supply"]] = int(revies[joined].sum())
+        stocks[day, stock["erythl_supply"]] = int(erythl[joined].sum())
+        stocks[day, stock["pending_revies"]] = int(pending_revies[joined].sum())
+        stocks[day, stock["pending_erythl"]] = int(pending_erythl[joined].sum())
+        stocks[day, stock["joined_players"]] = int(joined.sum())
+        stocks[day, stock["active_players"]] = int(active.sum())
+        stocks[day, stock["level_sum"]] = int(level[joined].sum())
+        stocks[day, stock["buildings"]] = int((shrine_count + cluster_count)[joined].sum())
+        buckets = np.zeros(int(joined.sum()), dtype=np.int64)
+        held = revies[joined]
+        positive = held > 0
+        buckets[positive] = np.minimum(np.floor(np.log2(held[positive])).astype(np.int64) + 1, WEALTH_BUCKETS - 1)
+        wealth_histogram[day] = np.bincount(buckets, minlength=WEALTH_BUCKETS)
+
+    return EconomyOutcome(players=n, flows=flows, stocks=stocks, wealth_histogram=wealth_histogram)
+
+
+def run_shard(task: Tuple[EconomyParams, int, int]) -> EconomyOutcome:
+    """Process-pool entry point: (params, players, seed)"""
+    params, players, seed = task
+    return simulate_shard(params, players, seed)
+
+
+def split_population(players: int, shard_size: int) -> Sequence[int]:
+    """Shard sizes covering ``players``"""
+    sizes = [shard_size] * (players // shard_size)
+    if players % shard_size:
+        sizes.append(players % shard_size)
+    return sizes
@@ -6,6 +6,7 @@ import random
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from src.database.models import Player, Esprit, EspritBase
+from src.domain import combat_formulas, economy_formulas
 from src.utils.transaction_logger import transaction_logger, TransactionType
 import logging
 
@@ -97,9 +98,9 @@ class BossEncounter:
             return None
         
         # Calculate boss HP with proper multiplier
-        hp_multiplier = boss_config.get("hp_multiplier", 3.0)
+        hp_multiplier = boss_config.get("hp_multiplier", combat_formulas.DEFAULT_BOSS_HP_MULTIPLIER)
         base_hp = esprit_data.get("base_hp", 150)
-        boss_max_hp = int(base_hp * hp_multiplier)
+        boss_max_hp = combat_formulas.boss_max_hp(base_hp, hp_multiplier)
         
         # Build COMPLETE boss data with image information
         boss_data = {
@@ -124,12 +125,13 @@ class BossEncounter:
     async def _get_complete_esprit_data(esprit_name: str) -> Optional[Dict[str, Any]]:
         """Get COMPLETE esprit data from database including image_url"""
         from src.utils.database_service import DatabaseService
+        from src.utils.esprit_search_index import EspritSearchIndex
         
         try:
-            async with DatabaseService.get_transaction() as session:
-                # Find the actual esprit in database with exact or partial match
-                stmt = select(EspritBase).where(EspritBase.name.ilike(f"%{esprit_name}%"))
-                esprit_base = (await session.execute(stmt)).scalar_one_or_none()
+            # Exact match first, then the best ranked partial match from the catalog index
+            entry = await EspritSearchIndex.best_match(esprit_name)
+            async with DatabaseService.get_session() as session:
+                esprit_base = await session.get(EspritBase, entry.id) if entry else None
                 
                 if esprit_base:
                     complete_data = {
@@ -221,17 +223,14 @@ class BossEncounter:
         # Base damage calculation: Attack vs Defense
         base_damage = max(1, player_attack - self.base_def)
         
-        # Apply 15% variance (Monster Warlord style)
-        variance_multiplier = 1.0 + random.uniform(-0.15, 0.15)
-        variable_damage = int(base_damage * variance_multiplier)
-        
-        # Critical hit chance (10% for 50% bonus damage)
-        if random.random() < 0.1:
-            variable_damage = int(variable_damage * 1.5)
-            logger.debug(f"💥 CRITICAL HIT: {variable_damage} damage!")
+        # Apply 15% variance and 10% crit chance (Monster Warlord style)
+        variance = random.uniform(-combat_formulas.DAMAGE_VARIANCE, combat_formulas.DAMAGE_VARIANCE)
+        is_crit = random.random() < combat_formulas.CRIT_CHANCE
         
         # Ensure minimum damage (even if defense is higher than attack)
-        final_damage = max(1, variable_damage)
+        final_damage = combat_formulas.apply_damage_roll(base_damage, variance, is_crit)
+        if is_crit:
+            logger.debug(f"💥 CRITICAL HIT: {final_damage} damage!")
         
         logger.debug(f"⚔️ Damage calc: {player_attack} ATK vs {self.base_def} DEF = {final_damage} damage")
         
@@ -483,14 +482,11 @@ class QuestRewardCalculator:
         rewards = {}
         
         # Calculate revies reward
-        revies_range = quest_data.get("revies_reward", [50, 150])
-        if isinstance(revies_range, list) and len(revies_range) == 2:
-            rewards["revies"] = random.randint(revies_range[0], revies_range[1])
-        else:
-            rewards["revies"] = int(revies_range) if isinstance(revies_range, (int, float)) else 50
+        revies_low, revies_high = economy_formulas.quest_revies_range(quest_data)
+        rewards["revies"] = random.randint(revies_low, revies_high)
         
         # Calculate XP reward
-        rewards["xp"] = quest_data.get("xp_reward", 10)
+        rewards["xp"] = quest_data.get("xp_reward", economy_formulas.DEFAULT_XP_REWARD)
         
         # TODO: Add item rewards when item system is implemented
         
@@ -500,13 +496,11 @@ class QuestRewardCalculator:
     def apply_level_bonuses(rewards: Dict[str, Any], player_level: int) -> Dict[str, Any]:
         """Apply level-based bonuses to rewards"""
         # Small level bonus (1% per level up to 50%)
-        level_bonus = min(0.5, player_level * 0.01)
-        
         if "revies" in rewards:
-            rewards["revies"] = int(rewards["revies"] * (1 + level_bonus))
+            rewards["revies"] = economy_formulas.apply_level_bonus(rewards["revies"], player_level)
         
         if "xp" in rewards:
-            rewards["xp"] = int(rewards["xp"] * (1 + level_bonus))
+            rewards["xp"] = economy_formulas.apply_level_bonus(rewards["xp"], player_level)
         
         return rewards
 
@@ -2,7 +2,6 @@
 from dataclasses import dataclass
 from typing import Dict, Any, List, Optional, Callable
 from sqlalchemy import select, delete, update, func, text
-from sqlalchemy.orm.attributes import flag_modified
 from datetime import datetime, timedelta
 import time
 import asyncio
@@ -20,6 +19,11 @@ from src.database.models.esprit import Esprit
 from src.database.models.esprit_base import EspritBase
 from src.database.models.player_class import PlayerClass
 from src.utils.database_service import DatabaseService
+from src.utils.esprit_search_index import EspritSearchIndex
+from src.utils.fusion_table import FusionTable
+from src.utils.tracing import Tracer
+from src.utils.ownership_bitset import OwnershipBitsets
+from src.utils.jsonb_counters import JsonbCounters
 from src.utils.transaction_logger import transaction_logger, TransactionType
 from src.utils.config_manager import ConfigManager
 from src.utils.emoji_manager import EmojiStorageManager
@@ -454,6 +458,30 @@ class AdminService(BaseService):
         
         return await cls._safe_execute(_operation, "get economy overview")
     
+    @classmethod
+    async def get_top_item_holders(cls, limit: int = 10, min_items: int = 1) -> ServiceResult[List[Dict[str, Any]]]:
+        """Players with the most inventory items (served by ix_player_inventory_item_count)"""
+        async def _operation():
+            cls._validate_positive_int(limit, "limit")
+            await cls._ensure_db_health()
+            
+            item_count = func.player_item_count(Player.inventory)
+            async with DatabaseService.get_read_session() as session:
+                stmt = (
+                    select(Player.id, Player.discord_id, Player.username, item_count.label("item_count"))  # type: ignore
+                    .where(item_count >= min_items)
+                    .order_by(item_count.desc())
+                    .limit(limit)
+                )
+                rows = (await session.execute(stmt)).all()
+                
+                return [
+                    {"player_id": row.id, "discord_id": row.discord_id, "username": row.username, "item_count": int(row.item_count)}
+                    for row in rows
+                ]
+        
+        return await cls._safe_execute(_operation, "get top item holders")
+    
     @classmethod
     async def get_player_analytics(cls, days_back: int = 7) -> ServiceResult[Dict[str, Any]]:
         """Player activity and growth analytics"""
@@ -732,6 +760,7 @@ class AdminService(BaseService):
         """Delete all player Esprits"""
         esprit_delete_stmt = delete(Esprit).where(Esprit.owner_id == player_id)  # type: ignore
         await session.execute(esprit_delete_stmt)
+        await DatabaseService.after_commit(OwnershipBitsets.changed, player_id)
     
     @classmethod
     async def _finalize_reset_cleanup(cls, player_id: Optional[int]):
@@ -934,12 +963,15 @@ class AdminService(BaseService):
     
     @classmethod
     async def _find_esprit_base(cls, esprit_name: str) -> EspritBase:
-        """Find Esprit base by name"""
+        """Find Esprit base by exact name (admin writes never act on a fuzzy hit)"""
+        entry = await EspritSearchIndex.find(esprit_name)
+        if entry is None:
+            suggestions = [hit.name for hit, _ in await EspritSearchIndex.search(esprit_name, limit=3)]
+            hint = f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""
+            raise ValueError(f"Esprit '{esprit_name}' not found.{hint}")
+        
         async with DatabaseService.get_session() as session:
-            esprit_stmt = select(EspritBase).where(
-                EspritBase.name.ilike(f"%{esprit_name}%")  # type: ignore
-            ).limit(1)
-            esprit_base = (await session.execute(esprit_stmt)).scalar_one_or_none()
+            esprit_base = await session.get(EspritBase, entry.id)
             
             if not esprit_base:
                 raise ValueError(f"Esprit '{esprit_name}' not found")
@@ -998,18 +1030,8 @@ class AdminService(BaseService):
     async def _execute_item_transfer(cls, player_id: int, item_type: str, amount: int, reason: str, admin_id: int) -> int:
         """Execute item transfer to player inventory"""
         async with DatabaseService.get_transaction() as session:
-            stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
-            target_player = (await session.execute(stmt)).scalar_one()
-            
-            if target_player.inventory is None:
-                target_player.inventory = {}
-            
-            old_amount = target_player.inventory.get(item_type, 0)
-            new_amount = old_amount + amount
-            target_player.inventory[item_type] = new_amount
-            flag_modified(target_player, "inventory")
-            
-            target_player.update_activity()
+            new_amount = await JsonbCounters.increment(session, player_id, "inventory", item_type, amount)
+            old_amount = new_amount - amount
             await session.commit()
             
             # Log transaction
@@ -1149,6 +1171,9 @@ class AdminService(BaseService):
         """Reload all configuration files"""
         old_count = len(ConfigManager._configs) if hasattr(ConfigManager, '_configs') else 0
         ConfigManager.reload()
+        EspritSearchIndex.invalidate()
+        FusionTable.invalidate()
+        Tracer.configure()
         new_count = len(ConfigManager._configs)
         
         execution_time = time.time() - start_time
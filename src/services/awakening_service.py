@@ -1,6 +1,6 @@
 # src/services/awakening_service.py
-from typing import Dict, Any, List
-from sqlalchemy import select, and_, func
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import BigInteger, Integer, column, select, update, values, and_, func
 from sqlalchemy.orm.attributes import flag_modified
 
 from src.services.base_service import BaseService, ServiceResult
@@ -8,10 +8,14 @@ from src.services.cache_service import CacheService
 from src.database.models.esprit import Esprit
 from src.database.models.esprit_base import EspritBase
 from src.database.models.player import Player
+from src.domain.combat_formulas import awakened_stat
 from src.utils.database_service import DatabaseService
+from src.utils.analytics_counters import AnalyticsCounters
 from src.utils.transaction_logger import transaction_logger, TransactionType
 from src.utils.config_manager import ConfigManager
 
+MAX_AWAKENING = 5
+
 class AwakeningService(BaseService):
     """Esprit awakening system with star progression"""
     
@@ -133,11 +137,11 @@ class AwakeningService(BaseService):
                     "power": new_power["power"] - old_power["power"]
                 }
                 
-                # Update player stats
-                player_stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
-                player = (await session.execute(player_stmt)).scalar_one()
-                player.total_awakenings += 1
-                player.update_activity()
+                # Analytics counter goes through the write-behind buffer once this commits
+                await DatabaseService.after_commit(AnalyticsCounters.increment, player_id, {"total_awakenings": 1})
+                stored_awakenings = (await session.execute(
+                    select(Player.total_awakenings).where(Player.id == player_id)  # type: ignore
+                )).scalar_one()
                 
                 await session.commit()
                 
@@ -152,6 +156,11 @@ class AwakeningService(BaseService):
                 # Invalidate caches
                 await CacheService.invalidate_player_cache(player_id)
                 
+                # Stored column plus buffered deltas (this awakening's increment runs after commit)
+                total_awakenings = (await AnalyticsCounters.merged(
+                    player_id, {"total_awakenings": stored_awakenings}
+                ))["total_awakenings"] + 1
+                
                 return {
                     "esprit_info": {
                         "id": esprit.id, "name": base.name, "element": esprit.element,
@@ -165,7 +174,7 @@ class AwakeningService(BaseService):
                     "power_changes": {
                         "old_power": old_power, "new_power": new_power, "gains": power_gains
                     },
-                    "total_player_awakenings": player.total_awakenings
+                    "total_player_awakenings": total_awakenings
                 }
         return await cls._safe_execute(_operation, "execute awakening")
     
@@ -305,22 +314,21 @@ class AwakeningService(BaseService):
                 raise ValueError(f"Cannot preview more than {max_bulk_preview} awakenings at once")
             
             async with DatabaseService.get_session() as session:
+                stmt = (select(Esprit, EspritBase)
+                       .where(Esprit.id.in_(esprit_ids))  # type: ignore
+                       .where(Esprit.owner_id == player_id)  # type: ignore
+                       .where(Esprit.esprit_base_id == EspritBase.id))  # type: ignore
+                found = {esprit.id: (esprit, base) for esprit, base in (await session.execute(stmt)).all()}
+                
                 previews = []
                 total_copies_needed = 0
                 total_power_gain = 0
                 
                 for esprit_id in esprit_ids:
-                    # Use individual WHERE clauses instead of and_()
-                    stmt = (select(Esprit, EspritBase)
-                           .where(Esprit.id == esprit_id)  # type: ignore
-                           .where(Esprit.owner_id == player_id)  # type: ignore
-                           .where(Esprit.esprit_base_id == EspritBase.id))  # type: ignore
-                    
-                    result = (await session.execute(stmt)).first()
-                    if not result:
+                    if esprit_id not in found:
                         raise ValueError(f"Esprit {esprit_id} not found or not owned by player")
                     
-                    esprit, base = result
+                    esprit, base = found[esprit_id]
                     awakening_cost = esprit.get_awakening_cost()
                     
                     if awakening_cost["can_awaken"]:
@@ -328,14 +336,7 @@ class AwakeningService(BaseService):
                         
                         # Calculate power after awakening
                         next_awakening = esprit.awakening_level + 1
-                        awakening_multiplier = 1.0 + (next_awakening * 0.2)
-                        
-                        preview_power = {
-                            "atk": int(base.base_atk * awakening_multiplier),
-                            "def": int(base.base_def * awakening_multiplier),
-                            "hp": int(base.base_hp * awakening_multiplier)
-                        }
-                        preview_power["power"] = preview_power["atk"] + preview_power["def"] + (preview_power["hp"] // 10)
+                        preview_power = cls._power_at(base, next_awakening)
                         
                         power_gain = preview_power["power"] - current_power["power"]
                         copies_needed = awakening_cost["copies_needed"]
@@ -344,6 +345,7 @@ class AwakeningService(BaseService):
                             "esprit_id": esprit.id, "name": base.name,
                             "current_awakening": esprit.awakening_level, "target_awakening": next_awakening,
                             "copies_needed": copies_needed, "power_gain": power_gain,
+                            "max_reachable_awakening": cls._max_awakening(esprit.quantity, esprit.awakening_level)[0],
                             "can_awaken": True
                         })
                         
@@ -370,6 +372,111 @@ class AwakeningService(BaseService):
                 }
         return await cls._safe_execute(_operation, "bulk awakening preview")
     
+    @classmethod
+    async def execute_bulk_awakening(cls, player_id: int, esprit_ids: Optional[List[int]] = None,
+                                     target_level: int = MAX_AWAKENING) -> ServiceResult[Dict[str, Any]]:
+        """
+        Awaken several stacks as far as their copies allow (up to target_level).
+        esprit_ids=None awakens everything possible across the collection.
+        """
+        async def _operation():
+            cls._validate_player_id(player_id)
+            if not 1 <= target_level <= MAX_AWAKENING:
+                raise ValueError(f"Target awakening must be between 1 and {MAX_AWAKENING}")
+            
+            stmt = (select(Esprit.id, Esprit.quantity, Esprit.awakening_level, EspritBase)
+                   .join(EspritBase, Esprit.esprit_base_id == EspritBase.id)  # type: ignore
+                   .where(Esprit.owner_id == player_id)  # type: ignore
+                   .order_by(Esprit.id)  # type: ignore  # Consistent lock order
+                   .with_for_update(of=Esprit))
+            if esprit_ids is None:
+                stmt = (stmt.where(Esprit.awakening_level < target_level)  # type: ignore
+                           .where(Esprit.quantity > Esprit.awakening_level + 1))  # type: ignore  # Can afford at least one star
+            else:
+                awakening_config = ConfigManager.get("awakening_system") or {}
+                max_bulk_awaken = awakening_config.get("limits", {}).get("max_bulk_awaken", 50)
+                if not esprit_ids:
+                    raise ValueError("No Esprits selected for awakening")
+                if len(esprit_ids) > max_bulk_awaken:
+                    raise ValueError(f"Cannot awaken more than {max_bulk_awaken} Esprits at once")
+                stmt = stmt.where(Esprit.id.in_(esprit_ids))  # type: ignore
+            
+            async with DatabaseService.get_transaction() as session:
+                rows = (await session.execute(stmt)).all()
+                if esprit_ids is not None:
+                    owned = {row.id for row in rows}
+                    missing = [esprit_id for esprit_id in esprit_ids if esprit_id not in owned]
+                    if missing:
+                        raise ValueError(f"Esprit {missing[0]} not found or not owned by player")
+                
+                # Work out every stack's end state in memory
+                results = []
+                for row in rows:
+                    new_level, remaining = cls._max_awakening(row.quantity, row.awakening_level, target_level)
+                    if new_level == row.awakening_level:
+                        continue  # Maxed out or not enough copies
+                    base = row.EspritBase
+                    old_power = cls._power_at(base, row.awakening_level)
+                    new_power = cls._power_at(base, new_level)
+                    results.append({
+                        "esprit_id": row.id, "name": base.name, "element": base.element,
+                        "old_awakening": row.awakening_level, "new_awakening": new_level,
+                        "copies_consumed": row.quantity - remaining, "remaining_copies": remaining,
+                        "old_power": old_power["power"], "new_power": new_power["power"],
+                        "power_gain": new_power["power"] - old_power["power"]
+                    })
+                
+                summary = {
+                    "awakened_count": len(results),
+                    "stars_gained": sum(r["new_awakening"] - r["old_awakening"] for r in results),
+                    "copies_consumed": sum(r["copies_consumed"] for r in results),
+                    "total_power_gain": sum(r["power_gain"] for r in results)
+                }
+                if not results:
+                    return {"results": results, "summary": summary}
+                
+                # One UPDATE ... FROM (VALUES ...) for every stack
+                changes = values(
+                    column("id", Integer), column("quantity", BigInteger), column("awakening_level", Integer),
+                    name="changes"
+                ).data([(r["esprit_id"], r["remaining_copies"], r["new_awakening"]) for r in results])
+                await session.execute(
+                    update(Esprit)
+                    .where(Esprit.id == changes.c.id, Esprit.owner_id == player_id)  # type: ignore
+                    .values(quantity=changes.c.quantity, awakening_level=changes.c.awakening_level,
+                            last_modified=func.now())
+                    .execution_options(synchronize_session=False)
+                )
+                
+                # Batched side effects once the transaction commits
+                await DatabaseService.after_commit(AnalyticsCounters.increment, player_id,
+                                                   {"total_awakenings": summary["stars_gained"]})
+                await DatabaseService.after_commit(transaction_logger.log_transaction, player_id, TransactionType.ESPRIT_AWAKENED, {
+                    "bulk": True, **summary,
+                    "esprits": {r["name"]: [r["old_awakening"], r["new_awakening"]] for r in results}
+                })
+                await DatabaseService.after_commit(CacheService.invalidate_player_cache, player_id)
+                
+                results.sort(key=lambda r: r["power_gain"], reverse=True)
+                return {"results": results, "summary": summary}
+        return await cls._safe_execute(_operation, "execute bulk awakening")
+    
+    @staticmethod
+    def _max_awakening(quantity: int, level: int, target_level: int = MAX_AWAKENING) -> Tuple[int, int]:
+        """Highest level a stack can reach (star N costs N copies, one copy always kept) and copies left"""
+        while level < target_level and quantity > level + 1:
+            level += 1
+            quantity -= level
+        return level, quantity
+    
+    @staticmethod
+    def _power_at(base: EspritBase, awakening_level: int) -> Dict[str, int]:
+        """Power of one copy of base at an awakening level"""
+        atk = awakened_stat(base.base_atk, awakening_level)
+        defense = awakened_stat(base.base_def, awakening_level)
+        hp = awakened_stat(base.base_hp, awakening_level)
+        return {"atk": atk, "def": defense, "hp": hp, "power": atk + defense + (hp // 10)}
+    
     @classmethod
     def _get_awakening_warnings(cls, esprit: Esprit, awakening_cost: Dict[str, Any]) -> List[str]:
         """Generate warnings for awakening preview"""
@@ -4,6 +4,10 @@ from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta, date
 import logging
+import time
+
+from src.utils.metrics import Metrics
+from src.utils.tracing import Tracer
 
 logger = logging.getLogger(__name__)
 
@@ -121,12 +125,25 @@ class BaseService(ABC):
     
     @classmethod
     async def _safe_execute(cls, operation, description: str = "operation"):
-        """Execute operation with standardized error handling"""
+        """Execute operation with standardized error handling, latency/error metrics and a trace span"""
+        stats = Metrics.operation(cls.__name__, operation)
+        span = Tracer.push_span(stats.label, "service") if Tracer.current() else None
+        stats.inflight += 1
+        started = time.perf_counter()
+        error = None
         try:
             result = await operation()
             return ServiceResult.success_result(result)
         except ValueError as e:
+            stats.rejected += 1
+            error = "rejected"
             return ServiceResult.error_result(str(e))
         except Exception as e:
+            stats.errors += 1
+            error = type(e).__name__
             error_msg = cls._format_error(e, description)
-            return ServiceResult.error_result(error_msg)
\ No newline at end of file
+            return ServiceResult.error_result(error_msg)
+        finally:
+            stats.inflight -= 1
+            stats.histogram.observe(time.perf_counter() - started)
+            Tracer.pop_span(span, error)
\ No newline at end of file
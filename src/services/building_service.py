@@ -5,6 +5,7 @@ from sqlalchemy import select, or_
 from datetime import datetime, timedelta
 
 from src.services.base_service import BaseService, ServiceResult
+from src.domain import economy_formulas
 from src.database.models.player import Player
 from src.utils.database_service import DatabaseService
 from src.utils.transaction_logger import transaction_logger, TransactionType
@@ -33,7 +34,7 @@ class BuildingService(BaseService):
             cost = building_config["cost"]
             
             async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore[arg-type]
+                stmt = select(Player).options(Player.projection("buildings", "currency")).where(Player.id == player_id).with_for_update()  # type: ignore[arg-type]
                 player = (await session.execute(stmt)).scalar_one()
                 
                 # Check available slots
@@ -93,7 +94,7 @@ class BuildingService(BaseService):
             max_level = building_config.get("max_level", 10)
             
             async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore[arg-type]
+                stmt = select(Player).options(Player.projection("buildings", "currency")).where(Player.id == player_id).with_for_update()  # type: ignore[arg-type]
                 player = (await session.execute(stmt)).scalar_one()
                 
                 # Get current level and count
@@ -115,7 +116,7 @@ class BuildingService(BaseService):
                 # Calculate upgrade cost for all buildings of this type
                 base_cost = building_config.get("cost", 0)
                 cost_multiplier = upgrade_config.get("cost_multiplier", 1.5)
-                upgrade_cost_per_building = int(base_cost * (cost_multiplier ** current_level))
+                upgrade_cost_per_building = economy_formulas.building_upgrade_cost(base_cost, cost_multiplier, current_level)
                 total_cost = upgrade_cost_per_building * building_count
                 
                 # Check currency
@@ -125,8 +126,8 @@ class BuildingService(BaseService):
                 # Calculate income improvement
                 base_income = building_config.get("income_per_tick", 0)
                 income_multiplier = upgrade_config.get("income_multiplier", 1.3)
-                old_income_per_building = int(base_income * (income_multiplier ** (current_level - 1)))
-                new_income_per_building = int(base_income * (income_multiplier ** current_level))
+                old_income_per_building = economy_formulas.building_income_per_tick(base_income, income_multiplier, current_level)
+                new_income_per_building = economy_formulas.building_income_per_tick(base_income, income_multiplier, current_level + 1)
                 income_increase_per_building = new_income_per_building - old_income_per_building
                 total_income_increase = income_increase_per_building * building_count
                 
@@ -176,7 +177,7 @@ class BuildingService(BaseService):
             cls._validate_player_id(player_id)
             
             async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update() # type: ignore
+                stmt = select(Player).options(Player.projection("buildings", "currency")).where(Player.id == player_id).with_for_update() # type: ignore
                 player = (await session.execute(stmt)).scalar_one()
                 
                 # Get pending income
@@ -235,7 +236,7 @@ class BuildingService(BaseService):
             cls._validate_player_id(player_id)
             
             async with DatabaseService.get_session() as session:
-                stmt = select(Player).where(Player.id == player_id) # type: ignore
+                stmt = select(Player).options(Player.projection("buildings")).where(Player.id == player_id) # type: ignore
                 player = (await session.execute(stmt)).scalar_one()
                 
                 # Get building configs
@@ -264,7 +265,7 @@ class BuildingService(BaseService):
                         # Calculate current income per building
                         base_income = config.get("income_per_tick", 0)
                         income_multiplier = upgrade_config.get("income_multiplier", 1.3)
-                        income_per_building = int(base_income * (income_multiplier ** (level - 1)))
+                        income_per_building = economy_formulas.building_income_per_tick(base_income, income_multiplier, level)
                         total_income = income_per_building * count
                         
                         # Calculate upgrade costs and next level income
@@ -276,10 +277,10 @@ class BuildingService(BaseService):
                         total_upgrade_cost = None
                         
                         if can_upgrade:
-                            next_income_per_building = int(base_income * (income_multiplier ** level))
+                            next_income_per_building = economy_formulas.building_income_per_tick(base_income, income_multiplier, level + 1)
                             base_cost = config.get("cost", 0)
                             cost_multiplier = upgrade_config.get("cost_multiplier", 1.5)
-                            upgrade_cost_per_building = int(base_cost * (cost_multiplier ** level))
+                            upgrade_cost_per_building = economy_formulas.building_upgrade_cost(base_cost, cost_multiplier, level)
                             total_upgrade_cost = upgrade_cost_per_building * count
                         
                         building_info[building_type] = {
@@ -322,7 +323,7 @@ class BuildingService(BaseService):
             cls._validate_player_id(player_id)
             
             async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update() # type: ignore
+                stmt = select(Player).options(Player.projection("buildings", "currency")).where(Player.id == player_id).with_for_update() # type: ignore
                 player = (await session.execute(stmt)).scalar_one()
                 
                 # Get system config
@@ -382,12 +383,13 @@ class BuildingService(BaseService):
             
             income_interval_minutes = system_config.get("income_interval_minutes", 30)
             max_stack_hours = system_config.get("max_stack_hours", 12)
-            max_ticks = int((max_stack_hours * 60) / income_interval_minutes)
+            max_ticks = economy_formulas.max_income_ticks(income_interval_minutes, max_stack_hours)
             
             try:
-                async with DatabaseService.get_session() as session:
+                # Read-only scan; each player is re-locked in its own transaction below
+                async with DatabaseService.get_read_session() as session:
                     # Get all players who have buildings
-                    stmt = select(Player).where(
+                    stmt = select(Player).options(Player.projection("buildings")).where(
                         or_(Player.shrine_count > 0, Player.cluster_count > 0)  # type: ignore[arg-type]
                     )
                     result = await session.execute(stmt)
@@ -451,7 +453,7 @@ class BuildingService(BaseService):
             try:
                 async with DatabaseService.get_transaction() as session:
                     # Re-fetch player with lock
-                    stmt = select(Player).where(Player.id == player.id).with_for_update() # type: ignore
+                    stmt = select(Player).options(Player.projection("buildings")).where(Player.id == player.id).with_for_update() # type: ignore
                     locked_player = (await session.execute(stmt)).scalar_one()
                     
                     # Check if player has buildings
@@ -491,7 +493,7 @@ class BuildingService(BaseService):
                         base_income = shrine_config.get("income_per_tick", 0)
                         income_multiplier = upgrade_config.get("income_multiplier", 1.3)
                         
-                        income_per_shrine = int(base_income * (income_multiplier ** (locked_player.shrine_level - 1)))
+                        income_per_shrine = economy_formulas.building_income_per_tick(base_income, income_multiplier, locked_player.shrine_level)
                         total_shrine_income = income_per_shrine * locked_player.shrine_count * ticks_due
                         revies_income += total_shrine_income
                     
@@ -502,7 +504,7 @@ class BuildingService(BaseService):
                         base_income = cluster_config.get("income_per_tick", 0)
                         income_multiplier = upgrade_config.get("income_multiplier", 1.4)
                         
-                        income_per_cluster = int(base_income * (income_multiplier ** (locked_player.cluster_level - 1)))
+                        income_per_cluster = economy_formulas.building_income_per_tick(base_income, income_multiplier, locked_player.cluster_level)
                         total_cluster_income = income_per_cluster * locked_player.cluster_count * ticks_due
                         erythl_income += total_cluster_income
                     
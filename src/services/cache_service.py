@@ -1,19 +1,34 @@
 # src/services/cache_service.py
-from typing import Dict, Any, List, Optional, Set, Union, Callable, Awaitable
+from typing import Dict, Any, List, Optional, Set, Tuple, Union, Callable, Awaitable
 from datetime import datetime, timedelta
 import asyncio
 import json
 import hashlib
+import random
+import time
 import zlib
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
 from src.utils.redis_service import RedisService
 from src.services.base_service import BaseService, ServiceResult
-from src.utils.config_manager import ConfigManager
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Write a warmed entry (and tag it) only if the player's warm generation is still the one
+# read before the payload was built; an invalidation in between bumps it.
+# KEYS[1] entry, KEYS[2] generation; ARGV: expected generation, payload, ttl, tag keys...
+_SET_IF_GENERATION = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then return 0 end
+local ttl = tonumber(ARGV[3])
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ttl)
+for i = 4, #ARGV do
+    redis.call('SADD', ARGV[i], KEYS[1])
+    if redis.call('TTL', ARGV[i]) < ttl + 300 then redis.call('EXPIRE', ARGV[i], ttl + 300) end
+end
+return 1
+"""
+
 @dataclass
 class CacheMetrics:
     """Cache performance metrics"""
@@ -39,17 +54,22 @@ class CacheEntry:
     compressed: bool = False
 
 @dataclass
-class CacheCleanupStats:
-    """Detailed cleanup operation statistics"""
-    total_keys_scanned: int = 0
-    expired_keys_removed: int = 0
-    stale_keys_removed: int = 0
-    orphaned_keys_removed: int = 0
-    ttl_keys_updated: int = 0
-    memory_freed_bytes: int = 0
-    execution_time_seconds: float = 0.0
-    errors: List[str] = field(default_factory=list)
-    cleanup_patterns: Dict[str, int] = field(default_factory=dict)
+class SweepStats:
+    """What one cache sweeper slice sampled and removed"""
+    keys_sampled: int = 0
+    bytes_sampled: int = 0
+    cold_evicted: int = 0
+    oversized_evicted: int = 0
+    bytes_freed: int = 0
+    ttl_added: int = 0
+    tag_members_removed: int = 0
+    tag_sets_removed: int = 0
+    commands: int = 0
+    pass_completed: bool = False
+    
+    def totals(self) -> Dict[str, int]:
+        """Counters accumulated into cache_sweep:state"""
+        return {name: value for name, value in self.__dict__.items() if name != "pass_completed"}
     
 class CacheService(BaseService):
     """Advanced cache management service with sophisticated patterns"""
@@ -87,6 +107,11 @@ class CacheService(BaseService):
     _metrics = CacheMetrics()
     _key_versions: Dict[str, int] = {}
     
+    # Incremental sweeper (see sweep_cache)
+    SWEEP_STATE_KEY = "cache_sweep:state"
+    TAG_PREFIX = "tag:"
+    _idle_supported = True
+    
     @classmethod
     async def get(
         cls, 
@@ -161,39 +186,8 @@ class CacheService(BaseService):
             if not client:
                 return ServiceResult.success_result(True)
             
-            # Serialize data
-            serialized = json.dumps(value, default=str)
-            
-            # Auto-compression for large data
-            should_compress = compress if compress is not None else len(serialized) > cls.COMPRESSION_THRESHOLD
-            
-            if should_compress:
-                # Compress and encode
-                compressed = zlib.compress(serialized.encode('utf-8'))
-                compressed_str = compressed.decode('latin1')
-                
-                # Create enhanced cache entry
-                cache_entry = {
-                    "data": compressed_str,
-                    "tags": list(tags) if tags else [],
-                    "version": cls._get_key_version(key),
-                    "created_at": datetime.utcnow().isoformat(),
-                    "ttl": ttl,
-                    "compressed": True
-                }
-            else:
-                # Create standard cache entry
-                cache_entry = {
-                    "data": value,
-                    "tags": list(tags) if tags else [],
-                    "version": cls._get_key_version(key),
-                    "created_at": datetime.utcnow().isoformat(),
-                    "ttl": ttl,
-                    "compressed": False
-                }
-            
             # Set in Redis
-            await client.setex(key, ttl, json.dumps(cache_entry, default=str))
+            await client.setex(key, ttl, cls._build_entry(key, value, ttl, tags, compress))
             
             # Store tags for grouped operations
             if tags:
@@ -213,6 +207,81 @@ class CacheService(BaseService):
             logger.warning(f"Cache set failed for key {key}: {e}")
             return ServiceResult.error_result("Cache set failed")
     
+    @classmethod
+    def _build_entry(
+        cls,
+        key: str,
+        value: Any,
+        ttl: int,
+        tags: Optional[Set[str]] = None,
+        compress: Optional[bool] = None
+    ) -> str:
+        """Serialized cache entry with metadata (what get() expects)"""
+        # Serialize data
+        serialized = json.dumps(value, default=str)
+        
+        # Auto-compression for large data
+        should_compress = compress if compress is not None else len(serialized) > cls.COMPRESSION_THRESHOLD
+        
+        if should_compress:
+            # Compress and encode
+            compressed = zlib.compress(serialized.encode('utf-8'))
+            data: Any = compressed.decode('latin1')
+        else:
+            data = value
+        
+        return json.dumps({
+            "data": data,
+            "tags": list(tags) if tags else [],
+            "version": cls._get_key_version(key),
+            "created_at": datetime.utcnow().isoformat(),
+            "ttl": ttl,
+            "compressed": should_compress
+        }, default=str)
+    
+    @classmethod
+    async def set_many(cls, entries: List[Tuple[str, Any, int, Set[str]]],
+                       guards: Optional[List[Tuple[str, str]]] = None) -> ServiceResult[List[str]]:
+        """
+        Write (key, value, ttl, tags) entries in one pipelined round trip; same format and tagging as set().
+        With guards (generation key, expected value per entry), an entry is only written while its
+        generation is unchanged. Returns the keys that were written.
+        """
+        if not entries or not RedisService.is_available():
+            return ServiceResult.success_result([])
+        
+        try:
+            client = RedisService.get_client()
+            if not client:
+                return ServiceResult.success_result([])
+            
+            pipe = client.pipeline(transaction=False)
+            if guards is not None:
+                for (key, value, ttl, tags), (generation_key, generation) in zip(entries, guards):
+                    pipe.eval(_SET_IF_GENERATION, 2, key, generation_key,
+                              generation, cls._build_entry(key, value, ttl, tags), ttl, *(f"tag:{tag}" for tag in tags))
+                flags = await pipe.execute()
+                written = [entry[0] for entry, flag in zip(entries, flags) if flag]
+                cls._metrics.sets += len(written)
+                return ServiceResult.success_result(written)
+            
+            tag_ttls: Dict[str, int] = {}
+            for key, value, ttl, tags in entries:
+                pipe.setex(key, ttl, cls._build_entry(key, value, ttl, tags))
+                for tag in tags:
+                    pipe.sadd(f"tag:{tag}", key)
+                    tag_ttls[tag] = max(tag_ttls.get(tag, 0), ttl)
+            for tag, ttl in tag_ttls.items():
+                pipe.expire(f"tag:{tag}", ttl + 300)
+            await pipe.execute()
+            
+            cls._metrics.sets += len(entries)
+            return ServiceResult.success_result([key for key, _, _, _ in entries])
+            
+        except Exception as e:
+            logger.warning(f"Cache set_many failed for {len(entries)} keys: {e}")
+            return ServiceResult.error_result("Cache set failed")
+    
     @classmethod
     async def delete(cls, key: str, track_metrics: bool = True) -> ServiceResult[bool]:
         """Delete a cache key and clean up tags"""
@@ -319,9 +388,24 @@ class CacheService(BaseService):
             logger.warning(f"Tag-based deletion failed for tags {tags}: {e}")
             return ServiceResult.error_result("Tag deletion failed")
     
+    @classmethod
+    async def _bump_warm_generation(cls, player_id: int):
+        """Cancel warm writes already in flight for this player (call before deleting)"""
+        client = RedisService.get_client()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=True)
+            pipe.incr(cls.WARM_GENERATION_KEY.format(player_id=player_id))
+            pipe.expire(cls.WARM_GENERATION_KEY.format(player_id=player_id), cls.WARM_GENERATION_TTL)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to bump warm generation for player {player_id}: {e}")
+    
     @classmethod
     async def invalidate_player_cache(cls, player_id: int) -> ServiceResult[int]:
         """Invalidate all caches for a specific player"""
+        await cls._bump_warm_generation(player_id)
         tags_to_invalidate = [
             cls.PLAYER_TAG.format(player_id=player_id),
             cls.COLLECTION_TAG.format(player_id=player_id),
@@ -339,6 +423,7 @@ class CacheService(BaseService):
     @classmethod
     async def invalidate_player_power(cls, player_id: int) -> ServiceResult[bool]:
         """Invalidate player power cache"""
+        await cls._bump_warm_generation(player_id)
         key = cls.PLAYER_POWER_KEY.format(player_id=player_id)
         result = await cls.delete(key)
         
@@ -350,12 +435,14 @@ class CacheService(BaseService):
     @classmethod
     async def invalidate_leader_bonuses(cls, player_id: int) -> ServiceResult[bool]:
         """Invalidate leader bonuses cache"""
+        await cls._bump_warm_generation(player_id)
         key = cls.LEADER_BONUSES_KEY.format(player_id=player_id)
         return await cls.delete(key)
     
     @classmethod
     async def invalidate_collection_stats(cls, player_id: int) -> ServiceResult[bool]:
         """Invalidate collection stats cache"""
+        await cls._bump_warm_generation(player_id)
         key = cls.COLLECTION_STATS_KEY.format(player_id=player_id)
         result = await cls.delete(key)
         
@@ -464,45 +551,232 @@ class CacheService(BaseService):
         key = cls.LEADERBOARD_KEY.format(category=category, period=period)
         return await cls.get(key)
     
+    # --- Warming ---
+    
+    WARM_MARKER_KEY = "cache_warm:last_run"  # no TTL: missing means Redis was flushed
+    # Bumped by every player invalidation; not a cache prefix, so the sweeper leaves it alone
+    WARM_GENERATION_KEY = "cache_gen:{player_id}"
+    WARM_GENERATION_TTL = 3600  # only has to outlive one warm batch
+    warm_progress: Dict[str, Any] = {}
+    
+    @classmethod
+    def _warm_kinds(cls) -> Dict[str, Tuple[str, int, Tuple[str, ...]]]:
+        """Payload kind -> (key template, TTL, tag templates), matching the cache_* writers"""
+        return {
+            "power": (cls.PLAYER_POWER_KEY, cls.TTL_MEDIUM, (cls.PLAYER_TAG, cls.COMBAT_TAG)),
+            "collection_stats": (cls.COLLECTION_STATS_KEY, cls.TTL_MEDIUM, (cls.PLAYER_TAG, cls.COLLECTION_TAG)),
+            "leader_bonuses": (cls.LEADER_BONUSES_KEY, cls.TTL_LONG, (cls.PLAYER_TAG, cls.COMBAT_TAG)),
+        }
+    
+    @classmethod
+    async def _missing_keys(cls, targets: Dict[str, List[int]], chunk: int = 1000) -> Dict[str, List[int]]:
+        """Players whose payload of each kind is not cached (pipelined EXISTS)"""
+        client = RedisService.get_client()
+        kinds = cls._warm_kinds()
+        missing: Dict[str, List[int]] = {}
+        for kind, player_ids in targets.items():
+            template = kinds[kind][0]
+            missing[kind] = []
+            for i in range(0, len(player_ids), chunk):
+                batch = player_ids[i:i + chunk]
+                pipe = client.pipeline(transaction=False)  # type: ignore[union-attr]
+                for player_id in batch:
+                    pipe.exists(template.format(player_id=player_id))
+                exists = await pipe.execute()
+                missing[kind].extend(player_id for player_id, found in zip(batch, exists) if not found)
+        return missing
+    
+    @classmethod
+    async def _warm_batch(cls, need: Dict[str, List[int]]) -> Dict[str, int]:
+        """Compute payloads for a batch with set-based queries and write them in one pipeline"""
+        from src.services.esprit_service import EspritService
+        from src.services.leadership_service import LeadershipService
+        
+        builders = {
+            "power": EspritService.bulk_collection_power,
+            "collection_stats": EspritService.bulk_collection_stats,
+            "leader_bonuses": LeadershipService.bulk_leader_bonuses,
+        }
+        # Generations first: an invalidation after this point cancels the player's writes
+        player_ids = sorted({player_id for ids in need.values() for player_id in ids})
+        generation_keys = {player_id: cls.WARM_GENERATION_KEY.format(player_id=player_id) for player_id in player_ids}
+        client = RedisService.get_client()
+        generations: Dict[int, str] = {}
+        if client is not None and player_ids:
+            values = await client.mget([generation_keys[player_id] for player_id in player_ids])
+            generations = {player_id: value or "0" for player_id, value in zip(player_ids, values)}
+        
+        payloads: Dict[str, Dict[int, Any]] = {}
+        # Primary, not the replica: a lagging read would be cached for a whole TTL
+        async with DatabaseService.get_session() as session:
+            for kind, player_ids in need.items():
+                payloads[kind] = await builders[kind](session, player_ids) if player_ids else {}
+        
+        kinds = cls._warm_kinds()
+        entries: List[Tuple[str, Any, int, Set[str]]] = []
+        guards: List[Tuple[str, str]] = []
+        key_kinds: Dict[str, str] = {}
+        for kind, by_player in payloads.items():
+            template, ttl, tag_templates = kinds[kind]
+            for player_id, payload in by_player.items():
+                # Spread expiry so a warmed cohort doesn't all miss again at the same moment
+                jittered = int(ttl * random.uniform(0.85, 1.0))
+                tags = {tag.format(player_id=player_id) for tag in tag_templates}
+                key = template.format(player_id=player_id)
+                key_kinds[key] = kind
+                entries.append((key, payload, jittered, tags))
+                guards.append((generation_keys[player_id], generations.get(player_id, "0")))
+        
+        written = await cls.set_many(entries, guards=guards)
+        if not written.success:
+            raise RuntimeError(written.error or "Cache write failed")
+        counts = {kind: 0 for kind in payloads}
+        for key in written.data or []:
+            counts[key_kinds[key]] += 1
+        skipped = len(entries) - sum(counts.values())
+        if skipped:
+            logger.debug(f"Cache warm skipped {skipped} entries invalidated while building")
+        return counts
+    
     @classmethod
     async def warm_player_caches(cls, player_id: int) -> ServiceResult[Dict[str, bool]]:
         """Pre-warm all caches for a player"""
-        results = {}
-        
         try:
-            # Import services here to avoid circular imports
-            from src.services.player_service import PlayerService
-            from src.services.esprit_service import EspritService
-            
-            # Warm power cache
-            power_result = await EspritService.calculate_collection_power(player_id)
-            results["power_cache"] = power_result.success
-            
-            # Warm collection stats
-            stats_result = await EspritService.get_collection_stats(player_id)
-            results["stats_cache"] = stats_result.success
-            
-            # Warm leader bonuses (requires player lookup)
-            async with DatabaseService.get_transaction() as session:
-                from src.database.models import Player
-                from sqlalchemy import select
-                
-                player_stmt = select(Player).where(Player.id == player_id)  # type: ignore
-                player = (await session.execute(player_stmt)).scalar_one_or_none()
-                
-                if player:
-                    leader_bonuses = await player.get_leader_bonuses(session)
-                    bonus_result = await cls.cache_leader_bonuses(player_id, leader_bonuses)
-                    results["leader_bonuses_cache"] = bonus_result.success
-                else:
-                    results["leader_bonuses_cache"] = False
-            
-            return ServiceResult.success_result(results)
+            counts = await cls._warm_batch({kind: [player_id] for kind in cls._warm_kinds()})
+            return ServiceResult.success_result({
+                "power_cache": counts["power"] > 0,
+                "stats_cache": counts["collection_stats"] > 0,
+                "leader_bonuses_cache": counts["leader_bonuses"] > 0
+            })
             
         except Exception as e:
             logger.warning(f"Failed to warm caches for player {player_id}: {e}")
             return ServiceResult.error_result("Cache warming failed")
     
+    @classmethod
+    async def warm_active_players(
+        cls,
+        active_within_hours: float = 24,
+        max_players: int = 20000,
+        batch_size: int = 200,
+        concurrency: int = 2,
+        players_per_second: float = 500.0,
+        only_missing: bool = True,
+        skip_if_warmed_since: Optional[float] = None
+    ) -> ServiceResult[Dict[str, Any]]:
+        """
+        Warm power, collection-stat and leader-bonus caches for recently active players.
+        
+        Players are taken by Player.last_active (most recent first); payloads are
+        built per batch with set-based queries and written with pipelined SETs,
+        at most `concurrency` batches at once and `players_per_second` overall.
+        With skip_if_warmed_since, does nothing if a warm already finished after
+        that epoch time (e.g. another process did it since this one started).
+        """
+        async def _operation():
+            if not RedisService.is_available():
+                return {"skipped": "redis unavailable"}
+            client = RedisService.get_client()
+            
+            if skip_if_warmed_since is not None:
+                last_run = await client.get(cls.WARM_MARKER_KEY)  # type: ignore[union-attr]
+                if last_run is not None and float(last_run) >= skip_if_warmed_since:
+                    return {"skipped": "already warmed"}
+            
+            from src.database.models import Player
+            from sqlalchemy import select
+            
+            started = time.monotonic()
+            cutoff = datetime.utcnow() - timedelta(hours=active_within_hours)
+            async with DatabaseService.get_read_session() as session:
+                stmt = select(Player.id, Player.leader_esprit_stack_id).where(  # type: ignore
+                    Player.last_active >= cutoff  # type: ignore
+                ).order_by(Player.last_active.desc()).limit(max_players)  # type: ignore
+                rows = (await session.execute(stmt)).all()
+            
+            player_ids = [row.id for row in rows]
+            targets = {
+                "power": player_ids,
+                "collection_stats": player_ids,
+                "leader_bonuses": [row.id for row in rows if row.leader_esprit_stack_id],
+            }
+            missing = await cls._missing_keys(targets)
+            coverage_before = {
+                kind: round(1 - len(missing[kind]) / len(ids), 4) if ids else 1.0 for kind, ids in targets.items()
+            }
+            need = missing if only_missing else targets
+            
+            # Batch by player, carrying only the kinds each player still needs
+            needed_by_player: Dict[int, List[str]] = {}
+            for kind, ids in need.items():
+                for player_id in ids:
+                    needed_by_player.setdefault(player_id, []).append(kind)
+            ordered = [player_id for player_id in player_ids if player_id in needed_by_player]
+            batches = []
+            for i in range(0, len(ordered), batch_size):
+                batch: Dict[str, List[int]] = {kind: [] for kind in targets}
+                for player_id in ordered[i:i + batch_size]:
+                    for kind in needed_by_player[player_id]:
+                        batch[kind].append(player_id)
+                batches.append((len(ordered[i:i + batch_size]), batch))
+            
+            written = {kind: 0 for kind in targets}
+            progress = cls.warm_progress = {
+                "started_at": datetime.utcnow().isoformat(), "players": len(ordered),
+                "done": 0, "batches": len(batches), "errors": 0
+            }
+            interval = 1.0 / players_per_second if players_per_second > 0 else 0.0
+            pacing = {"next": time.monotonic()}
+            pace_lock = asyncio.Lock()
+            queue = iter(batches)
+            next_log = 0.1
+            
+            async def worker():
+                nonlocal next_log
+                for size, batch in queue:
+                    # Global rate limit: reserve this batch's slot, then wait for it
+                    async with pace_lock:
+                        now = time.monotonic()
+                        slot = max(now, pacing["next"])
+                        pacing["next"] = slot + size * interval
+                    if slot > now:
+                        await asyncio.sleep(slot - now)
+                    try:
+                        counts = await cls._warm_batch(batch)
+                        for kind, count in counts.items():
+                            written[kind] += count
+                    except Exception as e:
+                        progress["errors"] += 1
+                        logger.warning(f"Cache warm batch of {size} players failed: {e}")
+                    progress["done"] += size
+                    if ordered and progress["done"] / len(ordered) >= next_log:
+                        logger.info(f"🔥 Cache warming {progress['done']:,}/{len(ordered):,} players")
+                        next_log = progress["done"] / len(ordered) + 0.1
+            
+            await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+            
+            still_missing = await cls._missing_keys(targets)
+            coverage_after = {
+                kind: round(1 - len(still_missing[kind]) / len(ids), 4) if ids else 1.0 for kind, ids in targets.items()
+            }
+            await client.set(cls.WARM_MARKER_KEY, time.time())  # type: ignore[union-attr]
+            
+            duration = time.monotonic() - started
+            report = {
+                "active_players": len(player_ids), "players_warmed": len(ordered),
+                "written": written, "batches": len(batches), "errors": progress["errors"],
+                "coverage_before": coverage_before, "coverage_after": coverage_after,
+                "duration_seconds": round(duration, 2),
+                "players_per_second": round(len(ordered) / duration, 1) if duration > 0 else 0.0
+            }
+            progress.update(finished_at=datetime.utcnow().isoformat(), report=report)
+            logger.info(
+                f"🔥 Cache warming: {len(ordered):,}/{len(player_ids):,} active players in {duration:.1f}s, "
+                f"coverage " + ", ".join(f"{kind} {coverage_before[kind]:.0%}→{coverage_after[kind]:.0%}" for kind in targets)
+            )
+            return report
+        return await cls._safe_execute(_operation, "warm active players")
+    
     @classmethod
     async def warm_related_caches(cls, cache_key: str) -> ServiceResult[List[str]]:
         """Warm caches related to a specific cache key"""
@@ -776,438 +1050,239 @@ class CacheService(BaseService):
         return ServiceResult.success_result(True)
 
     @classmethod
-    async def cleanup_expired_cache(cls) -> ServiceResult[Dict[str, Any]]:
+    def _cache_prefixes(cls) -> Tuple[str, ...]:
+        """Key prefixes owned by this cache (safe to evict); everything else is only measured"""
+        templates = (
+            cls.PLAYER_POWER_KEY, cls.LEADER_BONUSES_KEY, cls.COLLECTION_STATS_KEY, cls.FUSION_RATES_KEY,
+            cls.LEADERBOARD_KEY, cls.QUEST_DATA_KEY, cls.SHOP_DATA_KEY, cls.ACHIEVEMENT_PROGRESS_KEY,
+            cls.GUILD_DATA_KEY,
+        )
+        return tuple(template.split(":")[0] + ":" for template in templates)
+
+    @classmethod
+    async def sweep_cache(
+        cls,
+        time_budget_ms: float = 25.0,
+        max_commands: int = 400,
+        scan_count: int = 100,
+        idle_evict_seconds: int = 6 * 3600,
+        max_entry_bytes: int = 256 * 1024,
+        tag_sample: int = 20
+    ) -> ServiceResult[Dict[str, Any]]:
         """
-        Sophisticated cache cleanup with intelligent pattern recognition,
-        memory optimization, and comprehensive analytics.
+        One budgeted slice of the incremental cache sweep.
+
+        Resumes the SCAN cursor where the last slice stopped and samples OBJECT
+        IDLETIME, MEMORY USAGE and TTL per key in one pipelined round trip. Cache
+        entries idle past idle_evict_seconds or larger than max_entry_bytes are
+        unlinked, cache entries without a TTL get one, and tag sets drop members
+        that no longer exist (and are removed once empty). Expiry itself is left
+        to Redis. Stops as soon as the time or command budget is spent; the cursor,
+        running totals and per-prefix memory of the last full pass live in
+        cache_sweep:state.
         """
         async def _operation():
-            if not RedisService.is_available():
-                return {"status": "redis_unavailable", "cleaned_keys": 0}
-            
             client = RedisService.get_client()
-            if not client:
-                return {"status": "client_unavailable", "cleaned_keys": 0}
-            
-            # Get sophisticated cleanup configuration
-            cache_config = ConfigManager.get("cache_system") or {}
-            cleanup_config = cache_config.get("cleanup", {})
-            
-            stats = CacheCleanupStats()
-            start_time = datetime.utcnow()
+            if client is None:
+                return {"skipped": "redis unavailable"}
+            
+            started = time.perf_counter()
+            deadline = started + time_budget_ms / 1000
+            stats = SweepStats()
+            state = await client.hgetall(cls.SWEEP_STATE_KEY)
+            stats.commands += 1
+            cursor = int(state.get("cursor") or 0)
+            pass_memory: Dict[str, List[int]] = json.loads(state.get("pass_memory") or "{}")
+            
+            while time.perf_counter() < deadline:
+                # SCAN's count is a hint, so size each round to what is left of the command budget
+                per_key = 3 if cls._idle_supported else 2
+                count = min(scan_count, (max_commands - stats.commands - 1) // (per_key + 2))
+                if count < 1:
+                    break
+                cursor, keys = await client.scan(cursor, count=count)
+                stats.commands += 1
+                if keys:
+                    await cls._sweep_keys(client, keys, stats, pass_memory, idle_evict_seconds, max_entry_bytes, tag_sample)
+                if cursor == 0:
+                    stats.pass_completed = True
+                    break
+                await asyncio.sleep(0)  # let queued commands run between round trips
             
-            # Define sophisticated cleanup patterns with specific logic
-            cleanup_patterns = {
-                # Player data - keep fresh, clean stale
-                "reve:player:*": {
-                    "max_age_hours": cleanup_config.get("player_data_max_age", 24),
-                    "stale_threshold_hours": cleanup_config.get("player_stale_threshold", 6),
-                    "priority": "high"
-                },
-                # Collection stats - medium retention
-                "reve:collection:*": {
-                    "max_age_hours": cleanup_config.get("collection_max_age", 12),
-                    "stale_threshold_hours": cleanup_config.get("collection_stale_threshold", 4),
-                    "priority": "medium"
-                },
-                # Power calculations - short retention, frequent updates
-                "reve:power:*": {
-                    "max_age_hours": cleanup_config.get("power_max_age", 6),
-                    "stale_threshold_hours": cleanup_config.get("power_stale_threshold", 2),
-                    "priority": "high"
-                },
-                # Temporary data - aggressive cleanup
-                "reve:temp:*": {
-                    "max_age_hours": cleanup_config.get("temp_max_age", 2),
-                    "stale_threshold_hours": cleanup_config.get("temp_stale_threshold", 0.5),
-                    "priority": "low"
-                },
-                # Session data - moderate retention
-                "reve:session:*": {
-                    "max_age_hours": cleanup_config.get("session_max_age", 8),
-                    "stale_threshold_hours": cleanup_config.get("session_stale_threshold", 3),
-                    "priority": "medium"
-                },
-                # Leaderboard data - longer retention
-                "reve:leaderboard:*": {
-                    "max_age_hours": cleanup_config.get("leaderboard_max_age", 48),
-                    "stale_threshold_hours": cleanup_config.get("leaderboard_stale_threshold", 12),
-                    "priority": "low"
-                }
-            }
+            fields: Dict[str, Any] = {"cursor": cursor, "last_tick": int(time.time())}
+            if stats.pass_completed:
+                fields.update(pass_memory="{}", last_pass_memory=json.dumps(pass_memory), last_pass_at=int(time.time()))
+            else:
+                fields["pass_memory"] = json.dumps(pass_memory)
+            pipe = client.pipeline(transaction=False)
+            pipe.hset(cls.SWEEP_STATE_KEY, mapping=fields)
+            for name, value in stats.totals().items():
+                if value:
+                    pipe.hincrby(cls.SWEEP_STATE_KEY, name, value)
+            await pipe.execute()
             
-            try:
-                # Phase 1: Intelligent key scanning and categorization
-                logger.info("🧹 Starting sophisticated cache cleanup...")
-                
-                for pattern, config in cleanup_patterns.items():
-                    pattern_stats = await cls._cleanup_pattern_sophisticated(
-                        client, pattern, config, stats
-                    )
-                    stats.cleanup_patterns[pattern] = pattern_stats
-                
-                # Phase 2: Orphaned key detection and removal
-                orphaned_count = await cls._cleanup_orphaned_keys(client, stats)
-                stats.orphaned_keys_removed = orphaned_count
-                
-                # Phase 3: Memory optimization
-                memory_freed = await cls._optimize_cache_memory(client, stats)
-                stats.memory_freed_bytes = memory_freed
-                
-                # Phase 4: Intelligent TTL management
-                ttl_updated = await cls._optimize_ttl_distribution(client, cleanup_config, stats)
-                stats.ttl_keys_updated = ttl_updated
-                
-                # Phase 5: Analytics and reporting
-                execution_time = (datetime.utcnow() - start_time).total_seconds()
-                stats.execution_time_seconds = execution_time
-                
-                # Generate comprehensive report
-                report = cls._generate_cleanup_report(stats)
-                
+            if stats.pass_completed:
+                largest = sorted(pass_memory.items(), key=lambda item: -item[1][1])[:5]
                 logger.info(
-                    f"🎯 Sophisticated cache cleanup completed: "
-                    f"{stats.expired_keys_removed + stats.stale_keys_removed + stats.orphaned_keys_removed} keys removed, "
-                    f"{stats.memory_freed_bytes / 1024:.1f}KB freed, "
-                    f"{stats.ttl_keys_updated} TTLs optimized "
-                    f"in {execution_time:.2f}s"
+                    f"🧹 Cache sweep pass complete: {sum(c for c, _ in pass_memory.values()):,} keys, "
+                    f"{sum(b for _, b in pass_memory.values()) / 1024 / 1024:.1f}MB ("
+                    + ", ".join(f"{prefix} {size / 1024:.0f}KB" for prefix, (_, size) in largest) + ")"
                 )
-                
-                return report
-                
-            except Exception as e:
-                stats.errors.append(f"Cleanup failed: {str(e)}")
-                logger.error(f"Sophisticated cache cleanup failed: {e}")
-                return {"status": "error", "error": str(e), "partial_stats": stats.__dict__}
-        
-        return await cls._safe_execute(_operation, "sophisticated cache cleanup")
-
-    @classmethod
-    async def _cleanup_pattern_sophisticated(
-        cls, 
-        client, 
-        pattern: str, 
-        config: Dict[str, Any], 
-        stats: CacheCleanupStats
-    ) -> int:
-        """Sophisticated pattern-specific cleanup with intelligent logic"""
-        keys_processed = 0
-        max_age_seconds = config["max_age_hours"] * 3600
-        stale_threshold_seconds = config["stale_threshold_hours"] * 3600
-        priority = config["priority"]
-        
-        # Adjust scan count based on priority
-        scan_count = {"high": 200, "medium": 150, "low": 100}[priority]
-        
-        cursor = 0
-        while True:
-            try:
-                cursor, keys = await client.scan(cursor, match=pattern, count=scan_count)
-                stats.total_keys_scanned += len(keys)
-                
-                # Process keys in batches for efficiency
-                batch_size = 50
-                for i in range(0, len(keys), batch_size):
-                    batch = keys[i:i + batch_size]
-                    await cls._process_key_batch_sophisticated(
-                        client, batch, max_age_seconds, stale_threshold_seconds, stats
-                    )
-                    keys_processed += len(batch)
-                
-                if cursor == 0:
-                    break
-                    
-            except Exception as e:
-                stats.errors.append(f"Pattern {pattern} scan error: {str(e)}")
-                break
+            
+            return {
+                **stats.totals(),
+                "evicted": stats.cold_evicted + stats.oversized_evicted,
+                "cursor": cursor,
+                "pass_completed": stats.pass_completed,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+            }
         
-        return keys_processed
+        return await cls._safe_execute(_operation, "cache sweep")
 
     @classmethod
-    async def _process_key_batch_sophisticated(
-        cls, 
-        client, 
-        keys: List[str], 
-        max_age_seconds: int, 
-        stale_threshold_seconds: int, 
-        stats: CacheCleanupStats
+    async def _sweep_keys(
+        cls,
+        client,
+        keys: List[str],
+        stats: "SweepStats",
+        pass_memory: Dict[str, List[int]],
+        idle_evict_seconds: int,
+        max_entry_bytes: int,
+        tag_sample: int
     ):
-        """Process key batch with sophisticated aging logic"""
-        pipeline = client.pipeline()
-        
-        # Gather key information in batch
+        """Sample one SCAN batch and apply evictions/TTL fixes in a second round trip"""
+        per_key = 3 if cls._idle_supported else 2
+        pipe = client.pipeline(transaction=False)
         for key in keys:
-            pipeline.ttl(key)
-            pipeline.memory_usage(key) if hasattr(client, 'memory_usage') else None
+            pipe.memory_usage(key)
+            pipe.ttl(key)
+            if per_key == 3:
+                pipe.object("idletime", key)
+        results = await pipe.execute(raise_on_error=False)
+        stats.commands += len(results)
         
-        try:
-            results = await pipeline.execute()
-            ttl_results = results[::2] if len(results) > 0 else []
-            memory_results = results[1::2] if len(results) > 1 else [0] * len(keys)
-            
-            for i, key in enumerate(keys):
-                try:
-                    ttl = ttl_results[i] if i < len(ttl_results) else -1
-                    memory_size = memory_results[i] if i < len(memory_results) else 0
-                    
-                    # Sophisticated decision logic
-                    should_delete = False
-                    delete_reason = ""
-                    
-                    if ttl == -2:  # Key expired or doesn't exist
-                        should_delete = True
-                        delete_reason = "expired"
-                        stats.expired_keys_removed += 1
-                    elif ttl == -1:  # No expiration set
-                        # Apply intelligent default TTL based on key pattern
-                        default_ttl = cls._calculate_intelligent_ttl(key)
-                        await client.expire(key, default_ttl)
-                        stats.ttl_keys_updated += 1
-                    elif ttl > max_age_seconds:  # Too old
-                        should_delete = True
-                        delete_reason = "too_old"
-                        stats.stale_keys_removed += 1
-                    elif ttl < stale_threshold_seconds and memory_size > 1024:  # Large stale key
-                        should_delete = True
-                        delete_reason = "large_stale"
-                        stats.stale_keys_removed += 1
-                    
-                    if should_delete:
-                        await client.delete(key)
-                        if isinstance(memory_size, int):
-                            stats.memory_freed_bytes += memory_size
-                        
-                        logger.debug(f"Deleted {key} ({delete_reason})")
-                        
-                except Exception as e:
-                    stats.errors.append(f"Key {key} processing error: {str(e)}")
-                    
-        except Exception as e:
-            stats.errors.append(f"Batch processing error: {str(e)}")
-
-    @classmethod
-    async def _cleanup_orphaned_keys(cls, client, stats: CacheCleanupStats) -> int:
-        """Detect and remove orphaned cache entries"""
-        orphaned_count = 0
-        
-        try:
-            # Look for keys that don't match any known pattern
-            unknown_pattern_keys = []
-            
-            cursor = 0
-            while True:
-                cursor, keys = await client.scan(cursor, match="reve:*", count=100)
-                
-                for key in keys:
-                    # Check if key matches any known pattern
-                    key_str = key.decode() if isinstance(key, bytes) else str(key)
-                    is_known_pattern = any(
-                        key_str.startswith(pattern.replace("*", "")) 
-                        for pattern in ["reve:player:", "reve:collection:", "reve:power:", 
-                                    "reve:temp:", "reve:session:", "reve:leaderboard:"]
-                    )
-                    
-                    if not is_known_pattern:
-                        unknown_pattern_keys.append(key_str)
-                
-                if cursor == 0:
-                    break
-            
-            # Remove orphaned keys older than 1 hour
-            for key in unknown_pattern_keys:
-                try:
-                    ttl = await client.ttl(key)
-                    if ttl < 3600:  # Less than 1 hour TTL remaining
-                        await client.delete(key)
-                        orphaned_count += 1
-                        logger.debug(f"Removed orphaned key: {key}")
-                except Exception as e:
-                    stats.errors.append(f"Orphaned key {key} error: {str(e)}")
-        
-        except Exception as e:
-            stats.errors.append(f"Orphaned key cleanup error: {str(e)}")
-        
-        return orphaned_count
-
-    @classmethod
-    async def _optimize_cache_memory(cls, client, stats: CacheCleanupStats) -> int:
-        """Optimize cache memory usage with intelligent compression"""
-        memory_freed = 0
-        
-        try:
-            # Get Redis memory info
-            memory_info = await client.info("memory")
-            used_memory = memory_info.get("used_memory", 0)
-            max_memory = memory_info.get("maxmemory", 0)
-            
-            if max_memory > 0:
-                memory_usage_percent = (used_memory / max_memory) * 100
-                
-                # If memory usage is high, be more aggressive
-                if memory_usage_percent > 80:
-                    logger.warning(f"High Redis memory usage: {memory_usage_percent:.1f}%")
-                    # Implement more aggressive cleanup
-                    aggressive_cleanup = await cls._aggressive_memory_cleanup(client)
-                    memory_freed += aggressive_cleanup
-            
-        except Exception as e:
-            stats.errors.append(f"Memory optimization error: {str(e)}")
-        
-        return memory_freed
-
-    @classmethod
-    async def _optimize_ttl_distribution(
-        cls, 
-        client, 
-        cleanup_config: Dict[str, Any], 
-        stats: CacheCleanupStats
-    ) -> int:
-        """Optimize TTL distribution to prevent cache thundering herd"""
-        ttl_updated = 0
+        cache_prefixes = cls._cache_prefixes()
+        unlink: List[str] = []
+        expire: List[str] = []
+        tag_keys: List[str] = []
+        for i, key in enumerate(keys):
+            size, ttl = results[i * per_key], results[i * per_key + 1]
+            idle = results[i * per_key + 2] if per_key == 3 else None
+            if not isinstance(size, int) or ttl == -2:
+                continue  # expired between SCAN and sampling
+            if isinstance(idle, Exception):
+                # OBJECT IDLETIME is refused under an LFU maxmemory-policy; size-only from here on
+                if cls._idle_supported:
+                    logger.info("Cache sweeper: OBJECT IDLETIME unavailable, disabling idle eviction")
+                cls._idle_supported = False
+                idle = None
+            
+            stats.keys_sampled += 1
+            stats.bytes_sampled += size
+            prefix = key.split(":", 1)[0] if ":" in key else "(none)"
+            counts = pass_memory.setdefault(prefix, [0, 0])
+            counts[0] += 1
+            counts[1] += size
+            
+            if key.startswith(cls.TAG_PREFIX):
+                tag_keys.append(key)
+                if ttl == -1:
+                    expire.append(key)
+                continue
+            if not key.startswith(cache_prefixes):
+                continue
+            if size > max_entry_bytes:
+                logger.warning(f"Cache sweeper evicting oversized entry {key} ({size / 1024:.0f}KB)")
+                stats.oversized_evicted += 1
+            elif isinstance(idle, int) and idle > idle_evict_seconds:
+                stats.cold_evicted += 1
+            else:
+                if ttl == -1:
+                    expire.append(key)
+                continue
+            unlink.append(key)
+            stats.bytes_freed += size
         
-        try:
-            # Find keys with similar TTLs and spread them out
-            ttl_distribution = {}
-            
-            cursor = 0
-            sample_size = 1000  # Sample for analysis
-            keys_sampled = 0
-            
-            while cursor != 0 or keys_sampled == 0:
-                cursor, keys = await client.scan(cursor, match="reve:*", count=100)
-                
-                for key in keys[:min(10, len(keys))]:  # Sample subset
-                    try:
-                        ttl = await client.ttl(key)
-                        if ttl > 0:
-                            # Group by TTL ranges (10-minute buckets)
-                            ttl_bucket = (ttl // 600) * 600
-                            ttl_distribution[ttl_bucket] = ttl_distribution.get(ttl_bucket, 0) + 1
-                    except Exception:
-                        continue
-                
-                keys_sampled += len(keys)
-                if keys_sampled >= sample_size or cursor == 0:
-                    break
-            
-            # If we find TTL clustering, add jitter
-            for ttl_bucket, count in ttl_distribution.items():
-                if count > 50:  # Too many keys expiring at similar time
-                    # Add jitter to future keys with this TTL pattern
-                    jitter_range = cleanup_config.get("ttl_jitter_minutes", 30) * 60
-                    logger.info(f"Detected TTL clustering at {ttl_bucket}s, applying jitter")
-            
-        except Exception as e:
-            stats.errors.append(f"TTL optimization error: {str(e)}")
+        dead_members: Dict[str, List[str]] = {}
+        empty_tags: List[str] = []
+        if tag_keys:
+            dead_members, empty_tags = await cls._sweep_tags(client, tag_keys, tag_sample, stats)
         
-        return ttl_updated
+        if unlink or expire or dead_members or empty_tags:
+            pipe = client.pipeline(transaction=False)
+            if unlink:
+                pipe.unlink(*unlink)
+            for key in expire:
+                pipe.expire(key, cls.TTL_LONG + 300 if key.startswith(cls.TAG_PREFIX) else cls.TTL_LONG)
+            for tag_key, members in dead_members.items():
+                pipe.srem(tag_key, *members)
+            if empty_tags:
+                pipe.unlink(*empty_tags)
+            stats.commands += len(pipe.command_stack)
+            await pipe.execute()
+            stats.ttl_added += len(expire)
+            stats.tag_members_removed += sum(len(members) for members in dead_members.values())
+            stats.tag_sets_removed += len(empty_tags)
 
     @classmethod
-    def _calculate_intelligent_ttl(cls, key: str) -> int:
-        """Calculate intelligent TTL based on key pattern and usage"""
-        key_str = str(key)
+    async def _sweep_tags(
+        cls,
+        client,
+        tag_keys: List[str],
+        tag_sample: int,
+        stats: "SweepStats"
+    ) -> Tuple[Dict[str, List[str]], List[str]]:
+        """Check a random sample of each tag set's members; returns (dead members per tag, tags left empty)"""
+        pipe = client.pipeline(transaction=False)
+        for tag_key in tag_keys:
+            pipe.scard(tag_key)
+            pipe.srandmember(tag_key, tag_sample)
+        results = await pipe.execute(raise_on_error=False)
+        stats.commands += len(results)
         
-        # Get cleanup config with fallbacks
-        cache_config = ConfigManager.get("cache_system") or {}
-        cleanup_config = cache_config.get("cleanup", {})
-
-        if ":player:" in key_str:
-            return 24 * 3600  # 24 hours for player data
-        elif ":collection:" in key_str:
-            return 12 * 3600  # 12 hours for collection stats
-        elif ":power:" in key_str:
-            return 6 * 3600   # 6 hours for power calculations
-        elif ":temp:" in key_str:
-            return 2 * 3600   # 2 hours for temporary data
-        elif ":session:" in key_str:
-            return 8 * 3600   # 8 hours for session data
-        elif ":leaderboard:" in key_str:
-            return 48 * 3600  # 48 hours for leaderboards
-        else:
-            return 6 * 3600   # Default 6 hours
-
-    @classmethod
-    async def _aggressive_memory_cleanup(cls, client) -> int:
-        """Aggressive cleanup when memory usage is critical"""
-        memory_freed = 0
+        samples: List[Tuple[str, int, List[str]]] = []
+        for i, tag_key in enumerate(tag_keys):
+            size, members = results[i * 2], results[i * 2 + 1]
+            if isinstance(size, int) and isinstance(members, list):
+                samples.append((tag_key, size, members))
         
-        try:
-            # Target temporary and session data first
-            aggressive_patterns = ["reve:temp:*", "reve:session:*"]
-            
-            for pattern in aggressive_patterns:
-                cursor = 0
-                while True:
-                    cursor, keys = await client.scan(cursor, match=pattern, count=200)
-                    
-                    for key in keys:
-                        try:
-                            # More aggressive TTL reduction
-                            current_ttl = await client.ttl(key)
-                            if current_ttl > 1800:  # More than 30 minutes
-                                new_ttl = min(current_ttl // 2, 1800)  # Halve TTL, max 30 min
-                                await client.expire(key, new_ttl)
-                                memory_freed += 1
-                        except Exception:
-                            continue
-                    
-                    if cursor == 0:
-                        break
-            
-            logger.warning(f"Aggressive cleanup: reduced TTL on {memory_freed} keys")
-            
-        except Exception as e:
-            logger.error(f"Aggressive cleanup failed: {e}")
+        pipe = client.pipeline(transaction=False)
+        for _, _, members in samples:
+            for member in members:
+                pipe.exists(member)
+        exists = iter(await pipe.execute()) if len(pipe.command_stack) else iter(())
+        stats.commands += sum(len(members) for _, _, members in samples)
         
-        return memory_freed
+        dead_members: Dict[str, List[str]] = {}
+        empty_tags: List[str] = []
+        for tag_key, size, members in samples:
+            dead = [member for member in members if not next(exists)]
+            if size <= len(members) and len(dead) == len(members):
+                empty_tags.append(tag_key)  # every member is gone: the set itself is orphaned
+            elif dead:
+                dead_members[tag_key] = dead
+        return dead_members, empty_tags
 
     @classmethod
-    def _generate_cleanup_report(cls, stats: CacheCleanupStats) -> Dict[str, Any]:
-        """Generate comprehensive cleanup report"""
-        return {
-            "status": "success",
-            "summary": {
-                "total_keys_scanned": stats.total_keys_scanned,
-                "total_keys_removed": stats.expired_keys_removed + stats.stale_keys_removed + stats.orphaned_keys_removed,
-                "memory_freed_kb": round(stats.memory_freed_bytes / 1024, 2),
-                "execution_time_seconds": round(stats.execution_time_seconds, 2),
-                "error_count": len(stats.errors)
-            },
-            "details": {
-                "expired_keys_removed": stats.expired_keys_removed,
-                "stale_keys_removed": stats.stale_keys_removed,
-                "orphaned_keys_removed": stats.orphaned_keys_removed,
-                "ttl_keys_updated": stats.ttl_keys_updated,
-                "cleanup_patterns": stats.cleanup_patterns
-            },
-            "performance": {
-                "keys_per_second": round(stats.total_keys_scanned / max(stats.execution_time_seconds, 0.001), 2),
-                "memory_efficiency": round(stats.memory_freed_bytes / max(stats.total_keys_scanned, 1), 2)
-            },
-            "errors": stats.errors[:10],  # First 10 errors for debugging
-            "recommendations": cls._generate_cleanup_recommendations(stats)
-        }
-
-    @classmethod
-    def _generate_cleanup_recommendations(cls, stats: CacheCleanupStats) -> List[str]:
-        """Generate intelligent recommendations based on cleanup results"""
-        recommendations = []
-        
-        if stats.orphaned_keys_removed > 100:
-            recommendations.append("High number of orphaned keys detected - review cache key patterns")
-        
-        if stats.memory_freed_bytes > 10 * 1024 * 1024:  # > 10MB
-            recommendations.append("Significant memory freed - consider more frequent cleanup")
-        
-        if len(stats.errors) > 10:
-            recommendations.append("Multiple cleanup errors detected - investigate Redis connectivity")
-        
-        if stats.execution_time_seconds > 30:
-            recommendations.append("Cleanup taking too long - consider reducing scan scope")
-        
-        if stats.ttl_keys_updated > 1000:
-            recommendations.append("Many keys without TTL - review cache setting practices")
+    async def get_sweep_status(cls) -> ServiceResult[Dict[str, Any]]:
+        """Sweeper cursor, running totals and per-prefix memory of the last full pass"""
+        async def _operation():
+            client = RedisService.get_client()
+            if client is None:
+                return {"available": False}
+            
+            state = await client.hgetall(cls.SWEEP_STATE_KEY)
+            status: Dict[str, Any] = {"available": True, "idle_eviction": cls._idle_supported}
+            for name, value in state.items():
+                if name.endswith("pass_memory"):
+                    status[name] = {
+                        prefix: {"keys": count, "bytes": size}
+                        for prefix, (count, size) in sorted(json.loads(value).items(), key=lambda item: -item[1][1])
+                    }
+                else:
+                    status[name] = int(value)
+            return status
         
-        return recommendations
+        return await cls._safe_execute(_operation, "get cache sweep status")
 
 from src.utils.database_service import DatabaseService
\ No newline at end of file
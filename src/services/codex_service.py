@@ -6,9 +6,9 @@ from datetime import datetime
 from src.services.base_service import BaseService, ServiceResult
 from src.services.cache_service import CacheService
 from src.database.models.player import Player
-from src.database.models.esprit import Esprit
 from src.database.models.esprit_base import EspritBase
 from src.utils.database_service import DatabaseService
+from src.utils.ownership_bitset import OwnershipBitsets
 from src.utils.config_manager import ConfigManager
 from src.utils.transaction_logger import transaction_logger, TransactionType
 from src.utils.logger import get_logger
@@ -51,14 +51,8 @@ class CodexService(BaseService):
             
             collections = collections_result.data or {}
             
-            # Get player's owned Esprits
-            async with DatabaseService.get_transaction() as session:
-                stmt = (select(EspritBase.name)  # type: ignore
-                       .join(Esprit, Esprit.esprit_base_id == EspritBase.id)
-                       .where(Esprit.owner_id == player_id))
-                
-                result = await session.execute(stmt)
-                owned_esprits = {row[0] for row in result.fetchall()}
+            # Player's owned Esprits as a catalog bitset
+            snapshot, owned = await OwnershipBitsets.owned_mask(player_id)
             
             # Calculate progress for each collection
             progress_data = {
@@ -73,7 +67,8 @@ class CodexService(BaseService):
                     continue
                     
                 required_esprits = set(collection_info.get("required_esprits", []))  # type: ignore
-                owned_required = required_esprits.intersection(owned_esprits)
+                owned_names, _ = OwnershipBitsets.split_names(snapshot, owned, required_esprits)
+                owned_required = set(owned_names)
                 
                 is_completed = len(owned_required) == len(required_esprits)
                 if is_completed:
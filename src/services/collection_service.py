@@ -10,6 +10,8 @@ from src.database.models.esprit import Esprit
 from src.database.models.esprit_base import EspritBase
 from src.database.models.player import Player
 from src.utils.database_service import DatabaseService
+from src.utils.esprit_search_index import EspritSearchIndex
+from src.utils.ownership_bitset import OwnershipBitsets
 from src.utils.transaction_logger import transaction_logger, TransactionType
 from src.utils.game_constants import Elements, Tiers, GameConstants
 from src.utils.config_manager import ConfigManager
@@ -57,7 +59,7 @@ class CollectionService(BaseService):
                     raise ValueError("Failed to get collection stats")
                 collection_stats = stats_result.data
             
-            async with DatabaseService.get_transaction() as session:
+            async with DatabaseService.get_read_session() as session:
                 # Get total available Esprits
                 total_available_stmt = select(func.count()).select_from(EspritBase)  # type: ignore
                 total_available_result = await session.execute(total_available_stmt)
@@ -150,7 +152,7 @@ class CollectionService(BaseService):
         async def _operation():
             cls._validate_player_id(player_id)
             
-            async with DatabaseService.get_transaction() as session:
+            async with DatabaseService.get_read_session() as session:
                 element_progress = {}
                 
                 for element in Elements.get_all():
@@ -221,7 +223,7 @@ class CollectionService(BaseService):
         async def _operation():
             cls._validate_player_id(player_id)
             
-            async with DatabaseService.get_transaction() as session:
+            async with DatabaseService.get_read_session() as session:
                 tier_progress = {}
                 
                 for tier_num, tier_data in Tiers.get_all().items():
@@ -312,39 +314,30 @@ class CollectionService(BaseService):
                 limit = max_limit
             cls._validate_positive_int(limit, "limit")
             
-            async with DatabaseService.get_transaction() as session:
-                # Get owned Esprit base IDs
-                owned_stmt = select(Esprit.esprit_base_id).where(Esprit.owner_id == player_id)  # type: ignore
-                owned_results = await session.execute(owned_stmt)
-                owned_ids = [row[0] for row in owned_results.all()]
-                
-                # Get missing Esprits
-                stmt = select(EspritBase)
-                
-                # Apply missing filter
-                if owned_ids:
-                    stmt = stmt.where(~EspritBase.id.in_(owned_ids))  # type: ignore
-                
-                # Apply other filters with validation
-                if element:
-                    element_obj = Elements.from_string(element)
-                    if not element_obj:
-                        raise ValueError(f"Invalid element: {element}")
-                    stmt = stmt.where(EspritBase.element == element_obj.name)  # type: ignore
-                
-                if tier is not None:
-                    if not Tiers.is_valid(tier):
-                        raise ValueError(f"Invalid tier: {tier}")
-                    stmt = stmt.where(EspritBase.base_tier == tier)  # type: ignore
-                
-                # Order and limit
-                stmt = stmt.order_by(EspritBase.base_tier.desc(), EspritBase.name).limit(limit)
-                
-                results = (await session.execute(stmt)).all()
+            # Validate filters before touching the catalog
+            if element and not Elements.from_string(element):
+                raise ValueError(f"Invalid element: {element}")
+            if tier is not None and not Tiers.is_valid(tier):
+                raise ValueError(f"Invalid tier: {tier}")
+            
+            # Missing = catalog filter mask AND NOT owned bitset, ordered like the old query
+            snapshot, owned = await OwnershipBitsets.owned_mask(player_id)
+            mask = EspritSearchIndex.filter_mask(
+                snapshot, element=element, tiers=[tier] if tier is not None else None
+            ) & ~owned
+            entries = sorted(
+                (snapshot.entries[pos] for pos in EspritSearchIndex.positions(mask)),
+                key=lambda entry: (-entry.tier, entry.name)
+            )[:limit]
+            missing_ids = [entry.id for entry in entries]
+            
+            async with DatabaseService.get_read_session() as session:
+                stmt = select(EspritBase).where(EspritBase.id.in_(missing_ids))  # type: ignore
+                by_id = {base.id: base for base in (await session.execute(stmt)).scalars().all()}
+                results = [by_id[base_id] for base_id in missing_ids if base_id in by_id]
                 
                 missing_esprits = []
-                for result in results:
-                    base = result[0]
+                for base in results:
                     missing_esprits.append({
                         "id": base.id,
                         "name": base.name,
@@ -369,7 +362,7 @@ class CollectionService(BaseService):
             cls._validate_player_id(player_id)
             
             # Get current unique count
-            async with DatabaseService.get_transaction() as session:
+            async with DatabaseService.get_read_session() as session:
                 count_stmt = select(func.count()).select_from(Esprit).where(Esprit.owner_id == player_id)  # type: ignore
                 count_result = await session.execute(count_stmt)
                 unique_count = count_result.scalar() or 0
@@ -423,7 +416,7 @@ class CollectionService(BaseService):
             
             cutoff_date = datetime.utcnow() - timedelta(days=days)
             
-            async with DatabaseService.get_transaction() as session:
+            async with DatabaseService.get_read_session() as session:
                 # Get recent Esprits
                 stmt = (select(Esprit, EspritBase)
                        .where(Esprit.owner_id == player_id)  # type: ignore
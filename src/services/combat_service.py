@@ -2,7 +2,6 @@
 
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
-from enum import Enum
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import random
@@ -11,6 +10,8 @@ from src.services.base_service import BaseService, ServiceResult
 from src.services.power_service import PowerService
 from src.services.team_service import TeamService
 from src.services.ability_service import AbilityService
+from src.domain import combat_formulas
+from src.domain.combat_formulas import EffectType
 from src.database.models import Player, Esprit, EspritBase
 from src.utils.database_service import DatabaseService
 from src.utils.transaction_logger import transaction_logger, TransactionType
@@ -18,15 +19,6 @@ from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-class EffectType(Enum):
-    """Types of status effects"""
-    BUFF = "buff"
-    DEBUFF = "debuff"
-    DOT = "damage_over_time"
-    HOT = "heal_over_time"
-    SPECIAL = "special"
-    ADVANCED = "advanced"
-
 @dataclass
 class StatusEffect:
     """Individual status effect"""
@@ -99,8 +91,8 @@ class CombatState:
     
     # Advanced combat mechanics
     overcharge_next_turn: bool = False
-    overcharge_damage_multiplier: float = 1.5
-    overcharge_stamina_multiplier: float = 2.0
+    overcharge_damage_multiplier: float = combat_formulas.OVERCHARGE_DAMAGE_MULTIPLIER
+    overcharge_stamina_multiplier: float = combat_formulas.OVERCHARGE_STAMINA_MULTIPLIER
     
     # Element transformation
     transformation_active: bool = False
@@ -144,122 +136,9 @@ class CombatResult:
 class CombatService(BaseService):
     """Complete combat orchestration service with all effects"""
     
-    # === STATUS EFFECT DEFINITIONS ===
-    EFFECT_DEFINITIONS = {
-        # Basic DOT/HOT effects
-        "burn": {
-            "name": "Burning",
-            "type": EffectType.DOT,
-            "description": "Takes fire damage each turn",
-            "max_stacks": 3,
-            "base_damage_percent": 0.1
-        },
-        "poison": {
-            "name": "Poisoned", 
-            "type": EffectType.DOT,
-            "description": "Takes poison damage each turn",
-            "max_stacks": 5,
-            "base_damage_percent": 0.08
-        },
-        "regeneration": {
-            "name": "Regenerating",
-            "type": EffectType.HOT,
-            "description": "Restores health each turn",
-            "max_stacks": 1,
-            "base_heal_percent": 0.05
-        },
-        
-        # Basic buffs/debuffs
-        "attack_boost": {
-            "name": "Attack Boost",
-            "type": EffectType.BUFF,
-            "description": "Increased attack power",
-            "max_stacks": 1,
-            "stat_modifiers": {"attack_multiplier": 1.2}
-        },
-        "weakened": {
-            "name": "Weakened",
-            "type": EffectType.DEBUFF,
-            "description": "Reduced attack power", 
-            "max_stacks": 1,
-            "stat_modifiers": {"attack_multiplier": 0.7}
-        }
-    }
-    
-    # === ADVANCED EFFECT DEFINITIONS WITH TIER SCALING ===
-    ADVANCED_EFFECTS = {
-        "elemental_weakness": {
-            "name": "Elemental Weakness",
-            "description": "Next opposing element attack deals {multiplier}x damage",
-            "duration": 1,
-            "base_multiplier": 2.0,
-            "tier_scaling": 0.1
-        },
-        "vulnerability_mark": {
-            "name": "Vulnerability Mark",
-            "description": "Increases damage taken by {percent}% per stack",
-            "duration": 3,
-            "base_percent": 16,
-            "tier_scaling": 1.0,
-            "max_stacks_base": 5
-        },
-        "power_siphon": {
-            "name": "Power Siphon",
-            "description": "Steals {percent}% attack per turn",
-            "duration": 4,
-            "base_percent": 5.5,
-            "tier_scaling": 0.5
-        },
-        "berserker_rage": {
-            "name": "Berserker Rage",
-            "description": "Damage increases by {percent}% each turn",
-            "duration": 4,
-            "base_percent": 15,
-            "tier_scaling": 0.5
-        },
-        "perfect_counter": {
-            "name": "Perfect Counter",
-            "description": "Next attack reflects {percent}% damage",
-            "duration": 2,
-            "base_percent": 80,
-            "tier_scaling": 2.0
-        },
-        "overcharge": {
-            "name": "Overcharge",
-            "description": "Next attack deals {multiplier}x damage but costs 2x stamina",
-            "duration": 1,
-            "base_multiplier": 1.5,
-            "tier_scaling": 0.05
-        },
-        "temporal_shift": {
-            "name": "Temporal Shift",
-            "description": "Cooldowns reduced by {reduction} turns",
-            "duration": 1,
-            "base_reduction": 1,
-            "tier_scaling": 0.1
-        },
-        "elemental_resonance": {
-            "name": "Elemental Resonance",
-            "description": "All abilities enhanced with {element} properties",
-            "duration": 3,
-            "base_power": 1.0,
-            "tier_scaling": 0.1
-        },
-        "counter_stance": {
-            "name": "Counter Stance",
-            "description": "Automatically counterattacks for {percent}% damage",
-            "duration": 3,
-            "base_percent": 50,
-            "tier_scaling": 1.0
-        },
-        "mana_burn": {
-            "name": "Mana Burn",
-            "description": "Reduces enemy resource generation by {percent}%",
-            "duration": 3,
-            "base_percent": 30,
-            "tier_scaling": 1.0
-        }
-    }
+    # Effect tables live in the shared combat core so the simulator tunes the same data
+    EFFECT_DEFINITIONS = combat_formulas.EFFECT_DEFINITIONS
+    ADVANCED_EFFECTS = combat_formulas.ADVANCED_EFFECTS
 
     @classmethod
     async def start_boss_encounter(
@@ -381,7 +260,9 @@ class CombatService(BaseService):
                 boss_action = await cls._process_boss_action(combat_state)
                 if boss_action and boss_action.damage > 0:
                     # Apply damage to player (through defense calculation)
-                    actual_damage = max(1, boss_action.damage - combat_state.player_total_defense // 2)
+                    actual_damage = combat_formulas.damage_after_defense(
+                        boss_action.damage, combat_state.player_total_defense
+                    )
                     combat_state.total_damage_taken += actual_damage
                 
                 # Tick cooldowns and turn counter
@@ -444,8 +325,9 @@ class CombatService(BaseService):
         """Process leader basic attack"""
         
         # Check stamina cost (apply overcharge if active)
-        base_stamina_cost = 1
-        stamina_cost = int(base_stamina_cost * combat_state.overcharge_stamina_multiplier) if combat_state.overcharge_next_turn else base_stamina_cost
+        stamina_cost = combat_formulas.stamina_cost(
+            combat_formulas.LEADER_BASIC_STAMINA_COST, combat_state.overcharge_next_turn
+        )
         
         if player.stamina < stamina_cost:
             return CombatAction(
@@ -474,7 +356,7 @@ class CombatService(BaseService):
         
         # Apply overcharge if active
         if combat_state.overcharge_next_turn:
-            base_damage = int(base_damage * combat_state.overcharge_damage_multiplier)
+            base_damage = combat_formulas.apply_overcharge(base_damage, True)
             combat_state.overcharge_next_turn = False  # Reset overcharge
         
         return CombatAction(
@@ -498,8 +380,9 @@ class CombatService(BaseService):
         """Process leader ultimate ability"""
         
         # Check stamina cost
-        base_stamina_cost = 2
-        stamina_cost = int(base_stamina_cost * combat_state.overcharge_stamina_multiplier) if combat_state.overcharge_next_turn else base_stamina_cost
+        stamina_cost = combat_formulas.stamina_cost(
+            combat_formulas.LEADER_ULTIMATE_STAMINA_COST, combat_state.overcharge_next_turn
+        )
         
         if player.stamina < stamina_cost:
             return CombatAction(
@@ -528,7 +411,7 @@ class CombatService(BaseService):
         
         # Apply overcharge if active
         if combat_state.overcharge_next_turn:
-            base_damage = int(base_damage * combat_state.overcharge_damage_multiplier)
+            base_damage = combat_formulas.apply_overcharge(base_damage, True)
             combat_state.overcharge_next_turn = False
         
         return CombatAction(
@@ -552,7 +435,7 @@ class CombatService(BaseService):
         """Process support member action"""
         
         # Check stamina cost
-        stamina_cost = 1
+        stamina_cost = combat_formulas.SUPPORT_STAMINA_COST
         if player.stamina < stamina_cost:
             return CombatAction(
                 action_type="failed",
@@ -591,7 +474,7 @@ class CombatService(BaseService):
         
         # Support skills usually provide buffs/healing, minimal damage
         support_damage = cls._calculate_base_damage(
-            combat_state.player_total_attack // 2,
+            combat_formulas.support_attack(combat_state.player_total_attack),
             combat_state.boss_defense,
             skill.get("power", 80)
         )
@@ -615,20 +498,19 @@ class CombatService(BaseService):
         # Boss AI decision making with random effects
         boss_effects = []
         
-        if hp_percent < 0.25:
+        base_damage = combat_formulas.boss_attack_damage(combat_state.player_total_attack, hp_percent)
+        
+        if hp_percent < combat_formulas.BOSS_DESPERATE_THRESHOLD:
             # Desperate - high damage + debuffs
-            base_damage = int(combat_state.player_total_attack * 0.4)
             description = f"💢 {combat_state.boss_name} unleashes a desperate attack!"
             boss_effects = ["vulnerability_mark", "weakened"]
-        elif hp_percent < 0.5:
+        elif hp_percent < combat_formulas.BOSS_AGGRESSIVE_THRESHOLD:
             # Aggressive - medium damage + some effects
-            base_damage = int(combat_state.player_total_attack * 0.3)
             description = f"⚔️ {combat_state.boss_name} strikes back fiercely!"
-            if random.random() < 0.3:
+            if random.random() < combat_formulas.BOSS_AGGRESSIVE_BURN_CHANCE:
                 boss_effects = ["burn"]
         else:
             # Normal - standard damage
-            base_damage = int(combat_state.player_total_attack * 0.2)
             description = f"🗡️ {combat_state.boss_name} attacks!"
         
         return CombatAction(
@@ -654,12 +536,7 @@ class CombatService(BaseService):
             effect_def = cls.ADVANCED_EFFECTS[effect_name]
             
             # Calculate tier-scaled values
-            if "base_multiplier" in effect_def:
-                scaled_value = effect_def["base_multiplier"] + (source_tier * effect_def.get("tier_scaling", 0))
-            elif "base_percent" in effect_def:
-                scaled_value = effect_def["base_percent"] + (source_tier * effect_def.get("tier_scaling", 0))
-            else:
-                scaled_value = 1.0
+            scaled_value = combat_formulas.scale_effect_value(effect_def, source_tier)
             
             # Apply the effect based on its type
             if effect_name == "overcharge":
@@ -696,8 +573,7 @@ class CombatService(BaseService):
         """Process combat victory and rewards"""
         
         # Basic reward calculation
-        base_revies = 200 + (combat_state.turn_count * 10)
-        base_xp = 50 + (combat_state.turn_count * 5)
+        base_revies, base_xp = combat_formulas.victory_rewards(combat_state.turn_count)
         
         # Apply rewards
         player.revies += base_revies
@@ -725,5 +601,4 @@ class CombatService(BaseService):
     @classmethod
     def _calculate_base_damage(cls, attack: int, defense: int, power: int) -> int:
         """Calculate base damage from attack, defense, and ability power"""
-        base = (attack * power // 100) - (defense // 2)
-        return max(1, base)  # Minimum 1 damage
\ No newline at end of file
+        return combat_formulas.calculate_base_damage(attack, defense, power)
\ No newline at end of file
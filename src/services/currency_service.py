@@ -1,7 +1,7 @@
 # src/services/currency_service.py
 from dataclasses import dataclass
 from typing import Dict, Any, List, Optional
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update
 from datetime import datetime
 
 from src.services.base_service import BaseService, ServiceResult
@@ -82,26 +82,10 @@ class CurrencyService(BaseService):
             max_balance = currency_limits.get("max_balance", 999999999)
             
             async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
-                
-                old_balance = getattr(player, currency)
-                
-                # Check balance limits
-                if old_balance + amount > max_balance:
+                new_balance = await cls._conditional_adjust(session, player_id, currency, amount, max_balance=max_balance)
+                if new_balance is None:
                     raise ValueError(f"Currency addition would exceed max balance of {max_balance:,}")
-                
-                # Add currency
-                new_balance = old_balance + amount
-                setattr(player, currency, new_balance)
-                
-                # Update earning totals
-                if currency == cls.PRIMARY_CURRENCY:
-                    player.total_revies_earned += amount
-                elif currency == cls.PREMIUM_CURRENCY:
-                    player.total_erythl_earned += amount
-                
-                player.update_activity()
+                old_balance = new_balance - amount
                 await session.commit()
                 
                 # Log transaction
@@ -147,21 +131,14 @@ class CurrencyService(BaseService):
                 raise ValueError("Reason cannot be empty")
             
             async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
-                
-                old_balance = getattr(player, currency)
-                
-                # Check sufficient funds
-                if not allow_negative and old_balance < amount:
+                new_balance = await cls._conditional_adjust(session, player_id, currency, -amount, allow_negative=allow_negative)
+                if new_balance is None:
+                    current = (await session.execute(
+                        select(getattr(Player, currency)).where(Player.id == player_id)  # type: ignore
+                    )).scalar_one()
                     currency_display = cls._get_currency_display_name(currency)
-                    raise ValueError(f"Insufficient {currency_display}. Need {amount:,}, have {old_balance:,}")
-                
-                # Deduct currency
-                new_balance = old_balance - amount
-                setattr(player, currency, new_balance)
-                
-                player.update_activity()
+                    raise ValueError(f"Insufficient {currency_display}. Need {amount:,}, have {current:,}")
+                old_balance = new_balance + amount
                 await session.commit()
                 
                 # Log transaction
@@ -193,6 +170,42 @@ class CurrencyService(BaseService):
                 
         return await cls._safe_execute(_operation, "spend currency")
     
+    @classmethod
+    async def _conditional_adjust(cls, session, player_id: int, currency: str, delta: int,
+                                  allow_negative: bool = False, max_balance: Optional[int] = None) -> Optional[int]:
+        """
+        Single-statement balance change: the guard and the write happen in one
+        UPDATE ... RETURNING, so no SELECT ... FOR UPDATE round trip holds the row.
+        Returns the new balance, or None when the guard rejected the change.
+        Multi-resource operations (transfers, purchases) keep the locking path.
+        """
+        column = getattr(Player, currency)
+        values: Dict[str, Any] = {currency: column + delta, "last_active": datetime.utcnow()}
+        guards = [Player.id == player_id]
+        
+        if delta < 0 and not allow_negative:
+            guards.append(column >= -delta)
+        if delta > 0:
+            if max_balance is not None:
+                guards.append(column + delta <= max_balance)
+            if currency == cls.PRIMARY_CURRENCY:
+                values["total_revies_earned"] = Player.total_revies_earned + delta
+            elif currency == cls.PREMIUM_CURRENCY:
+                values["total_erythl_earned"] = Player.total_erythl_earned + delta
+        
+        stmt = (
+            update(Player)
+            .where(*guards)  # type: ignore
+            .values(values)
+            .returning(column)
+            .execution_options(synchronize_session=False)
+        )
+        new_balance = (await session.execute(stmt)).scalar()
+        if new_balance is None:
+            # Distinguish a missing player (NoResultFound, as before) from a rejected guard
+            (await session.execute(select(Player.id).where(Player.id == player_id))).scalar_one()  # type: ignore
+        return new_balance
+    
     @classmethod
     async def transfer_currency(cls, from_player_id: int, to_player_id: int, currency: str, 
                               amount: int, reason: str) -> ServiceResult[Dict[str, CurrencyTransaction]]:
@@ -320,7 +333,7 @@ class CurrencyService(BaseService):
                 cls._validate_currency(currency)
             
             async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id)  # type: ignore
+                stmt = select(Player).options(Player.projection("currency")).where(Player.id == player_id)  # type: ignore
                 player = (await session.execute(stmt)).scalar_one()
                 
                 affordability = {}
@@ -459,7 +472,7 @@ class CurrencyService(BaseService):
             
             cls._validate_positive_int(capped_limit, "limit")
             
-            async with DatabaseService.get_transaction() as session:
+            async with DatabaseService.get_read_session() as session:
                 # Order by the specified currency
                 if currency == "revies":
                     stmt = select(Player).order_by(Player.revies.desc()).limit(capped_limit)
@@ -489,7 +502,7 @@ class CurrencyService(BaseService):
     async def get_economy_stats(cls) -> ServiceResult[Dict[str, Any]]:
         """Get overall economy statistics"""
         async def _operation():
-            async with DatabaseService.get_transaction() as session:
+            async with DatabaseService.get_read_session() as session:
                 # Get total players
                 total_players_stmt = select(func.count()).select_from(Player)  # type: ignore
                 total_players = (await session.execute(total_players_stmt)).scalar() or 0
@@ -8,6 +8,7 @@ from src.services.base_service import BaseService, ServiceResult
 from src.database.models.player import Player
 from src.database.models.esprit_base import EspritBase
 from src.utils.database_service import DatabaseService
+from src.utils.jsonb_counters import JsonbCounters
 from src.utils.transaction_logger import transaction_logger, TransactionType
 from src.utils.config_manager import ConfigManager
 
@@ -89,14 +90,16 @@ class EchoService(BaseService):
                 raise ValueError(f"Invalid echo type. Must be one of: {valid_types}")
             
             async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
+                # Consume the echo/key server-side first; the guarded UPDATE also takes the row lock
+                consumed_item = "echo_key" if use_echo_key else echo_type
+                if await JsonbCounters.apply(session, player_id, "inventory", {consumed_item: -1}) is None:
+                    raise ValueError("No echo keys available" if use_echo_key else f"No {echo_type} in inventory")
                 
-                if player.inventory is None or player.inventory.get(echo_type, 0) == 0:
+                if use_echo_key and not await JsonbCounters.get(session, player_id, "inventory", echo_type):
                     raise ValueError(f"No {echo_type} in inventory")
                 
-                if use_echo_key and player.inventory.get("echo_key", 0) == 0:
-                    raise ValueError("No echo keys available")
+                stmt = select(Player).where(Player.id == player_id).execution_options(populate_existing=True)  # type: ignore
+                player = (await session.execute(stmt)).scalar_one()
                 
                 # Get all esprit bases
                 bases_stmt = select(EspritBase)
@@ -117,14 +120,6 @@ class EchoService(BaseService):
                 else:
                     raise ValueError("Invalid echo result format")
                 
-                # Consume echo/key
-                if not use_echo_key:
-                    player.inventory[echo_type] -= 1
-                else:
-                    player.inventory["echo_key"] -= 1
-                
-                flag_modified(player, "inventory")
-                
                 # Add esprit to collection
                 from src.services.esprit_service import EspritService
                 add_result = await EspritService.add_to_collection(player_id, selected_base.id, 1)
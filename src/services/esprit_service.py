@@ -1,7 +1,10 @@
 # src/services/esprit_service.py
+from datetime import datetime
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from sqlalchemy import select, func, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import load_only
 from sqlalchemy.orm.attributes import flag_modified
 
 from src.services.base_service import BaseService, ServiceResult
@@ -10,6 +13,8 @@ from src.database.models.esprit import Esprit
 from src.database.models.esprit_base import EspritBase
 from src.database.models.player import Player
 from src.utils.database_service import DatabaseService
+from src.utils import collection_cursor
+from src.utils.ownership_bitset import OwnershipBitsets
 from src.utils.transaction_logger import transaction_logger, TransactionType
 from src.utils.config_manager import ConfigManager
 
@@ -30,40 +35,24 @@ class EspritService(BaseService):
                 base_stmt = select(EspritBase).where(EspritBase.id == esprit_base_id)  # type: ignore
                 base = (await session.execute(base_stmt)).scalar_one()
                 
-                # Check if player already owns this Esprit type
-                existing_stmt = select(Esprit).where(
-                    and_(
-                        Esprit.owner_id == player_id,  # type: ignore
-                        Esprit.esprit_base_id == esprit_base_id  # type: ignore
-                    )
-                ).with_for_update()
-                
-                existing_stack = (await session.execute(existing_stmt)).scalar_one_or_none()
+                # Create or stack in one statement: concurrent first captures of a base
+                # both land on uq_esprit_owner_base instead of racing to INSERT
+                now = datetime.utcnow()
+                insert_stmt = pg_insert(Esprit).values(
+                    esprit_base_id=esprit_base_id, owner_id=player_id, quantity=quantity,
+                    tier=base.base_tier, element=base.element, awakening_level=0,
+                    created_at=now, last_modified=now
+                )
+                upsert = insert_stmt.on_conflict_do_update(
+                    index_elements=["owner_id", "esprit_base_id"],
+                    set_={"quantity": Esprit.quantity + insert_stmt.excluded.quantity, "last_modified": now}
+                ).returning(Esprit)
+                # populate_existing refreshes a copy of the stack the caller may already hold
+                stack = (await session.execute(upsert, execution_options={"populate_existing": True})).scalar_one()
                 
-                if existing_stack:
-                    # Add to existing stack
-                    old_quantity = existing_stack.quantity
-                    existing_stack.quantity += quantity
-                    existing_stack.last_modified = func.now()
-                    
-                    esprit_id = existing_stack.id
-                    is_new = False
-                else:
-                    # Create new stack
-                    new_stack = Esprit(
-                        esprit_base_id=esprit_base_id,
-                        owner_id=player_id,
-                        quantity=quantity,
-                        tier=base.base_tier,
-                        element=base.element,
-                        awakening_level=0
-                    )
-                    session.add(new_stack)
-                    await session.flush()  # Get the ID
-                    
-                    esprit_id = new_stack.id
-                    old_quantity = 0
-                    is_new = True
+                esprit_id = stack.id
+                old_quantity = stack.quantity - quantity
+                is_new = old_quantity == 0
                 
                 # Update player statistics
                 player_stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
@@ -81,8 +70,10 @@ class EspritService(BaseService):
                 })
                 
                 # Invalidate caches
-                await CacheService.invalidate_player_power(player_id)
-                await CacheService.invalidate_collection_stats(player_id)
+                await DatabaseService.after_commit(CacheService.invalidate_player_power, player_id)
+                await DatabaseService.after_commit(CacheService.invalidate_collection_stats, player_id)
+                if is_new:
+                    await DatabaseService.after_commit(OwnershipBitsets.changed, player_id)
                 
                 return {
                     "esprit_id": esprit_id, "esprit_name": base.name,
@@ -217,6 +208,133 @@ class EspritService(BaseService):
                 }
         return await cls._safe_execute(_operation, "get player collection")
     
+    @classmethod
+    async def get_collection_page(cls, player_id: int, sort_by: str = "tier_desc",
+                                  after: Optional[str] = None, before: Optional[str] = None,
+                                  limit: int = 10, include_total: bool = False) -> ServiceResult[Dict[str, Any]]:
+        """
+        One keyset page of a player's collection, sorted server-side.
+
+        Pass the returned next_cursor as after (or prev_cursor as before) to turn the
+        page; cost is O(limit) regardless of how deep the page is.
+        """
+        async def _operation():
+            cls._validate_player_id(player_id)
+            if not 1 <= limit <= 50:
+                raise ValueError("limit must be between 1 and 50")
+            
+            where, reverse = collection_cursor.resolve(sort_by, after, before)
+            
+            async with DatabaseService.get_read_session() as session:
+                stmt = (
+                    select(Esprit, EspritBase, *collection_cursor.key_columns(sort_by))
+                    .join(EspritBase, Esprit.esprit_base_id == EspritBase.id)  # type: ignore
+                    .where(Esprit.owner_id == player_id)  # type: ignore
+                    .order_by(*collection_cursor.order_by(sort_by, reverse))
+                    .limit(limit + 1)
+                )
+                if where is not None:
+                    stmt = stmt.where(where)
+                
+                rows = list((await session.execute(stmt)).all())
+                has_more = len(rows) > limit
+                rows = rows[:limit]
+                if reverse:
+                    rows.reverse()
+                
+                total_count = None
+                if include_total:
+                    count_stmt = select(func.count(Esprit.id)).where(Esprit.owner_id == player_id)  # type: ignore
+                    total_count = (await session.execute(count_stmt)).scalar() or 0
+            
+            esprits = []
+            for row in rows:
+                esprit, base = row.Esprit, row.EspritBase
+                power = esprit.get_individual_power(base)
+                esprits.append({
+                    "esprit_id": esprit.id, "name": base.name,
+                    "element": esprit.element, "tier": esprit.tier,
+                    "quantity": esprit.quantity, "awakening_level": esprit.awakening_level,
+                    "atk": power["atk"], "def": power["def"], "hp": power["hp"]
+                })
+            
+            # Walking backwards, "more" lies before the page and the page we came from lies after it
+            has_next = has_more if not reverse else True
+            has_prev = has_more if reverse else after is not None
+            return {
+                "esprits": esprits,
+                "next_cursor": collection_cursor.boundary(rows[-1], sort_by) if rows and has_next else None,
+                "prev_cursor": collection_cursor.boundary(rows[0], sort_by) if rows and has_prev else None,
+                "total_count": total_count,
+                "sort_by": sort_by
+            }
+        return await cls._safe_execute(_operation, "get collection page")
+    
+    @staticmethod
+    def _collection_power_payload(skill_bonuses: Dict[str, float], esprit_rows) -> Dict[str, Any]:
+        """Power breakdown cached under player_power; shared by the single-player path and cache warming"""
+        power_by_element = {}
+        power_by_tier = {}
+        total_base_power = {"atk": 0, "def": 0, "hp": 0}
+        esprit_contributions = []
+        
+        for esprit, base in esprit_rows:
+            individual_power = esprit.get_individual_power(base)
+            stack_power = esprit.get_stack_total_power(base)
+            
+            # By element
+            element = esprit.element
+            if element not in power_by_element:
+                power_by_element[element] = {"atk": 0, "def": 0, "hp": 0, "count": 0}
+            
+            power_by_element[element]["atk"] += stack_power["atk"]
+            power_by_element[element]["def"] += stack_power["def"]
+            power_by_element[element]["hp"] += stack_power["hp"]
+            power_by_element[element]["count"] += esprit.quantity
+            
+            # By tier
+            tier = esprit.tier
+            if tier not in power_by_tier:
+                power_by_tier[tier] = {"atk": 0, "def": 0, "hp": 0, "count": 0}
+            
+            power_by_tier[tier]["atk"] += stack_power["atk"]
+            power_by_tier[tier]["def"] += stack_power["def"]
+            power_by_tier[tier]["hp"] += stack_power["hp"]
+            power_by_tier[tier]["count"] += esprit.quantity
+            
+            # Total base power
+            total_base_power["atk"] += stack_power["atk"]
+            total_base_power["def"] += stack_power["def"]
+            total_base_power["hp"] += stack_power["hp"]
+            
+            # Individual contributions
+            esprit_contributions.append({
+                "name": base.name, "element": esprit.element, "tier": esprit.tier,
+                "awakening": esprit.awakening_level, "quantity": esprit.quantity,
+                "individual_power": individual_power, "stack_power": stack_power,
+                "efficiency": (individual_power["atk"] + individual_power["def"] + individual_power["hp"]) / max(esprit.tier, 1)
+            })
+        
+        # Apply skill bonuses
+        final_power = {
+            "atk": int(total_base_power["atk"] * (1 + skill_bonuses["bonus_attack_percent"])),
+            "def": int(total_base_power["def"] * (1 + skill_bonuses["bonus_defense_percent"])),
+            "hp": total_base_power["hp"]  # HP not affected by skill bonuses
+        }
+        
+        # Sort contributions by total stack power
+        esprit_contributions.sort(key=lambda x: sum(x["stack_power"].values()), reverse=True)
+        
+        return {
+            "total_power": final_power, "base_power": total_base_power,
+            "skill_bonuses": skill_bonuses, "power_by_element": power_by_element,
+            "power_by_tier": power_by_tier, "top_contributors": esprit_contributions[:10],
+            "total_esprits": len(esprit_contributions),
+            "total_quantity": sum(c["quantity"] for c in esprit_contributions),
+            "average_tier": round(sum(c["tier"] * c["quantity"] for c in esprit_contributions) / 
+                                max(sum(c["quantity"] for c in esprit_contributions), 1), 2)
+        }
+
     @classmethod
     async def calculate_collection_power(cls, player_id: int) -> ServiceResult[Dict[str, Any]]:
         """Calculate total collection power with detailed breakdown"""
@@ -242,68 +360,7 @@ class EspritService(BaseService):
                 )
                 esprit_results = (await session.execute(esprits_stmt)).all()
                 
-                power_by_element = {}
-                power_by_tier = {}
-                total_base_power = {"atk": 0, "def": 0, "hp": 0}
-                esprit_contributions = []
-                
-                for esprit, base in esprit_results:
-                    individual_power = esprit.get_individual_power(base)
-                    stack_power = esprit.get_stack_total_power(base)
-                    
-                    # By element
-                    element = esprit.element
-                    if element not in power_by_element:
-                        power_by_element[element] = {"atk": 0, "def": 0, "hp": 0, "count": 0}
-                    
-                    power_by_element[element]["atk"] += stack_power["atk"]
-                    power_by_element[element]["def"] += stack_power["def"]
-                    power_by_element[element]["hp"] += stack_power["hp"]
-                    power_by_element[element]["count"] += esprit.quantity
-                    
-                    # By tier
-                    tier = esprit.tier
-                    if tier not in power_by_tier:
-                        power_by_tier[tier] = {"atk": 0, "def": 0, "hp": 0, "count": 0}
-                    
-                    power_by_tier[tier]["atk"] += stack_power["atk"]
-                    power_by_tier[tier]["def"] += stack_power["def"]
-                    power_by_tier[tier]["hp"] += stack_power["hp"]
-                    power_by_tier[tier]["count"] += esprit.quantity
-                    
-                    # Total base power
-                    total_base_power["atk"] += stack_power["atk"]
-                    total_base_power["def"] += stack_power["def"]
-                    total_base_power["hp"] += stack_power["hp"]
-                    
-                    # Individual contributions
-                    esprit_contributions.append({
-                        "name": base.name, "element": esprit.element, "tier": esprit.tier,
-                        "awakening": esprit.awakening_level, "quantity": esprit.quantity,
-                        "individual_power": individual_power, "stack_power": stack_power,
-                        "efficiency": (individual_power["atk"] + individual_power["def"] + individual_power["hp"]) / max(esprit.tier, 1)
-                    })
-                
-                # Apply skill bonuses
-                skill_bonuses = player.get_skill_bonuses()
-                final_power = {
-                    "atk": int(total_base_power["atk"] * (1 + skill_bonuses["bonus_attack_percent"])),
-                    "def": int(total_base_power["def"] * (1 + skill_bonuses["bonus_defense_percent"])),
-                    "hp": total_base_power["hp"]  # HP not affected by skill bonuses
-                }
-                
-                # Sort contributions by total stack power
-                esprit_contributions.sort(key=lambda x: sum(x["stack_power"].values()), reverse=True)
-                
-                result = {
-                    "total_power": final_power, "base_power": total_base_power,
-                    "skill_bonuses": skill_bonuses, "power_by_element": power_by_element,
-                    "power_by_tier": power_by_tier, "top_contributors": esprit_contributions[:10],
-                    "total_esprits": len(esprit_contributions),
-                    "total_quantity": sum(c["quantity"] for c in esprit_contributions),
-                    "average_tier": round(sum(c["tier"] * c["quantity"] for c in esprit_contributions) / 
-                                        max(sum(c["quantity"] for c in esprit_contributions), 1), 2)
-                }
+                result = cls._collection_power_payload(player.get_skill_bonuses(), esprit_results)
                 
                 # Cache for 5 minutes
                 await CacheService.cache_player_power(player_id, result)
@@ -311,6 +368,85 @@ class EspritService(BaseService):
                 return result
         return await cls._safe_execute(_operation, "calculate collection power")
     
+    @staticmethod
+    def _collection_groups_stmt(player_ids: List[int]):
+        """Stack count and copies per (owner, element, tier, awakening); everything collection stats need in one scan"""
+        return select(
+            Esprit.owner_id,  # type: ignore
+            Esprit.element,  # type: ignore
+            Esprit.tier,  # type: ignore
+            Esprit.awakening_level,  # type: ignore
+            func.count().label('stack_count'),  # type: ignore
+            func.coalesce(func.sum(Esprit.quantity), 0).label('total_quantity')  # type: ignore
+        ).where(Esprit.owner_id.in_(player_ids)).group_by(  # type: ignore
+            Esprit.owner_id, Esprit.element, Esprit.tier, Esprit.awakening_level  # type: ignore
+        )
+    
+    @staticmethod
+    def _collection_stats_payload(groups) -> Dict[str, Any]:
+        """Collection stats cached under collection_stats, folded from _collection_groups_stmt rows"""
+        unique_count = total_quantity = 0
+        element_stats: Dict[str, Dict[str, int]] = {}
+        tier_stats: Dict[int, Dict[str, int]] = {}
+        awakened_stats: Dict[int, Dict[str, int]] = {}
+        
+        for row in groups:
+            stacks, quantity = int(row.stack_count), int(row.total_quantity)
+            unique_count += stacks
+            total_quantity += quantity
+            
+            if row.element:
+                element = element_stats.setdefault(row.element.lower(), {"unique": 0, "total": 0})
+                element["unique"] += stacks
+                element["total"] += quantity
+            
+            tier = tier_stats.setdefault(row.tier, {"unique": 0, "total": 0})
+            tier["unique"] += stacks
+            tier["total"] += quantity
+            
+            if row.awakening_level > 0:
+                awakened = awakened_stats.setdefault(row.awakening_level, {"stacks": 0, "total": 0})
+                awakened["stacks"] += stacks
+                awakened["total"] += quantity
+        
+        return {
+            "unique_esprits": unique_count, "total_quantity": total_quantity,
+            "by_element": element_stats,
+            "by_tier": {f"tier_{tier}": tier_stats[tier] for tier in sorted(tier_stats)},
+            "awakened": {f"star_{level}": awakened_stats[level] for level in sorted(awakened_stats)}
+        }
+    
+    @classmethod
+    async def bulk_collection_power(cls, session, player_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """player_power payloads for many players from two queries (cache warming)"""
+        players_stmt = select(Player).options(
+            load_only(Player.id, Player.allocated_skills)  # type: ignore
+        ).where(Player.id.in_(player_ids))  # type: ignore
+        players = (await session.execute(players_stmt)).scalars().all()
+        
+        rows_by_owner: Dict[int, List[Any]] = {player.id: [] for player in players}
+        esprits_stmt = select(Esprit, EspritBase).join(
+            EspritBase, Esprit.esprit_base_id == EspritBase.id  # type: ignore
+        ).options(
+            load_only(EspritBase.id, EspritBase.name, EspritBase.base_atk, EspritBase.base_def, EspritBase.base_hp)  # type: ignore
+        ).where(Esprit.owner_id.in_(player_ids))  # type: ignore
+        for esprit, base in (await session.execute(esprits_stmt)).all():
+            if esprit.owner_id in rows_by_owner:
+                rows_by_owner[esprit.owner_id].append((esprit, base))
+        
+        return {
+            player.id: cls._collection_power_payload(player.get_skill_bonuses(), rows_by_owner[player.id])
+            for player in players
+        }
+    
+    @classmethod
+    async def bulk_collection_stats(cls, session, player_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """collection_stats payloads for many players from one grouped query (cache warming)"""
+        groups_by_owner: Dict[int, List[Any]] = {player_id: [] for player_id in player_ids}
+        for row in (await session.execute(cls._collection_groups_stmt(player_ids))).all():
+            groups_by_owner[row.owner_id].append(row)
+        return {player_id: cls._collection_stats_payload(groups) for player_id, groups in groups_by_owner.items()}
+    
     @classmethod
     async def get_collection_stats(cls, player_id: int) -> ServiceResult[Dict[str, Any]]:
         """Get comprehensive collection statistics"""
@@ -322,66 +458,10 @@ class EspritService(BaseService):
             if cached.success and cached.data:
                 return cached.data
             
+            # Primary, not the replica: this result is cached, so a lagging read would stick for the TTL
             async with DatabaseService.get_session() as session:
-                # Total unique and quantity
-                total_stmt = select(
-                    func.count(Esprit.id).label('unique_count'),  # type: ignore
-                    func.coalesce(func.sum(Esprit.quantity), 0).label('total_quantity')  # type: ignore
-                ).where(Esprit.owner_id == player_id)  # type: ignore
-                
-                total_result = (await session.execute(total_stmt)).first()
-                unique_count = total_result.unique_count if total_result else 0
-                total_quantity = total_result.total_quantity if total_result else 0
-                
-                # By element
-                element_stmt = select(
-                    Esprit.element,  # type: ignore
-                    func.count().label('unique_count'),  # type: ignore
-                    func.coalesce(func.sum(Esprit.quantity), 0).label('total_quantity')  # type: ignore
-                ).where(Esprit.owner_id == player_id).group_by(Esprit.element)  # type: ignore
-                
-                element_results = (await session.execute(element_stmt)).all()
-                element_stats = {
-                    row.element.lower(): {"unique": row.unique_count, "total": row.total_quantity}
-                    for row in element_results
-                }
-                
-                # By tier
-                tier_stmt = select(
-                    Esprit.tier,  # type: ignore
-                    func.count().label('unique_count'),  # type: ignore
-                    func.coalesce(func.sum(Esprit.quantity), 0).label('total_quantity')  # type: ignore
-                ).where(Esprit.owner_id == player_id).group_by(Esprit.tier).order_by(Esprit.tier)  # type: ignore
-                
-                tier_results = (await session.execute(tier_stmt)).all()
-                tier_stats = {
-                    f"tier_{row.tier}": {"unique": row.unique_count, "total": row.total_quantity}
-                    for row in tier_results
-                }
-                
-                # Awakened stacks
-                awakened_stmt = select(
-                    Esprit.awakening_level,  # type: ignore
-                    func.count().label('stack_count'),  # type: ignore
-                    func.coalesce(func.sum(Esprit.quantity), 0).label('total_quantity')  # type: ignore
-                ).where(
-                    and_(
-                        Esprit.owner_id == player_id,  # type: ignore
-                        Esprit.awakening_level > 0  # type: ignore
-                    )
-                ).group_by(Esprit.awakening_level)
-                
-                awakened_results = (await session.execute(awakened_stmt)).all()
-                awakened_stats = {
-                    f"star_{row.awakening_level}": {"stacks": row.stack_count, "total": row.total_quantity}
-                    for row in awakened_results
-                }
-                
-                result = {
-                    "unique_esprits": unique_count, "total_quantity": total_quantity,
-                    "by_element": element_stats, "by_tier": tier_stats,
-                    "awakened": awakened_stats
-                }
+                groups = (await session.execute(cls._collection_groups_stmt([player_id]))).all()
+                result = cls._collection_stats_payload(groups)
                 
                 # Cache for 15 minutes
                 await CacheService.cache_collection_stats(player_id, result)
@@ -425,6 +505,7 @@ class EspritService(BaseService):
                 if esprit.quantity <= 0:
                     await session.delete(esprit)
                     stack_deleted = True
+                    await DatabaseService.after_commit(OwnershipBitsets.changed, player_id)
                 
                 # Update player activity
                 player_stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
@@ -443,8 +524,8 @@ class EspritService(BaseService):
                 })
                 
                 # Invalidate caches
-                await CacheService.invalidate_player_power(player_id)
-                await CacheService.invalidate_collection_stats(player_id)
+                await DatabaseService.after_commit(CacheService.invalidate_player_power, player_id)
+                await DatabaseService.after_commit(CacheService.invalidate_collection_stats, player_id)
                 
                 return {
                     "esprit_name": base.name, "quantity_removed": quantity,
@@ -1,11 +1,11 @@
 # src/services/fragment_service.py
 from typing import Dict, Any, Optional
 from sqlalchemy import select
-from sqlalchemy.orm.attributes import flag_modified
 
 from src.services.base_service import BaseService, ServiceResult
 from src.database.models.player import Player
 from src.utils.database_service import DatabaseService
+from src.utils.jsonb_counters import JsonbCounters, InsufficientCountError
 from src.utils.transaction_logger import transaction_logger, TransactionType
 from src.utils.config_manager import ConfigManager
 
@@ -23,25 +23,15 @@ class FragmentService(BaseService):
                 raise ValueError("Tier must be between 1 and 12")
             
             async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
-                
-                if player.tier_fragments is None:
-                    player.tier_fragments = {}
-                
-                tier_str = str(tier)
-                old_amount = player.tier_fragments.get(tier_str, 0)
-                player.tier_fragments[tier_str] = old_amount + amount
-                flag_modified(player, "tier_fragments")
-                player.update_activity()
+                new_amount = await JsonbCounters.increment(session, player_id, "tier_fragments", str(tier), amount)
                 await session.commit()
                 
                 transaction_logger.log_transaction(player_id, TransactionType.FRAGMENT_GAINED, {
                     "type": "tier", "tier": tier, "amount": amount, "source": source,
-                    "old_amount": old_amount, "new_amount": player.tier_fragments[tier_str]
+                    "old_amount": new_amount - amount, "new_amount": new_amount
                 })
                 
-                return {"tier": tier, "added": amount, "total": player.tier_fragments[tier_str], "source": source}
+                return {"tier": tier, "added": amount, "total": new_amount, "source": source}
         return await cls._safe_execute(_operation, "add tier fragments")
     
     @classmethod
@@ -55,26 +45,15 @@ class FragmentService(BaseService):
                 raise ValueError("Tier must be between 1 and 18")
             
             async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
-                
-                tier_str = str(tier)
-                current = player.tier_fragments.get(tier_str, 0) if player.tier_fragments else 0
-                
-                if current < amount:
-                    raise ValueError(f"Insufficient tier {tier} fragments. Need {amount}, have {current}")
-                
-                if player.tier_fragments is None:
-                    player.tier_fragments = {}
-                
-                player.tier_fragments[tier_str] = current - amount
-                flag_modified(player, "tier_fragments")
-                player.update_activity()
+                try:
+                    new_amount = await JsonbCounters.consume(session, player_id, "tier_fragments", str(tier), amount)
+                except InsufficientCountError as e:
+                    raise ValueError(f"Insufficient tier {tier} fragments. Need {amount}, have {e.available}")
                 await session.commit()
                 
                 transaction_logger.log_transaction(player_id, TransactionType.FRAGMENT_CONSUMED, {
                     "type": "tier", "tier": tier, "amount": amount, "reason": reason,
-                    "old_amount": current, "new_amount": player.tier_fragments[tier_str]
+                    "old_amount": new_amount + amount, "new_amount": new_amount
                 })
                 return True
         return await cls._safe_execute(_operation, "consume tier fragments")
@@ -92,24 +71,15 @@ class FragmentService(BaseService):
                 raise ValueError(f"Invalid element. Must be one of: {valid_elements}")
             
             async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
-                
-                if player.element_fragments is None:
-                    player.element_fragments = {}
-                
-                old_amount = player.element_fragments.get(element_key, 0)
-                player.element_fragments[element_key] = old_amount + amount
-                flag_modified(player, "element_fragments")
-                player.update_activity()
+                new_amount = await JsonbCounters.increment(session, player_id, "element_fragments", element_key, amount)
                 await session.commit()
                 
                 transaction_logger.log_transaction(player_id, TransactionType.FRAGMENT_GAINED, {
                     "type": "element", "element": element, "amount": amount, "source": source,
-                    "old_amount": old_amount, "new_amount": player.element_fragments[element_key]
+                    "old_amount": new_amount - amount, "new_amount": new_amount
                 })
                 
-                return {"element": element, "added": amount, "total": player.element_fragments[element_key], "source": source}
+                return {"element": element, "added": amount, "total": new_amount, "source": source}
         return await cls._safe_execute(_operation, "add element fragments")
     
     @classmethod
@@ -125,25 +95,15 @@ class FragmentService(BaseService):
                 raise ValueError(f"Invalid element. Must be one of: {valid_elements}")
             
             async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
-                
-                current = player.element_fragments.get(element_key, 0) if player.element_fragments else 0
-                
-                if current < amount:
-                    raise ValueError(f"Insufficient {element} fragments. Need {amount}, have {current}")
-                
-                if player.element_fragments is None:
-                    player.element_fragments = {}
-                
-                player.element_fragments[element_key] = current - amount
-                flag_modified(player, "element_fragments")
-                player.update_activity()
+                try:
+                    new_amount = await JsonbCounters.consume(session, player_id, "element_fragments", element_key, amount)
+                except InsufficientCountError as e:
+                    raise ValueError(f"Insufficient {element} fragments. Need {amount}, have {e.available}")
                 await session.commit()
                 
                 transaction_logger.log_transaction(player_id, TransactionType.FRAGMENT_CONSUMED, {
                     "type": "element", "element": element, "amount": amount, "reason": reason,
-                    "old_amount": current, "new_amount": player.element_fragments[element_key]
+                    "old_amount": new_amount + amount, "new_amount": new_amount
                 })
                 return True
         return await cls._safe_execute(_operation, "consume element fragments")
@@ -1,18 +1,26 @@
 # src/services/fusion_service.py
 from dataclasses import dataclass
-from typing import Dict, Any, Optional, List, Tuple
-from sqlalchemy import select, and_, func
+from datetime import datetime
+from typing import AbstractSet, Dict, Any, Optional, List, Set, Tuple
+from sqlalchemy import select, update, delete, and_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm.attributes import flag_modified
+import heapq
 import random
 
 from src.services.base_service import BaseService, ServiceResult
 from src.services.cache_service import CacheService
+from src.domain import economy_formulas
 from src.database.models.esprit import Esprit
 from src.database.models.esprit_base import EspritBase
 from src.database.models.player import Player
 from src.utils.database_service import DatabaseService
+from src.utils.analytics_counters import AnalyticsCounters
+from src.utils.ownership_bitset import OwnershipBitsets
 from src.utils.transaction_logger import transaction_logger, TransactionType
 from src.utils.game_constants import FUSION_CHART, get_fusion_result
+from src.utils.fusion_table import MAX_TIER, FusionTable
+from src.utils.jsonb_counters import JsonbCounters
 from src.utils.config_manager import ConfigManager
 from src.utils.logger import get_logger
 
@@ -84,8 +92,9 @@ class FusionService(BaseService):
                 if esprit1.tier != esprit2.tier:
                     raise ValueError("Esprits must be the same tier to fuse")
                 
-                # Calculate fusion cost
-                fusion_cost = cls._calculate_fusion_cost(esprit1.tier, esprit2.tier)
+                # Cost, odds and candidates are precompiled per tier
+                rates = await FusionTable.rates(esprit1.tier, esprit2.tier)
+                fusion_cost = rates.cost
                 
                 # Get player for currency check
                 player_stmt = select(Player).where(Player.id == player_id)  # type: ignore
@@ -93,27 +102,12 @@ class FusionService(BaseService):
                 
                 can_afford = player.revies >= fusion_cost
                 
-                # Get possible fusion results (tier + 1)
-                result_tier = esprit1.tier + 1
-                if result_tier > 12:  # Max tier cap
-                    raise ValueError("Cannot fuse - result would exceed maximum tier")
-                
-                # Get possible Esprits for result tier
-                tier_stmt = select(EspritBase).where(EspritBase.base_tier == result_tier)  # type: ignore
-                tier_bases = (await session.execute(tier_stmt)).scalars().all()
-                
-                possible_results = [
-                    {
-                        "id": base.id, "name": base.name, "element": base.element,
-                        "tier": base.base_tier, "rarity": base.get_rarity_name(),
-                        "image_url": base.image_url, "element_emoji": base.get_element_emoji(),
-                        "base_power": base.get_base_power()
-                    }
-                    for base in tier_bases
-                ]
+                # Possible fusion results (tier + 1)
+                result_tier = rates.result_tier
+                possible_results = await FusionTable.candidates(result_tier)
                 
                 # Calculate success rates
-                base_success_rate = cls._calculate_success_rate(esprit1.tier, esprit2.tier)
+                base_success_rate = rates.success_rate
                 fragment_bonus = fragments_amount * 10 if use_fragments else 0  # 10% per fragment
                 total_success_rate = min(base_success_rate + fragment_bonus, 100)
                 
@@ -194,16 +188,15 @@ class FusionService(BaseService):
                 if esprit1.tier != esprit2.tier:
                     raise ValueError("Esprits must be the same tier to fuse")
                 
-                result_tier = esprit1.tier + 1
-                if result_tier > 12:
-                    raise ValueError("Cannot fuse - result would exceed maximum tier")
+                rates = await FusionTable.rates(esprit1.tier, esprit2.tier)
+                result_tier = rates.result_tier
                 
                 # Get player (with lock for currency)
                 player_stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
                 player = (await session.execute(player_stmt)).scalar_one()
                 
                 # Calculate and validate costs
-                fusion_cost = cls._calculate_fusion_cost(esprit1.tier, esprit2.tier)
+                fusion_cost = rates.cost
                 if player.revies < fusion_cost:
                     raise ValueError(f"Insufficient revies. Need {fusion_cost}, have {player.revies}")
                 
@@ -229,7 +222,7 @@ class FusionService(BaseService):
                 player.revies -= fusion_cost
                 
                 # Calculate success
-                base_success_rate = cls._calculate_success_rate(esprit1.tier, esprit2.tier)
+                base_success_rate = rates.success_rate
                 fragment_bonus = fragments_amount * 10 if use_fragments else 0
                 total_success_rate = min(base_success_rate + fragment_bonus, 100)
                 
@@ -250,6 +243,8 @@ class FusionService(BaseService):
                     await session.delete(esprit1)
                 if esprit2.quantity <= 0 and esprit2.id != esprit1.id:
                     await session.delete(esprit2)
+                if esprit1.quantity <= 0 or esprit2.quantity <= 0:
+                    await DatabaseService.after_commit(OwnershipBitsets.changed, player_id)
                 
                 result_data = {
                     "successful": fusion_successful, "fusion_cost": fusion_cost,
@@ -258,31 +253,21 @@ class FusionService(BaseService):
                 }
                 
                 if fusion_successful:
-                    # Get all possible Esprits of result tier
-                    tier_stmt = select(EspritBase).where(EspritBase.base_tier == result_tier)  # type: ignore
-                    possible_bases = (await session.execute(tier_stmt)).scalars().all()
-                    
-                    if not possible_bases:
-                        raise ValueError(f"No Esprits available for tier {result_tier}")
-                    
-                    result_base = random.choice(possible_bases)
-                    
-                    # Ensure result_base.id is not None
-                    if result_base.id is None:
-                        raise ValueError("Result EspritBase has no id")
+                    # Uniform draw over the result tier's catalog (precompiled, no query)
+                    result_base = await FusionTable.sample(result_tier)
                     
                     # Add result to collection using EspritService logic
                     from src.services.esprit_service import EspritService
-                    add_result = await EspritService.add_to_collection(player_id, result_base.id, 1)
+                    add_result = await EspritService.add_to_collection(player_id, result_base["id"], 1)
                     
                     if not add_result.success or not add_result.data:
                         raise ValueError("Failed to add result Esprit to collection")
                     
                     result_data["result_esprit"] = {
-                        "id": add_result.data["esprit_id"], "name": result_base.name,
-                        "tier": result_base.base_tier, "element": result_base.element,
-                        "rarity": result_base.get_rarity_name(), "image_url": result_base.image_url,
-                        "element_emoji": result_base.get_element_emoji(), 
+                        "id": add_result.data["esprit_id"], "name": result_base["name"],
+                        "tier": result_base["tier"], "element": result_base["element"],
+                        "rarity": result_base["rarity"], "image_url": result_base["image_url"],
+                        "element_emoji": result_base["element_emoji"], 
                         "is_new_capture": add_result.data["is_new_capture"]
                     }
                 else:
@@ -295,17 +280,17 @@ class FusionService(BaseService):
                     flag_modified(player, "tier_fragments")
                     result_data["consolation_fragments"] = {"tier": esprit1.tier, "amount": fragment_reward}
                 
-                # Update player stats
-                player.total_fusions += 1
-                if fusion_successful:
-                    player.successful_fusions += 1
+                # Update player stats (counters are buffered until this commits)
+                await DatabaseService.after_commit(AnalyticsCounters.increment, player_id, {
+                    "total_fusions": 1, "successful_fusions": 1 if fusion_successful else 0
+                })
                 player.last_fusion = func.now()
                 player.update_activity()
                 
                 await session.commit()
                 
                 # Log the fusion
-                transaction_logger.log_transaction(player_id, TransactionType.FUSION_ATTEMPTED, {
+                transaction_logger.log_transaction(player_id, TransactionType.ESPRIT_FUSED, {
                     "esprit1": input_data[0], "esprit2": input_data[1],
                     "fusion_cost": fusion_cost, "fragments_used": fragments_amount,
                     "success_rate": total_success_rate, "successful": fusion_successful,
@@ -319,6 +304,231 @@ class FusionService(BaseService):
                 return result_data
         return await cls._safe_execute(_operation, "execute fusion")
     
+    @classmethod
+    async def execute_fusion_batch(cls, player_id: int, pairs: List[Tuple[int, int]]) -> ServiceResult[Dict[str, Any]]:
+        """Fuse many (esprit1_id, esprit2_id) pairs in one transaction; the whole plan succeeds or nothing is written"""
+        async def _operation():
+            cls._validate_player_id(player_id)
+            if not pairs:
+                raise ValueError("No fusions to perform")
+            cls._check_batch_size(len(pairs))
+            
+            stack_ids = {stack_id for pair in pairs for stack_id in pair}
+            async with DatabaseService.get_transaction() as session:
+                stacks = await cls._lock_stacks(session, player_id, Esprit.id.in_(stack_ids))  # type: ignore
+                if stack_ids - stacks.keys():
+                    raise ValueError("One or more Esprits not found or not owned by player")
+                team = await cls._team_stack_ids(session, player_id)
+                return await cls._apply_fusion_batch(session, player_id, stacks, pairs, team)
+        return await cls._safe_execute(_operation, "execute fusion batch")
+    
+    @classmethod
+    async def auto_fuse(cls, player_id: int, below_tier: int, keep: int = 1,
+                        max_fusions: Optional[int] = None) -> ServiceResult[Dict[str, Any]]:
+        """
+        Fuse every spare copy (beyond `keep` per stack) of tiers below `below_tier`.
+        Copies are paired across different stacks of the same tier, most spares first;
+        team stacks always keep one copy, and results are not fused again in the same run.
+        """
+        async def _operation():
+            cls._validate_player_id(player_id)
+            if keep < 0:
+                raise ValueError("keep cannot be negative")
+            limit = cls._check_batch_size(max_fusions)
+            
+            async with DatabaseService.get_transaction() as session:
+                stacks = await cls._lock_stacks(
+                    session, player_id,
+                    Esprit.tier < min(below_tier, MAX_TIER), Esprit.quantity > keep  # type: ignore
+                )
+                team = await cls._team_stack_ids(session, player_id)
+                pairs = cls._plan_auto_fusions(stacks, keep, limit, team)
+                return await cls._apply_fusion_batch(session, player_id, stacks, pairs, team)
+        return await cls._safe_execute(_operation, "auto fuse")
+    
+    @classmethod
+    def _check_batch_size(cls, count: Optional[int]) -> int:
+        """Fusions allowed in one batch (fusion_system.max_batch_fusions)"""
+        config = ConfigManager.get("fusion_system") or {}
+        limit = int(config.get("max_batch_fusions", 100))
+        if count is None:
+            return limit
+        if count > limit:
+            raise ValueError(f"Too many fusions in one batch ({count}, max {limit})")
+        return count
+    
+    @staticmethod
+    async def _lock_stacks(session, player_id: int, *criteria) -> Dict[int, Dict[str, Any]]:
+        """Lock the player's matching stacks (in id order) and return their fusion-relevant columns"""
+        stmt = (
+            select(Esprit.id, Esprit.esprit_base_id, Esprit.tier, Esprit.element, Esprit.quantity, EspritBase.name)
+            .join(EspritBase, Esprit.esprit_base_id == EspritBase.id)  # type: ignore
+            .where(Esprit.owner_id == player_id, *criteria)  # type: ignore
+            .order_by(Esprit.id)  # type: ignore
+            .with_for_update(of=Esprit)
+        )
+        return {row.id: dict(row._mapping) for row in await session.execute(stmt)}
+    
+    @staticmethod
+    async def _team_stack_ids(session, player_id: int) -> Set[int]:
+        """Stacks in the leader and support slots (locked with the player row, after the stacks)"""
+        row = (await session.execute(
+            select(Player.leader_esprit_stack_id, Player.support1_esprit_stack_id, Player.support2_esprit_stack_id)
+            .where(Player.id == player_id)  # type: ignore
+            .with_for_update()
+        )).first()
+        if row is None:
+            raise ValueError("Player not found")
+        return {stack_id for stack_id in row if stack_id is not None}
+    
+    @staticmethod
+    def _plan_auto_fusions(stacks: Dict[int, Dict[str, Any]], keep: int, limit: int,
+                           team: AbstractSet[int] = frozenset()) -> List[Tuple[int, int]]:
+        """Pair spare copies of different stacks within each tier, lowest tier first"""
+        heaps: Dict[int, List[Tuple[int, int]]] = {}
+        for stack in stacks.values():
+            spare = stack["quantity"] - max(keep, 1 if stack["id"] in team else 0)
+            if spare > 0:
+                heaps.setdefault(stack["tier"], []).append((-spare, stack["id"]))
+        
+        pairs: List[Tuple[int, int]] = []
+        for tier in sorted(heaps):
+            heap = heaps[tier]
+            heapq.heapify(heap)
+            while len(heap) >= 2 and len(pairs) < limit:
+                spare1, stack1 = heapq.heappop(heap)
+                spare2, stack2 = heapq.heappop(heap)
+                pairs.append((stack1, stack2))
+                for spare, stack_id in ((spare1 + 1, stack1), (spare2 + 1, stack2)):
+                    if spare < 0:
+                        heapq.heappush(heap, (spare, stack_id))
+        return pairs
+    
+    @classmethod
+    async def _apply_fusion_batch(cls, session, player_id: int, stacks: Dict[int, Dict[str, Any]],
+                                  pairs: List[Tuple[int, int]], team: AbstractSet[int] = frozenset(),
+                                  rng: Any = random) -> Dict[str, Any]:
+        """Validate a plan against locked stacks, roll it, and write it with bulk statements"""
+        table = await FusionTable.ensure_loaded()
+        
+        # Validate the whole plan in memory before touching anything
+        used: Dict[int, int] = {}
+        plan_rates = []
+        for esprit1_id, esprit2_id in pairs:
+            if esprit1_id == esprit2_id:
+                raise ValueError("Cannot fuse an Esprit with itself")
+            stack1, stack2 = stacks[esprit1_id], stacks[esprit2_id]
+            if stack1["tier"] != stack2["tier"]:
+                raise ValueError("Esprits must be the same tier to fuse")
+            rates = table.rates.get(stack1["tier"])
+            if rates is None:
+                raise ValueError("Cannot fuse - result would exceed maximum tier")
+            for stack_id in (esprit1_id, esprit2_id):
+                used[stack_id] = used.get(stack_id, 0) + 1
+                if used[stack_id] > stacks[stack_id]["quantity"]:
+                    raise ValueError(f"Not enough copies of {stacks[stack_id]['name']} for this plan")
+                if stack_id in team and used[stack_id] == stacks[stack_id]["quantity"]:
+                    raise ValueError(f"This plan would use up {stacks[stack_id]['name']}, which is on your team")
+            plan_rates.append(rates)
+        
+        total_cost = sum(rates.cost for rates in plan_rates)
+        summary: Dict[str, Any] = {
+            "fusions": len(pairs), "successful": 0, "failed": 0, "fusion_cost": total_cost,
+            "consumed": [], "results": [], "consolation_fragments": {}
+        }
+        if not pairs:
+            return summary
+        
+        # One RNG pass over every outcome
+        results: Dict[int, Dict[str, Any]] = {}
+        fragments: Dict[str, int] = {}
+        for rates in plan_rates:
+            if rng.randint(1, 100) <= rates.success_rate:
+                candidate = table.draw(rates.result_tier, rng=rng)
+                results.setdefault(candidate["id"], {**candidate, "quantity": 0})["quantity"] += 1
+            else:
+                fragments[str(rates.tier)] = fragments.get(str(rates.tier), 0) + max(1, rates.tier // 2)
+        
+        now = datetime.utcnow()
+        player_row = (await session.execute(
+            update(Player)
+            .where(Player.id == player_id, Player.revies >= total_cost)  # type: ignore
+            .values(revies=Player.revies - total_cost, last_fusion=now, last_active=now)
+            .returning(Player.revies)
+            .execution_options(synchronize_session=False)
+        )).first()
+        if player_row is None:
+            have = (await session.execute(select(Player.revies).where(Player.id == player_id))).scalar_one()  # type: ignore
+            raise ValueError(f"Insufficient revies. Need {total_cost}, have {have}")
+        
+        emptied = [stack_id for stack_id, count in used.items() if count >= stacks[stack_id]["quantity"]]
+        # A base whose stack is deleted and rolled again in this batch was already owned
+        emptied_bases = {stacks[stack_id]["esprit_base_id"] for stack_id in emptied}
+        
+        # Stack decrements: one executemany UPDATE by primary key, one DELETE for emptied stacks
+        remaining = [
+            {"id": stack_id, "quantity": stacks[stack_id]["quantity"] - count, "last_modified": now}
+            for stack_id, count in used.items() if stack_id not in emptied
+        ]
+        if remaining:
+            await session.execute(update(Esprit), remaining)
+        if emptied:
+            await session.execute(delete(Esprit).where(Esprit.id.in_(emptied)))  # type: ignore
+        
+        # Result upserts: one INSERT ... ON CONFLICT for every base rolled
+        new_captures = set()
+        if results:
+            insert_stmt = pg_insert(Esprit).values([
+                {
+                    "owner_id": player_id, "esprit_base_id": base_id, "quantity": result["quantity"],
+                    "tier": result["tier"], "element": result["element"], "awakening_level": 0,
+                    "created_at": now, "last_modified": now
+                }
+                for base_id, result in results.items()
+            ])
+            upsert = insert_stmt.on_conflict_do_update(
+                index_elements=["owner_id", "esprit_base_id"],
+                set_={"quantity": Esprit.quantity + insert_stmt.excluded.quantity, "last_modified": now}
+            ).returning(Esprit.esprit_base_id, Esprit.id, Esprit.quantity)
+            for row in await session.execute(upsert):
+                result = results[row.esprit_base_id]
+                is_new_capture = row.quantity == result["quantity"] and row.esprit_base_id not in emptied_bases
+                result.update(esprit_id=row.id, total_quantity=row.quantity, is_new_capture=is_new_capture)
+                if is_new_capture:
+                    new_captures.add(row.esprit_base_id)
+        
+        if fragments:
+            await JsonbCounters.apply(session, player_id, "tier_fragments", fragments, touch=False)
+        
+        successes = sum(result["quantity"] for result in results.values())
+        summary.update(
+            successful=successes, failed=len(pairs) - successes, new_balance=player_row.revies,
+            consumed=[
+                {"esprit_id": stack_id, "name": stacks[stack_id]["name"], "tier": stacks[stack_id]["tier"],
+                 "used": count, "remaining": stacks[stack_id]["quantity"] - count}
+                for stack_id, count in used.items()
+            ],
+            results=sorted(results.values(), key=lambda result: (-result["tier"], result["name"])),
+            consolation_fragments={int(tier): amount for tier, amount in fragments.items()}
+        )
+        
+        # One aggregated counter bump, log record and cache invalidation, all after commit
+        await DatabaseService.after_commit(AnalyticsCounters.increment, player_id, {
+            "total_fusions": len(pairs), "successful_fusions": successes
+        })
+        await DatabaseService.after_commit(transaction_logger.log_transaction, player_id, TransactionType.ESPRIT_FUSED, {
+            "batch": True, "fusions": len(pairs), "successful": successes, "fusion_cost": total_cost,
+            "consumed": {stacks[stack_id]["name"]: count for stack_id, count in used.items()},
+            "results": {result["name"]: result["quantity"] for result in results.values()},
+            "consolation_fragments": fragments
+        })
+        if new_captures or emptied_bases - results.keys():
+            await DatabaseService.after_commit(OwnershipBitsets.changed, player_id)
+        await DatabaseService.after_commit(CacheService.invalidate_player_power, player_id)
+        await DatabaseService.after_commit(CacheService.invalidate_collection_stats, player_id)
+        
+        return summary
+    
     @classmethod
     async def get_fusion_rates(cls, tier1: int, tier2: int) -> ServiceResult[Dict[str, Any]]:
         """Get fusion success rates and possible results for tier combination"""
@@ -326,30 +536,14 @@ class FusionService(BaseService):
             if tier1 != tier2:
                 raise ValueError("Fusion requires same tier Esprits")
             
-            result_tier = tier1 + 1
-            if result_tier > 12:
-                raise ValueError("Result tier would exceed maximum")
-            
-            # Check cache first
-            cache_key = f"fusion_rates:{tier1}_{tier2}"
-            cached = await CacheService.get(cache_key)
-            if cached.success and cached.data:
-                return cached.data
-            
-            base_success_rate = cls._calculate_success_rate(tier1, tier2)
-            fusion_cost = cls._calculate_fusion_cost(tier1, tier2)
-            
-            result = {
-                "input_tiers": [tier1, tier2], "result_tier": result_tier,
-                "base_success_rate": base_success_rate, "fusion_cost": fusion_cost,
-                "fragment_bonus_per_fragment": 10, "max_fragment_bonus": 100 - base_success_rate,
-                "fragments_for_guaranteed": max(0, (100 - base_success_rate + 9) // 10)  # Ceiling division
+            # Precompiled in-process, so no Redis round trip
+            rates = await FusionTable.rates(tier1, tier2)
+            return {
+                "input_tiers": [tier1, tier2], "result_tier": rates.result_tier,
+                "base_success_rate": rates.success_rate, "fusion_cost": rates.cost,
+                "fragment_bonus_per_fragment": 10, "max_fragment_bonus": 100 - rates.success_rate,
+                "fragments_for_guaranteed": rates.fragments_for_guaranteed
             }
-            
-            # Cache for 1 hour
-            await CacheService.set(cache_key, result, 3600)
-            
-            return result
         return await cls._safe_execute(_operation, "get fusion rates")
     
     @classmethod
@@ -377,24 +571,13 @@ class FusionService(BaseService):
     def _calculate_fusion_cost(cls, tier1: int, tier2: int) -> int:
         """Calculate revies cost for fusion based on tiers"""
         config = ConfigManager.get("fusion_system") or {}
-        base_cost = config.get("base_fusion_cost", 1000)
-        tier_multiplier = config.get("tier_cost_multiplier", 100)
-        
-        average_tier = (tier1 + tier2) / 2
-        return int(base_cost + (average_tier * tier_multiplier))
+        return economy_formulas.fusion_cost(tier1, tier2, config)
     
     @classmethod
     def _calculate_success_rate(cls, tier1: int, tier2: int) -> int:
         """Calculate base success rate for fusion"""
         config = ConfigManager.get("fusion_system") or {}
-        base_rate = config.get("base_success_rate", 50)
-        tier_penalty = config.get("tier_penalty_per_level", 2)
-        
-        average_tier = (tier1 + tier2) / 2
-        success_rate = base_rate - int((average_tier - 1) * tier_penalty)
-        
-        # Clamp between 5% and 95%
-        return max(5, min(95, success_rate))
+        return economy_formulas.fusion_success_rate(tier1, tier2, config)
     
     @classmethod
     def _get_fusion_warnings(cls, esprit1: Esprit, esprit2: Esprit, base1: EspritBase, base2: EspritBase) -> List[str]:
@@ -481,56 +664,28 @@ class FusionService(BaseService):
         async def _operation():
             result_tier = source_tier + 1
             
+            # Precompiled chart distribution; list results are 50/50, "random" is any element
+            outcome = await FusionTable.outcome(element1, element2)
+            possible_elements = [element.title() for element in outcome.elements]
+            result_element = possible_elements[outcome.sampler.sample()]
+            
             if element1.lower() == element2.lower():
                 # Same element fusion - always produces same element
-                return FusionResultDetermination(
-                    result_element=element1.title(),
-                    result_tier=result_tier,
-                    fusion_type="same_element",
-                    possible_elements=[element1.title()],
-                    chart_result=element1.title()
-                )
-            
-            # Different element fusion - use fusion chart
-            fusion_result = get_fusion_result(element1, element2)
-            
-            if not fusion_result:
-                # Invalid combination - should not happen with proper validation
-                raise ValueError(f"Invalid fusion combination: {element1} + {element2}")
-            
-            # Handle MW-style results
-            if isinstance(fusion_result, list):
-                # Multiple possible results - 50/50 chance
-                selected_element = random.choice(fusion_result).title()
-                return FusionResultDetermination(
-                    result_element=selected_element,
-                    result_tier=result_tier,
-                    fusion_type="different_element",
-                    possible_elements=[e.title() for e in fusion_result],
-                    chart_result="multiple_choice"
-                )
-            
-            elif fusion_result.lower() == "random":
-                # Random any element
-                all_elements = ["Inferno", "Verdant", "Abyssal", "Tempest", "Umbral", "Radiant"]
-                selected_element = random.choice(all_elements)
-                return FusionResultDetermination(
-                    result_element=selected_element,
-                    result_tier=result_tier,
-                    fusion_type="different_element",
-                    possible_elements=all_elements,
-                    chart_result="random"
-                )
-            
+                fusion_type, chart_result = "same_element", element1.title()
+            elif isinstance(outcome.chart_result, list):
+                fusion_type, chart_result = "different_element", "multiple_choice"
+            elif outcome.chart_result == "random":
+                fusion_type, chart_result = "different_element", "random"
             else:
-                # Single specific result
-                return FusionResultDetermination(
-                    result_element=fusion_result.title(),
-                    result_tier=result_tier,
-                    fusion_type="different_element",
-                    possible_elements=[fusion_result.title()],
-                    chart_result=fusion_result.title()
-                )
+                fusion_type, chart_result = "different_element", outcome.chart_result.title()
+            
+            return FusionResultDetermination(
+                result_element=result_element,
+                result_tier=result_tier,
+                fusion_type=fusion_type,
+                possible_elements=possible_elements,
+                chart_result=chart_result
+            )
         
         return await cls._safe_execute(_operation, f"determine fusion result for {element1} + {element2}")
 
@@ -6,6 +6,7 @@ from sqlalchemy.orm.attributes import flag_modified
 from src.services.base_service import BaseService, ServiceResult
 from src.database.models.player import Player
 from src.utils.database_service import DatabaseService
+from src.utils.jsonb_counters import JsonbCounters
 from src.utils.transaction_logger import transaction_logger, TransactionType
 from src.utils.config_manager import ConfigManager
 
@@ -53,25 +54,16 @@ class InventoryService(BaseService):
                 raise ValueError("Item name cannot be empty")
             
             async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
-                
-                if player.inventory is None:
-                    player.inventory = {}
-                
-                old_quantity = player.inventory.get(item_name, 0)
-                player.inventory[item_name] = old_quantity + quantity
-                flag_modified(player, "inventory")
-                player.update_activity()
+                new_quantity = await JsonbCounters.increment(session, player_id, "inventory", item_name, quantity)
                 await session.commit()
                 
                 transaction_logger.log_transaction(player_id, TransactionType.ITEM_GAINED, {
                     "item": item_name, "quantity": quantity, "source": source,
-                    "old_quantity": old_quantity, "new_quantity": player.inventory[item_name]
+                    "old_quantity": new_quantity - quantity, "new_quantity": new_quantity
                 })
                 
                 return {
-                    "item": item_name, "added": quantity, "total": player.inventory[item_name], "source": source
+                    "item": item_name, "added": quantity, "total": new_quantity, "source": source
                 }
         return await cls._safe_execute(_operation, "add item")
     
@@ -86,26 +78,13 @@ class InventoryService(BaseService):
                 raise ValueError("Item name cannot be empty")
             
             async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update() # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
-                
-                current_quantity = player.inventory.get(item_name, 0) if player.inventory else 0
-                
-                if current_quantity < quantity:
-                    raise ValueError(f"Insufficient {item_name}. Need {quantity}, have {current_quantity}")
-                
-                if player.inventory is None:
-                    player.inventory = {}
-                
-                old_quantity = current_quantity
-                player.inventory[item_name] = current_quantity - quantity
-                flag_modified(player, "inventory")
-                player.update_activity()
+                # Guarded decrement; raises InsufficientCountError (a ValueError) when short
+                new_quantity = await JsonbCounters.consume(session, player_id, "inventory", item_name, quantity)
                 await session.commit()
                 
                 transaction_logger.log_transaction(player_id, TransactionType.ITEM_CONSUMED, {
                     "item": item_name, "quantity": quantity, "reason": reason,
-                    "old_quantity": old_quantity, "new_quantity": player.inventory[item_name]
+                    "old_quantity": new_quantity + quantity, "new_quantity": new_quantity
                 })
                 return True
         return await cls._safe_execute(_operation, "consume item")
@@ -257,10 +236,10 @@ class InventoryService(BaseService):
             cls._validate_player_id(player_id)
             
             async with DatabaseService.get_session() as session:
-                stmt = select(Player).where(Player.id == player_id) # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
-                
-                return player.inventory.get(item_name, 0) if player.inventory else 0
+                count = await JsonbCounters.get(session, player_id, "inventory", item_name)
+                if count is None:
+                    raise ValueError(f"Player {player_id} not found")
+                return count
         return await cls._safe_execute(_operation, "get item count")
     
     @classmethod
@@ -152,7 +152,11 @@ class LeadershipService(BaseService):
             }
         
         leader_esprit, leader_base = leader_result
-        
+        return cls._leader_payload(leader_esprit, leader_base)
+    
+    @staticmethod
+    def _leader_payload(leader_esprit: Esprit, leader_base: EspritBase) -> Dict[str, Any]:
+        """Leader bonuses as cached under leader_bonuses"""
         # Calculate element-based bonuses
         element = Elements.from_string(leader_esprit.element)
         bonuses = {}
@@ -170,4 +174,18 @@ class LeadershipService(BaseService):
             "leader_tier": leader_base.base_tier,
             "awakening_level": leader_esprit.awakening_level,
             "description": f"{leader_base.name} ({leader_esprit.element}) provides {element.name if element else 'unknown'} element bonuses"
+        }
+    
+    @classmethod
+    async def bulk_leader_bonuses(cls, session: AsyncSession, player_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Leader payloads for every player in player_ids that has a leader, in one join (cache warming)"""
+        stmt = select(Player.id, Esprit, EspritBase).join(
+            Esprit, Esprit.id == Player.leader_esprit_stack_id  # type: ignore
+        ).join(
+            EspritBase, EspritBase.id == Esprit.esprit_base_id  # type: ignore
+        ).where(Player.id.in_(player_ids))  # type: ignore
+        
+        return {
+            player_id: cls._leader_payload(esprit, base)
+            for player_id, esprit, base in (await session.execute(stmt)).all()
         }
\ No newline at end of file
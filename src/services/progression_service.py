@@ -7,6 +7,7 @@ from sqlalchemy.orm.attributes import flag_modified
 from src.services.base_service import BaseService, ServiceResult
 from src.database.models.player import Player
 from src.utils.database_service import DatabaseService
+from src.utils.analytics_counters import AnalyticsCounters
 from src.utils.transaction_logger import transaction_logger, TransactionType
 from src.utils.config_manager import ConfigManager
 
@@ -68,7 +69,7 @@ class ProgressionService(BaseService):
                         setattr(player, flag_name, db_dict)
                         flag_modified(player, flag_name)
 
-                player.total_quests_completed += 1
+                await DatabaseService.after_commit(AnalyticsCounters.increment, player_id, {"total_quests_completed": 1})
                 player.update_activity()
                 await session.commit()
 
@@ -2,9 +2,11 @@
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from sqlalchemy import select
-import random
 
 from src.services.base_service import BaseService, ServiceResult
+from src.domain import economy_formulas
+from src.services.cache_service import CacheService
+from src.services.leadership_service import LeadershipService
 from src.database.models.player import Player
 from src.utils.database_service import DatabaseService
 from src.utils.game_constants import GameConstants
@@ -12,6 +14,12 @@ from src.utils.config_manager import ConfigManager
 from src.utils.transaction_logger import transaction_logger, TransactionType
 from src.utils.logger import get_logger
 
+# Optional dependency - only sampled simulations need NumPy
+try:
+    import numpy as np  # type: ignore
+except ImportError:
+    np = None  # type: ignore
+
 logger = get_logger(__name__)
 
 @dataclass
@@ -23,6 +31,15 @@ class CaptureCalculationResult:
     area_modifiers: Dict[str, float]
     success_guaranteed: bool
 
+@dataclass
+class QuestPlayerContext:
+    """Player state needed for quest math, loaded once per call"""
+    player_id: int
+    level: int
+    energy: int
+    max_energy: int
+    leader_bonuses: Dict[str, Any]
+
 @dataclass
 class AreaAnalysisResult:
     """Comprehensive analysis of a quest area"""
@@ -49,76 +66,98 @@ class QuestService(BaseService):
         Includes base rates, area modifiers, and player bonuses.
         """
         async def _operation():
-            # Get base capture chance from GameConstants
-            base_capture_chance = GameConstants.BASE_CAPTURE_CHANCE
-            
-            area_modifiers = {}
-            bonuses_applied = {}
-            final_chance = base_capture_chance
-            
-            # Apply area-specific modifiers
-            area_capture_modifier = area_data.get("capture_rate_modifier", 1.0)
-            if area_capture_modifier != 1.0:
-                area_modifiers["area_modifier"] = area_capture_modifier
-                final_chance *= area_capture_modifier
+            context = await cls._load_player_context(player_id) if apply_bonuses else None
+            return cls._compute_capture_probability(area_data, context)
+        
+        return await cls._safe_execute(_operation, f"calculate capture probability for player {player_id}")
+
+    @classmethod
+    async def _load_player_context(cls, player_id: int) -> QuestPlayerContext:
+        """Load everything quest math needs about a player in one session"""
+        cached_bonuses = await CacheService.get_cached_leader_bonuses(player_id)
+        
+        async with DatabaseService.get_session() as session:
+            stmt = select(Player).where(Player.id == player_id) # type: ignore
+            player = (await session.execute(stmt)).scalar_one()
             
-            # Apply difficulty-based modifiers
-            difficulty = area_data.get("difficulty", 1.0)
-            if difficulty > 1.0:
-                difficulty_penalty = 1.0 / difficulty
-                area_modifiers["difficulty_penalty"] = difficulty_penalty
-                final_chance *= difficulty_penalty
+            if cached_bonuses.success and cached_bonuses.data:
+                leader_bonuses = cached_bonuses.data
+            else:
+                leader_bonuses = await LeadershipService._calculate_leader_bonuses(player, session)
             
-            if apply_bonuses:
-                # Get player and apply bonuses
-                async with DatabaseService.get_session() as session:
-                    stmt = select(Player).where(Player.id == player_id) # type: ignore
-                    player = (await session.execute(stmt)).scalar_one()
-                    
-                    # Apply leader bonuses
-                    leader_bonuses = await player.get_leader_bonuses(session)
-                    element_bonuses = leader_bonuses.get("bonuses", {})
-                    
-                    capture_bonus = element_bonuses.get("capture_bonus", 0)
-                    if capture_bonus > 0:
-                        bonuses_applied["leader_capture_bonus"] = capture_bonus
-                        final_chance *= (1 + capture_bonus)
-                    
-                    # Apply element affinity bonus
-                    area_element = area_data.get("element_affinity")
-                    leader_element = leader_bonuses.get("element")
-                    if area_element and leader_element and area_element.lower() == leader_element.lower():
-                        element_affinity_bonus = 0.2  # 20% bonus for matching element
-                        bonuses_applied["element_affinity"] = element_affinity_bonus
-                        final_chance *= (1 + element_affinity_bonus)
-                    
-                    # Apply level-based bonus (higher level = slightly better capture)
-                    level_bonus = min(player.level * 0.001, 0.1)  # Max 10% bonus at level 100
-                    if level_bonus > 0:
-                        bonuses_applied["level_bonus"] = level_bonus
-                        final_chance *= (1 + level_bonus)
-                    
-                    # Apply skill-based bonuses (if any skills affect capture in the future)
-                    skill_bonuses = player.get_skill_bonuses()
-                    # Placeholder for potential capture-affecting skills
+            return QuestPlayerContext(
+                player_id=player_id,
+                level=player.level,
+                energy=player.energy,
+                max_energy=player.max_energy,
+                leader_bonuses=leader_bonuses
+            )
+
+    @classmethod
+    def _compute_capture_probability(
+        cls,
+        area_data: Dict[str, Any],
+        context: Optional[QuestPlayerContext] = None
+    ) -> CaptureCalculationResult:
+        """Pure capture probability calculation; player bonuses apply when a context is given"""
+        # Get base capture chance from GameConstants
+        base_capture_chance = GameConstants.BASE_CAPTURE_CHANCE
+        
+        area_modifiers = {}
+        bonuses_applied = {}
+        final_chance = base_capture_chance
+        
+        # Apply area-specific modifiers
+        area_capture_modifier = area_data.get("capture_rate_modifier", 1.0)
+        if area_capture_modifier != 1.0:
+            area_modifiers["area_modifier"] = area_capture_modifier
+            final_chance *= area_capture_modifier
+        
+        # Apply difficulty-based modifiers
+        difficulty = area_data.get("difficulty", 1.0)
+        if difficulty > 1.0:
+            difficulty_penalty = 1.0 / difficulty
+            area_modifiers["difficulty_penalty"] = difficulty_penalty
+            final_chance *= difficulty_penalty
+        
+        if context is not None:
+            # Apply leader bonuses
+            element_bonuses = context.leader_bonuses.get("bonuses", {})
             
-            # Cap the final chance (never 100% unless guaranteed)
-            final_chance = min(final_chance, 0.95)
+            capture_bonus = element_bonuses.get("capture_bonus", 0)
+            if capture_bonus > 0:
+                bonuses_applied["leader_capture_bonus"] = capture_bonus
+                final_chance *= (1 + capture_bonus)
             
-            # Check for guaranteed capture conditions
-            success_guaranteed = area_data.get("guaranteed_capture", False)
-            if success_guaranteed:
-                final_chance = 1.0
+            # Apply element affinity bonus
+            area_element = area_data.get("element_affinity")
+            leader_element = context.leader_bonuses.get("element")
+            if area_element and leader_element and area_element.lower() == leader_element.lower():
+                element_affinity_bonus = 0.2  # 20% bonus for matching element
+                bonuses_applied["element_affinity"] = element_affinity_bonus
+                final_chance *= (1 + element_affinity_bonus)
             
-            return CaptureCalculationResult(
-                base_capture_chance=base_capture_chance,
-                final_capture_chance=final_chance,
-                bonuses_applied=bonuses_applied,
-                area_modifiers=area_modifiers,
-                success_guaranteed=success_guaranteed
-            )
+            # Apply level-based bonus (higher level = slightly better capture)
+            level_bonus = min(context.level * 0.001, 0.1)  # Max 10% bonus at level 100
+            if level_bonus > 0:
+                bonuses_applied["level_bonus"] = level_bonus
+                final_chance *= (1 + level_bonus)
         
-        return await cls._safe_execute(_operation, f"calculate capture probability for player {player_id}")
+        # Cap the final chance (never 100% unless guaranteed)
+        final_chance = min(final_chance, 0.95)
+        
+        # Check for guaranteed capture conditions
+        success_guaranteed = area_data.get("guaranteed_capture", False)
+        if success_guaranteed:
+            final_chance = 1.0
+        
+        return CaptureCalculationResult(
+            base_capture_chance=base_capture_chance,
+            final_capture_chance=final_chance,
+            bonuses_applied=bonuses_applied,
+            area_modifiers=area_modifiers,
+            success_guaranteed=success_guaranteed
+        )
 
     @classmethod
     async def analyze_quest_area(
@@ -135,42 +174,7 @@ class QuestService(BaseService):
             if not quests_config or area_id not in quests_config:
                 raise ValueError(f"Area {area_id} not found in configuration")
             
-            area_data = quests_config[area_id]
-            
-            # Calculate difficulty rating
-            base_difficulty = area_data.get("difficulty", 1.0)
-            level_requirement = area_data.get("level_requirement", 1)
-            
-            # Adjust difficulty based on player level if provided
-            difficulty_rating = base_difficulty
-            if player_level:
-                level_factor = max(1.0, (level_requirement / player_level) ** 0.5)
-                difficulty_rating *= level_factor
-            
-            # Analyze capturable content
-            capturable_tiers = area_data.get("capturable_tiers", [])
-            element_affinity = area_data.get("element_affinity")
-            
-            # Calculate recommended power
-            if capturable_tiers:
-                max_tier = max(capturable_tiers)
-                # Rough power calculation based on tier
-                recommended_power = cls._estimate_recommended_power(max_tier, difficulty_rating)
-            else:
-                recommended_power = 1000  # Default minimum
-            
-            # Analyze expected rewards
-            expected_rewards = cls._analyze_area_rewards(area_data)
-            
-            return AreaAnalysisResult(
-                area_id=area_id,
-                difficulty_rating=difficulty_rating,
-                capturable_tiers=capturable_tiers,
-                element_affinity=element_affinity,
-                level_requirement=level_requirement,
-                recommended_power=recommended_power,
-                expected_rewards=expected_rewards
-            )
+            return cls._build_area_analysis(area_id, quests_config[area_id], player_level)
         
         return await cls._safe_execute(_operation, f"analyze quest area {area_id}")
 
@@ -183,102 +187,113 @@ class QuestService(BaseService):
         """
         Provide optimal quest strategy recommendations based on player state and goals.
         Goals: 'experience', 'capture', 'efficiency', 'progression'
+        
+        All areas are compared from a single player load; per-area math is pure.
         """
         async def _operation():
-            async with DatabaseService.get_session() as session:
-                stmt = select(Player).where(Player.id == player_id) # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
+            context = await cls._load_player_context(player_id)
+            
+            # Get available areas
+            quests_config = ConfigManager.get("quests")
+            if not quests_config:
+                raise ValueError("No quest configuration found")
+            
+            available_areas = []
+            for area_id, area_data in quests_config.items():
+                if context.level >= area_data.get("level_requirement", 1):
+                    analysis = cls._build_area_analysis(area_id, area_data, context.level)
+                    available_areas.append((area_id, area_data, analysis))
+            
+            recommendations = {
+                "goal": goal,
+                "player_level": context.level,
+                "current_energy": context.energy,
+                "recommended_areas": [],
+                "strategy_notes": [],
+                "efficiency_tips": []
+            }
+            
+            if goal == "experience":
+                # Prioritize areas with best XP/energy ratio
+                for area_id, area_data, analysis in available_areas:
+                    profile = cls._quest_reward_profile(area_data)
+                    xp_reward = cls._extract_xp_reward(area_data)
+                    energy_cost = profile["energy_cost"]
+                    xp_efficiency = xp_reward / energy_cost if energy_cost > 0 else 0
+                    
+                    recommendations["recommended_areas"].append({
+                        "area_id": area_id,
+                        "xp_efficiency": xp_efficiency,
+                        "energy_cost": energy_cost,
+                        "xp_reward": xp_reward
+                    })
                 
-                # Get available areas
-                quests_config = ConfigManager.get("quests")
-                if not quests_config:
-                    raise ValueError("No quest configuration found")
+                # Sort by efficiency
+                recommendations["recommended_areas"].sort(key=lambda x: x["xp_efficiency"], reverse=True)
+                recommendations["strategy_notes"].append("Focus on highest XP/energy ratio areas")
                 
-                available_areas = []
-                for area_id, area_data in quests_config.items():
-                    if player.can_access_area(area_id):
-                        analysis = await cls.analyze_quest_area(area_id, player.level)
-                        if analysis.success:
-                            available_areas.append((area_id, area_data, analysis.data))
+            elif goal == "capture":
+                # Prioritize areas with best capture opportunities
+                for area_id, area_data, analysis in available_areas:
+                    capture_calc = cls._compute_capture_probability(area_data, context)
+                    capture_value = cls._calculate_capture_value(analysis.capturable_tiers)
+                    
+                    recommendations["recommended_areas"].append({
+                        "area_id": area_id,
+                        "capture_chance": capture_calc.final_capture_chance,
+                        "capture_value": capture_value,
+                        "capturable_tiers": analysis.capturable_tiers
+                    })
                 
-                recommendations = {
-                    "goal": goal,
-                    "player_level": player.level,
-                    "current_energy": player.energy,
-                    "recommended_areas": [],
-                    "strategy_notes": [],
-                    "efficiency_tips": []
-                }
+                # Sort by capture value * chance
+                recommendations["recommended_areas"].sort(
+                    key=lambda x: x["capture_chance"] * x["capture_value"], 
+                    reverse=True
+                )
+                recommendations["strategy_notes"].append("Target areas with valuable captures and good success rates")
                 
-                if goal == "experience":
-                    # Prioritize areas with best XP/energy ratio
-                    for area_id, area_data, analysis in available_areas:
-                        xp_reward = cls._extract_xp_reward(area_data)
-                        energy_cost = area_data.get("energy_cost", 10)
-                        xp_efficiency = xp_reward / energy_cost if energy_cost > 0 else 0
-                        
-                        recommendations["recommended_areas"].append({
-                            "area_id": area_id,
-                            "xp_efficiency": xp_efficiency,
-                            "energy_cost": energy_cost,
-                            "xp_reward": xp_reward
-                        })
-                    
-                    # Sort by efficiency
-                    recommendations["recommended_areas"].sort(key=lambda x: x["xp_efficiency"], reverse=True)
-                    recommendations["strategy_notes"].append("Focus on highest XP/energy ratio areas")
-                    
-                elif goal == "capture":
-                    # Prioritize areas with best capture opportunities
-                    for area_id, area_data, analysis in available_areas:
-                        capture_calc = await cls.calculate_capture_probability(player_id, area_data)
-                        if capture_calc.success:
-                            capture_value = cls._calculate_capture_value(analysis.capturable_tiers)
-                            
-                            recommendations["recommended_areas"].append({
-                                "area_id": area_id,
-                                "capture_chance": capture_calc.data.final_capture_chance if capture_calc.data else 0.0,
-                                "capture_value": capture_value,
-                                "capturable_tiers": analysis.capturable_tiers
-                            })
+            elif goal == "efficiency":
+                # Balance all factors for overall efficiency
+                for area_id, area_data, analysis in available_areas:
+                    profile = cls._quest_reward_profile(area_data)
+                    energy_cost = profile["energy_cost"]
+                    xp_reward = cls._extract_xp_reward(area_data)
                     
-                    # Sort by capture value * chance
-                    recommendations["recommended_areas"].sort(
-                        key=lambda x: x["capture_chance"] * x["capture_value"], 
-                        reverse=True
-                    )
-                    recommendations["strategy_notes"].append("Target areas with valuable captures and good success rates")
+                    # Calculate overall efficiency score
+                    efficiency_score = (xp_reward / energy_cost) * analysis.difficulty_rating
                     
-                elif goal == "efficiency":
-                    # Balance all factors for overall efficiency
-                    for area_id, area_data, analysis in available_areas:
-                        energy_cost = area_data.get("energy_cost", 10)
-                        xp_reward = cls._extract_xp_reward(area_data)
-                        
-                        # Calculate overall efficiency score
-                        efficiency_score = (xp_reward / energy_cost) * analysis.difficulty_rating
-                        
-                        recommendations["recommended_areas"].append({
-                            "area_id": area_id,
-                            "efficiency_score": efficiency_score,
-                            "energy_cost": energy_cost,
-                            "difficulty": analysis.difficulty_rating
-                        })
-                    
-                    recommendations["recommended_areas"].sort(key=lambda x: x["efficiency_score"], reverse=True)
-                    recommendations["strategy_notes"].append("Balanced approach optimizing time and energy")
-                
-                # Add general efficiency tips
-                recommendations["efficiency_tips"] = [
-                    f"Current energy: {player.energy}/{player.max_energy}",
-                    "Use leader bonuses that match area elements",
-                    "Consider regeneration time vs immediate questing"
-                ]
-                
-                if player.energy < player.max_energy * 0.5:
-                    recommendations["efficiency_tips"].append("⚠️ Low energy - consider waiting for regeneration")
+                    recommendations["recommended_areas"].append({
+                        "area_id": area_id,
+                        "efficiency_score": efficiency_score,
+                        "energy_cost": energy_cost,
+                        "difficulty": analysis.difficulty_rating
+                    })
                 
-                return recommendations
+                recommendations["recommended_areas"].sort(key=lambda x: x["efficiency_score"], reverse=True)
+                recommendations["strategy_notes"].append("Balanced approach optimizing time and energy")
+            
+            # Attach expected value per full energy bar to every recommendation
+            areas_by_id = {area_id: area_data for area_id, area_data, _ in available_areas}
+            for entry in recommendations["recommended_areas"]:
+                area_data = areas_by_id[entry["area_id"]]
+                profile = cls._quest_reward_profile(area_data)
+                capture_chance = cls._compute_capture_probability(area_data, context).final_capture_chance
+                full_bar_attempts = context.max_energy // profile["energy_cost"]
+                entry["expected_per_full_energy"] = cls._analytic_outcomes(
+                    profile, capture_chance, full_bar_attempts, area_data.get("capturable_tiers", [])
+                )["expected"]
+            
+            # Add general efficiency tips
+            recommendations["efficiency_tips"] = [
+                f"Current energy: {context.energy}/{context.max_energy}",
+                "Use leader bonuses that match area elements",
+                "Consider regeneration time vs immediate questing"
+            ]
+            
+            if context.energy < context.max_energy * 0.5:
+                recommendations["efficiency_tips"].append("⚠️ Low energy - consider waiting for regeneration")
+            
+            return recommendations
         
         return await cls._safe_execute(_operation, f"optimize quest strategy for player {player_id}")
 
@@ -288,13 +303,22 @@ class QuestService(BaseService):
         player_id: int,
         area_id: str,
         attempts: int = 10,
-        use_current_energy: bool = True
+        use_current_energy: bool = True,
+        mode: str = "analytic",
+        samples: int = 10000,
+        seed: Optional[int] = None
     ) -> ServiceResult[Dict[str, Any]]:
         """
-        Simulate multiple quest attempts to show expected outcomes.
-        Useful for planning and decision making.
+        Project the outcome of multiple quest attempts for planning and decision making.
+        
+        mode="analytic" returns exact expected values and variances (binomial captures,
+        uniform revies ranges, XP totals). mode="sampled" additionally draws ``samples``
+        NumPy-vectorized runs of ``attempts`` quests and reports percentiles.
         """
         async def _operation():
+            if mode not in ("analytic", "sampled"):
+                raise ValueError("mode must be 'analytic' or 'sampled'")
+            
             quests_config = ConfigManager.get("quests")
             if not quests_config or area_id not in quests_config:
                 raise ValueError(f"Area {area_id} not found")
@@ -302,74 +326,174 @@ class QuestService(BaseService):
             # Use actual_attempts everywhere - NEVER reassign attempts parameter
             actual_attempts = attempts
             area_data = quests_config[area_id]
-            energy_cost = area_data.get("energy_cost", 10)
+            profile = cls._quest_reward_profile(area_data)
+            energy_cost = profile["energy_cost"]
             
-            # Check if player has enough energy
-            async with DatabaseService.get_session() as session:
-                stmt = select(Player).where(Player.id == player_id) # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
-                
-                if use_current_energy:
-                    max_attempts = player.energy // energy_cost
-                    actual_attempts = min(actual_attempts, max_attempts)  # ✅ Update actual_attempts
+            # One player load covers energy, level and leader bonuses
+            context = await cls._load_player_context(player_id)
+            if use_current_energy:
+                max_attempts = context.energy // energy_cost
+                actual_attempts = min(actual_attempts, max_attempts)
             
-            if actual_attempts <= 0:  # ✅ Use actual_attempts
+            if actual_attempts <= 0:
                 return {
                     "attempts": 0,
                     "reason": "Insufficient energy",
                     "energy_needed": energy_cost,
-                    "current_energy": player.energy if use_current_energy else "Not checked"
+                    "current_energy": context.energy if use_current_energy else "Not checked"
                 }
             
-            # Get capture probability
-            capture_calc = await cls.calculate_capture_probability(player_id, area_data)
-            if not capture_calc.success:
-                raise ValueError("Failed to calculate capture probability")
-            
-            capture_chance = capture_calc.data.final_capture_chance if capture_calc.data else 0.0
+            capture_chance = cls._compute_capture_probability(area_data, context).final_capture_chance
+            capturable_tiers = area_data.get("capturable_tiers", [])
+            analytic = cls._analytic_outcomes(profile, capture_chance, actual_attempts, capturable_tiers)
+            expected = analytic["expected"]
+            total_energy = energy_cost * actual_attempts
             
-            # Simulate attempts
             simulation_results = {
-                "attempts": actual_attempts,  # ✅ Use actual_attempts
-                "energy_cost": energy_cost * actual_attempts,  # ✅ Use actual_attempts
-                "captures": 0,
-                "total_xp": 0,
-                "total_revies": 0,
-                "captured_esprits": [],
-                "success_rate": 0.0
+                "mode": mode,
+                "attempts": actual_attempts,
+                "energy_cost": total_energy,
+                "capture_chance": capture_chance,
+                "captures": expected["captures"],
+                "total_xp": expected["xp"],
+                "total_revies": expected["revies"],
+                "expected_captures_by_tier": analytic["captures_by_tier"],
+                "variance": analytic["variance"],
+                "std_dev": {key: value ** 0.5 for key, value in analytic["variance"].items()},
+                "success_rate": capture_chance * 100,
+                "xp_per_energy": expected["xp"] / total_energy,
+                "captures_per_energy": expected["captures"] / total_energy
             }
             
-            xp_reward = cls._extract_xp_reward(area_data)
-            revies_range = area_data.get("revies_reward", [50, 100])
-            
-            for attempt in range(actual_attempts):  # ✅ Use actual_attempts
-                # Always get quest rewards
-                simulation_results["total_xp"] += xp_reward
-                revies_gain = random.randint(revies_range[0], revies_range[1])
-                simulation_results["total_revies"] += revies_gain
-                
-                # Check for capture
-                if random.random() < capture_chance:
-                    simulation_results["captures"] += 1
-                    # Simulate which esprit would be captured
-                    capturable_tiers = area_data.get("capturable_tiers", [])
-                    if capturable_tiers:
-                        captured_tier = random.choice(capturable_tiers)
-                        simulation_results["captured_esprits"].append({
-                            "tier": captured_tier,
-                            "attempt": attempt + 1
-                        })
-            
-            simulation_results["success_rate"] = (simulation_results["captures"] / actual_attempts * 100) if actual_attempts > 0 else 0  # ✅ Use actual_attempts
-            
-            # Add efficiency metrics
-            simulation_results["xp_per_energy"] = simulation_results["total_xp"] / (energy_cost * actual_attempts) if actual_attempts > 0 else 0  # ✅ Use actual_attempts
-            simulation_results["captures_per_energy"] = simulation_results["captures"] / (energy_cost * actual_attempts) if actual_attempts > 0 else 0  # ✅ Use actual_attempts
+            if mode == "sampled":
+                simulation_results["distribution"] = cls._sampled_outcomes(
+                    profile, capture_chance, actual_attempts, samples, seed
+                )
             
             return simulation_results
         
         return await cls._safe_execute(_operation, f"simulate quest outcomes for {area_id}")
 
+    @classmethod
+    def _build_area_analysis(
+        cls,
+        area_id: str,
+        area_data: Dict[str, Any],
+        player_level: Optional[int] = None
+    ) -> AreaAnalysisResult:
+        """Pure area analysis from quest configuration"""
+        
+        # Calculate difficulty rating
+        base_difficulty = area_data.get("difficulty", 1.0)
+        level_requirement = area_data.get("level_requirement", 1)
+        
+        # Adjust difficulty based on player level if provided
+        difficulty_rating = base_difficulty
+        if player_level:
+            level_factor = max(1.0, (level_requirement / player_level) ** 0.5)
+            difficulty_rating *= level_factor
+        
+        # Analyze capturable content
+        capturable_tiers = area_data.get("capturable_tiers", [])
+        element_affinity = area_data.get("element_affinity")
+        
+        # Calculate recommended power
+        if capturable_tiers:
+            max_tier = max(capturable_tiers)
+            # Rough power calculation based on tier
+            recommended_power = cls._estimate_recommended_power(max_tier, difficulty_rating)
+        else:
+            recommended_power = 1000  # Default minimum
+        
+        # Analyze expected rewards
+        expected_rewards = cls._analyze_area_rewards(area_data)
+        
+        return AreaAnalysisResult(
+            area_id=area_id,
+            difficulty_rating=difficulty_rating,
+            capturable_tiers=capturable_tiers,
+            element_affinity=element_affinity,
+            level_requirement=level_requirement,
+            recommended_power=recommended_power,
+            expected_rewards=expected_rewards
+        )
+
+    @classmethod
+    def _quest_reward_profile(cls, area_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Per-attempt reward moments for an area (see economy_formulas.area_reward_profile)"""
+        return economy_formulas.area_reward_profile(area_data)
+
+    @classmethod
+    def _analytic_outcomes(
+        cls,
+        profile: Dict[str, Any],
+        capture_chance: float,
+        attempts: int,
+        capturable_tiers: List[int]
+    ) -> Dict[str, Any]:
+        """Exact expected totals and variances for ``attempts`` independent quest runs"""
+        captures = attempts * capture_chance
+        tiers = capturable_tiers or []
+        return {
+            "expected": {
+                "captures": captures,
+                "revies": attempts * profile["revies_mean"],
+                "xp": attempts * profile["xp_mean"]
+            },
+            "variance": {
+                "captures": attempts * capture_chance * (1 - capture_chance),
+                "revies": attempts * profile["revies_var"],
+                "xp": attempts * profile["xp_var"]
+            },
+            "captures_by_tier": {str(tier): captures / len(tiers) for tier in tiers}
+        }
+
+    @classmethod
+    def _sampled_outcomes(
+        cls,
+        profile: Dict[str, Any],
+        capture_chance: float,
+        attempts: int,
+        samples: int,
+        seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Vectorized sampling of ``samples`` runs of ``attempts`` quests, reported as percentiles"""
+        if np is None:
+            raise ValueError("Sampled simulation requires numpy")
+        cls._validate_positive_int(samples, "samples")
+        
+        rng = np.random.default_rng(seed)
+        lows = np.array([low for low, _ in profile["revies_ranges"]], dtype=np.int64)
+        highs = np.array([high for _, high in profile["revies_ranges"]], dtype=np.int64)
+        xp_values = np.array(profile["xp_values"], dtype=np.int64)
+        
+        revies = np.empty(samples, dtype=np.int64)
+        xp = np.empty(samples, dtype=np.int64)
+        # Bound memory to ~1M draws per chunk regardless of samples x attempts
+        chunk = max(1, 1_000_000 // attempts)
+        for start in range(0, samples, chunk):
+            rows = min(chunk, samples - start)
+            quest_index = rng.integers(0, len(lows), size=(rows, attempts))
+            revies[start:start + rows] = rng.integers(lows[quest_index], highs[quest_index] + 1).sum(axis=1)
+            xp[start:start + rows] = xp_values[quest_index].sum(axis=1)
+        captures = rng.binomial(attempts, capture_chance, size=samples)
+        
+        def _percentiles(values) -> Dict[str, float]:
+            p5, p25, p50, p75, p95 = np.percentile(values, [5, 25, 50, 75, 95])
+            return {
+                "mean": float(values.mean()), "p5": float(p5), "p25": float(p25),
+                "p50": float(p50), "p75": float(p75), "p95": float(p95)
+            }
+        
+        return {
+            "samples": samples,
+            "captures": _percentiles(captures),
+            "revies": _percentiles(revies),
+            "xp": _percentiles(xp),
+            "capture_histogram": np.bincount(captures, minlength=attempts + 1).tolist(),
+            "probability_no_capture": float((1 - capture_chance) ** attempts)
+        }
+
     @classmethod
     def _estimate_recommended_power(cls, max_tier: int, difficulty: float) -> int:
         """Estimate recommended power for an area based on max tier and difficulty"""
@@ -1,13 +1,14 @@
 # src/services/resource_service.py
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
-from sqlalchemy import select
+from typing import Dict, Any, List, Optional
+from sqlalchemy import select, update, func, case, cast, extract, literal, and_, Integer, DateTime, Interval
 from sqlalchemy.orm.attributes import flag_modified
 
 from src.services.base_service import BaseService, ServiceResult
 from src.database.models.player import Player
 from src.utils.database_service import DatabaseService
+from src.utils.analytics_counters import AnalyticsCounters
 from src.utils.transaction_logger import transaction_logger, TransactionType
 from src.utils.game_constants import GameConstants
 from src.utils.logger import get_logger
@@ -18,67 +19,117 @@ logger = get_logger(__name__)
 class ResourceService(BaseService):
     """Energy, stamina, and currency management"""
     
+    # pool -> (current, max, last update, minutes per point); rates match Player.regenerate_*
+    _REGEN_POOLS = {
+        "energy": ("energy", "max_energy", "last_energy_update", GameConstants.ENERGY_REGEN_MINUTES),
+        "stamina": ("stamina", "max_stamina", "last_stamina_update", 10),
+    }
+    
+    @classmethod
+    async def _conditional_consume(cls, session, player_id: int, pool: str, amount: int) -> Optional[Dict[str, Any]]:
+        """
+        Regenerate and spend a pool in one UPDATE ... RETURNING instead of locking,
+        regenerating in Python and writing back. Mirrors Player.regenerate_energy /
+        regenerate_stamina: regen is capped at max and the timestamp advances by whole
+        ticks. Returns old/new values, or None if the player cannot afford it.
+        """
+        current_name, max_name, updated_name, minutes = cls._REGEN_POOLS[pool]
+        now = datetime.utcnow()
+        
+        # Lock-and-read in the same statement so RETURNING can report pre-regen values
+        last_update = getattr(Player, updated_name)
+        ticks = func.greatest(
+            cast(func.floor(extract("epoch", literal(now, DateTime) - last_update) / (minutes * 60)), Integer), 0
+        )
+        snapshot = (
+            select(Player.id, getattr(Player, current_name).label("current"),  # type: ignore
+                   getattr(Player, max_name).label("maximum"), last_update.label("updated"), ticks.label("ticks"))
+            .where(Player.id == player_id)  # type: ignore
+            .with_for_update()
+            .subquery("snapshot")
+        )
+        regenerating = and_(snapshot.c.current < snapshot.c.maximum, snapshot.c.ticks > 0)
+        available = case(
+            (regenerating, func.least(snapshot.c.current + snapshot.c.ticks, snapshot.c.maximum)), else_=snapshot.c.current
+        )
+        
+        stmt = (
+            update(Player)
+            .where(Player.id == snapshot.c.id, available >= amount)  # type: ignore
+            .values({
+                current_name: available - amount,
+                updated_name: case(
+                    (regenerating, snapshot.c.updated + literal(timedelta(minutes=minutes), Interval) * snapshot.c.ticks),
+                    else_=snapshot.c.updated
+                ),
+                "last_active": now
+            })
+            .returning(snapshot.c.current.label("old"), getattr(Player, current_name).label("new"),
+                       getattr(Player, max_name).label("maximum"))
+            .execution_options(synchronize_session=False)
+        )
+        row = (await session.execute(stmt)).first()
+        if row is None:
+            return None
+        
+        old, new, maximum = int(row.old), int(row.new), int(row.maximum)
+        return {
+            "old": old, "new": new, "max": maximum, "regenerated": new + amount - old,
+            "time_to_full": timedelta(minutes=max(0, maximum - new) * minutes)
+        }
+    
+    @classmethod
+    async def _consume_pool(cls, player_id: int, pool: str, amount: int) -> Dict[str, Any]:
+        async with DatabaseService.get_transaction() as session:
+            result = await cls._conditional_consume(session, player_id, pool, amount)
+            if result is None:
+                # Rejected (or missing player, which raises here as before): report the regenerated value
+                stmt = select(Player).options(Player.projection(pool)).where(Player.id == player_id)  # type: ignore
+                player = (await session.execute(stmt)).scalar_one()
+                player.regenerate_energy() if pool == "energy" else player.regenerate_stamina()
+                raise ValueError(f"Insufficient {pool}. Need {amount}, have {getattr(player, pool)}")
+            # total_*_spent is analytics only; it goes through the write-behind buffer
+            await DatabaseService.after_commit(AnalyticsCounters.increment, player_id, {f"total_{pool}_spent": amount})
+            await session.commit()
+            return result
+    
     @classmethod
     async def consume_energy(cls, player_id: int, amount: int, context: str = "quest") -> ServiceResult[Dict[str, Any]]:
         async def _operation():
-            async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update() # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
-                
-                energy_regen = player.regenerate_energy()
-                if player.energy < amount:
-                    raise ValueError(f"Insufficient energy. Need {amount}, have {player.energy}")
-                
-                old_energy = player.energy
-                player.energy -= amount
-                player.total_energy_spent += amount
-                player.update_activity()
-                await session.commit()
-                
-                transaction_logger.log_transaction(player_id, TransactionType.ENERGY_CONSUMED, {
-                    "amount": amount, "context": context, "old_energy": old_energy,
-                    "new_energy": player.energy, "regenerated": energy_regen
-                })
-                
-                return {
-                    "consumed": amount, "regenerated": energy_regen, "remaining": player.energy,
-                    "max": player.max_energy, "time_to_full": str(player.get_time_until_full_energy())
-                }
+            result = await cls._consume_pool(player_id, "energy", amount)
+            
+            transaction_logger.log_transaction(player_id, TransactionType.ENERGY_CONSUMED, {
+                "amount": amount, "context": context, "old_energy": result["old"] + result["regenerated"],
+                "new_energy": result["new"], "regenerated": result["regenerated"]
+            })
+            
+            return {
+                "consumed": amount, "regenerated": result["regenerated"], "remaining": result["new"],
+                "max": result["max"], "time_to_full": str(result["time_to_full"])
+            }
         return await cls._safe_execute(_operation, "consume energy")
     
     @classmethod
     async def consume_stamina(cls, player_id: int, amount: int, context: str = "battle") -> ServiceResult[Dict[str, Any]]:
         async def _operation():
-            async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update() # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
-                
-                stamina_regen = player.regenerate_stamina()
-                if player.stamina < amount:
-                    raise ValueError(f"Insufficient stamina. Need {amount}, have {player.stamina}")
-                
-                old_stamina = player.stamina
-                player.stamina -= amount
-                player.total_stamina_spent += amount
-                player.update_activity()
-                await session.commit()
-                
-                transaction_logger.log_transaction(player_id, TransactionType.STAMINA_SPENT, {
-                    "amount": amount, "context": context, "old_stamina": old_stamina,
-                    "new_stamina": player.stamina, "regenerated": stamina_regen
-                })
-                
-                return {
-                    "consumed": amount, "regenerated": stamina_regen, "remaining": player.stamina,
-                    "max": player.max_stamina, "time_to_full": str(player.get_time_until_full_stamina())
-                }
+            result = await cls._consume_pool(player_id, "stamina", amount)
+            
+            transaction_logger.log_transaction(player_id, TransactionType.STAMINA_SPENT, {
+                "amount": amount, "context": context, "old_stamina": result["old"] + result["regenerated"],
+                "new_stamina": result["new"], "regenerated": result["regenerated"]
+            })
+            
+            return {
+                "consumed": amount, "regenerated": result["regenerated"], "remaining": result["new"],
+                "max": result["max"], "time_to_full": str(result["time_to_full"])
+            }
         return await cls._safe_execute(_operation, "consume stamina")
     
     @classmethod
     async def restore_energy(cls, player_id: int, amount: int, source: str = "item") -> ServiceResult[Dict[str, Any]]:
         async def _operation():
             async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update() # type: ignore
+                stmt = select(Player).options(Player.projection("energy")).where(Player.id == player_id).with_for_update() # type: ignore
                 player = (await session.execute(stmt)).scalar_one()
                 
                 old_energy = player.energy
@@ -99,8 +150,8 @@ class ResourceService(BaseService):
     @classmethod
     async def get_resource_status(cls, player_id: int) -> ServiceResult[Dict[str, Any]]:
         async def _operation():
-            async with DatabaseService.get_session() as session:
-                stmt = select(Player).where(Player.id == player_id) # type: ignore
+            async with DatabaseService.get_read_session() as session:
+                stmt = select(Player).options(Player.projection("energy", "stamina", "currency")).where(Player.id == player_id) # type: ignore
                 player = (await session.execute(stmt)).scalar_one()
                 
                 return {
@@ -132,9 +183,10 @@ class ResourceService(BaseService):
             batch_size = background_config.get("energy_regeneration", {}).get("batch_size", 100)
             
             try:
-                async with DatabaseService.get_session() as session:
+                # Read-only scan; each player is re-locked in its own transaction below
+                async with DatabaseService.get_read_session() as session:
                     # FIXED: Proper comparison using SQLAlchemy column comparison
-                    stmt = select(Player).where(Player.energy < Player.max_energy) # type: ignore
+                    stmt = select(Player).options(Player.projection("energy")).where(Player.energy < Player.max_energy) # type: ignore
                     
                     result = await session.execute(stmt)
                     # FIXED: Convert to list to match type signature
@@ -191,9 +243,10 @@ class ResourceService(BaseService):
             batch_size = background_config.get("stamina_regeneration", {}).get("batch_size", 100)
             
             try:
-                async with DatabaseService.get_session() as session:
+                # Read-only scan; each player is re-locked in its own transaction below
+                async with DatabaseService.get_read_session() as session:
                     # FIXED: Proper comparison using SQLAlchemy column comparison
-                    stmt = select(Player).where(Player.stamina < Player.max_stamina) # type: ignore
+                    stmt = select(Player).options(Player.projection("stamina")).where(Player.stamina < Player.max_stamina) # type: ignore
                     
                     result = await session.execute(stmt)
                     # FIXED: Convert to list to match type signature
@@ -265,7 +318,7 @@ class ResourceService(BaseService):
                     # Apply regeneration with transaction
                     async with DatabaseService.get_transaction() as session:
                         # Re-fetch with lock
-                        stmt = select(Player).where(Player.id == player.id).with_for_update()  # type: ignore
+                        stmt = select(Player).options(Player.projection("energy")).where(Player.id == player.id).with_for_update()  # type: ignore
                         locked_player = (await session.execute(stmt)).scalar_one()
                         
                         # Double-check still needs energy
@@ -337,7 +390,7 @@ class ResourceService(BaseService):
                     # Apply regeneration with transaction
                     async with DatabaseService.get_transaction() as session:
                         # Re-fetch with lock
-                        stmt = select(Player).where(Player.id == player.id).with_for_update()  # type: ignore
+                        stmt = select(Player).options(Player.projection("stamina")).where(Player.id == player.id).with_for_update()  # type: ignore
                         locked_player = (await session.execute(stmt)).scalar_one()
                         
                         # Double-check still needs stamina
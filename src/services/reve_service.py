@@ -13,7 +13,7 @@ from src.database.models.esprit_base import EspritBase
 from src.utils.database_service import DatabaseService
 from src.utils.config_manager import ConfigManager
 from src.utils.transaction_logger import transaction_logger, TransactionType
-from src.utils.redis_service import RedisService
+from src.utils.redis_service import RateLimiter
 from sqlalchemy import select
 
 @dataclass
@@ -91,11 +91,11 @@ class ReveService(BaseService):
                     }
                 )
                 
-                # Invalidate cache
-                await CacheService.invalidate_player_cache(player_id)
-                
                 await session.commit()
                 
+                # Invalidate cache once the pull is committed
+                await DatabaseService.after_commit(CacheService.invalidate_player_cache, player_id)
+                
                 # Calculate new charges info (after commit, so player is updated)
                 new_charges_info = await cls._calculate_current_charges(player)
                 
@@ -268,15 +268,8 @@ class ReveService(BaseService):
         rate_limits = config.get("rate_limits", {})
         reve_limit = rate_limits.get("reve", {"uses": 10, "per_seconds": 60})  # 10 pulls per minute max
         
-        cache_key = f"reve:rate_limit:{player_id}"
-        current_count = await RedisService.get_int(cache_key)
-        
-        if current_count and current_count >= reve_limit["uses"]:
-            return False
-        
-        # Increment counter
-        await RedisService.incr(cache_key, expire_seconds=reve_limit["per_seconds"])
-        return True
+        is_limited, _ = await RateLimiter.hit(player_id, "reve_pull", reve_limit["uses"], reve_limit["per_seconds"])
+        return not is_limited
     
     @classmethod
     async def force_refresh_charges(cls, player_id: int) -> ServiceResult[ReveChargesInfo]:
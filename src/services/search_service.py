@@ -1,13 +1,14 @@
 # src/services/search_service.py
+from collections import Counter
 from typing import Dict, Any, Optional, List
-from sqlalchemy import select, func, and_, or_, desc, asc  # type: ignore
-from sqlalchemy.orm import aliased  # type: ignore
+from sqlalchemy import select, func, desc  # type: ignore
 
 from src.services.base_service import BaseService, ServiceResult
 from src.services.cache_service import CacheService
-from src.database.models.esprit import Esprit
 from src.database.models.esprit_base import EspritBase
 from src.utils.database_service import DatabaseService
+from src.utils.esprit_search_index import EspritSearchIndex
+from src.utils.ownership_bitset import OwnershipBitsets
 from src.utils.game_constants import Elements, Tiers
 
 class SearchService(BaseService):
@@ -24,53 +25,35 @@ class SearchService(BaseService):
             if not query or len(query) < 2:
                 raise ValueError("Search query must be at least 2 characters")
             
-            async with DatabaseService.get_session() as session:
-                stmt = select(EspritBase)
-                
-                # Apply name search
-                stmt = stmt.where(EspritBase.name.ilike(f"%{query}%"))  # type: ignore
-                
-                # Apply filters
-                if search_filters.get("element"):
-                    stmt = stmt.where(EspritBase.element.ilike(f"%{search_filters['element']}%"))  # type: ignore
-                
-                if search_filters.get("tier"):
-                    if isinstance(search_filters["tier"], list):
-                        stmt = stmt.where(EspritBase.base_tier.in_(search_filters["tier"]))  # type: ignore
-                    else:
-                        stmt = stmt.where(EspritBase.base_tier == search_filters["tier"])  # type: ignore
-                
-                if search_filters.get("min_tier"):
-                    stmt = stmt.where(EspritBase.base_tier >= search_filters["min_tier"])  # type: ignore
-                
-                # ✅ FIX: Add None check for max_tier comparison
-                max_tier = search_filters.get("max_tier")
-                if max_tier is not None:
-                    stmt = stmt.where(EspritBase.base_tier <= max_tier)  # type: ignore
-                
-                # Apply sorting
-                sort_by = search_filters.get("sort_by", "name")
-                sort_order = search_filters.get("sort_order", "asc")
-                
-                if sort_by == "name":
-                    stmt = stmt.order_by(asc(EspritBase.name) if sort_order == "asc" else desc(EspritBase.name))  # type: ignore
-                elif sort_by == "tier":
-                    stmt = stmt.order_by(asc(EspritBase.base_tier) if sort_order == "asc" else desc(EspritBase.base_tier))  # type: ignore
-                elif sort_by == "element":
-                    stmt = stmt.order_by(asc(EspritBase.element) if sort_order == "asc" else desc(EspritBase.element))  # type: ignore
-                elif sort_by == "power":
-                    power_expr = EspritBase.base_atk + EspritBase.base_def + (EspritBase.base_hp / 10)  # type: ignore
-                    stmt = stmt.order_by(asc(power_expr) if sort_order == "asc" else desc(power_expr))  # type: ignore
-                
-                # Get total count
-                count_stmt = select(func.count()).select_from(stmt.subquery())  # type: ignore
-                total_count = (await session.execute(count_stmt)).scalar()
-                
-                # Apply pagination
-                stmt = stmt.offset(offset).limit(limit)
-                
-                # ✅ FIX: Use .scalars().all() instead of .all()
-                results = (await session.execute(stmt)).scalars().all()
+            # Name matching and filters run against the in-memory catalog index
+            tier_filter = search_filters.get("tier")
+            hits = await EspritSearchIndex.search(
+                query, limit=None,
+                element=search_filters.get("element"),
+                tiers=(tier_filter if isinstance(tier_filter, list) else [tier_filter]) if tier_filter else None,
+                min_tier=search_filters.get("min_tier"),
+                max_tier=search_filters.get("max_tier"),
+                min_stats=search_filters.get("min_stats")
+            )
+            entries = [entry for entry, _ in hits]
+            
+            # Default order is relevance; explicit sorts re-order the matched set
+            sort_by = search_filters.get("sort_by", "relevance")
+            reverse = search_filters.get("sort_order", "asc") == "desc"
+            sort_keys = {
+                "name": lambda e: e.name.lower(), "tier": lambda e: e.tier,
+                "element": lambda e: e.element, "power": lambda e: e.power
+            }
+            if sort_by in sort_keys:
+                entries.sort(key=sort_keys[sort_by], reverse=reverse)
+            
+            total_count = len(entries)
+            page_ids = [entry.id for entry in entries[offset:offset + limit]]
+            
+            async with DatabaseService.get_read_session() as session:
+                stmt = select(EspritBase).where(EspritBase.id.in_(page_ids))  # type: ignore
+                by_id = {base.id: base for base in (await session.execute(stmt)).scalars().all()}
+                results = [by_id[esprit_id] for esprit_id in page_ids if esprit_id in by_id]
                 
                 esprits = []
                 for base in results:
@@ -97,9 +80,12 @@ class SearchService(BaseService):
     async def get_esprit_by_name(cls, name: str) -> ServiceResult[Optional[Dict[str, Any]]]:
         """Get exact Esprit match by name"""
         async def _operation():
-            async with DatabaseService.get_session() as session:
-                stmt = select(EspritBase).where(EspritBase.name.ilike(name))  # type: ignore
-                base = (await session.execute(stmt)).scalar_one_or_none()
+            entry = await EspritSearchIndex.find(name)
+            if entry is None:
+                return None
+            
+            async with DatabaseService.get_read_session() as session:
+                base = await session.get(EspritBase, entry.id)
                 
                 if not base:
                     return None
@@ -125,7 +111,7 @@ class SearchService(BaseService):
             if not element_obj:
                 raise ValueError(f"Invalid element: {element}")
             
-            async with DatabaseService.get_session() as session:
+            async with DatabaseService.get_read_session() as session:
                 stmt = select(EspritBase).where(
                     EspritBase.element == element_obj.name  # type: ignore
                 ).order_by(desc(EspritBase.base_tier), EspritBase.name).limit(limit)  # type: ignore
@@ -153,7 +139,7 @@ class SearchService(BaseService):
             if not Tiers.is_valid(tier):
                 raise ValueError(f"Invalid tier: {tier}")
             
-            async with DatabaseService.get_session() as session:
+            async with DatabaseService.get_read_session() as session:
                 stmt = select(EspritBase).where(
                     EspritBase.base_tier == tier  # type: ignore
                 ).order_by(EspritBase.element, EspritBase.name).limit(limit)
@@ -183,7 +169,7 @@ class SearchService(BaseService):
             if stat not in valid_stats:
                 raise ValueError(f"Invalid stat. Must be one of: {valid_stats}")
             
-            async with DatabaseService.get_session() as session:
+            async with DatabaseService.get_read_session() as session:
                 stmt = select(EspritBase)
                 
                 # Apply filters
@@ -236,7 +222,7 @@ class SearchService(BaseService):
         search_filters = filters or {}
         
         async def _operation():
-            async with DatabaseService.get_session() as session:
+            async with DatabaseService.get_read_session() as session:
                 stmt = select(EspritBase)
                 
                 # Apply filters
@@ -281,55 +267,28 @@ class SearchService(BaseService):
         async def _operation():
             cls._validate_player_id(player_id)
             
-            async with DatabaseService.get_session() as session:
-                # Get player's owned Esprits
-                owned_stmt = select(Esprit.esprit_base_id).where(Esprit.owner_id == player_id)  # type: ignore
-                owned_result = await session.execute(owned_stmt)
-                owned_ids = [row[0] for row in owned_result.all()]
-                
-                if not owned_ids:
-                    # New player - suggest some starter tier Esprits
-                    stmt = select(EspritBase).where(
-                        EspritBase.base_tier.in_([1, 2, 3])  # type: ignore
-                    ).order_by(func.random()).limit(limit)  # type: ignore
-                else:
-                    # ✅ FIX: Proper select statement for collection analysis
-                    collection_stmt = select(
-                        Esprit.element, # type: ignore
-                        Esprit.tier, # type: ignore
-                        func.count().label('count')
-                    ).where(Esprit.owner_id == player_id).group_by(  # type: ignore
-                        Esprit.element, Esprit.tier
-                    ).order_by(desc(func.count())).limit(3)  # type: ignore
-                    
-                    collection_result = await session.execute(collection_stmt)
-                    collection_data = collection_result.all()
-                    
-                    if collection_data:
-                        # Suggest similar Esprits they don't own
-                        favorite_elements = [row.element for row in collection_data]
-                        favorite_tiers = [row.tier for row in collection_data]
-                        
-                        # ✅ FIX: Ensure proper column references for .in_() calls
-                        element_condition = EspritBase.element.in_(favorite_elements) if favorite_elements else None  # type: ignore
-                        tier_condition = EspritBase.base_tier.in_(favorite_tiers) if favorite_tiers else None  # type: ignore
-                        
-                        conditions = [~EspritBase.id.in_(owned_ids)]  # type: ignore
-                        if element_condition is not None and tier_condition is not None:
-                            conditions.append(or_(element_condition, tier_condition))
-                        elif element_condition is not None:
-                            conditions.append(element_condition)
-                        elif tier_condition is not None:
-                            conditions.append(tier_condition)
-                        
-                        stmt = select(EspritBase).where(and_(*conditions)).order_by(func.random()).limit(limit)  # type: ignore
-                    else:
-                        # Fallback to random suggestions
-                        stmt = select(EspritBase).where(
-                            ~EspritBase.id.in_(owned_ids)  # type: ignore
-                        ).order_by(func.random()).limit(limit)  # type: ignore
-                
-                # ✅ FIX: Use .scalars().all() instead of .all()
+            snapshot, owned = await OwnershipBitsets.owned_mask(player_id)
+            
+            if not owned:
+                # New player - suggest some starter tier Esprits
+                candidates = EspritSearchIndex.filter_mask(snapshot, tiers=[1, 2, 3])
+            else:
+                # Suggest unowned Esprits sharing an element or tier with their three biggest groups
+                groups = Counter(
+                    (snapshot.entries[pos].element, snapshot.entries[pos].tier)
+                    for pos in EspritSearchIndex.positions(owned)
+                )
+                candidates = 0
+                for element, tier in (group for group, _ in groups.most_common(3)):
+                    candidates |= snapshot.element_bits.get(element, 0) | snapshot.tier_bits.get(tier, 0)
+            
+            suggested_ids = await OwnershipBitsets.sample_unowned(
+                player_id, limit, candidates, snapshot=snapshot, owned=owned
+            )
+            owned_ids = [snapshot.entries[pos].id for pos in EspritSearchIndex.positions(owned)]
+            
+            async with DatabaseService.get_read_session() as session:
+                stmt = select(EspritBase).where(EspritBase.id.in_(suggested_ids))  # type: ignore
                 results = (await session.execute(stmt)).scalars().all()
                 
                 suggestions = []
@@ -352,7 +311,7 @@ class SearchService(BaseService):
             if len(esprit_ids) < 2 or len(esprit_ids) > 5:
                 raise ValueError("Can compare between 2 and 5 Esprits")
             
-            async with DatabaseService.get_session() as session:
+            async with DatabaseService.get_read_session() as session:
                 stmt = select(EspritBase).where(EspritBase.id.in_(esprit_ids))  # type: ignore
                 # ✅ FIX: Use .scalars().all() instead of .all()
                 results = (await session.execute(stmt)).scalars().all()
@@ -7,6 +7,7 @@ from sqlalchemy import select, func, desc, asc
 from src.services.base_service import BaseService, ServiceResult
 from src.services.cache_service import CacheService
 from src.utils.database_service import DatabaseService
+from src.utils.analytics_counters import AnalyticsCounters
 from src.utils.transaction_logger import transaction_logger, TransactionType
 from src.utils.config_manager import ConfigManager
 from src.database.models.player import Player
@@ -52,6 +53,7 @@ class StatisticsService(BaseService):
                 cached_data = cache_result.data[offset:offset + limit]
                 return cached_data
             
+            # Primary, not the replica: this result is cached, so a lagging read would stick for the TTL
             async with DatabaseService.get_session() as session:
                 # Map category to proper column
                 if category == "level":
@@ -109,40 +111,27 @@ class StatisticsService(BaseService):
             if not isinstance(won, bool):
                 raise ValueError("won parameter must be a boolean")
             
-            async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
-                
-                # Update battle statistics
-                player.total_battles += 1
-                if won:
-                    player.battles_won += 1
-                
-                player.update_activity()
-                await session.commit()
-                
-                # Log transaction
-                transaction_logger.log_transaction(player_id, TransactionType.QUEST_COMPLETED, {
-                    "battle_type": battle_type,
-                    "won": won,
-                    "experience_gained": experience_gained,
-                    "total_battles": player.total_battles,
-                    "battles_won": player.battles_won
-                })
-                
-                # Invalidate relevant caches
-                await CacheService.invalidate_player_cache(player_id)
-                
-                win_rate = (player.battles_won / player.total_battles * 100) if player.total_battles > 0 else 0
-                
-                return {
-                    "won": won,
-                    "battle_type": battle_type,
-                    "experience_gained": experience_gained,
-                    "total_battles": player.total_battles,
-                    "battles_won": player.battles_won,
-                    "win_rate": round(win_rate, 2)
-                }
+            totals = await cls._bump_counters(player_id, {"total_battles": 1, "battles_won": 1 if won else 0})
+            
+            # Log transaction
+            transaction_logger.log_transaction(player_id, TransactionType.QUEST_COMPLETED, {
+                "battle_type": battle_type,
+                "won": won,
+                "experience_gained": experience_gained,
+                "total_battles": totals["total_battles"],
+                "battles_won": totals["battles_won"]
+            })
+            
+            win_rate = (totals["battles_won"] / totals["total_battles"] * 100) if totals["total_battles"] > 0 else 0
+            
+            return {
+                "won": won,
+                "battle_type": battle_type,
+                "experience_gained": experience_gained,
+                "total_battles": totals["total_battles"],
+                "battles_won": totals["battles_won"],
+                "win_rate": round(win_rate, 2)
+            }
                 
         return await cls._safe_execute(_operation, "record battle result")
     
@@ -160,40 +149,27 @@ class StatisticsService(BaseService):
             if tier < 1 or tier > 12:
                 raise ValueError("tier must be between 1 and 12")
             
-            async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
-                
-                # Update fusion statistics
-                player.total_fusions += 1
-                if success:
-                    player.successful_fusions += 1
-                
-                player.update_activity()
-                await session.commit()
-                
-                # Log transaction
-                transaction_logger.log_transaction(player_id, TransactionType.ESPRIT_FUSED, {
-                    "success": success,
-                    "tier": tier,
-                    "materials_used": materials_used,
-                    "total_fusions": player.total_fusions,
-                    "successful_fusions": player.successful_fusions
-                })
-                
-                # Invalidate relevant caches
-                await CacheService.invalidate_player_cache(player_id)
-                
-                success_rate = (player.successful_fusions / player.total_fusions * 100) if player.total_fusions > 0 else 0
-                
-                return {
-                    "success": success,
-                    "tier": tier,
-                    "materials_used": materials_used,
-                    "total_fusions": player.total_fusions,
-                    "successful_fusions": player.successful_fusions,
-                    "success_rate": round(success_rate, 2)
-                }
+            totals = await cls._bump_counters(player_id, {"total_fusions": 1, "successful_fusions": 1 if success else 0})
+            
+            # Log transaction
+            transaction_logger.log_transaction(player_id, TransactionType.ESPRIT_FUSED, {
+                "success": success,
+                "tier": tier,
+                "materials_used": materials_used,
+                "total_fusions": totals["total_fusions"],
+                "successful_fusions": totals["successful_fusions"]
+            })
+            
+            success_rate = (totals["successful_fusions"] / totals["total_fusions"] * 100) if totals["total_fusions"] > 0 else 0
+            
+            return {
+                "success": success,
+                "tier": tier,
+                "materials_used": materials_used,
+                "total_fusions": totals["total_fusions"],
+                "successful_fusions": totals["successful_fusions"],
+                "success_rate": round(success_rate, 2)
+            }
                 
         return await cls._safe_execute(_operation, "record fusion attempt")
     
@@ -203,7 +179,7 @@ class StatisticsService(BaseService):
         async def _operation():
             cls._validate_player_id(player_id)
             
-            async with DatabaseService.get_session() as session:
+            async with DatabaseService.get_read_session() as session:
                 stmt = select(Player).where(Player.id == player_id)  # type: ignore
                 player = (await session.execute(stmt)).scalar_one()
                 
@@ -211,6 +187,11 @@ class StatisticsService(BaseService):
                 if not player or not player.id:
                     raise ValueError(f"Player {player_id} not found or invalid")
                 
+                # Counters still buffered in the write-behind layer
+                pending = await AnalyticsCounters.pending(player_id)
+                for name, delta in pending.items():
+                    setattr(player, name, getattr(player, name) + delta)
+                
                 # Calculate derived statistics
                 win_rate = (player.battles_won / player.total_battles * 100) if player.total_battles > 0 else 0
                 fusion_success_rate = (player.successful_fusions / player.total_fusions * 100) if player.total_fusions > 0 else 0
@@ -257,7 +238,7 @@ class StatisticsService(BaseService):
     async def get_global_statistics(cls) -> ServiceResult[Dict[str, Any]]:
         """Get server-wide global statistics for analytics"""
         async def _operation():
-            async with DatabaseService.get_session() as session:
+            async with DatabaseService.get_read_session() as session:
                 # Get total player count
                 total_players_stmt = select(func.count()).select_from(Player)  # type: ignore
                 total_players = (await session.execute(total_players_stmt)).scalar() or 0
@@ -322,7 +303,7 @@ class StatisticsService(BaseService):
             rankings = {}
             categories = ["level", "revies", "erythl", "battles_won", "total_fusions"]
             
-            async with DatabaseService.get_session() as session:
+            async with DatabaseService.get_read_session() as session:
                 # Get player data
                 player_stmt = select(Player).where(Player.id == player_id)  # type: ignore
                 player = (await session.execute(player_stmt)).scalar_one()
@@ -367,29 +348,20 @@ class StatisticsService(BaseService):
             cls._validate_player_id(player_id)
             cls._validate_string(echo_type, "echo_type")
             
-            async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
-                
-                player.total_echoes_opened += 1
-                player.update_activity()
-                await session.commit()
-                
-                # Log transaction
-                transaction_logger.log_transaction(player_id, TransactionType.ECHO_OPENED, {
-                    "echo_type": echo_type,
-                    "rewards": rewards,
-                    "total_echoes_opened": player.total_echoes_opened
-                })
-                
-                # Invalidate relevant caches
-                await CacheService.invalidate_player_cache(player_id)
-                
-                return {
-                    "echo_type": echo_type,
-                    "rewards": rewards,
-                    "total_echoes_opened": player.total_echoes_opened
-                }
+            totals = await cls._bump_counters(player_id, {"total_echoes_opened": 1})
+            
+            # Log transaction
+            transaction_logger.log_transaction(player_id, TransactionType.ECHO_OPENED, {
+                "echo_type": echo_type,
+                "rewards": rewards,
+                "total_echoes_opened": totals["total_echoes_opened"]
+            })
+            
+            return {
+                "echo_type": echo_type,
+                "rewards": rewards,
+                "total_echoes_opened": totals["total_echoes_opened"]
+            }
                 
         return await cls._safe_execute(_operation, "record echo opening")
     
@@ -402,32 +374,47 @@ class StatisticsService(BaseService):
             cls._validate_positive_int(esprit_id, "esprit_id")
             cls._validate_positive_int(new_awakening_level, "new_awakening_level")
             
-            async with DatabaseService.get_transaction() as session:
-                stmt = select(Player).where(Player.id == player_id).with_for_update()  # type: ignore
-                player = (await session.execute(stmt)).scalar_one()
-                
-                player.total_awakenings += 1
-                player.update_activity()
-                await session.commit()
-                
-                # Log transaction
-                transaction_logger.log_transaction(player_id, TransactionType.ESPRIT_AWAKENED, {
-                    "esprit_id": esprit_id,
-                    "new_awakening_level": new_awakening_level,
-                    "total_awakenings": player.total_awakenings
-                })
-                
-                # Invalidate relevant caches
-                await CacheService.invalidate_player_cache(player_id)
-                
-                return {
-                    "esprit_id": esprit_id,
-                    "new_awakening_level": new_awakening_level,
-                    "total_awakenings": player.total_awakenings
-                }
+            totals = await cls._bump_counters(player_id, {"total_awakenings": 1})
+            
+            # Log transaction
+            transaction_logger.log_transaction(player_id, TransactionType.ESPRIT_AWAKENED, {
+                "esprit_id": esprit_id,
+                "new_awakening_level": new_awakening_level,
+                "total_awakenings": totals["total_awakenings"]
+            })
+            
+            return {
+                "esprit_id": esprit_id,
+                "new_awakening_level": new_awakening_level,
+                "total_awakenings": totals["total_awakenings"]
+            }
                 
         return await cls._safe_execute(_operation, "record awakening")
     
+    @classmethod
+    async def _bump_counters(cls, player_id: int, deltas: Dict[str, int]) -> Dict[str, int]:
+        """Buffer analytics deltas (no row lock) and return the merged totals for those counters"""
+        columns = [getattr(Player, name) for name in deltas]
+        async with DatabaseService.get_read_session() as session:
+            row = (await session.execute(select(*columns).where(Player.id == player_id))).one()  # type: ignore
+        
+        await AnalyticsCounters.increment(player_id, deltas)
+        return await AnalyticsCounters.merged(player_id, dict(zip(deltas, row)))
+    
+    @classmethod
+    async def flush_analytics_counters(cls) -> ServiceResult[Dict[str, Any]]:
+        """Write buffered analytics counters to the database in bulk"""
+        async def _operation():
+            background_config = ConfigManager.get("background_tasks") or {}
+            # Sections are nested under a "background_tasks" key
+            background_config = background_config.get("background_tasks", background_config)
+            batch_size = background_config.get("analytics_flush", {}).get("batch_size", 500)
+            
+            result = await AnalyticsCounters.flush(batch_size)
+            return {**result, **AnalyticsCounters.get_stats()}
+            
+        return await cls._safe_execute(_operation, "flush analytics counters")
+    
     @classmethod
     async def get_behavioral_analytics(cls, player_id: int, days: int = 30) -> ServiceResult[Dict[str, Any]]:
         """Get player behavioral analytics for the specified period"""
@@ -0,0 +1,216 @@
+# src/utils/analytics_counters.py
+import asyncio
+import uuid
+from collections import defaultdict
+from typing import Dict
+
+from sqlalchemy import Integer, column, update, values
+
+from src.database.models.player import Player
+from src.utils.database_service import DatabaseService
+from src.utils.redis_service import RedisService
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Player columns that are pure analytics and may lag behind gameplay by one flush
+COUNTER_COLUMNS = (
+    "total_battles", "battles_won", "total_fusions", "successful_fusions",
+    "total_awakenings", "total_echoes_opened", "total_quests_completed",
+    "total_energy_spent", "total_stamina_spent",
+)
+
+PENDING_KEY = "analytics:pending:{}"
+INFLIGHT_KEY = "analytics:inflight:{}"
+DIRTY_SET = "analytics:dirty"
+INFLIGHT_SET = "analytics:inflight"
+FLUSH_LOCK = "analytics:flush_lock"
+
+# Move up to ARGV[1] dirty players' pending hashes into their in-flight hashes (merging
+# with anything left by a failed flush) and return every in-flight player id.
+_CLAIM_SCRIPT = """
+local ids = redis.call('SPOP', KEYS[1], tonumber(ARGV[1])) or {}
+for _, id in ipairs(ids) do
+    local pending = 'analytics:pending:' .. id
+    local fields = redis.call('HGETALL', pending)
+    for i = 1, #fields, 2 do
+        redis.call('HINCRBY', 'analytics:inflight:' .. id, fields[i], fields[i + 1])
+    end
+    redis.call('DEL', pending)
+    redis.call('SADD', KEYS[2], id)
+end
+return redis.call('SRANDMEMBER', KEYS[2], tonumber(ARGV[1]))
+"""
+
+# Drop the flush lock only while we still hold it (it may have expired and been re-taken)
+_UNLOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end
+return 0
+"""
+
+
+class AnalyticsCounters:
+    """
+    Write-behind buffer for Player analytics counters.
+
+    increment() records deltas with HINCRBY in Redis (or in process when Redis is
+    unavailable) instead of locking the player row. flush() claims the buffered
+    deltas and applies them with one UPDATE ... FROM (VALUES ...) per batch. Claimed
+    deltas are only dropped after the UPDATE commits, so a crash replays them:
+    delivery is at-least-once. Readers combine the stored column with pending().
+    """
+
+    _local_pending: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    _local_inflight: Dict[int, Dict[str, int]] = {}
+    _flush_lock = asyncio.Lock()
+    _stats = {"flushes": 0, "players_flushed": 0, "failures": 0, "fallback_increments": 0}
+
+    @classmethod
+    async def increment(cls, player_id: int, deltas: Dict[str, int]):
+        """Buffer counter deltas for one player; never touches the database"""
+        deltas = {name: int(amount) for name, amount in deltas.items() if amount}
+        if not deltas:
+            return
+        unknown = set(deltas) - set(COUNTER_COLUMNS)
+        if unknown:
+            raise ValueError(f"Not analytics counters: {sorted(unknown)}")
+
+        client = RedisService.get_client()
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=True)
+                for name, amount in deltas.items():
+                    pipe.hincrby(PENDING_KEY.format(player_id), name, amount)
+                pipe.sadd(DIRTY_SET, player_id)
+                await pipe.execute()
+                return
+            except Exception as e:
+                logger.debug(f"Redis counter increment failed, buffering locally: {e}")
+
+        cls._stats["fallback_increments"] += 1
+        for name, amount in deltas.items():
+            cls._local_pending[player_id][name] += amount
+
+    @classmethod
+    async def pending(cls, player_id: int) -> Dict[str, int]:
+        """Deltas not yet in Postgres (buffered plus claimed-but-unflushed)"""
+        merged: Dict[str, int] = defaultdict(int)
+        for source in (cls._local_pending.get(player_id), cls._local_inflight.get(player_id)):
+            for name, amount in (source or {}).items():
+                merged[name] += amount
+
+        client = RedisService.get_client()
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                pipe.hgetall(PENDING_KEY.format(player_id))
+                pipe.hgetall(INFLIGHT_KEY.format(player_id))
+                for fields in await pipe.execute():
+                    for name, amount in fields.items():
+                        merged[name] += int(amount)
+            except Exception as e:
+                logger.debug(f"Redis pending counter read failed: {e}")
+
+        return dict(merged)
+
+    @classmethod
+    async def merged(cls, player_id: int, stored: Dict[str, int]) -> Dict[str, int]:
+        """Stored column values plus pending deltas, for the counters present in stored"""
+        deltas = await cls.pending(player_id)
+        return {name: value + deltas.get(name, 0) for name, value in stored.items()}
+
+    @classmethod
+    async def flush(cls, batch_size: int = 500) -> Dict[str, int]:
+        """Apply buffered deltas to Postgres; safe to call concurrently and across processes"""
+        async with cls._flush_lock:
+            flushed = await cls._flush_local(batch_size)
+            flushed += await cls._flush_redis(batch_size)
+            cls._stats["flushes"] += 1
+            cls._stats["players_flushed"] += flushed
+            return {"players_flushed": flushed}
+
+    @classmethod
+    async def _flush_local(cls, batch_size: int) -> int:
+        # In-flight leftovers from a failed flush go first, then a fresh batch
+        if not cls._local_inflight:
+            for player_id in list(cls._local_pending)[:batch_size]:
+                cls._local_inflight[player_id] = dict(cls._local_pending.pop(player_id))
+        if not cls._local_inflight:
+            return 0
+
+        batch = dict(cls._local_inflight)
+        try:
+            await cls._apply(batch)
+        except Exception:
+            cls._stats["failures"] += 1
+            raise
+        cls._local_inflight.clear()
+        return len(batch)
+
+    @classmethod
+    async def _flush_redis(cls, batch_size: int) -> int:
+        client = RedisService.get_client()
+        if client is None:
+            return 0
+
+        # One flusher at a time across bot processes, or two could apply the same in-flight hash
+        token = uuid.uuid4().hex
+        if not await client.set(FLUSH_LOCK, token, nx=True, ex=60):
+            return 0
+        try:
+            ids = await client.eval(_CLAIM_SCRIPT, 2, DIRTY_SET, INFLIGHT_SET, batch_size)
+            if not ids:
+                return 0
+
+            pipe = client.pipeline(transaction=False)
+            for player_id in ids:
+                pipe.hgetall(INFLIGHT_KEY.format(player_id))
+            batch = {
+                int(player_id): {name: int(amount) for name, amount in fields.items()}
+                for player_id, fields in zip(ids, await pipe.execute())
+                if fields
+            }
+
+            try:
+                await cls._apply(batch)
+            except Exception:
+                cls._stats["failures"] += 1
+                raise
+
+            pipe = client.pipeline(transaction=True)
+            for player_id in ids:
+                pipe.delete(INFLIGHT_KEY.format(player_id))
+            pipe.srem(INFLIGHT_SET, *ids)
+            await pipe.execute()
+            return len(batch)
+        finally:
+            await client.eval(_UNLOCK_SCRIPT, 1, FLUSH_LOCK, token)
+
+    @classmethod
+    async def _apply(cls, batch: Dict[int, Dict[str, int]]):
+        """One bulk UPDATE ... FROM (VALUES ...) for every player in the batch"""
+        if not batch:
+            return
+        names = sorted({name for deltas in batch.values() for name in deltas})
+        rows = [(player_id, *(deltas.get(name, 0) for name in names)) for player_id, deltas in batch.items()]
+        delta_table = values(
+            column("player_id", Integer), *(column(name, Integer) for name in names), name="deltas"
+        ).data(rows)
+
+        stmt = (
+            update(Player)
+            .where(Player.id == delta_table.c.player_id)  # type: ignore
+            .values({name: getattr(Player, name) + delta_table.c[name] for name in names})
+            .execution_options(synchronize_session=False)
+        )
+        async with DatabaseService.get_transaction() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, int]:
+        return {
+            **cls._stats,
+            "local_pending_players": len(cls._local_pending),
+            "local_inflight_players": len(cls._local_inflight),
+        }
@@ -11,7 +11,8 @@ import disnake
 from PIL import Image, ImageDraw, ImageFont
 
 from src.utils.logger import get_logger
-from src.utils.stats_generator import ImageConfig, ImageGenerator  # ✨ Use existing sophisticated system
+from src.utils.tracing import Tracer
+from src.utils.stats_generator import ImageConfig, get_generator  # ✨ Use existing sophisticated system
 
 logger = get_logger(__name__)
 
@@ -27,7 +28,7 @@ class UnifiedBossImageGenerator:
     def __init__(self) -> None:
         # ✨ Leverage your existing sophisticated config system
         self.config = ImageConfig()
-        self.main_generator = ImageGenerator()
+        self.main_generator = get_generator()
         
         # Load fonts using same system as main generator
         self._load_fonts()
@@ -391,6 +392,7 @@ class UnifiedBossImageGenerator:
             (200, 200, 200), shadow_offset=1
         )
     
+    @Tracer.traced("boss card", "render")
     async def render_boss_card(self, boss_data: Dict[str, Any]) -> Image.Image:
         """Create ULTIMATE boss encounter card with unified sophisticated system"""
         return await asyncio.to_thread(self._render_boss_sync, boss_data)
@@ -446,6 +448,7 @@ class UnifiedBossImageGenerator:
         logger.info(f"✅ ULTIMATE boss card complete for: {esprit_name}")
         return card
     
+    @Tracer.traced("encode png", "render")
     async def to_discord_file(self, img: Image.Image, filename: str = "boss_card.png") -> Optional[disnake.File]:
         """Convert to Discord file using main generator's sophisticated compression"""
         try:
@@ -488,8 +491,14 @@ class UnifiedBossImageGenerator:
         return disnake.File(buffer, filename=filename)
 
 
-# Singleton instance using unified system
-_unified_boss_generator = UnifiedBossImageGenerator()
+# Shared instance, built on first use so importing this module doesn't load fonts
+_unified_boss_generator: Optional[UnifiedBossImageGenerator] = None
+
+def get_boss_generator() -> UnifiedBossImageGenerator:
+    global _unified_boss_generator
+    if _unified_boss_generator is None:
+        _unified_boss_generator = UnifiedBossImageGenerator()
+    return _unified_boss_generator
 
 # Public API - Enhanced with unified system
 async def generate_boss_card(
@@ -499,8 +508,9 @@ async def generate_boss_card(
     """Generate ULTIMATE boss encounter card with unified sophisticated system"""
     try:
         logger.info(f"🎯 ULTIMATE boss card generation request: {boss_data.get('name', 'Unknown')}")
-        card = await _unified_boss_generator.render_boss_card(boss_data)
-        result = await _unified_boss_generator.to_discord_file(card, filename)
+        generator = get_boss_generator()
+        card = await generator.render_boss_card(boss_data)
+        result = await generator.to_discord_file(card, filename)
         logger.info(f"📸 ULTIMATE boss card generation {'✅ SUCCESS' if result else '❌ FAILED'}")
         return result
     except Exception as e:
@@ -0,0 +1,104 @@
+# src/utils/collection_cursor.py
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, Integer, and_, cast, func, literal, or_
+
+from src.database.models.esprit import Esprit
+from src.database.models.esprit_base import EspritBase
+from src.utils.game_constants import GameConstants
+
+
+def _awakened(base_stat):
+    """SQL twin of combat_formulas.awakened_stat (float8 math, truncated like int())"""
+    multiplier = literal(1.0, Float) + Esprit.awakening_level * literal(GameConstants.AWAKENING_BONUS_PER_STAR, Float)
+    return cast(func.trunc(base_stat * multiplier), Integer)
+
+
+ATK = _awakened(EspritBase.base_atk)
+DEF = _awakened(EspritBase.base_def)
+
+# Sort mode -> ordered (expression, descending) keys. Esprit.id is always the last key,
+# so every key tuple is unique and a page boundary can be resumed exactly.
+COLLECTION_SORTS: Dict[str, List[Tuple[Any, bool]]] = {
+    "tier_desc": [(Esprit.tier, True), (EspritBase.name, True)],
+    "tier_asc": [(Esprit.tier, False), (EspritBase.name, False)],
+    "name_asc": [(EspritBase.name, False)],
+    "name_desc": [(EspritBase.name, True)],
+    "power_desc": [(ATK + DEF, True)],
+    "atk_desc": [(ATK, True)],
+    "def_desc": [(DEF, True)],
+    "element": [(Esprit.element, False), (Esprit.tier, True)],
+    "recent": [(Esprit.created_at, True)],
+}
+
+
+def sort_keys(sort_by: str) -> List[Tuple[Any, bool]]:
+    if sort_by not in COLLECTION_SORTS:
+        raise ValueError(f"Invalid sort_by. Must be one of: {list(COLLECTION_SORTS)}")
+    return COLLECTION_SORTS[sort_by] + [(Esprit.id, True)]
+
+
+def order_by(sort_by: str, reverse: bool = False) -> List[Any]:
+    """ORDER BY clauses for a sort mode; reverse walks it backwards (for previous pages)"""
+    return [expr.desc() if desc != reverse else expr.asc() for expr, desc in sort_keys(sort_by)]
+
+
+def key_columns(sort_by: str) -> List[Any]:
+    """Labelled key expressions to select alongside each row"""
+    return [expr.label(f"k{i}") for i, (expr, _) in enumerate(sort_keys(sort_by))]
+
+
+def after(sort_by: str, values: List[Any], reverse: bool = False):
+    """
+    WHERE clause for rows strictly after values in sort order (before them if reverse).
+
+    Expanded lexicographically so mixed ASC/DESC keys work; the leading key's
+    comparison still drives the owner-scoped index range.
+    """
+    keys = sort_keys(sort_by)
+    if len(values) != len(keys):
+        raise ValueError("Cursor does not match sort mode")
+
+    clauses = []
+    for i, (expr, desc) in enumerate(keys):
+        forward = expr < values[i] if desc != reverse else expr > values[i]
+        clauses.append(and_(*(keys[j][0] == values[j] for j in range(i)), forward))
+    return or_(*clauses)
+
+
+def encode(sort_by: str, values: List[Any]) -> str:
+    """Opaque cursor string for the key values of a page boundary row"""
+    payload = [sort_by, [v.isoformat() if isinstance(v, datetime) else v for v in values]]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+
+
+def decode(cursor: str, sort_by: str) -> List[Any]:
+    """Key values from a cursor, checked against the sort mode it was issued for"""
+    try:
+        mode, values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Malformed collection cursor")
+    if mode != sort_by:
+        raise ValueError("Cursor was issued for a different sort mode")
+    if sort_by == "recent" and values:
+        values[0] = datetime.fromisoformat(values[0])
+    return values
+
+
+def boundary(row: Any, sort_by: str) -> str:
+    """Cursor pointing at a selected row (which must include key_columns)"""
+    return encode(sort_by, [row._mapping[f"k{i}"] for i in range(len(sort_keys(sort_by)))])
+
+
+def resolve(sort_by: str, after_cursor: Optional[str], before_cursor: Optional[str]) -> Tuple[Optional[Any], bool]:
+    """(WHERE clause or None, reverse) for a page request"""
+    if after_cursor and before_cursor:
+        raise ValueError("Pass either after or before, not both")
+    if after_cursor:
+        return after(sort_by, decode(after_cursor, sort_by)), False
+    if before_cursor:
+        return after(sort_by, decode(before_cursor, sort_by), reverse=True), True
+    return None, False
@@ -6,20 +6,140 @@ from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
 )
-from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.exc import IntegrityError, OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy import event
+import asyncio
+import inspect
 import os
-from typing import Optional
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
 from src.utils.logger import get_logger
+from src.utils.metrics import Metrics
 
 load_dotenv()
 logger = get_logger(__name__)
 
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+@dataclass
+class PoolMetrics:
+    """Checkout latency and saturation counters for one connection pool"""
+    name: str
+    checkouts: int = 0
+    timeouts: int = 0
+    slow_checkouts: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    slow_threshold_seconds: float = 0.1
+
+    def record(self, wait_seconds: float):
+        self.checkouts += 1
+        self.total_wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+        if wait_seconds >= self.slow_threshold_seconds:
+            self.slow_checkouts += 1
+            logger.warning(f"Slow {self.name} pool checkout: {wait_seconds * 1000:.1f}ms")
+
+    def reset(self):
+        self.checkouts = self.timeouts = self.slow_checkouts = 0
+        self.total_wait_seconds = self.max_wait_seconds = 0.0
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Queue pool that times every checkout (queue wait, connect and pre-ping)"""
+    metrics: PoolMetrics
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            logger.error(f"{self.metrics.name} pool exhausted: {self.status()}")
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+
+Hook = Tuple[Callable[..., Any], Tuple[Any, ...], Dict[str, Any]]
+
+
+@dataclass
+class UnitOfWork:
+    """Ambient session shared by every service call made inside one outer session"""
+    session: AsyncSession
+    task: Optional["asyncio.Task[Any]"]
+    pending_hooks: List[Hook] = field(default_factory=list)
+    committed_hooks: List[Hook] = field(default_factory=list)
+    commit_requested: bool = False      # a nested call asked to commit after the caller's last COMMIT
+    releasing_savepoint: bool = False
+
+    def on_commit(self, _session):
+        # after_commit also fires for RELEASE SAVEPOINT; only the outer COMMIT counts
+        if self.releasing_savepoint:
+            return
+        self.committed_hooks.extend(self.pending_hooks)
+        self.pending_hooks.clear()
+        self.commit_requested = False
+
+    async def run_hooks(self, succeeded: bool):
+        """Run hooks after the session closes; on failure only those already covered by a COMMIT"""
+        hooks = self.committed_hooks + (self.pending_hooks if succeeded else [])
+        self.committed_hooks, self.pending_hooks = [], []
+        for callback, args, kwargs in hooks:
+            try:
+                result = callback(*args, **kwargs)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Post-commit hook {getattr(callback, '__qualname__', callback)} failed: {e}")
+
+
+_current_uow: ContextVar[Optional[UnitOfWork]] = ContextVar("current_unit_of_work", default=None)
+
+
+class _JoinedSession:
+    """
+    Session handle given to nested service calls. Work runs inside a SAVEPOINT on the
+    caller's session; commit() only flushes so the outer caller decides when to commit.
+    """
+
+    def __init__(self, session: AsyncSession, savepoint: Any, uow: UnitOfWork):
+        self._session = session
+        self._savepoint = savepoint
+        self._uow = uow
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+    async def commit(self):
+        await self._session.flush()
+        self._uow.commit_requested = True
+
+    async def rollback(self):
+        if self._savepoint.is_active:
+            await self._savepoint.rollback()
+
+    async def close(self):
+        pass
+
+
 class DatabaseService:
     _engine: Optional[AsyncEngine] = None
     _session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+    _read_engine: Optional[AsyncEngine] = None
+    _read_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+    _pool_metrics: Dict[str, PoolMetrics] = {}
 
     @classmethod
     def init(cls):
@@ -28,19 +148,64 @@ class DatabaseService:
             logger.error("DATABASE_URL not found in environment.")
             raise ValueError("Missing DATABASE_URL")
 
-        cls._engine = create_async_engine(
-            database_url,
-            echo=False,
-            future=True,
-        )
-
+        cls._engine = cls._create_engine(database_url, "primary")
         cls._session_factory = async_sessionmaker(
             cls._engine,
             class_=AsyncSession,
             expire_on_commit=False,
         )
 
-        logger.info("DatabaseService initialized.")
+        # Reads go to the replica when one is configured, otherwise share the primary pool
+        read_url = os.getenv("DATABASE_READ_URL")
+        if read_url:
+            cls._read_engine = cls._create_engine(read_url, "replica")
+        else:
+            cls._read_engine = cls._engine
+        if cls._read_engine.dialect.name == "postgresql":
+            read_bind = cls._read_engine.execution_options(postgresql_readonly=True)
+        else:
+            read_bind = cls._read_engine
+        cls._read_session_factory = async_sessionmaker(
+            read_bind,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autoflush=False,
+        )
+
+        logger.info(f"DatabaseService initialized (read path: {'replica' if read_url else 'primary'}).")
+
+    @classmethod
+    def _create_engine(cls, url: str, name: str) -> AsyncEngine:
+        """Create an engine with pool sizing, timeouts and checkout instrumentation from the environment"""
+        options: Dict[str, Any] = {"echo": False, "future": True}
+
+        if not url.startswith("sqlite"):
+            metrics = PoolMetrics(
+                name=name,
+                slow_threshold_seconds=_env_int("DB_POOL_SLOW_CHECKOUT_MS", 100) / 1000
+            )
+            cls._pool_metrics[name] = metrics
+            options.update(
+                poolclass=type(f"{name.title()}Pool", (InstrumentedAsyncPool,), {"metrics": metrics}),
+                pool_size=_env_int("DB_POOL_SIZE", 10),
+                max_overflow=_env_int("DB_MAX_OVERFLOW", 20),
+                pool_timeout=_env_int("DB_POOL_TIMEOUT", 10),
+                pool_recycle=_env_int("DB_POOL_RECYCLE", 1800),
+                pool_pre_ping=True,
+            )
+
+        if "+asyncpg" in url:
+            server_settings = {
+                "statement_timeout": str(_env_int("DB_STATEMENT_TIMEOUT_MS", 15000)),
+                "lock_timeout": str(_env_int("DB_LOCK_TIMEOUT_MS", 5000)),
+                "idle_in_transaction_session_timeout": str(_env_int("DB_IDLE_TX_TIMEOUT_MS", 60000)),
+                "application_name": f"reve-{name}",
+            }
+            options["connect_args"] = {"server_settings": server_settings}
+
+        engine = create_async_engine(url, **options)
+        Metrics.instrument_engine(engine, name)
+        return engine
 
     @classmethod
     def get_engine(cls) -> AsyncEngine:
@@ -54,28 +219,155 @@ class DatabaseService:
             raise RuntimeError("DatabaseService not initialized.")
         return cls._session_factory
 
+    @classmethod
+    def get_read_session_factory(cls) -> async_sessionmaker[AsyncSession]:
+        if cls._read_session_factory is None:
+            raise RuntimeError("DatabaseService not initialized.")
+        return cls._read_session_factory
+
+    @classmethod
+    def _ambient_unit_of_work(cls) -> Optional[UnitOfWork]:
+        """Unit of work owned by the current task, if any (gathered child tasks get their own)"""
+        uow = _current_uow.get()
+        if uow is None:
+            return None
+        try:
+            current_task = asyncio.current_task()
+        except RuntimeError:
+            current_task = None
+        return uow if uow.task is current_task else None
+
+    @classmethod
+    @asynccontextmanager
+    async def _join_unit_of_work(cls, uow: UnitOfWork):
+        """Run a nested service call in a SAVEPOINT on the ambient session"""
+        savepoint = await uow.session.begin_nested()
+        hooks_before = len(uow.pending_hooks)
+        try:
+            yield _JoinedSession(uow.session, savepoint, uow)
+        except Exception:
+            if savepoint.is_active:
+                await savepoint.rollback()
+            # Hooks registered by the failed call must not run
+            del uow.pending_hooks[hooks_before:]
+            raise
+        else:
+            if savepoint.is_active:
+                uow.releasing_savepoint = True
+                try:
+                    await savepoint.commit()
+                finally:
+                    uow.releasing_savepoint = False
+
     @classmethod
     @asynccontextmanager
     async def get_session(cls):
-        """Context manager for database sessions."""
+        """Context manager for database sessions. Nested calls join the caller's session."""
+        uow = cls._ambient_unit_of_work()
+        if uow is not None:
+            async with cls._join_unit_of_work(uow) as joined:
+                yield joined
+            return
+
         session_factory = cls.get_session_factory()
         async with session_factory() as session:
+            uow = UnitOfWork(session=session, task=asyncio.current_task())
+            event.listen(session.sync_session, "after_commit", uow.on_commit)
+            token = _current_uow.set(uow)
+            succeeded = False
             try:
                 yield session
+                # Nested writers committed into this session; persist their work now
+                if uow.commit_requested and session.in_transaction():
+                    await session.commit()
+                succeeded = True
             except Exception:
                 await session.rollback()
                 raise
             finally:
+                _current_uow.reset(token)
                 await session.close()
+                await uow.run_hooks(succeeded)
 
     @classmethod
     @asynccontextmanager
     async def get_transaction(cls):
-        """Context manager for database transactions."""
+        """Context manager for database transactions. Nested calls join the caller's transaction."""
+        uow = cls._ambient_unit_of_work()
+        if uow is not None:
+            async with cls.get_session() as joined:
+                yield joined
+            # Leaving a transaction block commits, so the outer session must commit this work too
+            uow.commit_requested = True
+            return
+
         async with cls.get_session() as session:
             async with session.begin():
                 yield session
 
+    @classmethod
+    def defer_until_commit(cls, callback: Callable[..., Any], *args: Any, **kwargs: Any) -> bool:
+        """
+        Queue a callback to run after the ambient unit of work commits.
+        Returns False when there is no unit of work, in which case the caller runs it now.
+        """
+        uow = cls._ambient_unit_of_work()
+        if uow is None:
+            return False
+        uow.pending_hooks.append((callback, args, kwargs))
+        return True
+
+    @classmethod
+    async def after_commit(cls, callback: Callable[..., Any], *args: Any, **kwargs: Any):
+        """Run a (sync or async) callback after the outer commit, or immediately outside a unit of work"""
+        if cls.defer_until_commit(callback, *args, **kwargs):
+            return
+        result = callback(*args, **kwargs)
+        if inspect.isawaitable(result):
+            await result
+
+    @classmethod
+    @asynccontextmanager
+    async def get_read_session(cls):
+        """Context manager for READ ONLY sessions, routed to the replica when configured."""
+        session_factory = cls.get_read_session_factory()
+        async with session_factory() as session:
+            try:
+                yield session
+            finally:
+                # Nothing to persist; end the read-only transaction without a commit round trip
+                await session.rollback()
+                await session.close()
+
+    @classmethod
+    def get_pool_stats(cls) -> Dict[str, Dict[str, Any]]:
+        """Checkout latency and saturation for every instrumented pool"""
+        engines = {"primary": cls._engine}
+        if cls._read_engine is not None and cls._read_engine is not cls._engine:
+            engines["replica"] = cls._read_engine
+
+        stats = {}
+        for name, engine in engines.items():
+            metrics = cls._pool_metrics.get(name)
+            if engine is None or metrics is None:
+                continue
+            pool = engine.sync_engine.pool
+            size = pool.size()  # type: ignore[attr-defined]
+            checked_out = pool.checkedout()  # type: ignore[attr-defined]
+            capacity = size + max(getattr(pool, "_max_overflow", 0), 0)
+            stats[name] = {
+                "size": size,
+                "checked_out": checked_out,
+                "overflow": pool.overflow(),  # type: ignore[attr-defined]
+                "saturation": checked_out / capacity if capacity else 0.0,
+                "checkouts": metrics.checkouts,
+                "timeouts": metrics.timeouts,
+                "slow_checkouts": metrics.slow_checkouts,
+                "avg_wait_ms": (metrics.total_wait_seconds / metrics.checkouts * 1000) if metrics.checkouts else 0.0,
+                "max_wait_ms": metrics.max_wait_seconds * 1000,
+            }
+        return stats
+
     @classmethod
     async def create_all_tables(cls):
         if cls._engine is None:
@@ -92,4 +384,4 @@ class DatabaseService:
             return verify_model_relationships()
         except Exception as e:
             logger.error(f"Model integrity check failed: {e}")
-            return False
\ No newline at end of file
+            return False
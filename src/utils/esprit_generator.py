@@ -14,6 +14,7 @@ from PIL.ImageFont import FreeTypeFont
 
 from src.utils.config_manager import ConfigManager
 from src.utils.logger import get_logger
+from src.utils.tracing import Tracer
 from src.utils.game_constants import Tiers, Elements
 from src.utils.embed_colors import EmbedColors
 
@@ -320,6 +321,7 @@ class EspritGenerator:
         
         return placeholder
 
+    @Tracer.traced("esprit card", "render")
     async def render_esprit_card(self, esprit_data: Dict[str, Any]) -> Image.Image:
         """
         Main method: Render beautiful esprit card with new assets
@@ -368,6 +370,7 @@ class EspritGenerator:
         # Just a simple error card, no text needed
         return card
 
+    @Tracer.traced("encode png", "render")
     async def to_discord_file(self, image: Image.Image, filename: str) -> Optional[disnake.File]:
         """Convert PIL image to Discord file"""
         try:
@@ -0,0 +1,283 @@
+# src/utils/esprit_search_index.py
+import asyncio
+import bisect
+import re
+import time
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from src.database.models.esprit_base import EspritBase
+from src.utils.database_service import DatabaseService
+from src.utils.game_constants import Elements
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Trigram similarity (pg_trgm style) a fuzzy hit must reach to be returned
+FUZZY_THRESHOLD = 0.3
+
+# Rank bands: every exact hit beats every prefix hit, etc.; trigram similarity orders within a band
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING, FUZZY = 4.0, 3.0, 2.0, 1.0, 0.0
+
+
+def normalize(text: str) -> str:
+    """Casefolded, accent-stripped, punctuation collapsed to single spaces"""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    return re.sub(r"[^0-9a-z]+", " ", text).strip()
+
+
+def trigrams(text: str) -> Counter:
+    """Padded trigrams of each word, like pg_trgm"""
+    grams: Counter = Counter()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """Catalog fields the index filters and ranks on"""
+    id: int
+    name: str
+    element: str
+    tier: int
+    atk: int
+    defense: int
+    hp: int
+
+    @property
+    def power(self) -> int:
+        return self.atk + self.defense + self.hp // 10
+
+
+@dataclass
+class CatalogSnapshot:
+    """Immutable build of the index; searches read whichever snapshot is current"""
+    entries: List[CatalogEntry]
+    normalized: List[str]
+    by_name: Dict[str, int]
+    position_of: Dict[int, int]
+    trie: Dict[str, dict]
+    grams: Dict[str, List[int]]
+    gram_counts: List[int]
+    element_bits: Dict[str, int]
+    tier_bits: Dict[int, int]
+    # stat -> (negated values ascending, prefix bitmaps: mask of the top i entries)
+    stat_bits: Dict[str, Tuple[List[int], List[int]]]
+    all_bits: int = 0
+    built_at: float = field(default_factory=time.monotonic)
+
+
+class EspritSearchIndex:
+    """
+    In-memory search over the EspritBase catalog.
+
+    Names are indexed in a prefix trie (full name and every word start, each node
+    carrying a bitmap of entries beneath it) and a trigram posting list for ranked
+    fuzzy matching. Element, tier and stat filters are precomputed bitmaps over
+    entry positions, so a filtered search is a handful of integer ANDs. The catalog
+    is a few hundred rows, so the whole index is rebuilt rather than patched: on
+    first use, after invalidate() (catalog/config reload) or once max_age expires.
+    """
+
+    _snapshot: Optional[CatalogSnapshot] = None
+    _build_lock = asyncio.Lock()
+    _stale = False
+    max_age = 900.0
+
+    # --- Lifecycle ---
+
+    @classmethod
+    async def ensure_loaded(cls) -> CatalogSnapshot:
+        snapshot = cls._snapshot
+        if snapshot is not None and not cls._stale and time.monotonic() - snapshot.built_at < cls.max_age:
+            return snapshot
+        if snapshot is not None and cls._build_lock.locked():
+            return snapshot  # someone is rebuilding; serve the previous build meanwhile
+        return await cls.rebuild()
+
+    @classmethod
+    async def rebuild(cls) -> CatalogSnapshot:
+        """Reload the catalog from the database and swap in a fresh index"""
+        async with cls._build_lock:
+            async with DatabaseService.get_read_session() as session:
+                bases = (await session.execute(select(EspritBase).order_by(EspritBase.id))).scalars().all()  # type: ignore
+            entries = [
+                CatalogEntry(
+                    id=base.id, name=base.name, element=base.element.lower(), tier=base.base_tier,  # type: ignore[arg-type]
+                    atk=base.base_atk, defense=base.base_def, hp=base.base_hp
+                )
+                for base in bases
+            ]
+            cls._snapshot = cls.build(entries)
+            cls._stale = False
+            logger.info(f"Esprit search index built: {len(entries)} entries")
+            return cls._snapshot
+
+    @classmethod
+    def invalidate(cls):
+        """Mark the index stale; the next lookup rebuilds it"""
+        cls._stale = True
+
+    @staticmethod
+    def build(entries: List[CatalogEntry]) -> CatalogSnapshot:
+        normalized = [normalize(entry.name) for entry in entries]
+        trie: Dict[str, dict] = {}
+        grams: Dict[str, List[int]] = {}
+        gram_counts: List[int] = []
+        element_bits: Dict[str, int] = {}
+        tier_bits: Dict[int, int] = {}
+
+        for pos, (entry, name) in enumerate(zip(entries, normalized)):
+            bit = 1 << pos
+            # Full name plus each later word start, so "drake" finds "Ember Drake"
+            words = name.split()
+            for start in range(len(words)):
+                node = trie
+                for ch in " ".join(words[start:]):
+                    node = node.setdefault(ch, {})
+                    node["#"] = node.get("#", 0) | bit
+                    # Remember which entries match this prefix from their first word
+                    if start == 0:
+                        node["^"] = node.get("^", 0) | bit
+
+            entry_grams = trigrams(name)
+            gram_counts.append(sum(entry_grams.values()))
+            for gram in entry_grams:
+                grams.setdefault(gram, []).append(pos)
+
+            element_bits[entry.element] = element_bits.get(entry.element, 0) | bit
+            tier_bits[entry.tier] = tier_bits.get(entry.tier, 0) | bit
+
+        stat_bits = {}
+        for stat in ("atk", "defense", "hp", "power"):
+            order = sorted(range(len(entries)), key=lambda p: getattr(entries[p], stat), reverse=True)
+            negated, masks, mask = [], [0], 0
+            for pos in order:
+                negated.append(-getattr(entries[pos], stat))
+                mask |= 1 << pos
+                masks.append(mask)
+            stat_bits[stat] = (negated, masks)
+
+        return CatalogSnapshot(
+            entries=entries, normalized=normalized,
+            by_name={name: pos for pos, name in enumerate(normalized)},
+            position_of={entry.id: pos for pos, entry in enumerate(entries)},
+            trie=trie, grams=grams, gram_counts=gram_counts,
+            element_bits=element_bits, tier_bits=tier_bits, stat_bits=stat_bits,
+            all_bits=(1 << len(entries)) - 1
+        )
+
+    # --- Filters ---
+
+    @staticmethod
+    def filter_mask(snapshot: CatalogSnapshot, element: Optional[str] = None, tiers: Optional[Iterable[int]] = None,
+                    min_tier: Optional[int] = None, max_tier: Optional[int] = None,
+                    min_stats: Optional[Dict[str, int]] = None) -> int:
+        mask = snapshot.all_bits
+        if element:
+            element_obj = Elements.from_string(element)
+            mask &= snapshot.element_bits.get(element_obj.name.lower() if element_obj else element.lower(), 0)
+        if tiers is not None or min_tier is not None or max_tier is not None:
+            allowed = 0
+            for tier, bits in snapshot.tier_bits.items():
+                if tiers is not None and tier not in tiers:
+                    continue
+                if (min_tier is None or tier >= min_tier) and (max_tier is None or tier <= max_tier):
+                    allowed |= bits
+            mask &= allowed
+        for stat, minimum in (min_stats or {}).items():
+            if stat not in snapshot.stat_bits:
+                raise ValueError(f"Unknown stat filter: {stat}")
+            negated, masks = snapshot.stat_bits[stat]
+            # negated values ascend, so this counts the entries with stat >= minimum
+            mask &= masks[bisect.bisect_right(negated, -minimum)]
+        return mask
+
+    @staticmethod
+    def positions(mask: int) -> Iterable[int]:
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    # --- Lookups ---
+
+    @classmethod
+    def _trie_mask(cls, snapshot: CatalogSnapshot, prefix: str, key: str = "#") -> int:
+        node = snapshot.trie
+        for ch in prefix:
+            node = node.get(ch)  # type: ignore[assignment]
+            if node is None:
+                return 0
+        return node.get(key, 0)
+
+    @classmethod
+    def _rank(cls, snapshot: CatalogSnapshot, query: str, mask: int) -> List[Tuple[int, float]]:
+        q = normalize(query)
+        if not q:
+            return [(pos, FUZZY) for pos in cls.positions(mask)]
+
+        scores: Dict[int, float] = {}
+        exact = snapshot.by_name.get(q)
+        if exact is not None and mask >> exact & 1:
+            scores[exact] = EXACT
+
+        for band, bits in ((PREFIX, cls._trie_mask(snapshot, q, "^")), (WORD_PREFIX, cls._trie_mask(snapshot, q))):
+            for pos in cls.positions(bits & mask):
+                scores.setdefault(pos, band)
+
+        # Trigram overlap gives the in-band order and catches typos / out-of-order words
+        q_grams = trigrams(q)
+        q_total = sum(q_grams.values())
+        shared: Counter = Counter()
+        for gram in q_grams:
+            for pos in snapshot.grams.get(gram, ()):
+                if mask >> pos & 1:
+                    shared[pos] += 1
+        for pos, count in shared.items():
+            similarity = count / (q_total + snapshot.gram_counts[pos] - count)
+            band = scores.get(pos)
+            if band is None:
+                if q in snapshot.normalized[pos]:
+                    band = SUBSTRING
+                elif similarity >= FUZZY_THRESHOLD:
+                    band = FUZZY
+                else:
+                    continue
+            scores[pos] = band + similarity
+
+        return sorted(scores.items(), key=lambda item: (-item[1], len(snapshot.normalized[item[0]]), snapshot.normalized[item[0]]))
+
+    @classmethod
+    async def search(cls, query: str, limit: Optional[int] = 20, **filters) -> List[Tuple[CatalogEntry, float]]:
+        """Ranked (entry, score) matches; filters: element, tiers, min_tier, max_tier, min_stats"""
+        snapshot = await cls.ensure_loaded()
+        ranked = cls._rank(snapshot, query, cls.filter_mask(snapshot, **filters))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(snapshot.entries[pos], score) for pos, score in ranked]
+
+    @classmethod
+    async def find(cls, name: str) -> Optional[CatalogEntry]:
+        """Exact (normalized) name match"""
+        snapshot = await cls.ensure_loaded()
+        pos = snapshot.by_name.get(normalize(name))
+        return snapshot.entries[pos] if pos is not None else None
+
+    @classmethod
+    async def best_match(cls, name: str) -> Optional[CatalogEntry]:
+        """Exact match if there is one, otherwise the top-ranked prefix/substring/fuzzy hit"""
+        hits = await cls.search(name, limit=1)
+        return hits[0][0] if hits else None
+
+    @classmethod
+    async def autocomplete(cls, prefix: str, limit: int = 25, **filters) -> List[str]:
+        """Names for Discord autocomplete (at most 25 choices)"""
+        return [entry.name for entry, _ in await cls.search(prefix, limit=min(limit, 25), **filters)]
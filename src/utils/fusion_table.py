@@ -0,0 +1,211 @@
+# src/utils/fusion_table.py
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+
+from src.database.models.esprit_base import EspritBase
+from src.domain import economy_formulas
+from src.utils.config_manager import ConfigManager
+from src.utils.database_service import DatabaseService
+from src.utils.game_constants import FUSION_CHART
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MAX_TIER = 12
+ELEMENTS = ("inferno", "verdant", "abyssal", "tempest", "umbral", "radiant")
+
+
+class AliasSampler:
+    """Vose alias table: O(1) weighted draws after O(n) setup"""
+    __slots__ = ("probability", "alias")
+
+    def __init__(self, weights: Sequence[float]):
+        if not weights or sum(weights) <= 0:
+            raise ValueError("AliasSampler needs at least one positive weight")
+        count = len(weights)
+        total = float(sum(weights))
+        scaled = [weight * count / total for weight in weights]
+        self.probability = [1.0] * count
+        self.alias = list(range(count))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            self.probability[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] -= 1.0 - scaled[low]
+            (small if scaled[high] < 1.0 else large).append(high)
+        # Whatever is left is 1.0 up to rounding
+
+    def sample(self, rng: Any = random) -> int:
+        column = rng.randrange(len(self.probability))
+        return column if rng.random() < self.probability[column] else self.alias[column]
+
+
+@dataclass(frozen=True)
+class FusionRates:
+    """Cost and odds of fusing two esprits of one tier"""
+    tier: int
+    result_tier: int
+    cost: int
+    success_rate: int
+    fragments_for_guaranteed: int
+
+
+@dataclass(frozen=True)
+class ElementOutcome:
+    """Where an element pair can land: the raw chart entry and its distribution"""
+    chart_result: Any
+    elements: Tuple[str, ...]
+    probabilities: Tuple[float, ...]
+    sampler: AliasSampler = field(compare=False, repr=False)
+
+
+@dataclass
+class FusionSnapshot:
+    """One compiled build; lookups read whichever snapshot is current"""
+    rates: Dict[int, FusionRates]
+    outcomes: Dict[Tuple[str, str], ElementOutcome]
+    # tier -> candidates, (tier, element) -> candidates; candidates are preview payloads
+    tier_pools: Dict[int, Tuple[Dict[str, Any], ...]]
+    element_pools: Dict[Tuple[int, str], Tuple[Dict[str, Any], ...]]
+    samplers: Dict[Any, AliasSampler]
+    built_at: float = field(default_factory=time.monotonic)
+
+    def draw(self, tier: int, element: Optional[str] = None, rng: Any = random) -> Dict[str, Any]:
+        """One result candidate from the whole tier, or one element of it"""
+        key: Any = tier if element is None else (tier, element.lower())
+        pool = self.tier_pools.get(tier) if element is None else self.element_pools.get(key)
+        if not pool:
+            raise ValueError(f"No Esprits available for tier {tier}" + (f" ({element})" if element else ""))
+        return dict(pool[self.samplers[key].sample(rng)])
+
+
+class FusionTable:
+    """
+    Fusion rules compiled into lookup tables.
+
+    Tier costs and success rates come from fusion_system.json, element-pair
+    outcome distributions from FUSION_CHART, and result candidates from the
+    EspritBase catalog (per tier and per tier + element, each with an alias
+    sampler). Previews become dictionary lookups and executions skip the
+    per-fusion catalog query. Built on first use; invalidate() after a config
+    reload or catalog change.
+    """
+
+    _snapshot: Optional[FusionSnapshot] = None
+    _build_lock = asyncio.Lock()
+    _stale = False
+
+    # --- Lifecycle ---
+
+    @classmethod
+    async def ensure_loaded(cls) -> FusionSnapshot:
+        snapshot = cls._snapshot
+        if snapshot is not None and (not cls._stale or cls._build_lock.locked()):
+            return snapshot
+        return await cls.rebuild()
+
+    @classmethod
+    async def rebuild(cls) -> FusionSnapshot:
+        """Reload the catalog and config and swap in a fresh table"""
+        async with cls._build_lock:
+            async with DatabaseService.get_read_session() as session:
+                bases = (await session.execute(select(EspritBase).order_by(EspritBase.id))).scalars().all()  # type: ignore
+                cls._snapshot = cls.build(ConfigManager.get("fusion_system") or {}, bases)
+            cls._stale = False
+            logger.info(f"Fusion table built: {len(cls._snapshot.rates)} tiers, {len(bases)} candidates")
+            return cls._snapshot
+
+    @classmethod
+    def invalidate(cls):
+        """Mark the table stale; the next lookup rebuilds it"""
+        cls._stale = True
+
+    @staticmethod
+    def candidate(base: EspritBase) -> Dict[str, Any]:
+        """Preview payload for one possible result"""
+        return {
+            "id": base.id, "name": base.name, "element": base.element,
+            "tier": base.base_tier, "rarity": base.get_rarity_name(),
+            "image_url": base.image_url, "element_emoji": base.get_element_emoji(),
+            "base_power": base.get_base_power()
+        }
+
+    @classmethod
+    def build(cls, config: Dict[str, Any], bases: Sequence[EspritBase]) -> FusionSnapshot:
+        rates = {}
+        for tier in range(1, MAX_TIER):
+            success_rate = economy_formulas.fusion_success_rate(tier, tier, config)
+            rates[tier] = FusionRates(
+                tier=tier, result_tier=tier + 1,
+                cost=economy_formulas.fusion_cost(tier, tier, config),
+                success_rate=success_rate,
+                fragments_for_guaranteed=max(0, (100 - success_rate + 9) // 10)  # Ceiling division
+            )
+
+        outcomes = {}
+        for element1 in ELEMENTS:
+            for element2 in ELEMENTS:
+                chart_result = FUSION_CHART.get((element1, element2), FUSION_CHART.get((element2, element1), "random"))
+                if isinstance(chart_result, list):
+                    elements = tuple(chart_result)  # 50/50
+                elif chart_result == "random":
+                    elements = ELEMENTS
+                else:
+                    elements = (chart_result,)
+                outcomes[(element1, element2)] = ElementOutcome(
+                    chart_result=chart_result, elements=elements,
+                    probabilities=tuple(1 / len(elements) for _ in elements),
+                    sampler=AliasSampler([1.0] * len(elements))
+                )
+
+        tier_lists: Dict[int, List[Dict[str, Any]]] = {}
+        element_lists: Dict[Tuple[int, str], List[Dict[str, Any]]] = {}
+        for base in bases:
+            payload = cls.candidate(base)
+            tier_lists.setdefault(base.base_tier, []).append(payload)
+            element_lists.setdefault((base.base_tier, base.element.lower()), []).append(payload)
+        tier_pools = {tier: tuple(pool) for tier, pool in tier_lists.items()}
+        element_pools = {key: tuple(pool) for key, pool in element_lists.items()}
+
+        # Every catalog entry is equally likely within its pool
+        samplers: Dict[Any, AliasSampler] = {key: AliasSampler([1.0] * len(pool)) for key, pool in tier_pools.items()}
+        samplers.update({key: AliasSampler([1.0] * len(pool)) for key, pool in element_pools.items()})
+        return FusionSnapshot(rates=rates, outcomes=outcomes, tier_pools=tier_pools,
+                              element_pools=element_pools, samplers=samplers)
+
+    # --- Lookups ---
+
+    @classmethod
+    async def rates(cls, tier1: int, tier2: int) -> FusionRates:
+        if tier1 != tier2:
+            raise ValueError("Esprits must be the same tier to fuse")
+        rates = (await cls.ensure_loaded()).rates.get(tier1)
+        if rates is None:
+            raise ValueError("Cannot fuse - result would exceed maximum tier")
+        return rates
+
+    @classmethod
+    async def outcome(cls, element1: str, element2: str) -> ElementOutcome:
+        outcome = (await cls.ensure_loaded()).outcomes.get((element1.lower(), element2.lower()))
+        if outcome is None:
+            raise ValueError(f"Invalid fusion combination: {element1} + {element2}")
+        return outcome
+
+    @classmethod
+    async def candidates(cls, tier: int, element: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Possible results of a fusion into `tier` (optionally of one element)"""
+        snapshot = await cls.ensure_loaded()
+        pool = snapshot.tier_pools.get(tier, ()) if element is None else snapshot.element_pools.get((tier, element.lower()), ())
+        return [dict(payload) for payload in pool]
+
+    @classmethod
+    async def sample(cls, tier: int, element: Optional[str] = None, rng: Any = random) -> Dict[str, Any]:
+        """Draw one result candidate (the whole tier, or one element of it)"""
+        return (await cls.ensure_loaded()).draw(tier, element, rng)
@@ -405,9 +405,6 @@ FUSION_CHART = {
 
 
 def get_fusion_result(element1: str, element2: str) -> Any:
-    """Get fusion result for two elements"""
-    sorted_elements = sorted([element1.lower(), element2.lower()])
-    if len(sorted_elements) != 2:
-        return "random"
-    key = (sorted_elements[0], sorted_elements[1])
-    return FUSION_CHART.get(key, "random")
\ No newline at end of file
+    """Get fusion result for two elements (the chart lists each pair in one order only)"""
+    key = (element1.lower(), element2.lower())
+    return FUSION_CHART.get(key, FUSION_CHART.get((key[1], key[0]), "random"))
\ No newline at end of file
@@ -0,0 +1,446 @@
+# src/utils/job_scheduler.py
+import asyncio
+import os
+import random
+import socket
+import time as monotonic_time
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+
+from src.utils.database_service import DatabaseService
+from src.utils.redis_service import RedisService
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+LEASE_KEY = "scheduler:lease:{}"
+STATE_KEY = "scheduler:state:{}"
+LEADER_LOCK_KEY = zlib.crc32(b"scheduler:leader")
+LEADER_CHECK_SECONDS = 15.0
+
+# Release/extend the lease only while we still own it
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end
+return 0
+"""
+_EXTEND_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('PEXPIRE', KEYS[1], ARGV[2]) end
+return 0
+"""
+
+
+@dataclass
+class Job:
+    """A recurring job: every `interval`, or daily at `daily_at` (UTC)"""
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    interval: Optional[timedelta] = None
+    daily_at: Optional[time] = None
+    lease_seconds: int = 120
+    jitter_seconds: float = 0.0
+    catch_up: bool = True
+
+    def next_due(self, after: datetime) -> datetime:
+        """First scheduled time strictly after `after`"""
+        if self.interval is not None:
+            return after + self.interval
+        assert self.daily_at is not None
+        candidate = datetime.combine(after.date(), self.daily_at)
+        return candidate if candidate > after else candidate + timedelta(days=1)
+
+    def last_scheduled(self, now: datetime) -> datetime:
+        """Most recent scheduled time at or before now (daily jobs only)"""
+        assert self.daily_at is not None
+        candidate = datetime.combine(now.date(), self.daily_at)
+        return candidate if candidate <= now else candidate - timedelta(days=1)
+
+
+@dataclass
+class JobState:
+    """Per-job schedule and metrics; mirrored to Redis so every process (and task_status) sees it"""
+    next_due: Optional[datetime] = None
+    last_run: Optional[datetime] = None
+    last_duration: float = 0.0
+    last_lag: float = 0.0
+    max_lag: float = 0.0
+    runs: int = 0
+    errors: int = 0
+    consecutive_failures: int = 0
+    skipped_not_leader: int = 0
+    last_error: Optional[str] = None
+    last_owner: Optional[str] = None
+    running: bool = field(default=False, repr=False)
+
+    def to_redis(self) -> Dict[str, str]:
+        fields = {
+            "next_due": self.next_due.isoformat() if self.next_due else "",
+            "last_run": self.last_run.isoformat() if self.last_run else "",
+            "last_duration": f"{self.last_duration:.4f}", "last_lag": f"{self.last_lag:.4f}",
+            "max_lag": f"{self.max_lag:.4f}", "consecutive_failures": str(self.consecutive_failures),
+            "last_error": self.last_error or "", "last_owner": self.last_owner or "",
+        }
+        return fields
+
+    def merge_redis(self, fields: Dict[str, str]):
+        parse = lambda value: datetime.fromisoformat(value) if value else None  # noqa: E731
+        self.next_due = parse(fields.get("next_due", "")) or self.next_due
+        self.last_run = parse(fields.get("last_run", "")) or self.last_run
+        self.last_duration = float(fields.get("last_duration") or self.last_duration)
+        self.last_lag = float(fields.get("last_lag") or self.last_lag)
+        self.max_lag = float(fields.get("max_lag") or self.max_lag)
+        self.runs = int(fields.get("runs") or self.runs)
+        self.errors = int(fields.get("errors") or self.errors)
+        self.consecutive_failures = int(fields.get("consecutive_failures") or self.consecutive_failures)
+        self.last_error = fields.get("last_error") or self.last_error
+        self.last_owner = fields.get("last_owner") or self.last_owner
+
+
+async def _discard_connection(connection):
+    """Close a connection without returning it to the pool, which also drops its session-level locks"""
+    try:
+        await connection.invalidate()
+    except Exception:
+        pass
+    try:
+        await connection.close()
+    except Exception:
+        pass
+
+
+async def _try_advisory_lock(engine, key: int):
+    """Connection holding session advisory lock `key`, or None if another session has it"""
+    connection = await engine.connect()
+    try:
+        locked = (await connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key})).scalar()
+        # The lock is session-level; end the implicit transaction so the idle connection isn't timed out
+        await connection.commit()
+    except Exception:
+        await _discard_connection(connection)
+        raise
+    if locked:
+        return connection
+    await connection.close()
+    return None
+
+
+async def _advisory_unlock(connection, key: int):
+    try:
+        await connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+        await connection.commit()
+    except Exception:
+        await _discard_connection(connection)
+        raise
+    await connection.close()
+
+
+class _LeaderLock:
+    """
+    Scheduler leadership while Redis is unavailable: a session advisory lock held on one
+    dedicated connection for as long as the process lives. Without Redis there is no
+    shared schedule, so only the leader may run jobs.
+    """
+
+    def __init__(self):
+        self._connection = None
+        self._checked_at = float("-inf")
+
+    @property
+    def held(self) -> bool:
+        return self._connection is not None
+
+    async def ensure(self, engine) -> bool:
+        """True while this process is the leader; re-checked (or retried) every LEADER_CHECK_SECONDS"""
+        now = monotonic_time.monotonic()
+        if now - self._checked_at < LEADER_CHECK_SECONDS:
+            return self.held
+        self._checked_at = now
+
+        if self._connection is not None:
+            try:
+                await self._connection.execute(text("SELECT 1"))
+                await self._connection.commit()
+                return True
+            except Exception as e:
+                logger.warning(f"Lost scheduler leadership: {e}")
+                await _discard_connection(self._connection)
+                self._connection = None
+
+        self._connection = await _try_advisory_lock(engine, LEADER_LOCK_KEY)
+        if self._connection is not None:
+            logger.info("Became scheduler leader (Postgres advisory lock)")
+        return self.held
+
+    async def release(self):
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            try:
+                await _advisory_unlock(connection, LEADER_LOCK_KEY)
+            except Exception as e:
+                logger.warning(f"Failed to release scheduler leadership: {e}")
+
+
+class _Lease:
+    """Exclusive right to run one job; Redis lease, Postgres advisory lock, or in-process stand-in"""
+
+    _local_locks: Dict[str, asyncio.Lock] = {}
+
+    def __init__(self, job: Job, owner: str):
+        self.job = job
+        self.owner = owner
+        self.backend: Optional[str] = None
+        self._connection = None
+        self._renewer: Optional[asyncio.Task] = None
+
+    async def acquire(self) -> bool:
+        client = RedisService.get_client()
+        if client is not None:
+            try:
+                ttl_ms = self.job.lease_seconds * 1000
+                if await client.set(LEASE_KEY.format(self.job.name), self.owner, nx=True, px=ttl_ms):
+                    self.backend = "redis"
+                    self._renewer = asyncio.create_task(self._renew(client, ttl_ms))
+                    return True
+                return False
+            except Exception as e:
+                logger.debug(f"Redis lease for {self.job.name} unavailable: {e}")
+
+        engine = DatabaseService._engine
+        if engine is not None and engine.dialect.name == "postgresql":
+            # Session-level advisory lock held on a dedicated connection for the run
+            key = zlib.crc32(f"scheduler:{self.job.name}".encode())
+            self._connection = await _try_advisory_lock(engine, key)
+            if self._connection is None:
+                return False
+            self.backend = "advisory"
+            self._advisory_key = key
+            return True
+
+        lock = self._local_locks.setdefault(self.job.name, asyncio.Lock())
+        if lock.locked():
+            return False
+        await lock.acquire()
+        self.backend = "local"
+        return True
+
+    async def _renew(self, client, ttl_ms: int):
+        # Extend at a third of the TTL so a long run never loses the lease to another process
+        while True:
+            await asyncio.sleep(ttl_ms / 3000)
+            try:
+                if not await client.eval(_EXTEND_SCRIPT, 1, LEASE_KEY.format(self.job.name), self.owner, ttl_ms):
+                    logger.warning(f"Lost scheduler lease for {self.job.name}")
+                    return
+            except Exception as e:
+                logger.debug(f"Lease renewal for {self.job.name} failed: {e}")
+
+    async def release(self):
+        if self._renewer is not None:
+            self._renewer.cancel()
+        try:
+            if self.backend == "redis":
+                client = RedisService.get_client()
+                if client is not None:
+                    await client.eval(_RELEASE_SCRIPT, 1, LEASE_KEY.format(self.job.name), self.owner)
+            elif self.backend == "advisory" and self._connection is not None:
+                connection, self._connection = self._connection, None
+                await _advisory_unlock(connection, self._advisory_key)
+            elif self.backend == "local":
+                self._local_locks[self.job.name].release()
+        except Exception as e:
+            logger.warning(f"Failed to release scheduler lease for {self.job.name}: {e}")
+
+
+class JobScheduler:
+    """
+    Runs recurring jobs once per deployment rather than once per process.
+
+    Every process ticks through the same schedule; a due job is only run by the
+    process that wins its lease (Redis SET NX with renewal). The winner re-reads
+    the shared state after winning, runs, records duration and lag, and
+    publishes the next due time. Without Redis there is no shared schedule, so
+    on Postgres a single leader (long-lived advisory lock) runs every job and
+    the other processes stand by; single-process/local runs use in-process
+    locks. A job is never run concurrently with
+    itself, first runs are jittered so restarted shards don't stampede, and a
+    missed schedule (downtime) is caught up with one immediate run.
+    """
+
+    def __init__(self, tick_seconds: float = 1.0):
+        self.tick_seconds = tick_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.jobs: Dict[str, Job] = {}
+        self.state: Dict[str, JobState] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._running: Dict[str, asyncio.Task] = {}
+        self._leader = _LeaderLock()
+
+    def add(self, job: Job):
+        if (job.interval is None) == (job.daily_at is None):
+            raise ValueError(f"Job {job.name} needs exactly one of interval or daily_at")
+        self.jobs[job.name] = job
+        self.state.setdefault(job.name, JobState())
+
+    async def start(self):
+        for name, job in self.jobs.items():
+            state = self.state[name]
+            await self._load_shared(name, state)
+            state.next_due = self._initial_due(job, state, datetime.utcnow())
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self, wait: bool = True):
+        if self._task is not None:
+            self._task.cancel()
+        if wait and self._running:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+        await self._leader.release()
+
+    def _initial_due(self, job: Job, state: JobState, now: datetime) -> datetime:
+        jitter = timedelta(seconds=random.uniform(0, job.jitter_seconds))
+        if state.next_due is not None and state.next_due > now:
+            return state.next_due
+        if job.daily_at is not None:
+            missed = job.catch_up and state.last_run is not None and state.last_run < job.last_scheduled(now)
+            return now + jitter if missed else job.next_due(now)
+        # Interval jobs run shortly after start (as tasks.loop did) and also catch up after downtime
+        return now + jitter
+
+    async def _loop(self):
+        while True:
+            now = datetime.utcnow()
+            for name, job in self.jobs.items():
+                state = self.state[name]
+                if name in self._running or state.next_due is None or state.next_due > now:
+                    continue
+                self._running[name] = asyncio.create_task(self._attempt(job, state))
+                self._running[name].add_done_callback(lambda _t, n=name: self._running.pop(n, None))
+            await asyncio.sleep(self.tick_seconds)
+
+    async def _is_leader(self) -> bool:
+        """Whether this process may run jobs without a shared (Redis) schedule"""
+        engine = DatabaseService._engine
+        if engine is None or engine.dialect.name != "postgresql":
+            return True  # Single process / local run: the in-process locks are enough
+        try:
+            return await self._leader.ensure(engine)
+        except Exception as e:
+            logger.warning(f"Scheduler leadership check failed: {e}")
+            return False
+
+    async def _attempt(self, job: Job, state: JobState):
+        if RedisService.get_client() is None and not await self._is_leader():
+            await self._follow(job, state)
+            return
+
+        lease = _Lease(job, self.owner)
+        try:
+            acquired = await lease.acquire()
+        except Exception as e:
+            logger.warning(f"Scheduler could not acquire lease for {job.name}: {e}")
+            acquired = False
+        if acquired and lease.backend == "advisory" and not await self._is_leader():
+            # Redis failed mid-flight: the advisory lock only stops overlap, not a second run
+            await lease.release()
+            acquired = False
+        if not acquired:
+            await self._follow(job, state)
+            return
+
+        try:
+            await self._load_shared(job.name, state)
+            due = state.next_due or datetime.utcnow()
+            if due > datetime.utcnow():
+                return  # another process ran it while we were waiting for the lease
+            await self._run(job, state, due)
+        finally:
+            await lease.release()
+
+    async def _follow(self, job: Job, state: JobState):
+        """Another process owns this run; follow the shared schedule"""
+        state.skipped_not_leader += 1
+        if RedisService.get_client() is None:
+            # No shared schedule to follow: keep this job's own cadence, so taking over
+            # leadership later doesn't fire every job (daily reset included) at once
+            state.next_due = job.next_due(datetime.utcnow())
+            return
+        await self._load_shared(job.name, state)
+        if state.next_due is None or state.next_due <= datetime.utcnow():
+            state.next_due = datetime.utcnow() + timedelta(seconds=max(self.tick_seconds, 5))
+
+    async def run_now(self, name: str) -> Any:
+        """Run a job immediately in this process (manual trigger), still respecting its lease"""
+        job = self.jobs[name]
+        lease = _Lease(job, self.owner)
+        if not await lease.acquire():
+            raise RuntimeError(f"{name} is already running in another process")
+        try:
+            return await self._run(job, self.state[name], datetime.utcnow(), reschedule=False)
+        finally:
+            await lease.release()
+
+    async def _run(self, job: Job, state: JobState, due: datetime, reschedule: bool = True) -> Any:
+        started = datetime.utcnow()
+        clock = monotonic_time.perf_counter()
+        state.running = True
+        state.last_lag = max(0.0, (started - due).total_seconds())
+        state.max_lag = max(state.max_lag, state.last_lag)
+        error: Optional[str] = None
+        result = None
+        try:
+            result = await job.run()
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            logger.error(f"Scheduled job {job.name} failed: {e}", exc_info=True)
+        finally:
+            state.running = False
+
+        state.last_duration = monotonic_time.perf_counter() - clock
+        state.last_run = started
+        state.last_owner = self.owner
+        if error:
+            state.errors += 1
+            state.consecutive_failures += 1
+            state.last_error = error
+        else:
+            state.runs += 1
+            state.consecutive_failures = 0
+
+        if reschedule:
+            # Keep the cadence, but after a long outage run once and realign instead of replaying every slot
+            next_due = job.next_due(due)
+            state.next_due = next_due if next_due > datetime.utcnow() else job.next_due(datetime.utcnow())
+        await self._save_shared(job.name, state, failed=error is not None)
+        return result
+
+    async def _load_shared(self, name: str, state: JobState):
+        client = RedisService.get_client()
+        if client is None:
+            return
+        try:
+            fields = await client.hgetall(STATE_KEY.format(name))
+            if fields:
+                state.merge_redis(fields)
+        except Exception as e:
+            logger.debug(f"Failed to read scheduler state for {name}: {e}")
+
+    async def _save_shared(self, name: str, state: JobState, failed: bool):
+        client = RedisService.get_client()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=True)
+            pipe.hset(STATE_KEY.format(name), mapping=state.to_redis())
+            pipe.hincrby(STATE_KEY.format(name), "errors" if failed else "runs", 1)
+            await pipe.execute()
+        except Exception as e:
+            logger.debug(f"Failed to persist scheduler state for {name}: {e}")
+
+    async def status(self) -> Dict[str, JobState]:
+        """Current state of every job, refreshed from the shared store"""
+        for name, state in self.state.items():
+            await self._load_shared(name, state)
+        return self.state
@@ -0,0 +1,110 @@
+# src/utils/jsonb_counters.py
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import BigInteger, String, cast, func, literal, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models.player import Player
+
+# Player JSONB columns that hold {key: integer count} documents
+COUNTER_COLUMNS = ("inventory", "tier_fragments", "element_fragments")
+
+
+class InsufficientCountError(ValueError):
+    """A guarded decrement found fewer units than requested"""
+
+    def __init__(self, column: str, key: str, needed: int, available: int):
+        self.column = column
+        self.key = key
+        self.needed = needed
+        self.available = available
+        super().__init__(f"Insufficient {key}. Need {needed}, have {available}")
+
+
+class JsonbCounters:
+    """
+    Server-side increments/decrements on Player JSONB counter documents.
+
+    Each call is a single UPDATE ... RETURNING: the new counts are merged into the
+    document with jsonb_build_object/||, and decrements are guarded in the WHERE
+    clause, so the document never round-trips through Python and no SELECT ... FOR
+    UPDATE is needed. Callers own the session/transaction.
+    """
+
+    @staticmethod
+    def _column(column: str):
+        if column not in COUNTER_COLUMNS:
+            raise ValueError(f"{column} is not a JSONB counter column")
+        return Player.__table__.c[column]  # type: ignore[attr-defined]
+
+    @staticmethod
+    def _count(col, key: str):
+        return func.coalesce(col[key].astext.cast(BigInteger), 0)
+
+    @classmethod
+    async def apply(cls, session: AsyncSession, player_id: int, column: str,
+                    deltas: Dict[str, int], touch: bool = True) -> Optional[Dict[str, int]]:
+        """
+        Apply signed deltas to several keys of one document atomically.
+
+        Returns the new count per key, or None when the player does not exist or a
+        negative delta would take its key below zero (nothing is written then).
+        """
+        if not deltas:
+            return {}
+
+        col = cls._column(column)
+        pairs = []
+        guards = [Player.id == player_id]
+        for key, delta in deltas.items():
+            pairs.extend([cast(literal(key), String), cls._count(col, key) + int(delta)])
+            if delta < 0:
+                guards.append(cls._count(col, key) >= -int(delta))
+
+        merged = func.coalesce(col, literal({}, JSONB)).op("||")(func.jsonb_build_object(*pairs))
+        values = {column: merged}
+        if touch:
+            values["last_active"] = datetime.utcnow()
+
+        stmt = (
+            update(Player)
+            .where(*guards)
+            .values(values)
+            .returning(*(cls._count(col, key).label(key) for key in deltas))
+            .execution_options(synchronize_session=False)
+        )
+        row = (await session.execute(stmt)).first()
+        if row is None:
+            return None
+        return {key: int(row._mapping[key]) for key in deltas}
+
+    @classmethod
+    async def increment(cls, session: AsyncSession, player_id: int, column: str,
+                        key: str, amount: int) -> int:
+        """Add amount to one key; returns the new count"""
+        result = await cls.apply(session, player_id, column, {key: amount})
+        if result is None:
+            raise ValueError(f"Player {player_id} not found")
+        return result[key]
+
+    @classmethod
+    async def consume(cls, session: AsyncSession, player_id: int, column: str,
+                      key: str, amount: int) -> int:
+        """Take amount from one key if available; returns the new count"""
+        result = await cls.apply(session, player_id, column, {key: -amount})
+        if result is None:
+            available = await cls.get(session, player_id, column, key)
+            if available is None:
+                raise ValueError(f"Player {player_id} not found")
+            raise InsufficientCountError(column, key, amount, available)
+        return result[key]
+
+    @classmethod
+    async def get(cls, session: AsyncSession, player_id: int, column: str, key: str) -> Optional[int]:
+        """Read one count without loading the document; None if the player is missing"""
+        col = cls._column(column)
+        stmt = select(cls._count(col, key)).where(Player.id == player_id)  # type: ignore
+        value = (await session.execute(stmt)).scalar()
+        return None if value is None else int(value)
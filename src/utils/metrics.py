@@ -0,0 +1,375 @@
+# src/utils/metrics.py
+import asyncio
+import bisect
+import functools
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.logger import get_logger
+from src.utils.tracing import Tracer
+
+logger = get_logger(__name__)
+
+# Upper bounds (seconds) shared by every latency histogram
+BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+_TABLE_RE = {
+    "SELECT": re.compile(r"\bFROM\s+\"?(\w+)\"?", re.IGNORECASE),
+    "INSERT": re.compile(r"\bINTO\s+\"?(\w+)\"?", re.IGNORECASE),
+    "UPDATE": re.compile(r"^\s*UPDATE\s+\"?(\w+)\"?", re.IGNORECASE | re.MULTILINE),
+    "DELETE": re.compile(r"\bFROM\s+\"?(\w+)\"?", re.IGNORECASE),
+}
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; observe() is a bisect and three increments"""
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Bucket upper bound containing the q-th observation (last bucket reports the largest bound)"""
+        if not self.count:
+            return 0.0
+        target, seen = q * self.count, 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return BUCKETS[min(i, len(BUCKETS) - 1)]
+        return BUCKETS[-1]
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+class OperationStats:
+    """Latency, failures and in-flight calls for one instrumented operation"""
+    __slots__ = ("histogram", "errors", "rejected", "inflight", "rows", "label")
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.histogram = Histogram()
+        self.errors = 0
+        self.rejected = 0
+        self.inflight = 0
+        self.rows = 0
+
+
+class Metrics:
+    """
+    Process-wide metrics registry.
+
+    BaseService._safe_execute records every service operation (labelled by the
+    service method that built the closure, so dynamic descriptions don't explode
+    the label set), SQLAlchemy cursor events record per-statement timing and row
+    counts (labelled by verb and table), and the Redis client records round
+    trips per command. render_prometheus() serves it all in text exposition
+    format; serve() exposes that on a local HTTP port.
+    """
+
+    operations: Dict[Tuple[str, str], OperationStats] = {}
+    statements: Dict[Tuple[str, str, str], OperationStats] = {}
+    redis_commands: Dict[str, OperationStats] = {}
+    _by_code: Dict[Any, OperationStats] = {}
+    _statement_labels: Dict[str, Tuple[str, str]] = {}
+    _server: Optional[asyncio.AbstractServer] = None
+    started_at = time.time()
+
+    # --- Service operations ---
+
+    @classmethod
+    def operation(cls, service: str, operation: Any) -> OperationStats:
+        """Stats for a _safe_execute closure; resolved once per code object"""
+        code = getattr(operation, "__code__", None)
+        stats = cls._by_code.get(code) if code is not None else None
+        if stats is None:
+            qualname = getattr(operation, "__qualname__", "operation").split(".<locals>")[0]
+            name = qualname.rsplit(".", 1)[-1] if "." in qualname else qualname
+            stats = cls.operations.setdefault((service, name), OperationStats(f"{service}.{name}"))
+            if code is not None:
+                cls._by_code[code] = stats
+        return stats
+
+    # --- SQLAlchemy ---
+
+    @classmethod
+    def _statement_label(cls, statement: str) -> Tuple[str, str]:
+        label = cls._statement_labels.get(statement)
+        if label is None:
+            head = statement.lstrip().split(None, 1)
+            verb = head[0].upper() if head else "OTHER"
+            if verb == "WITH":
+                verb = next((v for v in ("INSERT", "UPDATE", "DELETE", "SELECT") if re.search(rf"\)\s*{v}\b", statement, re.I)), "SELECT")
+            table = "-"
+            if verb in _TABLE_RE:
+                match = _TABLE_RE[verb].search(statement)
+                table = match.group(1).lower() if match else "-"
+            else:
+                verb = verb if verb in ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "EXPLAIN") else "OTHER"
+            label = (verb, table)
+            # Compiled statements are cached upstream, so this stays bounded; cap it anyway
+            if len(cls._statement_labels) < 4096:
+                cls._statement_labels[statement] = label
+        return label
+
+    @classmethod
+    def instrument_engine(cls, engine: Any, name: str = "primary"):
+        """Time every cursor execution on an (async) engine"""
+        from sqlalchemy import event
+
+        sync_engine = getattr(engine, "sync_engine", engine)
+
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            span = Tracer.open_span(" ".join(cls._statement_label(statement)), "db") if Tracer.current() else None
+            conn.info.setdefault("metrics_started", []).append((time.perf_counter(), span))
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            started, span = conn.info["metrics_started"].pop()
+            Tracer.close_span(span)
+            verb, table = cls._statement_label(statement)
+            key = (name, verb, table)
+            stats = cls.statements.get(key)
+            if stats is None:
+                stats = cls.statements.setdefault(key, OperationStats())
+            stats.histogram.observe(time.perf_counter() - started)
+            rowcount = getattr(cursor, "rowcount", -1)
+            if rowcount and rowcount > 0:
+                stats.rows += rowcount
+
+        @event.listens_for(sync_engine, "handle_error")
+        def _error(context):
+            conn = context.connection
+            if conn is None or not conn.info.get("metrics_started"):
+                return
+            started, span = conn.info["metrics_started"].pop()
+            Tracer.close_span(span, type(context.original_exception).__name__)
+            verb, table = cls._statement_label(context.statement or "")
+            stats = cls.statements.setdefault((name, verb, table), OperationStats())
+            stats.histogram.observe(time.perf_counter() - started)
+            stats.errors += 1
+
+    # --- Redis ---
+
+    @classmethod
+    def _redis_stats(cls, command: str) -> OperationStats:
+        stats = cls.redis_commands.get(command)
+        if stats is None:
+            stats = cls.redis_commands.setdefault(command, OperationStats())
+        return stats
+
+    @classmethod
+    def instrument_redis(cls, client: Any):
+        """Wrap a redis.asyncio client so single commands and pipelines are timed per round trip"""
+        if getattr(client, "_metrics_instrumented", False):
+            return
+        execute_command = client.execute_command
+        make_pipeline = client.pipeline
+
+        @functools.wraps(execute_command)
+        async def timed_execute(*args, **options):
+            command = str(args[0]).upper() if args else "UNKNOWN"
+            stats = cls._redis_stats(command)
+            span = Tracer.open_span(command, "redis")
+            stats.inflight += 1
+            started = time.perf_counter()
+            error = None
+            try:
+                return await execute_command(*args, **options)
+            except Exception as e:
+                stats.errors += 1
+                error = type(e).__name__
+                raise
+            finally:
+                stats.inflight -= 1
+                stats.histogram.observe(time.perf_counter() - started)
+                Tracer.close_span(span, error)
+
+        @functools.wraps(make_pipeline)
+        def timed_pipeline(*args, **kwargs):
+            pipe = make_pipeline(*args, **kwargs)
+            execute = pipe.execute
+
+            async def timed_pipe_execute(*e_args, **e_kwargs):
+                stats = cls._redis_stats("PIPELINE")
+                stats.rows += len(pipe.command_stack)
+                span = Tracer.open_span(f"PIPELINE ({len(pipe.command_stack)} commands)", "redis")
+                stats.inflight += 1
+                started = time.perf_counter()
+                error = None
+                try:
+                    return await execute(*e_args, **e_kwargs)
+                except Exception as e:
+                    stats.errors += 1
+                    error = type(e).__name__
+                    raise
+                finally:
+                    stats.inflight -= 1
+                    stats.histogram.observe(time.perf_counter() - started)
+                    Tracer.close_span(span, error)
+
+            pipe.execute = timed_pipe_execute
+            return pipe
+
+        client.execute_command = timed_execute
+        client.pipeline = timed_pipeline
+        client._metrics_instrumented = True
+
+    # --- Views ---
+
+    @classmethod
+    def top(cls, table: Dict[Any, OperationStats], limit: int = 10, by: str = "total") -> List[Tuple[Any, OperationStats]]:
+        """Entries ordered by total time (or 'errors' / 'count')"""
+        keys = {
+            "total": lambda item: item[1].histogram.sum,
+            "errors": lambda item: item[1].errors,
+            "count": lambda item: item[1].histogram.count,
+        }
+        return sorted(table.items(), key=keys[by], reverse=True)[:limit]
+
+    @classmethod
+    def reset(cls):
+        for table in (cls.operations, cls.statements, cls.redis_commands):
+            for stats in table.values():
+                stats.__init__(stats.label)
+        cls.started_at = time.time()
+
+    @staticmethod
+    def _labels(**labels: Any) -> str:
+        escaped = (f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in labels.items())
+        return "{" + ",".join(escaped) + "}"
+
+    @classmethod
+    def _histogram_lines(cls, metric: str, labels: Dict[str, Any], histogram: Histogram) -> List[str]:
+        lines, cumulative = [], 0
+        for bound, bucket_count in zip(BUCKETS + (float("inf"),), histogram.counts):
+            cumulative += bucket_count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"{metric}_bucket{cls._labels(**labels, le=le)} {cumulative}")
+        lines.append(f"{metric}_sum{cls._labels(**labels)} {histogram.sum:.6f}")
+        lines.append(f"{metric}_count{cls._labels(**labels)} {histogram.count}")
+        return lines
+
+    @classmethod
+    def render_prometheus(cls) -> str:
+        """Text exposition format (version 0.0.4)"""
+        out: List[str] = []
+
+        def family(name: str, kind: str, help_text: str):
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+
+        family("reve_service_operation_seconds", "histogram", "Latency of BaseService._safe_execute operations")
+        for (service, name), stats in cls.operations.items():
+            out.extend(cls._histogram_lines("reve_service_operation_seconds", {"service": service, "operation": name}, stats.histogram))
+        family("reve_service_operation_errors_total", "counter", "Failed service operations (kind=error|rejected)")
+        for (service, name), stats in cls.operations.items():
+            out.append(f"reve_service_operation_errors_total{cls._labels(service=service, operation=name, kind='error')} {stats.errors}")
+            out.append(f"reve_service_operation_errors_total{cls._labels(service=service, operation=name, kind='rejected')} {stats.rejected}")
+        family("reve_service_operation_inflight", "gauge", "Service operations currently executing")
+        for (service, name), stats in cls.operations.items():
+            out.append(f"reve_service_operation_inflight{cls._labels(service=service, operation=name)} {stats.inflight}")
+
+        family("reve_db_statement_seconds", "histogram", "Cursor execution time by engine, verb and table")
+        for (engine, verb, table), stats in cls.statements.items():
+            out.extend(cls._histogram_lines("reve_db_statement_seconds", {"engine": engine, "verb": verb, "table": table}, stats.histogram))
+        family("reve_db_statement_rows_total", "counter", "Rows reported by the driver")
+        for (engine, verb, table), stats in cls.statements.items():
+            out.append(f"reve_db_statement_rows_total{cls._labels(engine=engine, verb=verb, table=table)} {stats.rows}")
+        family("reve_db_statement_errors_total", "counter", "Statements that raised")
+        for (engine, verb, table), stats in cls.statements.items():
+            out.append(f"reve_db_statement_errors_total{cls._labels(engine=engine, verb=verb, table=table)} {stats.errors}")
+
+        family("reve_redis_command_seconds", "histogram", "Redis round-trip time by command (PIPELINE = one batched round trip)")
+        for command, stats in cls.redis_commands.items():
+            out.extend(cls._histogram_lines("reve_redis_command_seconds", {"command": command}, stats.histogram))
+        family("reve_redis_command_errors_total", "counter", "Redis commands that raised")
+        for command, stats in cls.redis_commands.items():
+            out.append(f"reve_redis_command_errors_total{cls._labels(command=command)} {stats.errors}")
+
+        try:
+            from src.utils.database_service import DatabaseService
+            pool_stats = DatabaseService.get_pool_stats()
+        except Exception:
+            pool_stats = {}
+        if pool_stats:
+            family("reve_db_pool_checked_out", "gauge", "Connections currently checked out")
+            for pool, stats in pool_stats.items():
+                out.append(f"reve_db_pool_checked_out{cls._labels(pool=pool)} {stats['checked_out']}")
+            family("reve_db_pool_checkout_timeouts_total", "counter", "Pool checkouts that timed out")
+            for pool, stats in pool_stats.items():
+                out.append(f"reve_db_pool_checkout_timeouts_total{cls._labels(pool=pool)} {stats['timeouts']}")
+
+        from src.utils.startup import Startup
+        if Startup.phases:
+            family("reve_startup_phase_seconds", "gauge", "Duration of each startup phase in this process")
+            for phase, (_, seconds) in Startup.phases.items():
+                out.append(f"reve_startup_phase_seconds{cls._labels(phase=phase)} {seconds:.3f}")
+        if Startup.time_to_ready is not None:
+            family("reve_time_to_ready_seconds", "gauge", "Process start to the first on_ready")
+            out.append(f"reve_time_to_ready_seconds {Startup.time_to_ready:.3f}")
+
+        family("reve_process_start_time_seconds", "gauge", "When these counters started")
+        out.append(f"reve_process_start_time_seconds {cls.started_at:.0f}")
+        return "\n".join(out) + "\n"
+
+    # --- HTTP endpoint ---
+
+    @classmethod
+    async def serve(cls, host: Optional[str] = None, port: Optional[int] = None) -> bool:
+        """Expose /metrics on METRICS_HOST:METRICS_PORT (off unless a port is configured)"""
+        if cls._server is not None:
+            return True
+        port = port if port is not None else int(os.getenv("METRICS_PORT") or 0)
+        if not port:
+            return False
+        host = host or os.getenv("METRICS_HOST", "127.0.0.1")
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            try:
+                request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+                while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+                    pass
+                parts = request_line.decode("latin-1").split()
+                if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                    status, body = "200 OK", cls.render_prometheus().encode()
+                else:
+                    status, body = "404 Not Found", b"not found\n"
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+            except Exception as e:
+                logger.debug(f"Metrics request failed: {e}")
+            finally:
+                writer.close()
+
+        try:
+            cls._server = await asyncio.start_server(handle, host, port)
+        except OSError as e:
+            logger.warning(f"Metrics endpoint not started on {host}:{port}: {e}")
+            return False
+        logger.info(f"Metrics endpoint listening on http://{host}:{port}/metrics")
+        return True
+
+    @classmethod
+    async def stop(cls):
+        if cls._server is not None:
+            cls._server.close()
+            await cls._server.wait_closed()
+            cls._server = None
@@ -0,0 +1,142 @@
+# src/utils/ownership_bitset.py
+import random
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from src.database.models.esprit import Esprit
+from src.utils.database_service import DatabaseService
+from src.utils.esprit_search_index import CatalogSnapshot, EspritSearchIndex, normalize
+from src.utils.redis_service import RedisService
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+BITSET_KEY = "ownership:{}"
+GENERATION_KEY = "ownership:gen:{}"
+BITSET_TTL = 3600
+
+# Store the rebuilt bitset only if no ownership change was published while it was being read
+_STORE_IF_CURRENT = """
+if (redis.call('GET', KEYS[2]) or '0') == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+
+class OwnershipBitsets:
+    """
+    Which esprit bases a player owns, as one integer bitset (bit n = esprit_base_id n).
+
+    The esprit table stays the source of truth; the bitset is rebuilt from an
+    index-only scan of uq_esprit_owner_base and cached in Redis as hex. Writers
+    that create or delete a whole stack call changed() after commit, which bumps
+    a per-player generation and drops the cached copy, so a rebuild racing a write
+    can never store a stale set. Owned/missing/codex/sampling queries then become
+    bitwise operations against the EspritSearchIndex catalog masks.
+    """
+
+    # --- Storage ---
+
+    @classmethod
+    async def owned_ids(cls, player_id: int) -> int:
+        """Bitset of owned esprit_base_ids"""
+        client = RedisService.get_client()
+        generation = "0"
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                pipe.get(BITSET_KEY.format(player_id))
+                pipe.get(GENERATION_KEY.format(player_id))
+                cached, generation = await pipe.execute()
+                if cached is not None:
+                    return int(cached, 16)
+                generation = generation or "0"
+            except Exception as e:
+                logger.debug(f"Ownership bitset read failed, rebuilding from database: {e}")
+                client = None
+
+        bits = await cls._load(player_id)
+
+        if client is not None:
+            try:
+                await client.eval(
+                    _STORE_IF_CURRENT, 2, BITSET_KEY.format(player_id), GENERATION_KEY.format(player_id),
+                    generation, format(bits, "x"), BITSET_TTL
+                )
+            except Exception as e:
+                logger.debug(f"Ownership bitset store failed: {e}")
+        return bits
+
+    @staticmethod
+    async def _load(player_id: int) -> int:
+        # Primary, not the replica: the bitset is cached, so a lagging read would stick for the TTL
+        async with DatabaseService.get_session() as session:
+            stmt = select(Esprit.esprit_base_id).where(Esprit.owner_id == player_id)  # type: ignore
+            bits = 0
+            for base_id in (await session.execute(stmt)).scalars():
+                bits |= 1 << base_id
+            return bits
+
+    @classmethod
+    async def changed(cls, player_id: int):
+        """A stack was created or deleted: invalidate the cached bitset"""
+        client = RedisService.get_client()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=True)
+            pipe.incr(GENERATION_KEY.format(player_id))
+            pipe.expire(GENERATION_KEY.format(player_id), BITSET_TTL * 2)
+            pipe.delete(BITSET_KEY.format(player_id))
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to invalidate ownership bitset for player {player_id}: {e}")
+
+    # --- Catalog-relative views ---
+
+    @staticmethod
+    def to_catalog_mask(snapshot: CatalogSnapshot, owned: int) -> int:
+        """Re-index an id bitset onto catalog positions (ids missing from the catalog drop out)"""
+        mask = 0
+        while owned:
+            low = owned & -owned
+            position = snapshot.position_of.get(low.bit_length() - 1)
+            if position is not None:
+                mask |= 1 << position
+            owned ^= low
+        return mask
+
+    @classmethod
+    async def owned_mask(cls, player_id: int) -> Tuple[CatalogSnapshot, int]:
+        """(catalog snapshot, mask of owned catalog positions)"""
+        snapshot = await EspritSearchIndex.ensure_loaded()
+        return snapshot, cls.to_catalog_mask(snapshot, await cls.owned_ids(player_id))
+
+    @classmethod
+    async def missing(cls, player_id: int, **filters) -> List[int]:
+        """Unowned esprit_base_ids matching EspritSearchIndex filters (element, tiers, min_tier, ...)"""
+        snapshot, owned = await cls.owned_mask(player_id)
+        mask = EspritSearchIndex.filter_mask(snapshot, **filters) & ~owned
+        return [snapshot.entries[pos].id for pos in EspritSearchIndex.positions(mask)]
+
+    @classmethod
+    async def sample_unowned(cls, player_id: int, k: int, candidates: Optional[int] = None,
+                             snapshot: Optional[CatalogSnapshot] = None, owned: Optional[int] = None) -> List[int]:
+        """Up to k random unowned esprit_base_ids, drawn from a catalog mask (default: everything)"""
+        if snapshot is None or owned is None:
+            snapshot, owned = await cls.owned_mask(player_id)
+        mask = (snapshot.all_bits if candidates is None else candidates) & ~owned
+        pool = list(EspritSearchIndex.positions(mask))
+        return [snapshot.entries[pos].id for pos in random.sample(pool, min(k, len(pool)))]
+
+    @staticmethod
+    def split_names(snapshot: CatalogSnapshot, owned: int, names: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """(owned, missing) from a list of esprit names; names not in the catalog count as missing"""
+        have, missing = [], []
+        for name in names:
+            position = snapshot.by_name.get(normalize(name))
+            (have if position is not None and owned >> position & 1 else missing).append(name)
+        return have, missing
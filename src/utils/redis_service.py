@@ -5,7 +5,8 @@ from typing import Optional, Dict, Any, Callable, Tuple
 import json
 import time
 import functools
-from collections import defaultdict, deque
+import math
+from collections import OrderedDict
 from dotenv import load_dotenv
 import os
 
@@ -13,6 +14,7 @@ import disnake
 import disnake.errors
 
 from src.utils.logger import get_logger
+from src.utils.metrics import Metrics
 from src.utils.game_constants import EmbedColors
 
 load_dotenv()
@@ -35,6 +37,7 @@ class RedisService:
                 return
 
             cls._client = redis.from_url(redis_url, decode_responses=True)
+            Metrics.instrument_redis(cls._client)
             cls._available = True
             logger.info("RedisService initialized successfully")
             
@@ -222,11 +225,19 @@ class RedisService:
 
 
 class InMemoryRateLimiter:
-    """High-performance in-memory rate limiter using sliding window algorithm"""
+    """
+    Process-local GCRA rate limiter with a hard cap on tracked keys.
+
+    GCRA keeps one float per (command, user) - the theoretical arrival time (TAT) -
+    instead of a deque of timestamps, and a key whose TAT has passed is equivalent
+    to an absent one. Keys live in an LRU OrderedDict; past max_keys the least
+    recently used key is evicted, which can only ever make a limit more lenient.
+    """
     
-    def __init__(self):
-        # {command_name: {user_id: deque(timestamps)}}
-        self.usage_logs: Dict[str, Dict[int, deque]] = defaultdict(lambda: defaultdict(deque))
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self.tats: "OrderedDict[Tuple[str, int], float]" = OrderedDict()
+        self.evictions = 0
     
     def is_rate_limited(self, user_id: int, command_name: str, uses: int, per_seconds: int) -> Tuple[bool, float]:
         """
@@ -235,35 +246,89 @@ class InMemoryRateLimiter:
         Returns:
             (is_limited, retry_after_seconds)
         """
-        now = time.time()
-        user_log = self.usage_logs[command_name][user_id]
+        now = time.monotonic()
+        key = (command_name, user_id)
+        interval = per_seconds / uses
         
-        # Clean expired entries from sliding window
-        cutoff_time = now - per_seconds
-        while user_log and user_log[0] <= cutoff_time:
-            user_log.popleft()
+        tat = max(self.tats.get(key, now), now)
+        new_tat = tat + interval
+        allow_at = new_tat - per_seconds
+        if now < allow_at:
+            self.tats.move_to_end(key)
+            return True, allow_at - now
         
-        # Check if under rate limit
-        if len(user_log) < uses:
-            user_log.append(now)
-            return False, 0.0
-        
-        # Calculate time until oldest entry expires
-        retry_after = user_log[0] + per_seconds - now
-        return True, max(0.0, retry_after)
+        self.tats[key] = new_tat
+        self.tats.move_to_end(key)
+        if len(self.tats) > self.max_keys:
+            self.tats.popitem(last=False)
+            self.evictions += 1
+        return False, 0.0
     
-    def get_usage_stats(self, user_id: int, command_name: str) -> Dict[str, Any]:
+    def get_usage_stats(self, user_id: int, command_name: str, uses: int, per_seconds: int) -> Dict[str, Any]:
         """Get current usage statistics for debugging"""
-        user_log = self.usage_logs[command_name][user_id]
+        tat = self.tats.get((command_name, user_id))
+        backlog = max(0.0, tat - time.monotonic()) if tat else 0.0
         return {
-            "current_uses": len(user_log),
-            "oldest_use": user_log[0] if user_log else None,
-            "newest_use": user_log[-1] if user_log else None
+            "current_uses": min(uses, math.ceil(backlog / (per_seconds / uses))),
+            "seconds_until_full_reset": backlog
         }
 
 
-# Global rate limiter instance
-_rate_limiter = InMemoryRateLimiter()
+# Allow/deny one hit for GCRA key KEYS[1]; ARGV = emission interval, period (seconds).
+# Uses the Redis clock so every bot process agrees on "now". Returns {allowed, retry_after}.
+_GCRA_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if now < allow_at then
+    return {0, tostring(allow_at - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, '0'}
+"""
+
+
+class RateLimiter:
+    """
+    Cross-process GCRA limiter: one atomic Lua call per decision in Redis, falling
+    back to the bounded InMemoryRateLimiter whenever Redis is absent or failing.
+    """
+    
+    local = InMemoryRateLimiter()
+    _script = None
+    _script_client = None
+    _stats = {"redis_decisions": 0, "local_decisions": 0, "redis_errors": 0, "limited": 0}
+    
+    @classmethod
+    async def hit(cls, user_id: int, command_name: str, uses: int, per_seconds: int) -> Tuple[bool, float]:
+        """Record one use; returns (is_limited, retry_after_seconds)"""
+        client = RedisService.get_client()
+        if client is not None:
+            try:
+                if cls._script is None or cls._script_client is not client:
+                    cls._script = client.register_script(_GCRA_SCRIPT)
+                    cls._script_client = client
+                allowed, retry_after = await cls._script(
+                    keys=[f"ratelimit:{command_name}:{user_id}"], args=[per_seconds / uses, per_seconds]
+                )
+                cls._stats["redis_decisions"] += 1
+                limited = not int(allowed)
+                cls._stats["limited"] += limited
+                return limited, float(retry_after)
+            except Exception as e:
+                cls._stats["redis_errors"] += 1
+                logger.debug(f"Redis rate limit check failed for {command_name}, using local limiter: {e}")
+        
+        cls._stats["local_decisions"] += 1
+        limited, retry_after = cls.local.is_rate_limited(user_id, command_name, uses, per_seconds)
+        cls._stats["limited"] += limited
+        return limited, retry_after
 
 
 def ratelimit(uses: int, per_seconds: int, command_name: str):
@@ -300,9 +365,7 @@ def ratelimit(uses: int, per_seconds: int, command_name: str):
             user_id = inter.author.id
             
             # Check rate limit
-            is_limited, retry_after = _rate_limiter.is_rate_limited(
-                user_id, command_name, uses, per_seconds
-            )
+            is_limited, retry_after = await RateLimiter.hit(user_id, command_name, uses, per_seconds)
             
             if is_limited:
                 embed = disnake.Embed(
@@ -339,21 +402,17 @@ def ratelimit(uses: int, per_seconds: int, command_name: str):
 # Utility functions for debugging
 def get_rate_limiter_stats() -> Dict[str, Any]:
     """Get global rate limiter statistics for debugging"""
-    total_users = 0
-    total_commands = len(_rate_limiter.usage_logs)
-    
-    for command_logs in _rate_limiter.usage_logs.values():
-        total_users += len(command_logs)
-    
+    local = RateLimiter.local
     return {
-        "total_commands_tracked": total_commands,
-        "total_users_tracked": total_users,
-        "commands": list(_rate_limiter.usage_logs.keys())
+        **RateLimiter._stats,
+        "local_keys_tracked": len(local.tats),
+        "local_max_keys": local.max_keys,
+        "local_evictions": local.evictions,
+        "commands": sorted({command for command, _ in local.tats})
     }
 
 
 def clear_rate_limiter() -> None:
-    """Clear all rate limiter data (useful for testing)"""
-    global _rate_limiter
-    _rate_limiter = InMemoryRateLimiter()
-    logger.info("Rate limiter cleared")
\ No newline at end of file
+    """Clear local rate limiter data (useful for testing)"""
+    RateLimiter.local = InMemoryRateLimiter(RateLimiter.local.max_keys)
+    logger.info("Rate limiter cleared")
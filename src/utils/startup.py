@@ -0,0 +1,321 @@
+# src/utils/startup.py
+import asyncio
+import importlib
+import importlib.machinery
+import json
+import os
+import pkgutil
+import statistics
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.utils.logger import LOG_DIR, get_logger
+
+# Keep module-level imports to the stdlib and logger: bot.py imports this first so the
+# import profiler can be installed before disnake, SQLAlchemy and Pillow load.
+
+logger = get_logger(__name__)
+
+HISTORY_FILE = LOG_DIR / "startup_history.jsonl"
+
+# Packages the cogs pull in; imported in a worker thread while DB/Redis connect
+PREIMPORT_PACKAGES = ("src.database.models", "src.domain", "src.services")
+
+_TIMED_LOADERS = (
+    importlib.machinery.SourceFileLoader,
+    importlib.machinery.SourcelessFileLoader,
+    importlib.machinery.ExtensionFileLoader,
+)
+
+
+class ImportProfiler:
+    """sys.meta_path hook that times each module body as it executes (self time excludes nested imports)"""
+
+    def __init__(self):
+        self.timings: Dict[str, Tuple[float, float]] = {}  # module -> (self seconds, cumulative seconds)
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            # File loaders are created per module, so patching the instance only times this one
+            if type(spec.loader) in _TIMED_LOADERS:
+                spec.loader.exec_module = self._timed(fullname, spec.loader.exec_module)  # type: ignore[union-attr]
+            return spec
+        return None
+
+    def _timed(self, fullname: str, exec_module: Callable) -> Callable:
+        def timed_exec_module(module):
+            stack = self._local.__dict__.setdefault("stack", [])
+            frame = [time.perf_counter(), 0.0]
+            stack.append(frame)
+            try:
+                exec_module(module)
+            finally:
+                stack.pop()
+                total = time.perf_counter() - frame[0]
+                self.timings[fullname] = (total - frame[1], total)
+                if stack:
+                    stack[-1][1] += total
+        return timed_exec_module
+
+    def top(self, limit: int = 25) -> List[Tuple[str, float, float]]:
+        ranked = sorted(self.timings.items(), key=lambda item: -item[1][0])[:limit]
+        return [(name, own, total) for name, (own, total) in ranked]
+
+    def by_package(self) -> Dict[str, float]:
+        """Self time summed per top-level package"""
+        totals: Dict[str, float] = {}
+        for name, (own, _) in self.timings.items():
+            root = name.split(".")[0]
+            totals[root] = totals.get(root, 0.0) + own
+        return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+class Startup:
+    """
+    Startup pipeline and its timings.
+
+    initialize() brings up config, the database pool, Redis and the module
+    import cache concurrently; start_warmups() fills asset and index caches in
+    the background while the bot logs in. Every phase is timed, time-to-ready
+    (process start to the first on_ready) is appended to
+    logs/startup_history.jsonl, and --profile-startup adds per-module import
+    times via ImportProfiler.
+    """
+
+    started = time.perf_counter()
+    started_at = time.time()
+    phases: Dict[str, Tuple[float, float]] = {}  # name -> (offset from start, seconds)
+    time_to_ready: Optional[float] = None
+    _login_began: Optional[float] = None
+    profiler: Optional[ImportProfiler] = None
+    _warmups: List["asyncio.Task[Any]"] = []
+
+    @classmethod
+    def profile_imports(cls):
+        """Install the import profiler (call before heavy imports)"""
+        if cls.profiler is None:
+            cls.profiler = ImportProfiler()
+            sys.meta_path.insert(0, cls.profiler)
+
+    @classmethod
+    def elapsed(cls) -> float:
+        return time.perf_counter() - cls.started
+
+    # --- Phases ---
+
+    @classmethod
+    def _record(cls, name: str, began: float):
+        cls.phases[name] = (began - cls.started, time.perf_counter() - began)
+
+    @classmethod
+    @contextmanager
+    def phase(cls, name: str) -> Iterator[None]:
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            cls._record(name, began)
+
+    @classmethod
+    async def timed(cls, name: str, awaitable: Awaitable[Any]) -> Any:
+        began = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            cls._record(name, began)
+
+    # --- Initialization ---
+
+    @staticmethod
+    def preimport(packages: Tuple[str, ...] = PREIMPORT_PACKAGES) -> int:
+        """Import every module under the given packages; returns how many loaded"""
+        loaded = 0
+        for package_name in packages:
+            try:
+                package = importlib.import_module(package_name)
+            except Exception as e:
+                logger.warning(f"Preimport of {package_name} failed: {e}")
+                continue
+            for module in pkgutil.iter_modules(getattr(package, "__path__", []), f"{package_name}."):
+                try:
+                    importlib.import_module(module.name)
+                    loaded += 1
+                except Exception as e:
+                    logger.warning(f"Preimport of {module.name} failed: {e}")
+        return loaded
+
+    @classmethod
+    async def _config_and_imports(cls):
+        from src.utils.config_manager import ConfigManager
+        from src.utils.tracing import Tracer
+
+        await cls.timed("config", asyncio.to_thread(ConfigManager.load_all))
+        Tracer.configure()
+        # After config: some modules read it at import time
+        count = await cls.timed("imports", asyncio.to_thread(cls.preimport))
+        logger.info(f"Preimported {count} modules")
+
+    @classmethod
+    async def _database(cls):
+        module = await asyncio.to_thread(importlib.import_module, "src.utils.database_service")
+        DatabaseService = module.DatabaseService
+        DatabaseService.init()
+
+        # Open a few pooled connections now so the first commands don't pay connect + auth
+        warm = int(os.getenv("DB_WARM_CONNECTIONS", "4"))
+
+        async def connect():
+            from sqlalchemy import text
+            async with DatabaseService.get_engine().connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        results = await asyncio.gather(*(connect() for _ in range(max(1, warm))), return_exceptions=True)
+        failures = [r for r in results if isinstance(r, Exception)]
+        if failures:
+            logger.warning(f"Database warmup: {len(failures)}/{len(results)} connections failed ({failures[0]})")
+
+    @classmethod
+    async def _redis(cls):
+        from src.utils.redis_service import RedisService
+
+        RedisService.init()
+        if RedisService.is_available() and await RedisService.ping():
+            logger.info("✅ RedisService connected")
+        else:
+            logger.warning("⚠️ Redis not available - running without cache")
+
+    @classmethod
+    async def initialize(cls):
+        """Config (then module preimport), database and Redis concurrently; database errors are fatal"""
+        results = await asyncio.gather(
+            cls._config_and_imports(),
+            cls.timed("database", cls._database()),
+            cls.timed("redis", cls._redis()),
+            return_exceptions=True,
+        )
+        config_error, database_error, redis_error = results
+        if config_error:
+            logger.error(f"Config/preimport failed: {config_error}")
+        if redis_error:
+            logger.warning(f"Redis initialization failed - running without cache: {redis_error}")
+        if database_error:
+            raise database_error  # type: ignore[misc]
+
+    # --- Background warmup ---
+
+    @staticmethod
+    def _warm_assets():
+        from src.utils.boss_generator import get_boss_generator
+        from src.utils.stats_generator import get_generator
+        get_generator()
+        get_boss_generator()
+
+    @staticmethod
+    async def _warm_search_index():
+        from src.utils.esprit_search_index import EspritSearchIndex
+        await EspritSearchIndex.rebuild()
+
+    @staticmethod
+    async def _warm_fusion_table():
+        from src.utils.fusion_table import FusionTable
+        await FusionTable.rebuild()
+
+    @classmethod
+    def start_warmups(cls, loop: asyncio.AbstractEventLoop):
+        """Fill font/config, search-index and fusion-table caches while the bot logs in (not on the ready path)"""
+        async def run(name: str, awaitable: Awaitable[Any]):
+            try:
+                await cls.timed(f"warm:{name}", awaitable)
+            except Exception as e:
+                logger.error(f"Warmup {name} failed: {e}")
+
+        cls._warmups = [
+            loop.create_task(run("assets", asyncio.to_thread(cls._warm_assets))),
+            loop.create_task(run("search_index", cls._warm_search_index())),
+            loop.create_task(run("fusion_table", cls._warm_fusion_table())),
+        ]
+
+    @classmethod
+    async def wait_warmups(cls):
+        if cls._warmups:
+            await asyncio.gather(*cls._warmups)
+
+    # --- Ready ---
+
+    @classmethod
+    def mark_login(cls):
+        cls._login_began = time.perf_counter()
+
+    @classmethod
+    def mark_ready(cls) -> bool:
+        """Record time-to-ready on the first on_ready; False on reconnects"""
+        if cls.time_to_ready is not None:
+            return False
+        cls.time_to_ready = cls.elapsed()
+        if cls._login_began is not None:
+            cls._record("login+gateway", cls._login_began)
+        previous = cls.history(10)
+        cls._append_history()
+
+        logger.info(f"⏱️ Time to ready: {cls.time_to_ready:.2f}s ("
+                    + ", ".join(f"{name} {seconds:.2f}s" for name, (_, seconds) in cls.phases.items()) + ")")
+        if len(previous) >= 3:
+            typical = statistics.median(entry["time_to_ready"] for entry in previous)
+            if cls.time_to_ready > typical * 1.5:
+                logger.warning(f"Startup took {cls.time_to_ready:.2f}s, median of last {len(previous)} is {typical:.2f}s")
+        return True
+
+    @classmethod
+    def _append_history(cls):
+        entry = {
+            "at": datetime.utcnow().isoformat(timespec="seconds"),
+            "time_to_ready": round(cls.time_to_ready or 0.0, 3),
+            "phases": {name: round(seconds, 3) for name, (_, seconds) in cls.phases.items()},
+            "pid": os.getpid(),
+        }
+        try:
+            with HISTORY_FILE.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            logger.warning(f"Could not record startup history: {e}")
+
+    @staticmethod
+    def history(limit: int = 10) -> List[Dict[str, Any]]:
+        """Most recent startups, oldest first"""
+        if not HISTORY_FILE.exists():
+            return []
+        entries = []
+        for line in HISTORY_FILE.read_text(encoding="utf-8").splitlines()[-limit:]:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return entries
+
+    @classmethod
+    def report(cls, imports: int = 25) -> str:
+        """Phase timeline plus (when profiling) the slowest module imports"""
+        lines = [f"Startup {'ready in %.2fs' % cls.time_to_ready if cls.time_to_ready is not None else 'not ready yet'}"]
+        lines.append(f"{'phase':22} {'start':>8} {'took':>8}")
+        for name, (offset, seconds) in sorted(cls.phases.items(), key=lambda item: item[1][0]):
+            lines.append(f"{name:22} {offset:>7.3f}s {seconds:>7.3f}s")
+        if cls.profiler is not None:
+            lines.append("")
+            lines.append(f"{'module':52} {'self':>8} {'cumul':>8}")
+            for name, own, total in cls.profiler.top(imports):
+                lines.append(f"{name[:52]:52} {own * 1000:>6.1f}ms {total * 1000:>6.1f}ms")
+            lines.append("")
+            lines.append("self time by package: " + ", ".join(
+                f"{package} {seconds * 1000:.0f}ms" for package, seconds in list(cls.profiler.by_package().items())[:10]
+            ))
+        return "\n".join(lines)
@@ -12,6 +12,7 @@ import disnake
 from PIL import Image, ImageDraw, ImageFilter, ImageFont
 
 from src.utils.logger import get_logger
+from src.utils.tracing import Tracer
 from src.utils.game_constants import Tiers, Elements
 from src.utils.config_manager import ConfigManager
 
@@ -924,6 +925,7 @@ class ImageGenerator:
                                   self.config.CARD_WIDTH - inner_margin, self.config.CARD_HEIGHT - inner_margin]
                     draw.rectangle(inner_coords, outline=highlight_color, width=1)
     
+    @Tracer.traced("stats card", "render")
     async def render_esprit_card(self, card_data: Dict[str, Any]) -> Image.Image:
         """Main card rendering function with WORKING configuration support"""
         return await asyncio.to_thread(self._render_card_sync, card_data)
@@ -1018,6 +1020,7 @@ class ImageGenerator:
         
         return card
     
+    @Tracer.traced("encode png", "render")
     async def to_discord_file(self, img: Image.Image, filename: str = "card.png") -> Optional[disnake.File]:
         """Convert to Discord file with WORKING compression"""
         compression_config = self.config.get("compression", {})
@@ -1069,8 +1072,14 @@ class ImageGenerator:
             return None
 
 
-# Singleton instance
-_generator = ImageGenerator()
+# Shared instance, built on first use so importing this module doesn't load fonts
+_generator: Optional[ImageGenerator] = None
+
+def get_generator() -> ImageGenerator:
+    global _generator
+    if _generator is None:
+        _generator = ImageGenerator()
+    return _generator
 
 # Public API
 async def generate_esprit_card(
@@ -1079,8 +1088,9 @@ async def generate_esprit_card(
 ) -> Optional[disnake.File]:
     """Generate a card and return as Discord file"""
     try:
-        card = await _generator.render_esprit_card(card_data)
-        return await _generator.to_discord_file(card, filename)
+        generator = get_generator()
+        card = await generator.render_esprit_card(card_data)
+        return await generator.to_discord_file(card, filename)
     except Exception as e:
         logger.error(f"Card generation failed: {e}")
         return None
\ No newline at end of file
@@ -0,0 +1,312 @@
+# src/utils/tracing.py
+import functools
+import logging
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from src.utils.config_manager import ConfigManager
+from src.utils.logger import LOG_DIR, get_logger
+
+logger = get_logger(__name__)
+
+
+def _slow_logger() -> logging.Logger:
+    """Dedicated logs/slow_commands.log so timing trees don't drown bot.log"""
+    slow = logging.getLogger("reve.slow_commands")
+    if not slow.handlers:
+        handler = logging.FileHandler(LOG_DIR / "slow_commands.log", encoding="utf-8", mode="a")
+        handler.setFormatter(logging.Formatter("[%(asctime)s] %(message)s", "%Y-%m-%d %H:%M:%S"))
+        slow.addHandler(handler)
+        slow.setLevel(logging.INFO)
+        slow.propagate = False
+    return slow
+
+
+class Span:
+    """One timed step; children nest under whichever span was current when they opened"""
+    __slots__ = ("name", "kind", "started", "duration", "children", "error", "trace")
+
+    def __init__(self, name: str, kind: str, trace: "Trace"):
+        self.name = name
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.children: List["Span"] = []
+        self.error: Optional[str] = None
+        self.trace = trace
+
+    def finish(self):
+        self.duration = time.perf_counter() - self.started
+
+
+class Trace:
+    """Root span of one command or interaction plus its bookkeeping"""
+
+    def __init__(self, name: str, sampled: bool, max_spans: int):
+        self.root = Span(name, "command", self)
+        self.sampled = sampled
+        self.max_spans = max_spans
+        self.span_count = 1
+        self.dropped = 0
+        self.started_at = datetime.utcnow()
+        self.attrs: Dict[str, Any] = {}
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.root.duration or 0.0) * 1000
+
+    def breakdown(self) -> Dict[str, float]:
+        """Exclusive milliseconds per span kind (time not spent in a child); the root's own time is "other" """
+        totals: Dict[str, float] = {}
+
+        def walk(span: Span, kind: str):
+            if span.duration is None:
+                return
+            inner = sum(child.duration or 0.0 for child in span.children)
+            totals[kind] = totals.get(kind, 0.0) + max(span.duration - inner, 0.0) * 1000
+            for child in span.children:
+                walk(child, child.kind)
+        walk(self.root, "other")
+        return totals
+
+    def render(self, min_ms: float = 0.0) -> str:
+        """Indented timing tree; consecutive identical leaf spans are folded into one line"""
+        lines = [
+            f"{self.root.name} {self.duration_ms:.1f}ms @ {self.started_at:%Y-%m-%d %H:%M:%S} UTC"
+            + "".join(f" {k}={v}" for k, v in self.attrs.items())
+        ]
+        if self.root.children:
+            parts = [f"{kind} {ms:.1f}ms" for kind, ms in sorted(self.breakdown().items(), key=lambda item: -item[1])]
+            lines.append("  = " + " | ".join(parts))
+
+        def walk(span: Span, depth: int):
+            children = span.children
+            i = 0
+            while i < len(children):
+                child = children[i]
+                j = i + 1
+                while (j < len(children) and not child.children and not children[j].children
+                       and children[j].name == child.name and children[j].kind == child.kind):
+                    j += 1
+                group = children[i:j]
+                total = sum((s.duration or 0.0) for s in group) * 1000
+                if total >= min_ms:
+                    count = f" ×{len(group)}" if len(group) > 1 else ""
+                    error = f" ! {child.error}" if child.error else ""
+                    pending = "" if child.duration is not None else " (unfinished)"
+                    offset = (child.started - self.root.started) * 1000
+                    lines.append(f"{'  ' * depth}+{offset:7.1f}ms {total:7.1f}ms [{child.kind}] {child.name}{count}{error}{pending}")
+                    walk(child, depth + 1)
+                i = j
+        walk(self.root, 1)
+        if self.dropped:
+            lines.append(f"  ({self.dropped} spans dropped over the {self.max_spans} span limit)")
+        return "\n".join(lines)
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_trace_span", default=None)
+
+
+class Tracer:
+    """
+    Contextvar-based command tracing.
+
+    start_trace() opens a root span per command/interaction; span() opens a child
+    under the current span from anywhere in the call (service calls, SQL, Redis,
+    renders, Discord HTTP) and is a no-op when nothing is being traced. Only a
+    sample of commands record child spans; every command's total time is still
+    measured, and those over the slow threshold go to logs/slow_commands.log and
+    an in-memory ring for 'r system traces'. Settings live under "tracing" in
+    global_config.json.
+    """
+
+    slow_traces: Deque[Trace] = deque(maxlen=50)
+    enabled = True
+    sample_rate = 0.1
+    slow_threshold_ms = 1500.0
+    max_spans = 500
+    _configured = False
+
+    @classmethod
+    def configure(cls, config: Optional[Dict[str, Any]] = None):
+        if config is None:
+            config = (ConfigManager.get("global_config") or {}).get("tracing", {})
+        cls.enabled = config.get("enabled", True)
+        cls.sample_rate = float(config.get("sample_rate", 0.1))
+        cls.slow_threshold_ms = float(config.get("slow_threshold_ms", 1500))
+        cls.max_spans = int(config.get("max_spans_per_trace", 500))
+        keep = int(config.get("max_slow_traces", 50))
+        if cls.slow_traces.maxlen != keep:
+            cls.slow_traces = deque(cls.slow_traces, maxlen=keep)
+        cls._configured = True
+
+    # --- Roots ---
+
+    @classmethod
+    def start_trace(cls, name: str, **attrs: Any) -> Optional[Trace]:
+        """Open a root span and make it current for the rest of this task"""
+        if not cls._configured:
+            cls.configure()
+        if not cls.enabled:
+            return None
+        trace = Trace(name, random.random() < cls.sample_rate, cls.max_spans)
+        trace.attrs.update(attrs)
+        _current_span.set(trace.root)
+        return trace
+
+    @classmethod
+    def finish_trace(cls, trace: Optional[Trace], error: Optional[str] = None):
+        if trace is None:
+            return
+        trace.root.finish()
+        trace.root.error = error
+        if _current_span.get() is trace.root:
+            _current_span.set(None)
+        if trace.duration_ms < cls.slow_threshold_ms:
+            return
+        cls.slow_traces.append(trace)
+        if trace.sampled:
+            _slow_logger().info(trace.render())
+        else:
+            _slow_logger().info(f"{trace.root.name} {trace.duration_ms:.1f}ms (not sampled, no breakdown)"
+                                + "".join(f" {k}={v}" for k, v in trace.attrs.items()))
+        logger.warning(f"Slow command {trace.root.name}: {trace.duration_ms:.0f}ms")
+
+    @classmethod
+    def finish_current(cls, error: Optional[str] = None):
+        """Finish the trace this context is running under (for before/after invoke hooks)"""
+        span = _current_span.get()
+        if span is not None:
+            cls.finish_trace(span.trace, error)
+
+    @classmethod
+    @contextmanager
+    def trace(cls, name: str, **attrs: Any) -> Iterator[Optional[Trace]]:
+        trace = cls.start_trace(name, **attrs)
+        error = None
+        try:
+            yield trace
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            cls.finish_trace(trace, error)
+
+    # --- Child spans ---
+
+    @staticmethod
+    def current() -> Optional[Span]:
+        """The span new children would attach to, if this context is being sampled"""
+        span = _current_span.get()
+        return span if span is not None and span.trace.sampled else None
+
+    @staticmethod
+    def open_span(name: str, kind: str) -> Optional[Span]:
+        """Low-level start for hot paths (engine/Redis hooks); pair with close_span"""
+        parent = _current_span.get()
+        if parent is None or not parent.trace.sampled:
+            return None
+        trace = parent.trace
+        if trace.span_count >= trace.max_spans:
+            trace.dropped += 1
+            return None
+        trace.span_count += 1
+        span = Span(name, kind, trace)
+        parent.children.append(span)
+        return span
+
+    @staticmethod
+    def close_span(span: Optional[Span], error: Optional[str] = None):
+        if span is not None:
+            span.finish()
+            span.error = error
+
+    @classmethod
+    def push_span(cls, name: str, kind: str) -> Optional[Tuple[Span, Token]]:
+        """Open a child span and make it current; pair with pop_span (cheap no-op when not sampling)"""
+        span = cls.open_span(name, kind)
+        return (span, _current_span.set(span)) if span is not None else None
+
+    @staticmethod
+    def pop_span(pushed: Optional[Tuple[Span, Token]], error: Optional[str] = None):
+        if pushed is not None:
+            span, token = pushed
+            span.finish()
+            span.error = error
+            _current_span.reset(token)
+
+    @classmethod
+    @contextmanager
+    def span(cls, name: str, kind: str = "code") -> Iterator[Optional[Span]]:
+        """Child span that is current while the block runs (so its own calls nest under it)"""
+        span = cls.open_span(name, kind)
+        if span is None:
+            yield None
+            return
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.finish()
+            _current_span.reset(token)
+
+    @classmethod
+    def traced(cls, name: str, kind: str = "code") -> Callable:
+        """Decorator: run an async function inside a child span"""
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                pushed = cls.push_span(name, kind) if cls.current() else None
+                error = None
+                try:
+                    return await func(*args, **kwargs)
+                except BaseException as e:
+                    error = type(e).__name__
+                    raise
+                finally:
+                    cls.pop_span(pushed, error)
+            return wrapper
+        return decorator
+
+    # --- Discord ---
+
+    @classmethod
+    def _traced(cls, request):
+        async def traced_request(self_or_route, *args, **kwargs):
+            route = args[0] if args and hasattr(args[0], "method") else self_or_route
+            span = cls.open_span(f"{route.method} {getattr(route, 'path', '')}", "discord")
+            error = None
+            try:
+                return await request(self_or_route, *args, **kwargs)
+            except BaseException as e:
+                error = type(e).__name__
+                raise
+            finally:
+                cls.close_span(span, error)
+        return traced_request
+
+    @classmethod
+    def instrument_discord(cls, http: Any):
+        """Time Discord REST calls (bot HTTP client plus interaction responses/followups) inside traced commands"""
+        if not getattr(http, "_trace_instrumented", False):
+            http.request = cls._traced(http.request)
+            http._trace_instrumented = True
+
+        from disnake.webhook.async_ import AsyncWebhookAdapter
+        if not getattr(AsyncWebhookAdapter, "_trace_instrumented", False):
+            AsyncWebhookAdapter.request = cls._traced(AsyncWebhookAdapter.request)  # type: ignore[method-assign]
+            AsyncWebhookAdapter._trace_instrumented = True  # type: ignore[attr-defined]
+
+    # --- Views ---
+
+    @classmethod
+    def recent_slow(cls, limit: int = 5) -> List[Trace]:
+        return list(cls.slow_traces)[-limit:][::-1]
@@ -7,6 +7,8 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 from enum import Enum
 
+from src.utils.database_service import DatabaseService
+
 class ReveJSONEncoder(json.JSONEncoder):
     """Custom JSON encoder for Reve transaction logging"""
     
@@ -127,13 +129,21 @@ class TransactionLogger:
             "metadata": metadata or {}
         }
         
+        # Inside a unit of work, only write once the outer transaction has committed
+        if DatabaseService.defer_until_commit(self._write_transaction, transaction):
+            return
+        self._write_transaction(transaction)
+    
+    def _write_transaction(self, transaction: Dict[str, Any]):
+        """Serialize a transaction record to the transaction log"""
+        player_id = transaction["player_id"]
         try:
             # Use custom encoder to handle Decimal and other types
             self.logger.info(json.dumps(transaction, cls=ReveJSONEncoder))
         except Exception as e:
             # Fallback: log without JSON serialization
             self.logger.error(f"Transaction logging failed for player {player_id}: {e}")
-            self.logger.info(f"Transaction: {transaction_type.value} - Player: {player_id}")
+            self.logger.info(f"Transaction: {transaction['type']} - Player: {player_id}")
     
     def log_currency_change(
         self,